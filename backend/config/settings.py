@@ -44,6 +44,7 @@ INSTALLED_APPS = [
     'django.contrib.sessions',
     'django.contrib.messages',
     'django.contrib.staticfiles',
+    'django.contrib.postgres',
 
     # Thirdparty apps
     'django_filters',
@@ -67,6 +68,7 @@ MIDDLEWARE = [
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
     'django.contrib.auth.middleware.AuthenticationMiddleware',
+    'core.middleware.ReplicaStickinessMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
 ]
@@ -102,9 +104,53 @@ DATABASES = {
         'PASSWORD': config('POSTGRES_PASSWORD'),
         'HOST': config('POSTGRES_HOST'),
         'PORT': config('POSTGRES_PORT'),
+        # Keep connections open between requests (checked before reuse)
+        'CONN_MAX_AGE': config('DB_CONN_MAX_AGE', default=60, cast=int),
+        'CONN_HEALTH_CHECKS': config('DB_CONN_HEALTH_CHECKS', default=True, cast=bool),
     }
 }
 
+# Optional psycopg 3 connection pool (requires "psycopg[binary,pool]", which
+# is not in requirements.txt: the psycopg2 driver installed by default cannot
+# pool, and core.E001 refuses DB_POOL with it); replaces persistent
+# connections, so CONN_MAX_AGE is forced to 0 when enabled
+DB_POOL = config('DB_POOL', default=False, cast=bool)
+DB_POOL_MIN_SIZE = config('DB_POOL_MIN_SIZE', default=2, cast=int)
+DB_POOL_MAX_SIZE = config('DB_POOL_MAX_SIZE', default=4, cast=int)
+DB_POOL_TIMEOUT = config('DB_POOL_TIMEOUT', default=10, cast=int)  # seconds
+if DB_POOL:
+    DATABASES['default']['CONN_MAX_AGE'] = 0
+    DATABASES['default']['OPTIONS'] = {
+        'pool': {
+            'min_size': DB_POOL_MIN_SIZE,
+            'max_size': DB_POOL_MAX_SIZE,
+            'timeout': DB_POOL_TIMEOUT,
+        }
+    }
+
+# Optional read replica for reporting views (see core/routers.py). Views
+# decorated with @read_from_replica read from it unless the client wrote in
+# the last REPLICA_STICKY_SECONDS or the replica lags by over REPLICA_MAX_LAG
+REPLICA_DATABASE = 'replica'
+if config('POSTGRES_REPLICA_HOST', default=''):
+    DATABASES[REPLICA_DATABASE] = {
+        **DATABASES['default'],
+        'HOST': config('POSTGRES_REPLICA_HOST'),
+        'PORT': config('POSTGRES_REPLICA_PORT', default=DATABASES['default']['PORT']),
+        'TEST': {'MIRROR': 'default'},
+    }
+DATABASE_ROUTERS = ['core.routers.ReplicaRouter']
+REPLICA_MAX_LAG = config('REPLICA_MAX_LAG', default=5, cast=float)  # seconds
+REPLICA_LAG_CHECK_INTERVAL = config('REPLICA_LAG_CHECK_INTERVAL', default=5, cast=float)  # seconds
+REPLICA_STICKY_SECONDS = config('REPLICA_STICKY_SECONDS', default=15, cast=int)
+
+# Web server sizing, used by core/checks.py to validate connection budgets:
+# gunicorn workers (WEB_CONCURRENCY), threads per worker, and the Postgres
+# max_connections share this app may use
+WEB_CONCURRENCY = config('WEB_CONCURRENCY', default=1, cast=int)
+WEB_THREADS = config('WEB_THREADS', default=1, cast=int)
+DB_MAX_CONNECTIONS = config('DB_MAX_CONNECTIONS', default=90, cast=int)
+
 
 # Password validation
 # https://docs.djangoproject.com/en/5.2/ref/settings/#auth-password-validators
@@ -124,6 +170,28 @@ AUTH_PASSWORD_VALIDATORS = [
     },
 ]
 
+# Password hashing
+# PASSWORD_HASHER_POLICY picks the hasher for new passwords: 'pbkdf2' (Django's
+# default) or 'argon2' (requires argon2-cffi). The other hashers stay listed so
+# existing hashes still verify and are upgraded on the user's next login.
+PASSWORD_HASHER_POLICY = config('PASSWORD_HASHER_POLICY', default='pbkdf2')
+ARGON2_TIME_COST = config('ARGON2_TIME_COST', default=2, cast=int)
+ARGON2_MEMORY_COST = config('ARGON2_MEMORY_COST', default=19456, cast=int)  # KiB
+ARGON2_PARALLELISM = config('ARGON2_PARALLELISM', default=1, cast=int)
+
+PASSWORD_HASHERS = [
+    'django.contrib.auth.hashers.PBKDF2PasswordHasher',
+    'users.hashing.TunedArgon2PasswordHasher',
+    'django.contrib.auth.hashers.PBKDF2SHA1PasswordHasher',
+    'django.contrib.auth.hashers.ScryptPasswordHasher',
+]
+if PASSWORD_HASHER_POLICY == 'argon2':
+    PASSWORD_HASHERS.insert(0, PASSWORD_HASHERS.pop(1))
+
+# Registration hashes passwords in this many processes per web worker
+# (0 = inline, the default; see users/hashing.py)
+PASSWORD_HASHING_WORKERS = config('PASSWORD_HASHING_WORKERS', default=0, cast=int)
+
 
 # Internationalization
 # https://docs.djangoproject.com/en/5.2/topics/i18n/
@@ -147,21 +215,96 @@ STATIC_ROOT = BASE_DIR / 'staticfiles'
 MEDIA_URL = '/media/'
 MEDIA_ROOT = BASE_DIR / 'media'
 
+# Cold archives of closed events' votes (see votes/archive.py). Local disk by
+# default; set ARCHIVE_STORAGE_BACKEND to 'storages.backends.s3.S3Storage'
+# (django-storages) for S3-compatible object storage
+ARCHIVE_STORAGE_BACKEND = config('ARCHIVE_STORAGE_BACKEND', default='django.core.files.storage.FileSystemStorage')
+if ARCHIVE_STORAGE_BACKEND == 'django.core.files.storage.FileSystemStorage':
+    ARCHIVE_STORAGE_OPTIONS = {'location': config('ARCHIVE_ROOT', default=str(BASE_DIR / 'archive'))}
+else:
+    ARCHIVE_STORAGE_OPTIONS = {
+        'bucket_name': config('ARCHIVE_BUCKET', default=''),
+        'endpoint_url': config('ARCHIVE_ENDPOINT_URL', default='') or None,
+        'location': config('ARCHIVE_PREFIX', default=''),
+        'default_acl': 'private',
+    }
+
+STORAGES = {
+    'default': {'BACKEND': 'django.core.files.storage.FileSystemStorage'},
+    'staticfiles': {'BACKEND': 'django.contrib.staticfiles.storage.StaticFilesStorage'},
+    'archive': {'BACKEND': ARCHIVE_STORAGE_BACKEND, 'OPTIONS': ARCHIVE_STORAGE_OPTIONS},
+}
+ARCHIVE_BATCH_SIZE = config('ARCHIVE_BATCH_SIZE', default=5000, cast=int)  # rows per query/statement
+
+# Recounts run one election per process in a pool of this many workers
+# (0 or 1 = inline), each streaming votes through a server-side cursor
+RECOUNT_WORKERS = config('RECOUNT_WORKERS', default=4, cast=int)
+RECOUNT_CHUNK_SIZE = config('RECOUNT_CHUNK_SIZE', default=10000, cast=int)  # rows fetched per round trip
+# Running RecountJobs not finished after this long are assumed to have lost
+# their worker and are claimed again; keep it above the longest recount
+RECOUNT_JOB_STALE_SECONDS = config('RECOUNT_JOB_STALE_SECONDS', default=3600, cast=int)
+
 FRONTEND_URL = config('FRONTEND_URL', default='http://localhost:8000')
 
+# Signed invitation tokens
+INVITATION_TOKEN_MAX_AGE = config('INVITATION_TOKEN_MAX_AGE', default=14 * 24 * 60 * 60, cast=int)
+# Temporary migration switch: while enabled, plain UUID tokens from links sent
+# before signed tokens existed skip signature checks and are looked up in the
+# database. Only enable it until those links have expired, then remove it
+INVITATION_ACCEPT_LEGACY_TOKENS = config('INVITATION_ACCEPT_LEGACY_TOKENS', default=False, cast=bool)
+
+# Chunked voter roll uploads
+INVITATION_UPLOAD_ROOT = MEDIA_ROOT / 'invitation_uploads'
+INVITATION_UPLOAD_CHUNK_SIZE = config('INVITATION_UPLOAD_CHUNK_SIZE', default=5 * 1024 * 1024, cast=int)
+INVITATION_UPLOAD_MAX_SIZE = config('INVITATION_UPLOAD_MAX_SIZE', default=1024 * 1024 * 1024, cast=int)
+# Uploads still processing after this long are assumed to have lost their
+# worker and are claimed again; keep it above the longest import
+INVITATION_UPLOAD_STALE_SECONDS = config('INVITATION_UPLOAD_STALE_SECONDS', default=3600, cast=int)
+
+# Bulk imports keep this many row errors in their results and only count
+# the rest, so a bad file cannot produce an unbounded report
+IMPORT_MAX_REPORTED_ERRORS = config('IMPORT_MAX_REPORTED_ERRORS', default=100, cast=int)
+# Voter rolls provisioned through the API are capped at this many rows;
+# larger rolls go through the provision_voters management command
+VOTER_PROVISION_API_MAX_ROWS = config('VOTER_PROVISION_API_MAX_ROWS', default=5000, cast=int)
+
 # Default primary key field type
 # https://docs.djangoproject.com/en/5.2/ref/settings/#default-auto-field
 
 DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 
+# Cache (per-process memory by default; point at Redis or memcached in production
+# so cached sessions and THROTTLE_CACHE are shared across workers)
+CACHE_BACKEND = config('CACHE_BACKEND', default='django.core.cache.backends.locmem.LocMemCache')
+CACHES = {
+    'default': {
+        'BACKEND': CACHE_BACKEND,
+        'LOCATION': config('CACHE_LOCATION', default=''),
+    }
+}
+# Cache backends that only live in one process (see core/checks.py)
+PROCESS_LOCAL_CACHE_BACKENDS = [
+    'django.core.cache.backends.locmem.LocMemCache',
+    'django.core.cache.backends.dummy.DummyCache',
+]
+
 # Custom user model
 AUTH_USER_MODEL = 'users.User'
 
+# Admin changelists switch to estimated counts above this many rows
+ADMIN_ESTIMATED_COUNT_THRESHOLD = config('ADMIN_ESTIMATED_COUNT_THRESHOLD', default=100000, cast=int)
+
+# Deleting objects with more dependent rows than this queues a background
+# DeletionJob (run by the run_deletion_jobs worker) instead of deleting inline
+DELETION_INLINE_MAX_ROWS = config('DELETION_INLINE_MAX_ROWS', default=1000, cast=int)
+DELETION_BATCH_SIZE = config('DELETION_BATCH_SIZE', default=5000, cast=int)  # rows per statement
+DELETION_JOB_STALE_SECONDS = config('DELETION_JOB_STALE_SECONDS', default=600, cast=int)
+
 # REST Framework Settings
 REST_FRAMEWORK = {
     'DEFAULT_AUTHENTICATION_CLASSES': [
         'rest_framework.authentication.SessionAuthentication',
-        'rest_framework.authentication.TokenAuthentication',
+        'users.authentication.CachedTokenAuthentication',
     ],
     'DEFAULT_PERMISSION_CLASSES': [
         'rest_framework.permissions.IsAuthenticated',
@@ -169,20 +312,32 @@ REST_FRAMEWORK = {
     'DEFAULT_FILTER_BACKENDS': [
         'django_filters.rest_framework.DjangoFilterBackend',
         'rest_framework.filters.OrderingFilter',
-        'rest_framework.filters.SearchFilter',
+        'core.filters.IndexedSearchFilter',
     ],
     'DEFAULT_PAGINATION_CLASS': 'rest_framework.pagination.PageNumberPagination',
     'PAGE_SIZE': 20,
     'DEFAULT_THROTTLE_CLASSES': [
-        'rest_framework.throttling.AnonRateThrottle',
-        'rest_framework.throttling.UserRateThrottle',
+        'core.throttling.SharedAnonRateThrottle',
+        'core.throttling.SharedUserRateThrottle',
     ],
     'DEFAULT_THROTTLE_RATES': {
         'anon': '10/min',
-        'user': '1000/day'
+        'user': '1000/day',
+        'login': config('THROTTLE_RATE_LOGIN', default='10/min'),
+        'login_account': config('THROTTLE_RATE_LOGIN_ACCOUNT', default='20/hour'),
+        'vote_verify': config('THROTTLE_RATE_VOTE_VERIFY', default='30/min'),
     },
 }
 
+# Throttle counters live in the database (core.ThrottleBucket) so limits hold
+# across workers; set to a cache alias (e.g. a Redis cache) to count there instead
+THROTTLE_CACHE = config('THROTTLE_CACHE', default='')
+
+# API token lookups are cached per process (and optionally in a shared cache alias)
+TOKEN_AUTH_CACHE_TTL = config('TOKEN_AUTH_CACHE_TTL', default=60, cast=int)  # seconds
+TOKEN_AUTH_CACHE_SIZE = config('TOKEN_AUTH_CACHE_SIZE', default=10000, cast=int)
+TOKEN_AUTH_SHARED_CACHE = config('TOKEN_AUTH_SHARED_CACHE', default='')
+
 # CSRF Settings
 CSRF_COOKIE_NAME = "csrftoken"
 CSRF_COOKIE_SECURE = not DEBUG
@@ -197,6 +352,24 @@ CSRF_TRUSTED_ORIGINS = [
 SESSION_COOKIE_SAMESITE = 'Lax'
 SESSION_COOKIE_SECURE = True
 
+# Sessions are read through the cache and written through to the database
+# when the cache is shared by all workers; with a per-process cache another
+# worker would keep serving a session after logout, so they stay in the
+# database. 'django.contrib.sessions.backends.signed_cookies' avoids
+# server-side storage
+SESSION_ENGINE = config(
+    'SESSION_ENGINE',
+    default=(
+        'django.contrib.sessions.backends.db'
+        if CACHE_BACKEND in PROCESS_LOCAL_CACHE_BACKENDS
+        else 'django.contrib.sessions.backends.cached_db'
+    )
+)
+SESSION_CACHE_ALIAS = config('SESSION_CACHE_ALIAS', default='default')
+
+# Flash messages travel in a signed cookie so they never cause a session write
+MESSAGE_STORAGE = 'django.contrib.messages.storage.cookie.CookieStorage'
+
 X_FRAME_OPTIONS = 'DENY'
 SECURE_REFERRER_POLICY = "same-origin"
 
@@ -57,6 +57,7 @@ urlpatterns = [
     path('api/events/', include(('election_events.urls_api', 'events_api'), namespace='events_api')),
     path('api/', include('elections.urls_api')),
     path('api/votes/', include('votes.urls')),
+    path('api/deletion-jobs/', include('core.urls_api')),
     
     # API documentation (Swagger / Redoc)
     re_path(r'^swagger(?P<format>\.json|\.yaml)$', schema_view.without_ui(cache_timeout=0), name='schema-json'),
@@ -1,3 +1,22 @@
-from django.contrib import admin
+"""
+core/admin.py
 
-# Register your models here.
+This module defines admin helpers shared by the project's apps.
+"""
+from core.pagination import EstimatedCountPaginator
+
+
+class LargeTableAdminMixin:
+    """
+    ModelAdmin mixin for changelists over tables with millions of rows.
+    
+    Replaces the exact COUNT(*) with a Postgres row estimate above
+    ADMIN_ESTIMATED_COUNT_THRESHOLD, and skips the second, unfiltered count
+    the changelist would otherwise run for the "N total" label.
+    
+    Attributes:
+        paginator: Paginator using estimated counts for large results
+        show_full_result_count: Disabled to avoid the extra full-table count
+    """
+    paginator = EstimatedCountPaginator
+    show_full_result_count = False
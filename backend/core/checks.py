@@ -0,0 +1,128 @@
+"""
+core/checks.py
+
+This module defines system checks that validate database connection
+settings against the web server's size, and that features sharing state
+between workers through the cache are given a cache that is shared.
+
+Every gunicorn worker thread holds its own database connection (persistent
+connections) or draws from its worker's pool, so the connections the app
+can open are WEB_CONCURRENCY times either WEB_THREADS or DB_POOL_MAX_SIZE.
+These checks run at startup and with ``manage.py check`` and catch sizes
+that would exhaust Postgres' max_connections or starve threads.
+"""
+import importlib.util
+
+from django.conf import settings
+from django.core.checks import Error, Warning, register
+
+from core.routers import replica_configured
+
+
+@register()
+def check_database_connections(app_configs, **kwargs):
+    """
+    Validate persistent-connection and pool settings.
+
+    Returns:
+        list: Check messages
+    """
+    messages = []
+    workers = settings.WEB_CONCURRENCY
+    threads = settings.WEB_THREADS
+    budget = settings.DB_MAX_CONNECTIONS
+
+    if settings.DB_POOL:
+        # Django only pools with psycopg 3, and uses psycopg2 when psycopg 3
+        # is not installed (requirements.txt pins psycopg2-binary)
+        from django.db.backends.postgresql.psycopg_any import is_psycopg3
+
+        if not is_psycopg3 or importlib.util.find_spec('psycopg_pool') is None:
+            messages.append(Error(
+                "DB_POOL is enabled but the database driver is not psycopg 3 with "
+                "psycopg_pool; psycopg2 cannot pool connections.",
+                hint='Install "psycopg[binary,pool]" or unset DB_POOL.',
+                id='core.E001',
+            ))
+        if settings.DB_POOL_MIN_SIZE > settings.DB_POOL_MAX_SIZE:
+            messages.append(Error(
+                "DB_POOL_MIN_SIZE is larger than DB_POOL_MAX_SIZE.",
+                id='core.E002',
+            ))
+        total = workers * settings.DB_POOL_MAX_SIZE
+        if total > budget:
+            messages.append(Error(
+                f"{workers} workers x {settings.DB_POOL_MAX_SIZE} pooled connections "
+                f"= {total}, more than DB_MAX_CONNECTIONS ({budget}).",
+                hint="Lower DB_POOL_MAX_SIZE or WEB_CONCURRENCY.",
+                id='core.E003',
+            ))
+        if settings.DB_POOL_MAX_SIZE < threads:
+            messages.append(Warning(
+                f"DB_POOL_MAX_SIZE ({settings.DB_POOL_MAX_SIZE}) is smaller than "
+                f"WEB_THREADS ({threads}); threads will wait for connections.",
+                hint=f"Set DB_POOL_MAX_SIZE to at least {threads}.",
+                id='core.W001',
+            ))
+    elif settings.DATABASES['default'].get('CONN_MAX_AGE'):
+        total = workers * threads
+        if total > budget:
+            messages.append(Error(
+                f"{workers} workers x {threads} threads keep {total} persistent "
+                f"connections, more than DB_MAX_CONNECTIONS ({budget}).",
+                hint="Lower WEB_CONCURRENCY or WEB_THREADS, or enable DB_POOL.",
+                id='core.E004',
+            ))
+        if not settings.DATABASES['default'].get('CONN_HEALTH_CHECKS'):
+            messages.append(Warning(
+                "Persistent connections are enabled without CONN_HEALTH_CHECKS; "
+                "a request may fail on a connection the server has closed.",
+                hint="Set DB_CONN_HEALTH_CHECKS=True.",
+                id='core.W002',
+            ))
+
+    return messages
+
+
+def cache_is_shared(alias):
+    """
+    Check whether a cache alias is shared by every worker process.
+
+    Args:
+        alias (str): Cache alias in CACHES
+
+    Returns:
+        bool: False for per-process backends such as LocMemCache
+    """
+    backend = settings.CACHES.get(alias, {}).get('BACKEND')
+    return backend not in settings.PROCESS_LOCAL_CACHE_BACKENDS
+
+
+@register()
+def check_shared_caches(app_configs, **kwargs):
+    """
+    Refuse settings that keep cross-worker state in a per-process cache.
+
+    Returns:
+        list: Check messages
+    """
+    messages = []
+    if (
+        settings.SESSION_ENGINE == 'django.contrib.sessions.backends.cached_db'
+        and not cache_is_shared(settings.SESSION_CACHE_ALIAS)
+    ):
+        messages.append(Error(
+            f"cached_db sessions use the per-process cache '{settings.SESSION_CACHE_ALIAS}'; "
+            "a session flushed on logout stays valid on every other worker.",
+            hint="Point CACHE_BACKEND at a shared cache (e.g. Redis) or use the db session engine.",
+            id='core.E005',
+        ))
+    if replica_configured() and not cache_is_shared('default'):
+        messages.append(Warning(
+            "A read replica is configured but the default cache is per-process; "
+            "clients without cookies are only pinned to the primary after a write "
+            "on the worker that handled it.",
+            hint="Point CACHE_BACKEND at a shared cache (e.g. Redis).",
+            id='core.W003',
+        ))
+    return messages
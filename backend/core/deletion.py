@@ -0,0 +1,309 @@
+"""
+core/deletion.py
+
+This module deletes large objects in the background, in bounded batches.
+
+Deleting an ElectionEvent through the ORM makes Django's cascade collector
+load every election, candidate, vote, audit log, invitation and voter
+profile of the event into memory before deleting them, stalling the worker
+and holding locks for as long as that takes. Here, the object is flagged
+``is_deleting`` and a DeletionJob is queued instead. The run_deletion_jobs
+worker walks the models' CASCADE and SET_NULL relations, deepest first,
+and purges dependent rows with set-based ``DELETE ... WHERE pk IN (SELECT
+... LIMIT n)`` statements, each in its own short transaction. Once nothing
+depends on the object any more, the object itself is deleted through the
+ORM as usual.
+
+Apps can purge their rows faster than batch by batch (e.g. by dropping
+table partitions) by connecting to the ``purge_started`` signal.
+"""
+import logging
+from datetime import timedelta
+
+from django.conf import settings
+from django.contrib.contenttypes.models import ContentType
+from django.db import connections, models, router, transaction
+from django.db.models import Q
+from django.dispatch import Signal
+from django.utils import timezone
+
+from core.models import DeletionJob
+from core.pagination import estimate_count
+
+logger = logging.getLogger(__name__)
+
+# Sent by the worker before purging an object's dependent rows, with the
+# object's model as sender and ``object_id`` and ``using`` arguments
+purge_started = Signal()
+
+
+class DeletionStep:
+    """
+    One set of dependent rows to purge before deleting an object.
+
+    Attributes:
+        model: Model whose rows are purged
+        lookup (str): Filter lookup from the model to the object's primary key
+        field: Foreign key to clear instead of deleting rows, or None
+        depth (int): Number of relations between the model and the object
+    """
+    def __init__(self, model, lookup, field=None, depth=1):
+        self.model = model
+        self.lookup = lookup
+        self.field = field
+        self.depth = depth
+
+    @property
+    def label(self):
+        """
+        Return the table name, and the cleared column for SET_NULL steps.
+        """
+        table = self.model._meta.db_table
+        return f"{table}.{self.field.column}" if self.field else table
+
+    def queryset(self, object_id, using):
+        """
+        Return the rows this step still has to purge for an object.
+        """
+        return self.model._base_manager.using(using).filter(**{self.lookup: object_id})
+
+
+def deletion_plan(model, lookup='pk', depth=1, path=()):
+    """
+    Return the steps that purge everything depending on an instance of a model.
+
+    Steps are ordered so that rows are always purged before the rows they
+    reference: deeper models first, and for the same model, shorter (cheaper)
+    lookup paths first. A model reachable along several paths (such as votes,
+    through candidates, voters and events) gets one step per path; the
+    later ones find little or nothing left to purge.
+
+    Args:
+        model: Model of the object to delete
+
+    Returns:
+        list: DeletionStep instances in execution order
+    """
+    steps = []
+    for relation in model._meta.related_objects:
+        if not (relation.one_to_many or relation.one_to_one):
+            continue
+        field = relation.field
+        related_model = relation.related_model
+        if related_model in path + (model,) or related_model._meta.proxy:
+            continue
+        related_lookup = f"{field.name}__{lookup}"
+        on_delete = field.remote_field.on_delete
+        if on_delete is models.CASCADE:
+            steps.extend(deletion_plan(related_model, related_lookup, depth + 1, path + (model,)))
+            steps.append(DeletionStep(related_model, related_lookup, depth=depth))
+        elif on_delete is models.SET_NULL:
+            steps.append(DeletionStep(related_model, related_lookup, field=field, depth=depth))
+        # Other on_delete behaviours are left to the final ORM delete
+
+    if path:
+        return steps
+
+    max_depth = {}
+    for step in steps:
+        max_depth[step.model] = max(max_depth.get(step.model, 0), step.depth)
+    # A model referencing another is always at least one level deeper than
+    # it, so purging in decreasing max depth purges referencing rows first.
+    # SET_NULL steps only touch the referencing side and can run first.
+    return sorted(
+        steps,
+        key=lambda step: (step.field is None, -max_depth[step.model], step.depth)
+    )
+
+
+def estimate_rows(instance, exact_up_to):
+    """
+    Estimate how many dependent rows deleting an instance would purge.
+
+    Each step's rows are counted exactly up to ``exact_up_to`` (a bounded
+    count, cheap however large the object), and beyond that the planner's
+    row estimate is used, so small objects are never mistaken for large
+    ones or the other way round because of stale statistics.
+
+    Args:
+        instance: Model instance to delete
+        exact_up_to (int): Rows counted exactly per step
+
+    Returns:
+        int: Estimated number of rows
+    """
+    using = instance._state.db
+    total = 0
+    for step in deletion_plan(type(instance)):
+        if step.field is not None:
+            continue
+        queryset = step.queryset(instance.pk, using).order_by()
+        counted = queryset[:exact_up_to + 1].count()
+        if counted > exact_up_to:
+            counted = max(counted, estimate_count(queryset) or 0)
+        total += counted
+    return total
+
+
+def delete_or_schedule(instance, user=None):
+    """
+    Delete an instance now if it is small, or queue a DeletionJob for it.
+
+    Objects with at most DELETION_INLINE_MAX_ROWS dependent rows are
+    deleted immediately. Larger ones are flagged ``is_deleting``, along
+    with their dependents that have the flag (an event's elections), so
+    they drop out of listings and voting, and a job is queued. Scheduling an object that is
+    already being deleted returns its job, re-queued if it had failed.
+
+    Args:
+        instance: Model instance to delete
+        user: User requesting the deletion
+
+    Returns:
+        DeletionJob or None: The queued job, or None if deleted inline
+    """
+    model = type(instance)
+    content_type = ContentType.objects.get_for_model(model)
+
+    if getattr(instance, 'is_deleting', False):
+        job = DeletionJob.objects.filter(
+            content_type=content_type,
+            object_id=instance.pk
+        ).order_by('-created_at').first()
+        if job is not None:
+            if job.status == DeletionJob.FAILED:
+                job.status = DeletionJob.PENDING
+                job.error = ''
+                job.save(update_fields=['status', 'error', 'updated_at'])
+            return job
+
+    estimated = estimate_rows(instance, settings.DELETION_INLINE_MAX_ROWS)
+    if estimated <= settings.DELETION_INLINE_MAX_ROWS:
+        instance.delete()
+        return None
+
+    using = router.db_for_write(model, instance=instance)
+    with transaction.atomic(using=using):
+        for step in deletion_plan(model):
+            if step.field is None and any(f.name == 'is_deleting' for f in step.model._meta.fields):
+                step.queryset(instance.pk, using).update(is_deleting=True)
+        model._base_manager.using(using).filter(pk=instance.pk).update(is_deleting=True)
+        instance.is_deleting = True
+        job = DeletionJob.objects.using(using).create(
+            content_type=content_type,
+            object_id=instance.pk,
+            object_repr=str(instance)[:255],
+            requested_by=user,
+            estimated_rows=estimated
+        )
+    logger.info(f"Queued deletion job {job.pk} for {model.__name__} {instance.pk} (~{estimated} rows)")
+    return job
+
+
+def claim_job():
+    """
+    Claim the oldest runnable job for this worker.
+
+    Jobs still marked running whose worker stopped updating them for
+    DELETION_JOB_STALE_SECONDS are claimed again; purging is idempotent, so
+    they simply resume.
+
+    Returns:
+        DeletionJob or None: The claimed job, now running
+    """
+    stale_before = timezone.now() - timedelta(seconds=settings.DELETION_JOB_STALE_SECONDS)
+    with transaction.atomic():
+        job = (
+            DeletionJob.objects
+            .select_for_update(skip_locked=True)
+            .filter(
+                Q(status=DeletionJob.PENDING) |
+                Q(status=DeletionJob.RUNNING, updated_at__lt=stale_before)
+            )
+            .order_by('created_at')
+            .first()
+        )
+        if job is None:
+            return None
+        job.status = DeletionJob.RUNNING
+        job.started_at = job.started_at or timezone.now()
+        job.save(update_fields=['status', 'started_at', 'updated_at'])
+    return job
+
+
+def purge_batch(queryset, batch_size, clear_field=None):
+    """
+    Delete up to batch_size rows of a queryset with one set-based statement.
+
+    The rows are deleted by primary key with ``DELETE ... WHERE pk IN
+    (SELECT pk ... LIMIT n)``: no model instances are loaded, and no
+    signals or ORM cascades run, so whatever references the rows must be
+    purged first.
+
+    Args:
+        queryset: Rows to purge
+        batch_size (int): Maximum rows to purge
+        clear_field: Foreign key to set to NULL instead of deleting the rows
+
+    Returns:
+        int: Number of rows deleted or updated
+    """
+    using = queryset.db
+    connection = connections[using]
+    qn = connection.ops.quote_name
+    model = queryset.model
+    table = qn(model._meta.db_table)
+    pk = qn(model._meta.pk.column)
+    sql, params = queryset.order_by().values('pk')[:batch_size].query.sql_with_params()
+
+    with transaction.atomic(using=using), connection.cursor() as cursor:
+        if clear_field is None:
+            cursor.execute(f"DELETE FROM {table} WHERE {pk} IN ({sql})", params)
+        else:
+            cursor.execute(
+                f"UPDATE {table} SET {qn(clear_field.column)} = NULL WHERE {pk} IN ({sql})",
+                params
+            )
+        return cursor.rowcount
+
+
+def run_job(job, batch_size=None):
+    """
+    Purge a job's object batch by batch, then delete the object.
+
+    Progress is saved after every batch, so the status endpoint can report
+    it and a stale job can be resumed by another worker.
+
+    Args:
+        job (DeletionJob): A claimed, running job
+        batch_size (int): Rows per statement (default DELETION_BATCH_SIZE)
+    """
+    batch_size = batch_size or settings.DELETION_BATCH_SIZE
+    model = job.content_type.model_class()
+    using = job._state.db
+
+    try:
+        purge_started.send(sender=model, object_id=job.object_id, using=using)
+        for step in deletion_plan(model):
+            while True:
+                count = purge_batch(step.queryset(job.object_id, using), batch_size, step.field)
+                if count:
+                    job.progress[step.label] = job.progress.get(step.label, 0) + count
+                    if step.field is None:
+                        job.deleted_rows += count
+                    job.save(update_fields=['progress', 'deleted_rows', 'updated_at'])
+                if count < batch_size:
+                    break
+        model._base_manager.using(using).filter(pk=job.object_id).delete()
+    except Exception as e:
+        logger.exception(f"Deletion job {job.pk} failed")
+        job.status = DeletionJob.FAILED
+        job.error = str(e)
+        job.finished_at = timezone.now()
+        job.save(update_fields=['status', 'error', 'finished_at', 'updated_at'])
+        return
+
+    job.status = DeletionJob.DONE
+    job.finished_at = timezone.now()
+    job.save(update_fields=['status', 'finished_at', 'updated_at'])
+    logger.info(f"Deletion job {job.pk} done: {job.deleted_rows} rows purged")
@@ -0,0 +1,65 @@
+"""
+core/explain.py
+
+This module runs Postgres EXPLAIN on querysets and inspects the resulting
+plans, e.g. to check that a query is answered from an index.
+"""
+import json
+
+from django.db import connections
+
+
+def explain(queryset, analyze=False, buffers=False):
+    """
+    Return the Postgres query plan of a queryset as a dict.
+
+    Args:
+        queryset: QuerySet to explain
+        analyze (bool): Execute the query and include actual timings
+        buffers (bool): Include buffer usage (requires analyze)
+
+    Returns:
+        dict: The ``EXPLAIN (FORMAT JSON)`` output for the query, with the
+        plan tree under ``'Plan'``
+    """
+    options = ['FORMAT JSON']
+    if analyze:
+        options.append('ANALYZE')
+    if buffers:
+        options.append('BUFFERS')
+
+    sql, params = queryset.query.sql_with_params()
+    with connections[queryset.db].cursor() as cursor:
+        cursor.execute(f"EXPLAIN ({', '.join(options)}) {sql}", params)
+        plan = cursor.fetchone()[0]
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+    return plan[0]
+
+
+def plan_nodes(plan):
+    """
+    Yield every node of a plan tree, depth first.
+
+    Args:
+        plan (dict): A plan node, e.g. ``explain(queryset)['Plan']``
+
+    Yields:
+        dict: Plan nodes
+    """
+    yield plan
+    for child in plan.get('Plans', []):
+        yield from plan_nodes(child)
+
+
+def plan_index_names(plan):
+    """
+    Return the names of all indexes a plan reads.
+
+    Args:
+        plan (dict): A plan node, e.g. ``explain(queryset)['Plan']``
+
+    Returns:
+        set: Index names
+    """
+    return {node['Index Name'] for node in plan_nodes(plan) if 'Index Name' in node}
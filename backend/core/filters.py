@@ -0,0 +1,84 @@
+"""
+core/filters.py
+
+This module defines the project's DRF search filter backend.
+
+DRF's SearchFilter turns every term into ``icontains`` (``UPPER(col) LIKE
+UPPER('%term%')``). A leading wildcard can only be answered by the trigram
+GIN indexes on ``UPPER(col)``, and Postgres trigram indexes need at least
+three characters to narrow anything down. IndexedSearchFilter therefore
+matches terms of three or more characters as substrings (trigram index) and
+shorter terms as prefixes (``text_pattern_ops`` btree index), so that no
+search term falls back to a sequential scan.
+
+This changes what short terms match: ``?search=al`` finds "Alice" but not
+"Sally". Every field searched through this filter needs both indexes on
+``UPPER(col)``; check_search_indexes verifies that they are used.
+"""
+import operator
+from functools import reduce
+
+from django.db import models
+from django.db.models.constants import LOOKUP_SEP
+
+from rest_framework.filters import SearchFilter
+
+TRIGRAM_MIN_LENGTH = 3
+
+
+class IndexedSearchFilter(SearchFilter):
+    """
+    SearchFilter that picks an index-friendly lookup per search term.
+
+    Fields declared with an explicit DRF prefix (``^``, ``=``, ``@``, ``$``)
+    keep their lookup; unprefixed fields use ``icontains`` for terms of
+    TRIGRAM_MIN_LENGTH characters or more and ``istartswith`` for shorter
+    ones.
+    """
+
+    def filter_queryset(self, request, queryset, view):
+        """
+        Return the queryset filtered by the request's search terms.
+        """
+        search_fields = self.get_search_fields(view, request)
+        search_terms = self.get_search_terms(request)
+
+        if not search_fields or not search_terms:
+            return queryset
+
+        orm_lookups = [
+            self.construct_search(str(search_field), queryset)
+            for search_field in search_fields
+        ]
+
+        base = queryset
+        conditions = (
+            reduce(
+                operator.or_,
+                (models.Q(**{self.term_lookup(orm_lookup, term): term}) for orm_lookup in orm_lookups)
+            ) for term in search_terms
+        )
+        queryset = queryset.filter(reduce(operator.and_, conditions))
+
+        # Remove duplicates from results, if necessary
+        if self.must_call_distinct(queryset, search_fields):
+            queryset = queryset.filter(pk=models.OuterRef('pk'))
+            queryset = base.filter(models.Exists(queryset))
+        return queryset
+
+    def term_lookup(self, orm_lookup, term):
+        """
+        Return the lookup used to match one search term.
+
+        Args:
+            orm_lookup (str): Lookup built by construct_search
+            term (str): Search term
+
+        Returns:
+            str: ``orm_lookup``, or its ``istartswith`` variant for a short
+            term matched with ``icontains``
+        """
+        suffix = f'{LOOKUP_SEP}icontains'
+        if orm_lookup.endswith(suffix) and len(term) < TRIGRAM_MIN_LENGTH:
+            return orm_lookup[:-len(suffix)] + f'{LOOKUP_SEP}istartswith'
+        return orm_lookup
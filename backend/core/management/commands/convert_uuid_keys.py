@@ -0,0 +1,87 @@
+"""
+core/management/commands/convert_uuid_keys.py
+
+This module defines a management command that converts UUID key columns
+from varchar(36) to the native uuid type online.
+"""
+from django.apps import apps
+from django.core.management.base import BaseCommand, CommandError
+from django.db import DEFAULT_DB_ALIAS, connections, models
+
+from core.uuid_conversion import ConversionPlan, validate_foreign_keys
+
+
+def uuid_key_tables():
+    """
+    Return the tables of every model with a UUID primary key.
+    """
+    return [
+        model._meta.db_table
+        for model in apps.get_models()
+        if model._meta.managed and not model._meta.proxy
+        and isinstance(model._meta.pk, models.UUIDField)
+    ]
+
+
+class Command(BaseCommand):
+    """
+    Convert the varchar(36) primary keys of UUID models, and every foreign
+    key pointing at them, to uuid without holding long exclusive locks (see
+    core/uuid_conversion.py). Run it against a live database before
+    ``migrate``; the migrations converting these keys then find them
+    already converted and skip them. With --check, only scan for values
+    that cannot be cast to uuid.
+
+    Each phase can be re-run, so an interrupted conversion (for instance
+    when the swap gives up on --lock-timeout) is resumed by running the
+    command again.
+    """
+    help = "Convert varchar UUID key columns to native uuid online."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--check', action='store_true', help="Only report values that cannot be converted")
+        parser.add_argument('--batch-size', type=int, default=5000, help="Rows updated per transaction")
+        parser.add_argument('--lock-timeout', default='5s', help="Give up waiting for table locks after this long")
+        parser.add_argument('--database', default=DEFAULT_DB_ALIAS, help="Database to convert")
+
+    def handle(self, *args, **options):
+        connection = connections[options['database']]
+        tables = uuid_key_tables()
+        try:
+            plan = ConversionPlan(connection, tables)
+        except ValueError as error:
+            raise CommandError(str(error))
+
+        if plan:
+            for table, columns in plan.columns.items():
+                self.stdout.write(f"{table}: {', '.join(columns)}")
+            invalid = plan.invalid_values()
+            for table, column, pk, value in invalid[:20]:
+                self.stdout.write(self.style.ERROR(f"{table}.{column} pk={pk} value={value!r}"))
+            if invalid:
+                raise CommandError(f"{len(invalid)} values cannot be converted to uuid.")
+        if options['check']:
+            self.stdout.write(self.style.SUCCESS("All UUID key columns can be converted."))
+            return
+
+        if plan:
+            try:
+                self.stdout.write("Adding shadow columns and triggers...")
+                plan.prepare(lock_timeout=options['lock_timeout'])
+                self.stdout.write("Backfilling...")
+                updated = plan.backfill(batch_size=options['batch_size'])
+                self.stdout.write(f"  {updated} rows updated")
+                self.stdout.write("Building indexes concurrently...")
+                plan.build_indexes()
+                self.stdout.write("Swapping columns...")
+                plan.swap(lock_timeout=options['lock_timeout'])
+            except ValueError as error:
+                raise CommandError(str(error))
+
+        # Foreign keys re-created by this or an interrupted earlier run
+        related = set(plan.columns) | {
+            model._meta.db_table for model in apps.get_models(include_auto_created=True)
+        }
+        for table, name in validate_foreign_keys(connection, related):
+            self.stdout.write(f"Validated {table}.{name}")
+        self.stdout.write(self.style.SUCCESS("All UUID key columns are uuid."))
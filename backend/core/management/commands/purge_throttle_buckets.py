@@ -0,0 +1,36 @@
+"""
+core/management/commands/purge_throttle_buckets.py
+
+This module defines a management command that deletes expired throttle
+counters.
+"""
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from core.models import ThrottleBucket
+
+
+class Command(BaseCommand):
+    """
+    Delete ThrottleBucket rows whose windows can no longer affect a throttle
+    decision, in batches so the table is never locked for long. Run it
+    periodically (e.g. every few minutes from cron).
+    """
+    help = "Delete expired throttle counters."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=5000, help="Rows deleted per statement")
+
+    def handle(self, *args, **options):
+        now = timezone.now()
+        deleted = 0
+        while True:
+            batch = list(
+                ThrottleBucket.objects
+                .filter(expires_at__lt=now)
+                .values_list('pk', flat=True)[:options['batch_size']]
+            )
+            if not batch:
+                break
+            deleted += ThrottleBucket.objects.filter(pk__in=batch).delete()[0]
+        self.stdout.write(self.style.SUCCESS(f"Deleted {deleted} expired throttle buckets."))
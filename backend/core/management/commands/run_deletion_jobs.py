@@ -0,0 +1,41 @@
+"""
+core/management/commands/run_deletion_jobs.py
+
+This module defines the worker command that runs background deletion jobs.
+"""
+import time
+
+from django.core.management.base import BaseCommand
+
+from core.deletion import claim_job, run_job
+
+
+class Command(BaseCommand):
+    """
+    Claim queued DeletionJobs one at a time and purge their objects in
+    batches. Several workers can run side by side; each job is claimed with
+    SELECT ... FOR UPDATE SKIP LOCKED. With --once the worker exits when
+    the queue is empty, otherwise it polls every --sleep seconds.
+    """
+    help = "Run queued background deletion jobs."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--once', action='store_true', help="Exit when no job is queued")
+        parser.add_argument('--sleep', type=float, default=5.0, help="Seconds between polls of an empty queue")
+        parser.add_argument('--batch-size', type=int, default=None, help="Rows per statement")
+
+    def handle(self, *args, **options):
+        while True:
+            job = claim_job()
+            if job is None:
+                if options['once']:
+                    return
+                time.sleep(options['sleep'])
+                continue
+
+            self.stdout.write(f"Running deletion job {job.pk}: {job.content_type.model} {job.object_repr}")
+            run_job(job, batch_size=options['batch_size'])
+            if job.status == job.DONE:
+                self.stdout.write(self.style.SUCCESS(f"Deleted {job.object_repr}: {job.deleted_rows} rows purged."))
+            else:
+                self.stdout.write(self.style.ERROR(f"Deletion job {job.pk} failed: {job.error}"))
@@ -0,0 +1,41 @@
+"""
+core/management/commands/run_status_scheduler.py
+
+This module defines the worker command that moves election events and
+elections between scheduled, open and closed as their windows pass.
+"""
+import time
+
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from core.scheduling import advance_statuses, next_transition
+
+
+class Command(BaseCommand):
+    """
+    Advance every due status, then sleep until the next start or end time
+    and advance again, so statuses flip at the boundaries rather than on a
+    polling interval. Sleeps are capped at --max-sleep seconds so that
+    windows moved earlier by an edit are still picked up promptly. With
+    --once the command advances what is due and exits, e.g. from cron.
+    """
+    help = "Open and close election events and elections at their start and end times."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--once', action='store_true', help="Advance due statuses and exit")
+        parser.add_argument('--max-sleep', type=float, default=60.0, help="Longest wait between checks, in seconds")
+
+    def handle(self, *args, **options):
+        while True:
+            for instance, previous in advance_statuses():
+                self.stdout.write(f"{type(instance).__name__} {instance}: {previous} -> {instance.status}")
+            if options['once']:
+                return
+
+            moment = next_transition()
+            wait = options['max_sleep']
+            if moment is not None:
+                # Windows close once end_time has passed, so wake just after
+                wait = min(wait, max((moment - timezone.now()).total_seconds(), 0) + 0.01)
+            time.sleep(wait)
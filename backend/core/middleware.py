@@ -0,0 +1,28 @@
+"""
+core/middleware.py
+
+This module defines project middleware.
+"""
+from core.routers import pin_to_primary, replica_configured
+
+SAFE_METHODS = ('GET', 'HEAD', 'OPTIONS', 'TRACE')
+
+
+class ReplicaStickinessMiddleware:
+    """
+    Pin clients to the primary database for a short while after they write,
+    so replica-routed views (see core/routers.py) show them their own
+    changes even while the replica catches up.
+    """
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        response = self.get_response(request)
+        if (
+            request.method not in SAFE_METHODS and
+            response.status_code < 400 and
+            replica_configured()
+        ):
+            pin_to_primary(request, response)
+        return response
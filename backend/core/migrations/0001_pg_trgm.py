@@ -0,0 +1,12 @@
+from django.contrib.postgres.operations import TrigramExtension
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+    """
+    Enable pg_trgm, used by the trigram GIN search indexes of other apps.
+    """
+
+    operations = [
+        TrigramExtension(),
+    ]
@@ -0,0 +1,44 @@
+# Generated by Django 5.2.3 on 2026-10-19 01:27
+
+import django.db.models.deletion
+import uuid
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('contenttypes', '0002_remove_content_type_name'),
+        ('core', '0002_throttlebucket'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        # Create requested_by as uuid, also where convert_uuid_keys already
+        # converted users_user.id
+        ('users', '0010_alter_user_id_alter_voterprofile_id'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='DeletionJob',
+            fields=[
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('object_id', models.UUIDField()),
+                ('object_repr', models.CharField(max_length=255)),
+                ('status', models.CharField(choices=[('pending', 'Pending'), ('running', 'Running'), ('done', 'Done'), ('failed', 'Failed')], default='pending', max_length=10)),
+                ('estimated_rows', models.PositiveBigIntegerField(blank=True, null=True)),
+                ('deleted_rows', models.PositiveBigIntegerField(default=0)),
+                ('progress', models.JSONField(blank=True, default=dict)),
+                ('error', models.TextField(blank=True)),
+                ('started_at', models.DateTimeField(blank=True, null=True)),
+                ('finished_at', models.DateTimeField(blank=True, null=True)),
+                ('content_type', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='contenttypes.contenttype')),
+                ('requested_by', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='deletion_jobs', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'ordering': ['-created_at'],
+                'indexes': [models.Index(fields=['status', 'updated_at'], name='core_deleti_status_79b4ea_idx'), models.Index(fields=['content_type', 'object_id'], name='core_deleti_content_667abb_idx')],
+            },
+        ),
+    ]
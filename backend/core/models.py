@@ -1,16 +1,27 @@
 """
 core/models.py
 
-This module defines abstract base model for resue across this project.
+This module defines abstract base model for resue across this project, the
+scheduled status of voting windows, the shared throttle counter table, and
+background deletion jobs.
 """
+import os
+import threading
+import time
 import uuid
 
+from django.conf import settings
+from django.contrib.contenttypes.models import ContentType
 from django.db import models
+from django.utils import timezone
 
 
 def generate_uuid():
     """
     Generate a UUID as a string.
+
+    No longer used by models, whose keys are native UUIDs, but kept because
+    earlier migrations reference it.
     
     Returns:
         str: A unique UUID string in standard format.
@@ -18,6 +29,61 @@ def generate_uuid():
     return str(uuid.uuid4())
 
 
+_uuid7_lock = threading.Lock()
+_uuid7_last = 0
+
+
+def generate_uuid7():
+    """
+    Generate a time-ordered UUID (version 7, RFC 9562).
+
+    The first 48 bits are the Unix time in milliseconds and the next 12 bits
+    a fraction of the millisecond, so ids sort by creation time and new rows
+    are appended to the right edge of the primary key index instead of
+    landing on random pages. Within a process ids are strictly increasing.
+    The remaining 62 bits are random.
+
+    Returns:
+        uuid.UUID: A version 7 UUID
+    """
+    global _uuid7_last
+    nanoseconds = time.time_ns()
+    milliseconds, remainder = divmod(nanoseconds, 1_000_000)
+    timestamp = (milliseconds << 12) | (remainder * 4096 // 1_000_000)
+    with _uuid7_lock:
+        if timestamp <= _uuid7_last:
+            timestamp = _uuid7_last + 1
+        _uuid7_last = timestamp
+
+    rand_b = int.from_bytes(os.urandom(8), 'big') & ((1 << 62) - 1)
+    value = (
+        (timestamp >> 12) << 80 |      # unix_ts_ms
+        0x7 << 76 |                    # version
+        (timestamp & 0xFFF) << 64 |    # sub-millisecond fraction
+        0b10 << 62 |                   # variant
+        rand_b
+    )
+    return uuid.UUID(int=value)
+
+
+def uuid7_floor(moment):
+    """
+    Return the smallest version 7 UUID that can be generated at a moment.
+
+    Rows of a TimeOrderedUUIDModel created at or after ``moment`` have
+    ``id >= uuid7_floor(moment)``, which lets time-range queries scan the
+    primary key index.
+
+    Args:
+        moment (datetime): Aware datetime
+
+    Returns:
+        uuid.UUID: Lower bound for ids generated at or after ``moment``
+    """
+    milliseconds = int(moment.timestamp() * 1000)
+    return uuid.UUID(int=milliseconds << 80 | 0x7 << 76 | 0b10 << 62)
+
+
 class BaseUUIDModel(models.Model):
     """
     Abstract base model with UUID as primary key, and automatic timestamp
@@ -28,14 +94,13 @@ class BaseUUIDModel(models.Model):
     - Automatic timestamps for creation and last update
     
     Attributes:
-        id (CharField): UUID primary key with maximum length of 36 characters
+        id (UUIDField): UUID primary key, stored as a native 16-byte uuid
         created_at (DateTimeField): Timestamp when the record was created
         updated_at (DateTimeField): Timestamp when the record was last updated
     """
-    id = models.CharField(
+    id = models.UUIDField(
             primary_key=True,
-            max_length=36,
-            default=generate_uuid,
+            default=uuid.uuid4,
             editable=False
             )
     created_at = models.DateTimeField(auto_now_add=True)
@@ -43,3 +108,270 @@ class BaseUUIDModel(models.Model):
 
     class Meta:
         abstract = True
+
+
+class TimeOrderedUUIDModel(BaseUUIDModel):
+    """
+    Abstract base model like BaseUUIDModel, but with time-ordered UUIDv7
+    primary keys.
+
+    Use it for insert-heavy tables, where random UUIDv4 keys would scatter
+    inserts across the primary key index. Ids still carry no sequential
+    information beyond their creation time.
+
+    Attributes:
+        id (UUIDField): UUIDv7 primary key from generate_uuid7
+    """
+    id = models.UUIDField(
+            primary_key=True,
+            default=generate_uuid7,
+            editable=False
+            )
+
+    class Meta:
+        abstract = True
+
+
+class ScheduledStatusModel(models.Model):
+    """
+    Abstract model adding an explicit lifecycle status to models with a
+    ``start_time``/``end_time`` voting window, ``is_active`` and
+    ``is_deleting`` fields.
+
+    The status moves scheduled -> open at start_time, open -> closed once
+    end_time has passed, and closed -> certified when results are certified.
+    It is kept in step with the clock by the run_status_scheduler command
+    (see core/scheduling.py) and recomputed whenever the object is saved, so
+    queries can filter on the indexed column instead of comparing times.
+    Changes are announced with the ``status_changed`` signal once committed.
+
+    Attributes:
+        status (CharField): scheduled, open, closed or certified
+
+    Methods:
+        status_at: The status the voting window gives at a moment
+        next_transition_at: When the status changes next
+        is_open: Whether voting is allowed now
+        has_ended: Whether voting is over
+        certify: Mark a closed object's results as certified
+    """
+    SCHEDULED = 'scheduled'
+    OPEN = 'open'
+    CLOSED = 'closed'
+    CERTIFIED = 'certified'
+    STATUS_CHOICES = [
+        (SCHEDULED, 'Scheduled'),
+        (OPEN, 'Open'),
+        (CLOSED, 'Closed'),
+        (CERTIFIED, 'Certified'),
+    ]
+
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default=SCHEDULED, editable=False)
+
+    class Meta:
+        abstract = True
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        if 'status' in instance.__dict__:
+            instance._loaded_status = instance.status
+        return instance
+
+    def refresh_from_db(self, *args, **kwargs):
+        super().refresh_from_db(*args, **kwargs)
+        if 'status' in self.__dict__:
+            self._loaded_status = self.status
+
+    def status_at(self, moment):
+        """
+        Return the status the voting window gives at a moment.
+
+        Certified is final and only set by certify().
+
+        Args:
+            moment (datetime): Aware datetime
+
+        Returns:
+            str: scheduled, open, closed or certified
+        """
+        if self.status == self.CERTIFIED:
+            return self.CERTIFIED
+        if moment < self.start_time:
+            return self.SCHEDULED
+        if moment <= self.end_time:
+            return self.OPEN
+        return self.CLOSED
+
+    def next_transition_at(self):
+        """
+        Return when the status changes next on its own.
+
+        Returns:
+            datetime or None: start_time while scheduled, end_time while
+            open, None once closed
+        """
+        if self.status == self.SCHEDULED:
+            return self.start_time
+        if self.status == self.OPEN:
+            return self.end_time
+        return None
+
+    def is_open(self):
+        """
+        Check if voting is allowed now.
+
+        The voting window is checked against the clock rather than the
+        stored status, so votes are accepted and refused at the exact
+        boundaries even if the scheduler is running late.
+
+        Returns:
+            bool: True if active, not being deleted and within the window
+        """
+        return (
+            self.is_active and not self.is_deleting and
+            self.status_at(timezone.now()) == self.OPEN
+        )
+
+    def has_ended(self):
+        """
+        Check if voting is over.
+
+        Returns:
+            bool: True once closed or certified
+        """
+        return self.status_at(timezone.now()) in (self.CLOSED, self.CERTIFIED)
+
+    def certify(self):
+        """
+        Mark the results of a closed object as certified.
+
+        Raises:
+            ValueError: If voting has not ended yet
+        """
+        if self.status_at(timezone.now()) != self.CLOSED:
+            raise ValueError(f"Only closed objects can be certified; {self} is {self.status}.")
+        self.status = self.CERTIFIED
+        self.save(update_fields=['status', 'updated_at'])
+
+    def save(self, *args, **kwargs):
+        """
+        Recompute the status from the voting window, and announce a change
+        once the transaction commits.
+        """
+        from core.scheduling import announce_status_change
+
+        previous = None if self._state.adding else getattr(self, '_loaded_status', self.status)
+        self.status = self.status_at(timezone.now())
+        update_fields = kwargs.get('update_fields')
+        if update_fields is not None and self.status != previous:
+            kwargs['update_fields'] = {*update_fields, 'status'}
+        super().save(*args, **kwargs)
+        if self.status != previous:
+            self._loaded_status = self.status
+            announce_status_change(self, previous, using=kwargs.get('using') or self._state.db)
+
+
+class ThrottleBucket(models.Model):
+    """
+    Request counter for one throttle key in one fixed time window.
+
+    Rows are written with a single ``INSERT ... ON CONFLICT DO UPDATE`` per
+    request (see core/throttling.py), so every web worker shares the same
+    counts. Expired windows are removed by the ``purge_throttle_buckets``
+    management command.
+
+    Attributes:
+        key (CharField): Throttle scope and client identity
+        window_start (DateTimeField): Start of the counting window
+        count (PositiveIntegerField): Requests seen in the window
+        expires_at (DateTimeField): When the row stops mattering
+    """
+    key = models.CharField(max_length=255)
+    window_start = models.DateTimeField()
+    count = models.PositiveIntegerField(default=0)
+    expires_at = models.DateTimeField(db_index=True)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=['key', 'window_start'],
+                name='throttle_bucket_key_window_uniq'
+            )
+        ]
+
+    def __str__(self):
+        return f"{self.key} @ {self.window_start:%Y-%m-%d %H:%M:%S}: {self.count}"
+
+
+class DeletionJob(BaseUUIDModel):
+    """
+    Background deletion of one large object and everything that cascades
+    from it.
+
+    The object is flagged ``is_deleting`` when the job is queued, and the
+    ``run_deletion_jobs`` worker purges its dependent rows in bounded batches
+    (see core/deletion.py) before deleting the object itself.
+
+    Attributes:
+        content_type (ForeignKey): Model of the object being deleted
+        object_id (UUIDField): Primary key of the object being deleted
+        object_repr (CharField): String form of the object, kept after it is gone
+        status (CharField): pending, running, done or failed
+        requested_by (ForeignKey): User who asked for the deletion
+        estimated_rows (PositiveBigIntegerField): Dependent rows expected
+        deleted_rows (PositiveBigIntegerField): Dependent rows purged so far
+        progress (JSONField): Rows purged so far per table
+        error (TextField): Why the job failed
+        started_at (DateTimeField): When a worker first picked the job up
+        finished_at (DateTimeField): When the job completed or failed
+    """
+    PENDING = 'pending'
+    RUNNING = 'running'
+    DONE = 'done'
+    FAILED = 'failed'
+    STATUS_CHOICES = [
+        (PENDING, 'Pending'),
+        (RUNNING, 'Running'),
+        (DONE, 'Done'),
+        (FAILED, 'Failed'),
+    ]
+
+    content_type = models.ForeignKey(ContentType, on_delete=models.CASCADE)
+    object_id = models.UUIDField()
+    object_repr = models.CharField(max_length=255)
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default=PENDING)
+    requested_by = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name='deletion_jobs'
+    )
+    estimated_rows = models.PositiveBigIntegerField(null=True, blank=True)
+    deleted_rows = models.PositiveBigIntegerField(default=0)
+    progress = models.JSONField(default=dict, blank=True)
+    error = models.TextField(blank=True)
+    started_at = models.DateTimeField(null=True, blank=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['status', 'updated_at']),
+            models.Index(fields=['content_type', 'object_id']),
+        ]
+
+    @property
+    def percent_complete(self):
+        """
+        Return progress as a percentage, based on the estimated row count.
+        """
+        if self.status == self.DONE:
+            return 100
+        if not self.estimated_rows:
+            return 0
+        return min(99, int(self.deleted_rows * 100 / self.estimated_rows))
+
+    def __str__(self):
+        return f"Delete {self.content_type.model} {self.object_repr} ({self.status})"
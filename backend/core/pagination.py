@@ -0,0 +1,295 @@
+"""
+core/pagination.py
+
+This module defines keyset (cursor) pagination shared across the project,
+and a Django paginator that estimates counts on very large tables.
+
+Page-number pagination runs a COUNT(*) and an OFFSET scan on every page, so
+deep pages into large tables get slower and slower. Keyset pagination instead
+remembers the (created_at, id) of the last row served and asks for the rows
+that sort after it, which a composite (created_at, id) index answers in the
+same time for page 1000 as for page one.
+"""
+import base64
+import binascii
+import json
+
+from django.conf import settings
+from django.core.paginator import Paginator
+from django.db import connections
+from django.db.models import Q, QuerySet
+from django.utils.dateparse import parse_datetime
+from django.utils.functional import cached_property
+
+from core.explain import explain
+
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import BasePagination, PageNumberPagination
+from rest_framework.response import Response
+from rest_framework.settings import api_settings
+from rest_framework.utils.urls import replace_query_param
+
+
+def encode_cursor(obj, reverse=False):
+    """
+    Encode the keyset position of an object into an opaque cursor string.
+
+    Args:
+        obj: Model instance with created_at and pk attributes
+        reverse (bool): Whether the cursor pages backwards
+
+    Returns:
+        str: URL-safe cursor
+    """
+    position = {'c': obj.created_at.isoformat(), 'i': str(obj.pk)}
+    if reverse:
+        position['r'] = 1
+    data = json.dumps(position, separators=(',', ':')).encode()
+    return base64.urlsafe_b64encode(data).decode().rstrip('=')
+
+
+def decode_cursor(cursor):
+    """
+    Decode a cursor produced by encode_cursor.
+
+    Args:
+        cursor (str): Cursor string from the query string
+
+    Returns:
+        tuple: (created_at, pk, reverse)
+
+    Raises:
+        ValueError: If the cursor is malformed
+    """
+    try:
+        padded = cursor + '=' * (-len(cursor) % 4)
+        position = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        created_at = parse_datetime(position['c'])
+        pk = position['i']
+    except (binascii.Error, ValueError, KeyError, TypeError, UnicodeDecodeError):
+        raise ValueError("Invalid cursor")
+    if created_at is None:
+        raise ValueError("Invalid cursor")
+    return created_at, pk, bool(position.get('r'))
+
+
+class KeysetPage:
+    """
+    One page of keyset-paginated results.
+
+    Attributes:
+        items (list): Objects on this page, newest first
+        next_cursor (str or None): Cursor for the following (older) page
+        previous_cursor (str or None): Cursor for the preceding (newer) page
+    """
+    def __init__(self, items, next_cursor, previous_cursor):
+        self.items = items
+        self.next_cursor = next_cursor
+        self.previous_cursor = previous_cursor
+
+
+def keyset_paginate(queryset, cursor=None, page_size=api_settings.PAGE_SIZE):
+    """
+    Return one page of a queryset ordered by (created_at, id) descending.
+
+    Any existing ordering on the queryset is replaced. One extra row is
+    fetched to tell whether another page exists; no COUNT(*) is run.
+
+    Args:
+        queryset: QuerySet of a model with created_at and id fields
+        cursor (str): Cursor from a previous page, or None for the first page
+        page_size (int): Number of objects per page
+
+    Returns:
+        KeysetPage: The requested page
+
+    Raises:
+        ValueError: If the cursor is malformed
+    """
+    if not cursor:
+        rows = list(queryset.order_by('-created_at', '-id')[:page_size + 1])
+        has_more = len(rows) > page_size
+        items = rows[:page_size]
+        next_cursor = encode_cursor(items[-1]) if has_more else None
+        return KeysetPage(items, next_cursor, None)
+
+    created_at, pk, reverse = decode_cursor(cursor)
+
+    if not reverse:
+        # Rows strictly after the cursor in (created_at, id) DESC order.
+        # The redundant created_at__lte bound keeps this an index range scan.
+        rows = list(
+            queryset
+            .filter(created_at__lte=created_at)
+            .filter(Q(created_at__lt=created_at) | Q(created_at=created_at, id__lt=pk))
+            .order_by('-created_at', '-id')[:page_size + 1]
+        )
+        has_more = len(rows) > page_size
+        items = rows[:page_size]
+        next_cursor = encode_cursor(items[-1]) if has_more else None
+        previous_cursor = encode_cursor(items[0], reverse=True) if items else None
+        return KeysetPage(items, next_cursor, previous_cursor)
+
+    # Rows strictly before the cursor, read ascending and flipped back
+    rows = list(
+        queryset
+        .filter(created_at__gte=created_at)
+        .filter(Q(created_at__gt=created_at) | Q(created_at=created_at, id__gt=pk))
+        .order_by('created_at', 'id')[:page_size + 1]
+    )
+    has_more = len(rows) > page_size
+    items = list(reversed(rows[:page_size]))
+    next_cursor = encode_cursor(items[-1]) if items else None
+    previous_cursor = encode_cursor(items[0], reverse=True) if has_more else None
+    return KeysetPage(items, next_cursor, previous_cursor)
+
+
+class KeysetPagination(BasePagination):
+    """
+    DRF pagination class using keyset pagination on (created_at, id).
+
+    Responses contain ``next``, ``previous`` and ``results`` but no
+    ``count``, since counting is exactly the cost this class avoids.
+
+    Attributes:
+        page_size: Number of objects per page
+        cursor_query_param: Query parameter carrying the cursor
+    """
+    page_size = api_settings.PAGE_SIZE
+    cursor_query_param = 'cursor'
+
+    def paginate_queryset(self, queryset, request, view=None):
+        """
+        Return the page of objects selected by the request's cursor.
+        """
+        self.request = request
+        self.base_url = request.build_absolute_uri()
+        try:
+            self.page = keyset_paginate(
+                queryset,
+                request.query_params.get(self.cursor_query_param),
+                self.page_size
+            )
+        except ValueError:
+            raise NotFound("Invalid cursor.")
+        return self.page.items
+
+    def get_link(self, cursor):
+        """
+        Build an absolute URL for the given cursor.
+        """
+        if cursor is None:
+            return None
+        return replace_query_param(self.base_url, self.cursor_query_param, cursor)
+
+    def get_paginated_response(self, data):
+        """
+        Return the paginated response with next/previous cursor links.
+        """
+        return Response({
+            'next': self.get_link(self.page.next_cursor),
+            'previous': self.get_link(self.page.previous_cursor),
+            'results': data,
+        })
+
+    def get_paginated_response_schema(self, schema):
+        """
+        Describe the paginated response for API schema generation.
+        """
+        return {
+            'type': 'object',
+            'required': ['results'],
+            'properties': {
+                'next': {'type': 'string', 'nullable': True, 'format': 'uri'},
+                'previous': {'type': 'string', 'nullable': True, 'format': 'uri'},
+                'results': schema,
+            },
+        }
+
+
+class PageNumberOrKeysetPagination(PageNumberPagination):
+    """
+    Page-number pagination that switches to keyset pagination on request.
+
+    Clients opt in with ``?pagination=cursor`` (or by following a ``cursor``
+    link), so existing page-number clients keep working unchanged.
+
+    Attributes:
+        pagination_query_param: Query parameter selecting the pagination mode
+    """
+    pagination_query_param = 'pagination'
+
+    def paginate_queryset(self, queryset, request, view=None):
+        """
+        Paginate with keyset pagination if requested, page numbers otherwise.
+        """
+        self.keyset = None
+        if (
+            request.query_params.get(self.pagination_query_param) == 'cursor' or
+            KeysetPagination.cursor_query_param in request.query_params
+        ):
+            self.keyset = KeysetPagination()
+            self.keyset.page_size = self.get_page_size(request) or self.page_size
+            return self.keyset.paginate_queryset(queryset, request, view)
+        return super().paginate_queryset(queryset, request, view)
+
+    def get_paginated_response(self, data):
+        """
+        Return the response in the format of the pagination mode in use.
+        """
+        if self.keyset is not None:
+            return self.keyset.get_paginated_response(data)
+        return super().get_paginated_response(data)
+
+
+def estimate_count(queryset):
+    """
+    Estimate the number of rows a queryset returns using Postgres statistics.
+
+    Unfiltered querysets read the table's ``reltuples`` from pg_class; filtered
+    ones read the planner's row estimate from ``EXPLAIN``. Neither touches
+    the table data, so both are fast regardless of table size.
+
+    Args:
+        queryset: QuerySet to estimate
+
+    Returns:
+        int or None: Estimated row count, or None if no estimate is available
+    """
+    connection = connections[queryset.db]
+    if connection.vendor != 'postgresql':
+        return None
+
+    if not queryset.query.where:
+        with connection.cursor() as cursor:
+            cursor.execute(
+                "SELECT reltuples::bigint FROM pg_class WHERE oid = %s::regclass",
+                [queryset.model._meta.db_table]
+            )
+            row = cursor.fetchone()
+        # reltuples is -1 until the table has been vacuumed or analyzed
+        return row[0] if row and row[0] >= 0 else None
+
+    return int(explain(queryset)['Plan']['Plan Rows'])
+
+
+class EstimatedCountPaginator(Paginator):
+    """
+    Django paginator that trusts Postgres row estimates for large results.
+
+    Small results are still counted exactly. Once the estimate reaches
+    ADMIN_ESTIMATED_COUNT_THRESHOLD, the estimate is used as the count
+    instead of running COUNT(*), so admin changelists on tables with millions
+    of rows load in milliseconds. Page links near the end may then be off
+    by a little, which is an acceptable trade for a list view.
+    """
+    @cached_property
+    def count(self):
+        """
+        Return the estimated count for large querysets, exact otherwise.
+        """
+        if isinstance(self.object_list, QuerySet):
+            estimate = estimate_count(self.object_list)
+            if estimate is not None and estimate >= settings.ADMIN_ESTIMATED_COUNT_THRESHOLD:
+                return estimate
+        return super().count
@@ -0,0 +1,174 @@
+"""
+core/routers.py
+
+This module routes heavy reporting reads to a read replica.
+
+Reads go to the primary unless a view opts in with @read_from_replica.
+Inside such a view, reads are sent to the REPLICA_DATABASE alias, except:
+
+- when the client wrote something within the last REPLICA_STICKY_SECONDS
+  (read-your-writes), tracked by ReplicaStickinessMiddleware with a cookie
+  and, for clients without cookies, a per-user entry in the default cache;
+  that entry is only seen by other workers if the cache is shared (e.g.
+  Redis), which core.W003 warns about;
+- when the replica lags the primary by more than REPLICA_MAX_LAG seconds,
+  or cannot be reached.
+
+Writes always go to the primary.
+"""
+import logging
+import threading
+import time
+from contextvars import ContextVar
+from functools import wraps
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import DEFAULT_DB_ALIAS, DatabaseError, connections
+
+logger = logging.getLogger(__name__)
+
+STICKY_COOKIE_NAME = 'replica_pin'
+
+_read_alias = ContextVar('read_alias', default=None)
+
+_lag_lock = threading.Lock()
+_lag_checked_at = None
+_lag_seconds = None
+
+
+def _sticky_cache_key(user_id):
+    return f'replica-pin:{user_id}'
+
+
+def replica_configured():
+    """
+    Return whether a replica database alias is configured.
+    """
+    return settings.REPLICA_DATABASE in settings.DATABASES
+
+
+def replica_lag():
+    """
+    Return the replica's replication lag in seconds, or None if unreachable.
+
+    The result is cached per process for REPLICA_LAG_CHECK_INTERVAL seconds
+    so the check costs at most one query per interval.
+    """
+    global _lag_checked_at, _lag_seconds
+    now = time.monotonic()
+    with _lag_lock:
+        if _lag_checked_at is not None and now - _lag_checked_at < settings.REPLICA_LAG_CHECK_INTERVAL:
+            return _lag_seconds
+
+        lag = None
+        connection = connections[settings.REPLICA_DATABASE]
+        try:
+            if connection.vendor != 'postgresql':
+                lag = 0.0
+            else:
+                with connection.cursor() as cursor:
+                    cursor.execute(
+                        """
+                        SELECT CASE
+                            WHEN NOT pg_is_in_recovery() THEN 0
+                            WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0
+                            ELSE COALESCE(
+                                EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()),
+                                0
+                            )
+                        END
+                        """
+                    )
+                    lag = float(cursor.fetchone()[0])
+        except DatabaseError as e:
+            logger.warning(f"Replica {settings.REPLICA_DATABASE} unavailable: {str(e)}")
+
+        _lag_checked_at = now
+        _lag_seconds = lag
+        return lag
+
+
+def is_pinned_to_primary(request):
+    """
+    Return whether the request's client wrote recently and must read its
+    own writes from the primary.
+    """
+    if STICKY_COOKIE_NAME in request.COOKIES:
+        return True
+    user = getattr(request, 'user', None)
+    if user is not None and user.is_authenticated:
+        return cache.get(_sticky_cache_key(user.pk)) is not None
+    return False
+
+
+def pin_to_primary(request, response):
+    """
+    Pin a client to the primary for REPLICA_STICKY_SECONDS after a write.
+    """
+    seconds = settings.REPLICA_STICKY_SECONDS
+    response.set_cookie(
+        STICKY_COOKIE_NAME,
+        '1',
+        max_age=seconds,
+        secure=settings.SESSION_COOKIE_SECURE,
+        httponly=True,
+        samesite='Lax'
+    )
+    user = getattr(request, 'user', None)
+    if user is not None and user.is_authenticated:
+        cache.set(_sticky_cache_key(user.pk), 1, seconds)
+
+
+def choose_read_alias(request):
+    """
+    Return the database alias a replica-eligible request should read from.
+    """
+    if not replica_configured() or is_pinned_to_primary(request):
+        return DEFAULT_DB_ALIAS
+    lag = replica_lag()
+    if lag is None or lag > settings.REPLICA_MAX_LAG:
+        return DEFAULT_DB_ALIAS
+    return settings.REPLICA_DATABASE
+
+
+def read_from_replica(view_func):
+    """
+    Decorator sending a view's reads to the replica when it is safe.
+
+    Works on function views (below @api_view) and, through
+    method_decorator, on view methods.
+    """
+    @wraps(view_func)
+    def wrapper(request, *args, **kwargs):
+        token = _read_alias.set(choose_read_alias(request))
+        try:
+            return view_func(request, *args, **kwargs)
+        finally:
+            _read_alias.reset(token)
+    return wrapper
+
+
+class ReplicaRouter:
+    """
+    Database router sending opted-in reads to the replica alias.
+
+    Methods:
+        db_for_read: Replica inside @read_from_replica views, else primary
+        db_for_write: Always the primary
+        allow_relation: Allowed, since both aliases hold the same data
+        allow_migrate: Never on the replica, which follows the primary
+    """
+    def db_for_read(self, model, **hints):
+        return _read_alias.get() or DEFAULT_DB_ALIAS
+
+    def db_for_write(self, model, **hints):
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        return True
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        if db == settings.REPLICA_DATABASE:
+            return False
+        return None
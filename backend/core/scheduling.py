@@ -0,0 +1,154 @@
+"""
+core/scheduling.py
+
+This module moves ScheduledStatusModel objects (election events and
+elections) through their statuses as their voting windows open and close.
+
+Statuses are stored so that "what is open now" is an indexed lookup rather
+than a comparison of every row's times against the clock. The
+run_status_scheduler command calls advance_statuses() at each boundary
+returned by next_transition(), and every change, whether made there, by a
+save or by certification, is announced with the ``status_changed`` signal
+once its transaction commits. Values cached from statuses can expire at the
+next boundary with cache_timeout_until().
+"""
+import logging
+import math
+
+from django.apps import apps
+from django.db import DEFAULT_DB_ALIAS, transaction
+from django.db.models import Min, Q
+from django.dispatch import Signal
+from django.utils import timezone
+
+from core.models import ScheduledStatusModel
+
+logger = logging.getLogger(__name__)
+
+# Sent after a status change commits, with the model as sender and
+# ``instance``, ``previous`` (None for new objects) and ``status`` arguments
+status_changed = Signal()
+
+
+def scheduled_models():
+    """
+    Return every installed model with a scheduled status.
+    """
+    return [
+        model for model in apps.get_models()
+        if issubclass(model, ScheduledStatusModel)
+    ]
+
+
+def announce_status_change(instance, previous, using=DEFAULT_DB_ALIAS):
+    """
+    Send ``status_changed`` for an instance once the transaction commits.
+
+    Args:
+        instance: ScheduledStatusModel instance, already saved
+        previous (str): Status before the change, or None if new
+        using (str): Database alias of the transaction
+    """
+    status = instance.status
+    transaction.on_commit(
+        lambda: status_changed.send(
+            sender=type(instance),
+            instance=instance,
+            previous=previous,
+            status=status
+        ),
+        using=using
+    )
+
+
+def _due(now):
+    """
+    Return the filter matching objects whose status is behind the clock.
+    """
+    return (
+        Q(status=ScheduledStatusModel.SCHEDULED, start_time__lte=now) |
+        Q(status=ScheduledStatusModel.OPEN, end_time__lt=now)
+    )
+
+
+def advance_statuses(now=None, using=DEFAULT_DB_ALIAS):
+    """
+    Move every object whose window has opened or closed to its new status.
+
+    Due rows are found through the partial indexes on scheduled and open
+    rows and locked with SKIP LOCKED, so several schedulers can run side by
+    side without flipping the same row twice.
+
+    Args:
+        now (datetime): Moment to advance to (default: the current time)
+        using (str): Database alias
+
+    Returns:
+        list: (instance, previous status) for each change
+    """
+    now = now or timezone.now()
+    changes = []
+    for model in scheduled_models():
+        with transaction.atomic(using=using):
+            due = list(
+                model._base_manager.using(using)
+                .select_for_update(skip_locked=True)
+                .filter(_due(now))
+            )
+            by_status = {}
+            for instance in due:
+                previous = instance.status
+                instance.status = instance.status_at(now)
+                instance._loaded_status = instance.status
+                by_status.setdefault(instance.status, []).append(instance.pk)
+                changes.append((instance, previous))
+                announce_status_change(instance, previous, using)
+            for status, pks in by_status.items():
+                model._base_manager.using(using).filter(pk__in=pks).update(status=status, updated_at=now)
+
+    for instance, previous in changes:
+        logger.info(f"{type(instance).__name__} {instance.pk} {previous} -> {instance.status}")
+    return changes
+
+
+def next_transition(using=DEFAULT_DB_ALIAS):
+    """
+    Return the next moment any object's status is due to change.
+
+    Returns:
+        datetime or None: The earliest start_time of a scheduled object or
+        end_time of an open one, None if nothing is scheduled or open
+    """
+    moments = []
+    for model in scheduled_models():
+        manager = model._base_manager.using(using)
+        moments.append(
+            manager.filter(status=ScheduledStatusModel.SCHEDULED)
+            .aggregate(moment=Min('start_time'))['moment']
+        )
+        moments.append(
+            manager.filter(status=ScheduledStatusModel.OPEN)
+            .aggregate(moment=Min('end_time'))['moment']
+        )
+    moments = [moment for moment in moments if moment is not None]
+    return min(moments) if moments else None
+
+
+def cache_timeout_until(moment, now=None):
+    """
+    Return a cache timeout that expires at a status transition.
+
+    Rounded down, so entries expire at or just before the moment.
+
+    Args:
+        moment (datetime): Next transition, or None if there is none
+        now (datetime): Current time (default: now)
+
+    Returns:
+        int or None: Seconds until the moment (0, i.e. do not cache, if it
+        has passed), or None (no expiry) without a moment
+    """
+    if moment is None:
+        return None
+    now = now or timezone.now()
+    return max(math.floor((moment - now).total_seconds()), 0)
@@ -0,0 +1,35 @@
+"""
+core/serializers.py
+
+This module defines Django REST Framework serializers for the core app.
+"""
+from rest_framework import serializers
+
+from core.models import DeletionJob
+
+
+class DeletionJobSerializer(serializers.ModelSerializer):
+    """
+    Serializer reporting the progress of a background deletion.
+    """
+    object_type = serializers.CharField(source='content_type.model', read_only=True)
+    percent_complete = serializers.IntegerField(read_only=True)
+
+    class Meta:
+        model = DeletionJob
+        fields = [
+            'id',
+            'object_type',
+            'object_id',
+            'object_repr',
+            'status',
+            'estimated_rows',
+            'deleted_rows',
+            'percent_complete',
+            'progress',
+            'error',
+            'created_at',
+            'started_at',
+            'finished_at',
+        ]
+        read_only_fields = fields
@@ -1,3 +1,609 @@
-from django.test import TestCase
+"""
+core/tests.py
 
-# Create your tests here.
+This module tests the shared building blocks in core: the index-aware search
+filter and the indexes behind it, the system checks, the read replica
+router, the online conversion of UUID keys, the shared-store throttles and
+the scheduled status of voting windows.
+
+The router's two-database tests run when POSTGRES_REPLICA_HOST defines the
+replica alias; under test it mirrors the default database, so pointing it
+at the primary's host is enough.
+"""
+import unittest
+from datetime import timedelta
+from unittest import mock
+
+from django.conf import settings
+from django.contrib.auth.models import AnonymousUser
+from django.core.cache import cache
+from django.db import DEFAULT_DB_ALIAS, DatabaseError, IntegrityError, connection, connections, transaction
+from django.http import HttpResponse
+from django.test import RequestFactory, SimpleTestCase, TestCase, override_settings
+from django.utils import timezone
+from rest_framework.test import APIRequestFactory
+
+from core.checks import check_database_connections, check_shared_caches
+from core import routers
+from core.explain import explain, plan_index_names
+from core.filters import IndexedSearchFilter
+from core.middleware import ReplicaStickinessMiddleware
+from core.models import ScheduledStatusModel, ThrottleBucket
+from core.scheduling import advance_statuses, cache_timeout_until, next_transition, status_changed
+from core.throttling import LoginAccountRateThrottle, record_hit
+from core.uuid_conversion import ConversionPlan, column_type, shadow_name, validate_foreign_keys
+from election_events.models import ElectionEvent
+from elections.models import Candidate, Election
+from invitations.models import Invitation
+from users.models import User
+
+
+def trigram_available():
+    """
+    Check whether the pg_trgm extension is installed in the test database.
+    """
+    with connection.cursor() as cursor:
+        cursor.execute("SELECT 1 FROM pg_extension WHERE extname = 'pg_trgm'")
+        return cursor.fetchone() is not None
+
+
+class SearchView:
+    """
+    Minimal view exposing search_fields to the filter.
+    """
+    search_fields = ['first_name', 'last_name']
+
+
+class IndexedSearchFilterTests(TestCase):
+    """
+    Short terms match a prefix, longer terms a substring.
+    """
+    @classmethod
+    def setUpTestData(cls):
+        for first_name, last_name in (('Alice', 'Smith'), ('Sally', 'Jones'), ('Bob', 'Alder')):
+            User.objects.create(
+                email=f'{first_name.lower()}@example.com',
+                first_name=first_name,
+                last_name=last_name
+            )
+
+    def search(self, term):
+        request = APIRequestFactory().get('/', {'search': term})
+        request.query_params = request.GET
+        queryset = IndexedSearchFilter().filter_queryset(request, User.objects.all(), SearchView())
+        return sorted(queryset.values_list('first_name', flat=True))
+
+    def test_short_term_matches_prefix(self):
+        self.assertEqual(self.search('al'), ['Alice', 'Bob'])
+
+    def test_long_term_matches_substring(self):
+        self.assertEqual(self.search('ally'), ['Sally'])
+        self.assertEqual(self.search('lic'), ['Alice'])
+
+    def test_terms_are_combined_with_and(self):
+        self.assertEqual(self.search('al smi'), ['Alice'])
+
+    def test_explicit_prefix_is_kept(self):
+        view = SearchView()
+        view.search_fields = ['=first_name']
+        request = APIRequestFactory().get('/', {'search': 'sally'})
+        request.query_params = request.GET
+        queryset = IndexedSearchFilter().filter_queryset(request, User.objects.all(), view)
+        self.assertEqual(list(queryset.values_list('first_name', flat=True)), ['Sally'])
+
+
+class SearchIndexPlanTests(TestCase):
+    """
+    Searches are planned on their indexes.
+
+    Sequential scans are disabled, as in check_search_indexes, since on test
+    sized tables the planner would rightly prefer them.
+    """
+    @classmethod
+    def setUpTestData(cls):
+        now = timezone.now()
+        event = ElectionEvent.objects.create(title='Search', start_time=now, end_time=now + timedelta(days=1))
+        election = Election.objects.create(
+            title='Search',
+            election_event=event,
+            start_time=now,
+            end_time=now + timedelta(days=1)
+        )
+        Candidate.objects.create(election=election, first_name='Alice', last_name='Smith')
+        Invitation.objects.create(email='alice@example.com', election_event=event)
+
+    def assertUsesIndex(self, queryset, index_name):
+        with transaction.atomic():
+            with connection.cursor() as cursor:
+                cursor.execute("SET LOCAL enable_seqscan = off")
+            used = plan_index_names(explain(queryset)['Plan'])
+        self.assertIn(index_name, used)
+
+    def test_prefix_searches_use_prefix_indexes(self):
+        checks = [
+            (User.objects.filter(email__istartswith='al'), 'user_email_prefix_idx'),
+            (User.objects.filter(first_name__istartswith='al'), 'user_first_name_prefix_idx'),
+            (User.objects.filter(last_name__istartswith='sm'), 'user_last_name_prefix_idx'),
+            (Invitation.objects.filter(email__istartswith='al'), 'invitation_email_prefix_idx'),
+            (Candidate.objects.filter(first_name__istartswith='al'), 'candidate_first_prefix_idx'),
+            (Candidate.objects.filter(last_name__istartswith='sm'), 'candidate_last_prefix_idx'),
+        ]
+        for queryset, index_name in checks:
+            with self.subTest(index_name):
+                self.assertUsesIndex(queryset, index_name)
+
+    def test_substring_searches_use_trigram_indexes(self):
+        if not trigram_available():
+            self.skipTest("pg_trgm is not installed")
+        checks = [
+            (User.objects.filter(email__icontains='lice'), 'user_email_trgm_idx'),
+            (User.objects.filter(first_name__icontains='lice'), 'user_first_name_trgm_idx'),
+            (User.objects.filter(last_name__icontains='mith'), 'user_last_name_trgm_idx'),
+            (Invitation.objects.filter(email__icontains='lice'), 'invitation_email_trgm_idx'),
+            (Candidate.objects.filter(first_name__icontains='lice'), 'candidate_first_name_trgm_idx'),
+            (Candidate.objects.filter(last_name__icontains='mith'), 'candidate_last_name_trgm_idx'),
+        ]
+        for queryset, index_name in checks:
+            with self.subTest(index_name):
+                self.assertUsesIndex(queryset, index_name)
+
+
+LOCMEM = {'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}}
+REDIS = {'default': {'BACKEND': 'django.core.cache.backends.redis.RedisCache', 'LOCATION': 'redis://cache'}}
+
+
+class SharedCacheCheckTests(SimpleTestCase):
+    """
+    State shared between workers must not live in a per-process cache.
+    """
+    def error_ids(self):
+        return [message.id for message in check_shared_caches(None)]
+
+    @override_settings(CACHES=LOCMEM, SESSION_ENGINE='django.contrib.sessions.backends.cached_db')
+    def test_cached_db_sessions_need_a_shared_cache(self):
+        self.assertIn('core.E005', self.error_ids())
+
+    @override_settings(CACHES=REDIS, SESSION_ENGINE='django.contrib.sessions.backends.cached_db')
+    def test_cached_db_sessions_with_shared_cache(self):
+        self.assertNotIn('core.E005', self.error_ids())
+
+    @override_settings(CACHES=LOCMEM, SESSION_ENGINE='django.contrib.sessions.backends.db')
+    def test_db_sessions_with_local_cache(self):
+        self.assertNotIn('core.E005', self.error_ids())
+
+    @override_settings(CACHES=LOCMEM)
+    @mock.patch('core.checks.replica_configured', return_value=True)
+    def test_replica_pins_need_a_shared_cache(self, replica_configured):
+        self.assertIn('core.W003', self.error_ids())
+
+    @override_settings(CACHES=REDIS)
+    @mock.patch('core.checks.replica_configured', return_value=True)
+    def test_replica_pins_with_shared_cache(self, replica_configured):
+        self.assertNotIn('core.W003', self.error_ids())
+
+
+class DatabaseConnectionCheckTests(SimpleTestCase):
+    """
+    Pool and persistent connection settings are checked against the server size.
+    """
+    def error_ids(self):
+        return [message.id for message in check_database_connections(None)]
+
+    @override_settings(DB_POOL=True, DB_POOL_MIN_SIZE=2, DB_POOL_MAX_SIZE=4, WEB_CONCURRENCY=2, WEB_THREADS=4)
+    def test_pool_requires_psycopg3(self):
+        with mock.patch('django.db.backends.postgresql.psycopg_any.is_psycopg3', False):
+            self.assertIn('core.E001', self.error_ids())
+
+    @override_settings(DB_POOL=True, DB_POOL_MIN_SIZE=8, DB_POOL_MAX_SIZE=4)
+    def test_pool_min_above_max(self):
+        self.assertIn('core.E002', self.error_ids())
+
+    @override_settings(DB_POOL=True, DB_POOL_MIN_SIZE=2, DB_POOL_MAX_SIZE=50, WEB_CONCURRENCY=4, DB_MAX_CONNECTIONS=100)
+    def test_pool_over_connection_budget(self):
+        self.assertIn('core.E003', self.error_ids())
+
+    @override_settings(DB_POOL=False, WEB_CONCURRENCY=10, WEB_THREADS=20, DB_MAX_CONNECTIONS=100)
+    def test_persistent_connections_over_budget(self):
+        self.assertIn('core.E004', self.error_ids())
+
+    @override_settings(DB_POOL=False, WEB_CONCURRENCY=2, WEB_THREADS=4, DB_MAX_CONNECTIONS=100)
+    def test_persistent_connections_within_budget(self):
+        self.assertEqual([i for i in self.error_ids() if i.startswith('core.E')], [])
+
+
+class AuthenticatedUser:
+    """
+    Stand-in for a logged-in user.
+    """
+    is_authenticated = True
+    pk = 'router-test-user'
+
+
+@routers.read_from_replica
+def read_alias_view(request):
+    """
+    Report which alias a read inside a replica-routed view goes to.
+    """
+    return User.objects.all().db
+
+
+@override_settings(REPLICA_DATABASE='replica', REPLICA_MAX_LAG=5, REPLICA_STICKY_SECONDS=15)
+class ReplicaRoutingTests(SimpleTestCase):
+    """
+    Routing decisions, with the replica's presence and lag stubbed.
+    """
+    def setUp(self):
+        for target in ('core.routers.replica_configured', 'core.middleware.replica_configured'):
+            patcher = mock.patch(target, return_value=True)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+        self.lag = mock.patch('core.routers.replica_lag', return_value=0.0)
+        self.lag.start()
+        self.addCleanup(self.lag.stop)
+        cache.delete(routers._sticky_cache_key(AuthenticatedUser.pk))
+
+    def request(self, user=None, cookies=None):
+        request = RequestFactory().get('/')
+        request.user = user or AnonymousUser()
+        request.COOKIES.update(cookies or {})
+        return request
+
+    def test_reads_outside_replica_views_use_primary(self):
+        self.assertEqual(User.objects.all().db, DEFAULT_DB_ALIAS)
+
+    def test_replica_view_reads_from_replica(self):
+        self.assertEqual(read_alias_view(self.request()), 'replica')
+        # The choice does not leak out of the view
+        self.assertEqual(User.objects.all().db, DEFAULT_DB_ALIAS)
+
+    def test_writes_use_primary(self):
+        self.assertEqual(routers.ReplicaRouter().db_for_write(User), DEFAULT_DB_ALIAS)
+
+    def test_never_migrates_replica(self):
+        router = routers.ReplicaRouter()
+        self.assertIs(router.allow_migrate('replica', 'users'), False)
+        self.assertIsNone(router.allow_migrate(DEFAULT_DB_ALIAS, 'users'))
+
+    def test_pin_cookie_reads_from_primary(self):
+        request = self.request(cookies={routers.STICKY_COOKIE_NAME: '1'})
+        self.assertEqual(read_alias_view(request), DEFAULT_DB_ALIAS)
+
+    def test_write_pins_client_to_primary(self):
+        write = RequestFactory().post('/')
+        write.user = AuthenticatedUser()
+        response = ReplicaStickinessMiddleware(lambda request: HttpResponse())(write)
+        self.assertIn(routers.STICKY_COOKIE_NAME, response.cookies)
+        # A client that drops cookies is still pinned through the cache
+        self.assertEqual(read_alias_view(self.request(user=AuthenticatedUser())), DEFAULT_DB_ALIAS)
+
+    def test_failed_write_does_not_pin(self):
+        write = RequestFactory().post('/')
+        write.user = AuthenticatedUser()
+        response = ReplicaStickinessMiddleware(lambda request: HttpResponse(status=400))(write)
+        self.assertNotIn(routers.STICKY_COOKIE_NAME, response.cookies)
+        self.assertEqual(read_alias_view(self.request(user=AuthenticatedUser())), 'replica')
+
+    def test_lagging_replica_falls_back_to_primary(self):
+        routers.replica_lag.return_value = 30.0
+        self.assertEqual(read_alias_view(self.request()), DEFAULT_DB_ALIAS)
+
+    def test_unreachable_replica_falls_back_to_primary(self):
+        routers.replica_lag.return_value = None
+        self.assertEqual(read_alias_view(self.request()), DEFAULT_DB_ALIAS)
+
+    def test_without_replica_reads_from_primary(self):
+        routers.replica_configured.return_value = False
+        self.assertEqual(read_alias_view(self.request()), DEFAULT_DB_ALIAS)
+
+
+REPLICA_CONFIGURED = settings.REPLICA_DATABASE in settings.DATABASES
+
+
+@unittest.skipUnless(REPLICA_CONFIGURED, "No replica alias configured (set POSTGRES_REPLICA_HOST)")
+class ReplicaDatabaseTests(TestCase):
+    """
+    Routing against a real second database alias.
+    """
+    databases = {DEFAULT_DB_ALIAS, settings.REPLICA_DATABASE} if REPLICA_CONFIGURED else {DEFAULT_DB_ALIAS}
+
+    def setUp(self):
+        routers._lag_checked_at = None
+
+    def test_lag_of_an_up_to_date_replica(self):
+        self.assertEqual(routers.replica_lag(), 0.0)
+
+    def test_replica_view_queries_the_replica_connection(self):
+        request = RequestFactory().get('/')
+        request.user = AnonymousUser()
+
+        @routers.read_from_replica
+        def view(request):
+            return User.objects.count()
+
+        routers.replica_lag()  # measured once per interval, not per view
+        with self.assertNumQueries(0, using=DEFAULT_DB_ALIAS):
+            with self.assertNumQueries(1, using=settings.REPLICA_DATABASE):
+                view(request)
+
+    def test_unreachable_replica_is_reported_as_none(self):
+        replica = connections[settings.REPLICA_DATABASE]
+        with mock.patch.object(replica, 'cursor', side_effect=DatabaseError("down")):
+            self.assertIsNone(routers.replica_lag())
+
+
+class UUIDConversionTests(SimpleTestCase):
+    """
+    Converting varchar keys to uuid in phases, on a parent table and a child
+    table with a NOT NULL and a nullable foreign key to it. Runs outside a
+    transaction, as CREATE INDEX CONCURRENTLY requires.
+    """
+    databases = {DEFAULT_DB_ALIAS}
+    tables = ['uuid_test_child', 'uuid_test_parent']
+
+    def setUp(self):
+        self.drop_tables()
+        self.addCleanup(self.drop_tables)
+        with connection.cursor() as cursor:
+            cursor.execute("""
+                CREATE TABLE uuid_test_parent (id varchar(36) PRIMARY KEY, name text NOT NULL);
+                CREATE INDEX uuid_test_parent_id_like ON uuid_test_parent (id varchar_pattern_ops);
+                CREATE TABLE uuid_test_child (
+                    id serial PRIMARY KEY,
+                    parent_id varchar(36) NOT NULL REFERENCES uuid_test_parent (id)
+                        DEFERRABLE INITIALLY DEFERRED,
+                    other_id varchar(36) REFERENCES uuid_test_parent (id)
+                        DEFERRABLE INITIALLY DEFERRED,
+                    CONSTRAINT uuid_test_child_uniq UNIQUE (parent_id, other_id)
+                );
+                CREATE INDEX uuid_test_child_parent_idx ON uuid_test_child (parent_id) WHERE other_id IS NULL;
+                INSERT INTO uuid_test_parent
+                    SELECT md5(g::text)::uuid::text, 'p' || g FROM generate_series(1, 7) g;
+                INSERT INTO uuid_test_child (parent_id, other_id)
+                    SELECT md5(g::text)::uuid::text, CASE WHEN g % 2 = 0 THEN md5((g + 1)::text)::uuid::text END
+                    FROM generate_series(1, 6) g;
+            """)
+
+    def drop_tables(self):
+        with connection.cursor() as cursor:
+            cursor.execute(f"DROP TABLE IF EXISTS {', '.join(self.tables)} CASCADE")
+            for table in self.tables:
+                cursor.execute(f"DROP FUNCTION IF EXISTS {shadow_name(f'{table}_sync')}()")
+
+    def rows(self):
+        with connection.cursor() as cursor:
+            cursor.execute("SELECT parent_id::text, other_id::text FROM uuid_test_child ORDER BY id")
+            return cursor.fetchall()
+
+    def test_plan_covers_referencing_columns_and_indexes(self):
+        plan = ConversionPlan(connection, ['uuid_test_parent'])
+
+        self.assertEqual(plan.columns, {
+            'uuid_test_parent': {'id': False},
+            'uuid_test_child': {'parent_id': False, 'other_id': True},
+        })
+        self.assertEqual(len(plan.foreign_keys), 2)
+        self.assertEqual(
+            sorted(index[1] for index in plan.indexes),
+            ['uuid_test_child_parent_idx', 'uuid_test_child_uniq', 'uuid_test_parent_pkey']
+        )
+
+    def test_converts_keys_and_keeps_writes_made_meanwhile(self):
+        before = self.rows()
+        plan = ConversionPlan(connection, ['uuid_test_parent'])
+        plan.prepare()
+        with connection.cursor() as cursor:
+            cursor.execute("""
+                INSERT INTO uuid_test_parent VALUES ('00000000-0000-4000-8000-000000000001', 'new');
+                INSERT INTO uuid_test_child (parent_id) VALUES ('00000000-0000-4000-8000-000000000001');
+            """)
+        plan.backfill(batch_size=2)
+        plan.build_indexes()
+        plan.swap()
+        validated = validate_foreign_keys(connection, self.tables)
+
+        self.assertEqual(len(validated), 2)
+        for table, column in (('uuid_test_parent', 'id'), ('uuid_test_child', 'parent_id'),
+                              ('uuid_test_child', 'other_id')):
+            self.assertEqual(column_type(connection, table, column), 'uuid')
+            self.assertIsNone(column_type(connection, table, shadow_name(column)))
+        self.assertEqual(self.rows(), before + [('00000000-0000-4000-8000-000000000001', None)])
+
+        with connection.cursor() as cursor:
+            cursor.execute(
+                "SELECT indexname FROM pg_indexes WHERE tablename = ANY(%s) ORDER BY indexname",
+                [self.tables]
+            )
+            self.assertEqual([row[0] for row in cursor.fetchall()], [
+                'uuid_test_child_parent_idx', 'uuid_test_child_pkey', 'uuid_test_child_uniq',
+                'uuid_test_parent_pkey',
+            ])
+            cursor.execute(
+                "SELECT attnotnull FROM pg_attribute WHERE attrelid = 'uuid_test_child'::regclass "
+                "AND attname IN ('parent_id', 'other_id') ORDER BY attname"
+            )
+            self.assertEqual([row[0] for row in cursor.fetchall()], [False, True])
+
+        with self.assertRaises(IntegrityError), transaction.atomic():
+            with connection.cursor() as cursor:
+                cursor.execute(
+                    "INSERT INTO uuid_test_child (parent_id) VALUES ('00000000-0000-4000-8000-000000000002')"
+                )
+
+    def test_converted_keys_are_skipped(self):
+        plan = ConversionPlan(connection, ['uuid_test_parent'])
+        plan.prepare()
+        plan.backfill()
+        plan.build_indexes()
+        plan.swap()
+
+        self.assertFalse(ConversionPlan(connection, ['uuid_test_parent']))
+
+    def test_swap_refuses_before_backfill(self):
+        plan = ConversionPlan(connection, ['uuid_test_parent'])
+        plan.prepare()
+
+        with self.assertRaisesMessage(ValueError, 'has not been backfilled'):
+            plan.swap()
+        self.assertEqual(column_type(connection, 'uuid_test_parent', 'id'), 'character varying(36)')
+
+    def test_invalid_values_are_reported(self):
+        with connection.cursor() as cursor:
+            cursor.execute("INSERT INTO uuid_test_parent VALUES ('not-a-uuid', 'bad')")
+        plan = ConversionPlan(connection, ['uuid_test_parent'])
+
+        self.assertEqual(plan.invalid_values(chunk_size=3), [('uuid_test_parent', 'id', 'not-a-uuid', 'not-a-uuid')])
+
+
+class CountingThrottle(LoginAccountRateThrottle):
+    """
+    LoginAccountRateThrottle at 4 requests a minute with a settable clock.
+    """
+    rate = '4/min'
+    now = 6000.0
+
+    def timer(self):
+        return self.now
+
+
+class SharedStoreThrottleTests(TestCase):
+    """
+    Throttles count requests in the shared store over a sliding window.
+    """
+    def setUp(self):
+        self.factory = RequestFactory()
+
+    def attempt(self, now, email='voter@example.com'):
+        throttle = CountingThrottle()
+        throttle.now = now
+        allowed = throttle.allow_request(self.factory.post('/login/', {'email': email}), None)
+        return allowed, throttle
+
+    def test_requests_over_the_rate_are_refused(self):
+        results = [self.attempt(6000.0 + second)[0] for second in range(5)]
+
+        self.assertEqual(results, [True, True, True, True, False])
+        self.assertTrue(self.attempt(6000.0, email='other@example.com')[0])
+
+    def test_previous_window_is_weighted(self):
+        for second in range(4):
+            self.attempt(6000.0 + second)
+
+        # A quarter into the next window, three quarters of the previous
+        # four requests still count: 3 + 1 is within the rate, 3 + 2 is not
+        self.assertTrue(self.attempt(6075.0)[0])
+        allowed, throttle = self.attempt(6075.0)
+        self.assertFalse(allowed)
+        self.assertAlmostEqual(throttle.wait(), 30.0)
+
+    def test_wait_for_a_full_window(self):
+        for second in range(4):
+            self.attempt(6000.0)
+        allowed, throttle = self.attempt(6010.0)
+
+        self.assertFalse(allowed)
+        # 50 seconds until the window ends, then until 5 requests weigh
+        # less than the 3 that leave room for one more
+        self.assertAlmostEqual(throttle.wait(), 50.0 + (1 - 3 / 5) * 60)
+
+    def test_account_key_is_hashed(self):
+        self.attempt(6000.0, email=' Voter@Example.com ')
+
+        key = ThrottleBucket.objects.get().key
+        self.assertNotIn('example', key.lower())
+        self.assertEqual(key, self.attempt(6001.0)[1].key)
+
+    def test_requests_without_an_email_are_not_counted(self):
+        throttle = CountingThrottle()
+
+        self.assertTrue(throttle.allow_request(self.factory.post('/login/', {}), None))
+        self.assertFalse(ThrottleBucket.objects.exists())
+
+    @override_settings(THROTTLE_CACHE='default', CACHES=LOCMEM)
+    def test_cache_store(self):
+        cache.clear()
+        self.assertEqual(record_hit('key', 60, 6001.0), (1, 0, 1.0))
+        self.assertEqual(record_hit('key', 60, 6002.0), (2, 0, 2.0))
+        self.assertEqual(record_hit('key', 60, 6061.0), (1, 2, 1.0))
+        self.assertFalse(ThrottleBucket.objects.exists())
+
+
+class ScheduledStatusTests(TestCase):
+    """
+    Voting windows move through their statuses with the clock.
+    """
+    def create_event(self, starts_in, days=1):
+        start = timezone.now() + starts_in
+        return ElectionEvent.objects.create(title='Event', start_time=start, end_time=start + timedelta(days=days))
+
+    def test_status_at(self):
+        event = self.create_event(timedelta(0))
+        cases = [
+            (event.start_time - timedelta(seconds=1), ScheduledStatusModel.SCHEDULED),
+            (event.start_time, ScheduledStatusModel.OPEN),
+            (event.end_time, ScheduledStatusModel.OPEN),
+            (event.end_time + timedelta(seconds=1), ScheduledStatusModel.CLOSED),
+        ]
+        for moment, status in cases:
+            with self.subTest(status=status, moment=moment):
+                self.assertEqual(event.status_at(moment), status)
+
+    def test_save_recomputes_the_status(self):
+        event = self.create_event(timedelta(days=1))
+        self.assertEqual(event.status, ScheduledStatusModel.SCHEDULED)
+        self.assertEqual(event.next_transition_at(), event.start_time)
+
+        event.start_time = timezone.now() - timedelta(hours=1)
+        event.save(update_fields=['start_time'])
+
+        event.refresh_from_db()
+        self.assertEqual(event.status, ScheduledStatusModel.OPEN)
+        self.assertTrue(event.is_open())
+
+    def test_only_closed_windows_are_certified(self):
+        event = self.create_event(timedelta(hours=-1))
+        with self.assertRaises(ValueError):
+            event.certify()
+
+        closed = self.create_event(timedelta(days=-3))
+        closed.certify()
+        closed.refresh_from_db()
+        self.assertEqual(closed.status, ScheduledStatusModel.CERTIFIED)
+        self.assertEqual(closed.status_at(timezone.now()), ScheduledStatusModel.CERTIFIED)
+        self.assertTrue(closed.has_ended())
+        self.assertIsNone(closed.next_transition_at())
+
+    def test_scheduler_advances_late_statuses(self):
+        opening = self.create_event(timedelta(hours=-1))
+        closing = self.create_event(timedelta(days=-3))
+        ElectionEvent.objects.filter(pk=opening.pk).update(status=ScheduledStatusModel.SCHEDULED)
+        ElectionEvent.objects.filter(pk=closing.pk).update(status=ScheduledStatusModel.OPEN)
+        received = []
+
+        def receiver(sender, instance, previous, status, **kwargs):
+            received.append((instance.pk, previous, status))
+
+        status_changed.connect(receiver)
+        self.addCleanup(status_changed.disconnect, receiver)
+        with self.captureOnCommitCallbacks(execute=True):
+            changes = advance_statuses()
+
+        self.assertEqual(len(changes), 2)
+        self.assertCountEqual(received, [
+            (opening.pk, ScheduledStatusModel.SCHEDULED, ScheduledStatusModel.OPEN),
+            (closing.pk, ScheduledStatusModel.OPEN, ScheduledStatusModel.CLOSED),
+        ])
+        self.assertEqual(advance_statuses(), [])
+
+    def test_next_transition(self):
+        self.assertIsNone(next_transition())
+        scheduled = self.create_event(timedelta(days=1))
+        opened = self.create_event(timedelta(hours=-1), days=2)
+
+        self.assertEqual(next_transition(), min(scheduled.start_time, opened.end_time))
+
+    def test_cache_timeout_until(self):
+        now = timezone.now()
+
+        self.assertIsNone(cache_timeout_until(None, now))
+        self.assertEqual(cache_timeout_until(now + timedelta(seconds=90.7), now), 90)
+        self.assertEqual(cache_timeout_until(now - timedelta(seconds=5), now), 0)
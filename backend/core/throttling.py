@@ -0,0 +1,221 @@
+"""
+core/throttling.py
+
+This module defines DRF throttles whose counters are shared by every web
+worker.
+
+DRF's built-in throttles keep their request history in the default cache,
+which without a CACHES setting is a per-process local-memory cache: every
+gunicorn worker enforces its own copy of the limit and a restart resets it.
+The throttles here count requests in the ThrottleBucket table instead, with
+one atomic upsert per request, or in the cache named by THROTTLE_CACHE
+(e.g. Redis or memcached) when one is configured.
+
+Limits are enforced over a sliding window approximated from two fixed
+windows: the count of the current window plus the previous window's count
+weighted by how much of it still overlaps the sliding window.
+"""
+import hashlib
+from datetime import datetime, timedelta, timezone as dt_timezone
+
+from django.conf import settings
+from django.core.cache import caches
+from django.db import connection
+
+from rest_framework.throttling import (
+    AnonRateThrottle,
+    ScopedRateThrottle,
+    SimpleRateThrottle,
+    UserRateThrottle
+)
+
+from core.models import ThrottleBucket
+
+
+def _record_hit_db(key, window_start, duration):
+    """
+    Count a request in the ThrottleBucket table.
+
+    Returns:
+        tuple: (current window count, previous window count)
+    """
+    table = connection.ops.quote_name(ThrottleBucket._meta.db_table)
+    start = datetime.fromtimestamp(window_start, tz=dt_timezone.utc)
+    previous_start = start - timedelta(seconds=duration)
+    expires_at = start + timedelta(seconds=2 * duration)
+
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f"""
+            WITH hit AS (
+                INSERT INTO {table} (key, window_start, count, expires_at)
+                VALUES (%s, %s, 1, %s)
+                ON CONFLICT (key, window_start)
+                DO UPDATE SET count = {table}.count + 1
+                RETURNING count
+            )
+            SELECT
+                (SELECT count FROM hit),
+                COALESCE(
+                    (SELECT count FROM {table} WHERE key = %s AND window_start = %s),
+                    0
+                )
+            """,
+            [key, start, expires_at, key, previous_start]
+        )
+        return cursor.fetchone()
+
+
+def _record_hit_cache(cache, key, window_start, duration):
+    """
+    Count a request in a shared cache with atomic increments.
+
+    Returns:
+        tuple: (current window count, previous window count)
+    """
+    current_key = f'throttle:{key}:{window_start}'
+    previous_key = f'throttle:{key}:{window_start - duration}'
+    cache.add(current_key, 0, timeout=2 * duration)
+    try:
+        current = cache.incr(current_key)
+    except ValueError:
+        # The key expired between add() and incr()
+        cache.set(current_key, 1, timeout=2 * duration)
+        current = 1
+    return current, cache.get(previous_key, 0)
+
+
+def record_hit(key, duration, now):
+    """
+    Count one request for a throttle key and return the window counts.
+
+    Args:
+        key (str): Throttle key (scope and client identity)
+        duration (int): Window length in seconds
+        now (float): Current UNIX time
+
+    Returns:
+        tuple: (current window count including this request,
+        previous window count, seconds elapsed in the current window)
+    """
+    window_start = int(now // duration * duration)
+    if settings.THROTTLE_CACHE:
+        current, previous = _record_hit_cache(
+            caches[settings.THROTTLE_CACHE], key, window_start, duration
+        )
+    else:
+        current, previous = _record_hit_db(key, window_start, duration)
+    return current, previous, now - window_start
+
+
+class SharedStoreThrottleMixin:
+    """
+    Sliding-window throttling on a store shared by all processes.
+
+    Mixed into a SimpleRateThrottle subclass, it replaces the per-process
+    cache history with record_hit(). Every request is counted, including
+    rejected ones, so a client that keeps hammering stays throttled.
+    """
+
+    def allow_request(self, request, view):
+        """
+        Count the request and return whether it is within the rate.
+        """
+        if self.rate is None:
+            return True
+
+        self.key = self.get_cache_key(request, view)
+        if self.key is None:
+            return True
+
+        self.now = self.timer()
+        self.current, self.previous, self.elapsed = record_hit(
+            self.key, self.duration, self.now
+        )
+        weight = 1 - self.elapsed / self.duration
+        if self.previous * weight + self.current > self.num_requests:
+            return self.throttle_failure()
+        return self.throttle_success()
+
+    def throttle_success(self):
+        return True
+
+    def wait(self):
+        """
+        Return the seconds until the sliding window admits a request again.
+        """
+        remaining = self.duration - self.elapsed
+        if self.current >= self.num_requests:
+            # This window is full: wait for it to roll over, then for its
+            # weight as the previous window to decay enough for one request
+            decay = max(0.0, 1 - (self.num_requests - 1) / self.current)
+            return remaining + decay * self.duration
+        if not self.previous:
+            return remaining
+        needed_weight = (self.num_requests - self.current - 1) / self.previous
+        return max(0.0, (1 - needed_weight) * self.duration - self.elapsed)
+
+
+class SharedAnonRateThrottle(SharedStoreThrottleMixin, AnonRateThrottle):
+    """
+    AnonRateThrottle counted in the shared store.
+    """
+
+
+class SharedUserRateThrottle(SharedStoreThrottleMixin, UserRateThrottle):
+    """
+    UserRateThrottle counted in the shared store.
+    """
+
+
+class SharedScopedRateThrottle(SharedStoreThrottleMixin, ScopedRateThrottle):
+    """
+    ScopedRateThrottle counted in the shared store.
+    """
+
+
+class LoginRateThrottle(SharedStoreThrottleMixin, SimpleRateThrottle):
+    """
+    Limits login attempts per client IP address ('login' rate).
+    """
+    scope = 'login'
+
+    def get_cache_key(self, request, view):
+        return self.cache_format % {
+            'scope': self.scope,
+            'ident': self.get_ident(request)
+        }
+
+
+class LoginAccountRateThrottle(SharedStoreThrottleMixin, SimpleRateThrottle):
+    """
+    Limits login attempts per target account ('login_account' rate), so
+    guessing one voter's password from many addresses is throttled too.
+
+    The submitted email is hashed so the throttle store holds no addresses.
+    Works with both API requests (``email``) and the HTML login form
+    (``username``).
+    """
+    scope = 'login_account'
+
+    def get_cache_key(self, request, view):
+        data = getattr(request, 'data', request.POST)
+        email = data.get('email') or data.get('username')
+        if not email or not isinstance(email, str):
+            return None
+        ident = hashlib.sha256(email.strip().lower().encode()).hexdigest()
+        return self.cache_format % {'scope': self.scope, 'ident': ident}
+
+
+class VoteVerificationRateThrottle(SharedStoreThrottleMixin, SimpleRateThrottle):
+    """
+    Limits vote hash verification per client IP address ('vote_verify'
+    rate), whether or not the client is logged in.
+    """
+    scope = 'vote_verify'
+
+    def get_cache_key(self, request, view):
+        return self.cache_format % {
+            'scope': self.scope,
+            'ident': self.get_ident(request)
+        }
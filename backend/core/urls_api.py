@@ -0,0 +1,11 @@
+"""
+core/urls_api.py
+
+URL configuration for the core application's API views.
+"""
+from django.urls import path
+from core.views import DeletionJobDetailView
+
+urlpatterns = [
+    path('<uuid:pk>/', DeletionJobDetailView.as_view(), name='deletion-job-detail'),
+]
@@ -0,0 +1,496 @@
+"""
+core/uuid_conversion.py
+
+This module converts varchar(36) UUID key columns to the native uuid type
+online, without rewriting tables under an exclusive lock.
+
+``ALTER COLUMN ... TYPE uuid`` rewrites the table, its indexes and every
+referencing foreign key column while holding ACCESS EXCLUSIVE locks, which
+blocks reads and writes for as long as the largest table takes to copy.
+Here, each primary key and the foreign keys pointing at it are converted
+in phases that only take short locks:
+
+1. prepare: add a nullable ``<column>__uuid`` shadow column per column, a
+   NOT VALID ``IS NOT NULL`` check for NOT NULL columns, and a trigger
+   keeping the shadow columns in step with inserts and updates;
+2. backfill: fill the shadow columns in batches, walking each table by its
+   primary key with one short transaction per batch, then validate the
+   checks;
+3. index: build a copy of every index on the converted columns with
+   CREATE INDEX CONCURRENTLY;
+4. swap: in one short transaction, drop the foreign keys, drop the old
+   columns, rename the shadow columns and indexes into place, re-attach
+   the primary keys and unique constraints, and re-create the foreign keys
+   as NOT VALID;
+5. validate: validate the foreign keys, which only takes a SHARE UPDATE
+   EXCLUSIVE lock.
+
+Every phase can be re-run after an interruption. The ``AlterUUIDKey``
+migration operation skips columns that are already uuid, so migrations
+run after the conversion leave them alone.
+"""
+import logging
+import re
+
+from django.db import migrations, transaction
+
+logger = logging.getLogger(__name__)
+
+SHADOW_SUFFIX = '__uuid'
+
+UUID_PATTERN = (
+    r'^\{?[0-9a-f]{8}-?[0-9a-f]{4}-?[0-9a-f]{4}-?[0-9a-f]{4}-?[0-9a-f]{12}\}?$'
+)
+
+
+def shadow_name(name):
+    """
+    Return the name of the shadow column, index or constraint for a name,
+    truncated to Postgres' 63 character limit.
+    """
+    return f"{name[:63 - len(SHADOW_SUFFIX)]}{SHADOW_SUFFIX}"
+
+
+def not_null_check_name(column):
+    """
+    Return the name of the check standing in for a shadow column's NOT NULL.
+    """
+    return shadow_name(f"{column}_not_null")
+
+
+def column_type(connection, table, column):
+    """
+    Return the SQL type of a column, or None if the column does not exist.
+    """
+    with connection.cursor() as cursor:
+        cursor.execute(
+            """
+            SELECT format_type(atttypid, atttypmod) FROM pg_attribute
+            WHERE attrelid = to_regclass(%s) AND attname = %s AND NOT attisdropped
+            """,
+            [connection.ops.quote_name(table), column]
+        )
+        row = cursor.fetchone()
+    return row[0] if row else None
+
+
+class ConversionPlan:
+    """
+    The columns converting a set of primary keys to uuid, and the indexes
+    and foreign keys depending on them.
+
+    Attributes:
+        connection: Database connection the plan was read from
+        columns (dict): Table name -> {column: nullable} of columns to convert
+        primary_keys (dict): Table name -> primary key column walked by the backfill
+        foreign_keys (list): (table, constraint name, definition) of the
+            foreign keys between converted columns
+        indexes (list): (table, index name, definition, constraint name,
+            constraint type) of the indexes on converted columns to rebuild;
+            the constraint is None for plain indexes
+
+    Methods:
+        prepare(): Add the shadow columns, checks and sync triggers
+        backfill(): Fill the shadow columns in batches
+        build_indexes(): Build the shadow indexes concurrently
+        swap(): Replace the old columns with the shadow columns
+        invalid_values(): Return values that cannot be cast to uuid
+    """
+    def __init__(self, connection, tables):
+        """
+        Read the plan for converting the primary keys of some tables.
+
+        Tables that do not exist, or whose primary key is not a varchar
+        column, are skipped.
+
+        Args:
+            connection: Postgres database connection
+            tables (iterable): Names of the tables whose primary key to convert
+
+        Raises:
+            ValueError: If a table involved is partitioned or has no
+                single-column primary key
+        """
+        self.connection = connection
+        self.columns = {}
+        self.primary_keys = {}
+        self.foreign_keys = []
+        self.indexes = []
+        with connection.cursor() as cursor:
+            for table in tables:
+                self._add_primary_key(cursor, table)
+            for table in self.columns:
+                self._add_table(cursor, table)
+
+    def __bool__(self):
+        return bool(self.columns)
+
+    def _add_primary_key(self, cursor, table):
+        cursor.execute(
+            """
+            SELECT a.attname, format_type(a.atttypid, a.atttypmod)
+            FROM pg_constraint con
+            JOIN pg_attribute a ON a.attrelid = con.conrelid AND a.attnum = con.conkey[1]
+            WHERE con.conrelid = to_regclass(%s) AND con.contype = 'p'
+            """,
+            [self.connection.ops.quote_name(table)]
+        )
+        row = cursor.fetchone()
+        if row is None or not row[1].startswith('character varying'):
+            return
+        self.columns.setdefault(table, {})[row[0]] = False
+
+        cursor.execute(
+            """
+            SELECT r.relname, a.attname, NOT a.attnotnull, con.conname,
+                   pg_get_constraintdef(con.oid)
+            FROM pg_constraint con
+            JOIN pg_class r ON r.oid = con.conrelid
+            JOIN pg_attribute a ON a.attrelid = con.conrelid AND a.attnum = con.conkey[1]
+            WHERE con.contype = 'f' AND con.conparentid = 0
+              AND con.confrelid = to_regclass(%s)
+            """,
+            [self.connection.ops.quote_name(table)]
+        )
+        for referencing, column, nullable, name, definition in cursor.fetchall():
+            self.columns.setdefault(referencing, {})[column] = nullable
+            self.foreign_keys.append((referencing, name, definition))
+
+    def _add_table(self, cursor, table):
+        quoted = self.connection.ops.quote_name(table)
+        cursor.execute(
+            """
+            SELECT c.relkind, (
+                SELECT a.attname FROM pg_index i
+                JOIN pg_attribute a ON a.attrelid = i.indrelid AND a.attnum = i.indkey[0]
+                WHERE i.indrelid = c.oid AND i.indisprimary AND i.indnatts = 1
+            )
+            FROM pg_class c WHERE c.oid = to_regclass(%s)
+            """,
+            [quoted]
+        )
+        relkind, primary_key = cursor.fetchone()
+        if relkind == 'p':
+            raise ValueError(f"{table} is partitioned; convert its keys before partitioning it.")
+        if primary_key is None:
+            raise ValueError(f"{table} has no single-column primary key to walk.")
+        self.primary_keys[table] = primary_key
+
+        cursor.execute(
+            """
+            SELECT ic.relname, pg_get_indexdef(i.indexrelid), con.conname, con.contype
+            FROM pg_index i
+            JOIN pg_class ic ON ic.oid = i.indexrelid
+            LEFT JOIN pg_constraint con ON con.conindid = i.indexrelid
+                AND con.conrelid = i.indrelid AND con.contype IN ('p', 'u')
+            WHERE i.indrelid = to_regclass(%s) AND EXISTS (
+                SELECT 1 FROM pg_attribute a
+                WHERE a.attrelid = i.indrelid AND a.attname = ANY(%s)
+                  AND (a.attnum = ANY(i.indkey) OR EXISTS (
+                      SELECT 1 FROM pg_depend d
+                      WHERE d.classid = 'pg_class'::regclass AND d.objid = i.indexrelid
+                        AND d.refobjid = i.indrelid AND d.refobjsubid = a.attnum
+                  ))
+            )
+            ORDER BY ic.relname
+            """,
+            [quoted, list(self.columns[table])]
+        )
+        # Django's varchar_pattern_ops "_like" indexes have no uuid
+        # counterpart; they go with the old columns, as with AlterField
+        self.indexes.extend(
+            (table, *row) for row in cursor.fetchall() if '_pattern_ops' not in row[1]
+        )
+
+    def invalid_values(self, chunk_size=10000):
+        """
+        Return the values of the columns to convert that are not UUIDs.
+
+        Each table is read in chunks along its primary key, so the scan is
+        safe to run against a live database.
+
+        Returns:
+            list: (table, column, primary key, value) tuples
+        """
+        qn = self.connection.ops.quote_name
+        invalid = []
+        with self.connection.cursor() as cursor:
+            for table, columns in self.columns.items():
+                pk = f"{qn(table)}.{qn(self.primary_keys[table])}"
+                for column in columns:
+                    last = None
+                    while True:
+                        cursor.execute(
+                            f"""
+                            SELECT {pk}, {qn(column)}::text, {qn(column)}::text !~* %s
+                            FROM {qn(table)}
+                            {f'WHERE {pk} > %s' if last is not None else ''}
+                            ORDER BY {pk}
+                            LIMIT %s
+                            """,
+                            [UUID_PATTERN] + ([last] if last is not None else []) + [chunk_size]
+                        )
+                        rows = cursor.fetchall()
+                        if not rows:
+                            break
+                        invalid.extend((table, column, row[0], row[1]) for row in rows if row[2])
+                        last = rows[-1][0]
+        return invalid
+
+    def prepare(self, lock_timeout='5s'):
+        """
+        Add the shadow columns, their NOT NULL checks and the triggers
+        filling them on every insert and update.
+
+        All of these are catalog-only changes; the transaction gives up
+        after ``lock_timeout`` rather than queueing writes behind it.
+        """
+        qn = self.connection.ops.quote_name
+        with transaction.atomic(using=self.connection.alias), self.connection.cursor() as cursor:
+            cursor.execute("SELECT set_config('lock_timeout', %s, true)", [lock_timeout])
+            for table, columns in self.columns.items():
+                assignments = []
+                for column, nullable in columns.items():
+                    shadow = qn(shadow_name(column))
+                    cursor.execute(f"ALTER TABLE {qn(table)} ADD COLUMN IF NOT EXISTS {shadow} uuid")
+                    assignments.append(f"NEW.{shadow} := NEW.{qn(column)}::uuid;")
+                    if not nullable and not self._has_constraint(cursor, table, not_null_check_name(column)):
+                        cursor.execute(
+                            f"ALTER TABLE {qn(table)} ADD CONSTRAINT {qn(not_null_check_name(column))} "
+                            f"CHECK ({shadow} IS NOT NULL) NOT VALID"
+                        )
+
+                function = qn(shadow_name(f"{table}_sync"))
+                cursor.execute(
+                    f"""
+                    CREATE OR REPLACE FUNCTION {function}() RETURNS trigger LANGUAGE plpgsql AS $$
+                    BEGIN {' '.join(assignments)} RETURN NEW; END $$
+                    """
+                )
+                cursor.execute(f"DROP TRIGGER IF EXISTS {function} ON {qn(table)}")
+                cursor.execute(
+                    f"CREATE TRIGGER {function} BEFORE INSERT OR UPDATE ON {qn(table)} "
+                    f"FOR EACH ROW EXECUTE FUNCTION {function}()"
+                )
+
+    def backfill(self, batch_size=5000):
+        """
+        Fill the shadow columns of existing rows, one batch of rows per
+        transaction, then validate the NOT NULL checks.
+
+        Rows written meanwhile are filled by the triggers; rows the
+        triggers already filled are skipped.
+
+        Returns:
+            int: Number of rows updated
+        """
+        qn = self.connection.ops.quote_name
+        updated = 0
+        with self.connection.cursor() as cursor:
+            for table, columns in self.columns.items():
+                pk = qn(self.primary_keys[table])
+                assignments = ', '.join(f"{qn(shadow_name(c))} = {qn(c)}::uuid" for c in columns)
+                stale = ' OR '.join(f"{qn(shadow_name(c))} IS DISTINCT FROM {qn(c)}::uuid" for c in columns)
+                last = None
+                while True:
+                    cursor.execute(
+                        f"""
+                        SELECT {pk} FROM {qn(table)}
+                        {f'WHERE {pk} > %s' if last is not None else ''}
+                        ORDER BY {pk} LIMIT 1 OFFSET %s
+                        """,
+                        ([last] if last is not None else []) + [batch_size - 1]
+                    )
+                    row = cursor.fetchone()
+                    upper = row[0] if row else None
+                    bounds = []
+                    params = []
+                    if last is not None:
+                        bounds.append(f"{pk} > %s")
+                        params.append(last)
+                    if upper is not None:
+                        bounds.append(f"{pk} <= %s")
+                        params.append(upper)
+                    cursor.execute(
+                        f"UPDATE {qn(table)} SET {assignments} WHERE {' AND '.join(bounds + [f'({stale})'])}",
+                        params
+                    )
+                    updated += cursor.rowcount
+                    if upper is None:
+                        break
+                    last = upper
+                logger.info(f"Backfilled uuid columns of {table}")
+
+                for column, nullable in columns.items():
+                    if not nullable:
+                        cursor.execute(
+                            f"ALTER TABLE {qn(table)} VALIDATE CONSTRAINT {qn(not_null_check_name(column))}"
+                        )
+        return updated
+
+    def build_indexes(self):
+        """
+        Build a copy of every index on the converted columns over the shadow
+        columns, with CREATE INDEX CONCURRENTLY. An invalid copy left by an
+        interrupted build is dropped and built again.
+
+        Must run outside a transaction.
+        """
+        qn = self.connection.ops.quote_name
+        with self.connection.cursor() as cursor:
+            for table, name, definition, constraint, kind in self.indexes:
+                shadow = shadow_name(name)
+                cursor.execute(
+                    """
+                    SELECT i.indisvalid FROM pg_index i
+                    JOIN pg_class c ON c.oid = i.indexrelid
+                    WHERE c.oid = to_regclass(%s)
+                    """,
+                    [qn(shadow)]
+                )
+                row = cursor.fetchone()
+                if row and row[0]:
+                    continue
+                if row:
+                    cursor.execute(f"DROP INDEX CONCURRENTLY {qn(shadow)}")
+                cursor.execute(self._shadow_index_sql(table, definition, shadow))
+                logger.info(f"Built index {shadow} on {table}")
+
+    def _shadow_index_sql(self, table, definition, shadow):
+        """
+        Rewrite an index definition from pg_get_indexdef to build a
+        concurrent copy of the index over the shadow columns.
+        """
+        head, _, tail = definition.partition(' USING ')
+        head = re.sub(
+            r'^CREATE (UNIQUE )?INDEX \S+ ON',
+            lambda match: f"CREATE {match.group(1) or ''}INDEX CONCURRENTLY "
+                          f"{self.connection.ops.quote_name(shadow)} ON",
+            head
+        )
+        columns = re.compile(
+            r'(?<![\w"])(' + '|'.join(re.escape(c) for c in self.columns[table]) + r')(?![\w"])'
+        )
+        tail = columns.sub(lambda match: shadow_name(match.group(1)), tail)
+        return f"{head} USING {tail}"
+
+    def swap(self, lock_timeout='5s'):
+        """
+        Replace the old columns with the shadow columns in one short
+        transaction, and re-create the foreign keys as NOT VALID.
+
+        Setting NOT NULL is instant thanks to the validated checks, and the
+        primary keys and unique constraints take over the shadow indexes,
+        so no statement here scans a table.
+
+        Raises:
+            ValueError: If the shadow columns have not been backfilled
+        """
+        qn = self.connection.ops.quote_name
+        with transaction.atomic(using=self.connection.alias), self.connection.cursor() as cursor:
+            cursor.execute("SELECT set_config('lock_timeout', %s, true)", [lock_timeout])
+            cursor.execute(f"LOCK TABLE {', '.join(qn(t) for t in self.columns)} IN ACCESS EXCLUSIVE MODE")
+            self._check_ready(cursor)
+
+            for table, name, definition in self.foreign_keys:
+                cursor.execute(f"ALTER TABLE {qn(table)} DROP CONSTRAINT {qn(name)}")
+            for table, name, definition, constraint, kind in self.indexes:
+                if constraint:
+                    cursor.execute(f"ALTER TABLE {qn(table)} DROP CONSTRAINT {qn(constraint)}")
+
+            for table, columns in self.columns.items():
+                function = qn(shadow_name(f"{table}_sync"))
+                cursor.execute(f"DROP TRIGGER {function} ON {qn(table)}")
+                cursor.execute(f"DROP FUNCTION {function}()")
+                for column, nullable in columns.items():
+                    cursor.execute(f"ALTER TABLE {qn(table)} DROP COLUMN {qn(column)}")
+                    cursor.execute(
+                        f"ALTER TABLE {qn(table)} RENAME COLUMN {qn(shadow_name(column))} TO {qn(column)}"
+                    )
+                    if not nullable:
+                        cursor.execute(f"ALTER TABLE {qn(table)} ALTER COLUMN {qn(column)} SET NOT NULL")
+                        cursor.execute(
+                            f"ALTER TABLE {qn(table)} DROP CONSTRAINT {qn(not_null_check_name(column))}"
+                        )
+
+            for table, name, definition, constraint, kind in self.indexes:
+                if constraint:
+                    kind = 'PRIMARY KEY' if kind == 'p' else 'UNIQUE'
+                    cursor.execute(
+                        f"ALTER TABLE {qn(table)} ADD CONSTRAINT {qn(constraint)} "
+                        f"{kind} USING INDEX {qn(shadow_name(name))}"
+                    )
+                    if constraint != name:
+                        cursor.execute(f"ALTER INDEX {qn(constraint)} RENAME TO {qn(name)}")
+                else:
+                    cursor.execute(f"ALTER INDEX {qn(shadow_name(name))} RENAME TO {qn(name)}")
+
+            for table, name, definition in self.foreign_keys:
+                cursor.execute(f"ALTER TABLE {qn(table)} ADD CONSTRAINT {qn(name)} {definition} NOT VALID")
+
+    def _check_ready(self, cursor):
+        for table, columns in self.columns.items():
+            for column, nullable in columns.items():
+                if column_type(self.connection, table, shadow_name(column)) != 'uuid':
+                    raise ValueError(f"{table}.{column} has no uuid shadow column; run the prepare phase.")
+                if not nullable and not self._has_constraint(cursor, table, not_null_check_name(column), True):
+                    raise ValueError(f"{table}.{column} has not been backfilled.")
+        for table, name, definition, constraint, kind in self.indexes:
+            cursor.execute(
+                "SELECT i.indisvalid FROM pg_index i WHERE i.indexrelid = to_regclass(%s)",
+                [self.connection.ops.quote_name(shadow_name(name))]
+            )
+            row = cursor.fetchone()
+            if not row or not row[0]:
+                raise ValueError(f"Index {name} has no valid copy; run the index phase.")
+
+    def _has_constraint(self, cursor, table, name, validated=False):
+        cursor.execute(
+            """
+            SELECT 1 FROM pg_constraint
+            WHERE conrelid = to_regclass(%s) AND conname = %s AND (convalidated OR NOT %s)
+            """,
+            [self.connection.ops.quote_name(table), name, validated]
+        )
+        return cursor.fetchone() is not None
+
+
+def validate_foreign_keys(connection, tables):
+    """
+    Validate the NOT VALID foreign keys of some tables, one at a time.
+
+    Validation scans the table but only takes a SHARE UPDATE EXCLUSIVE
+    lock, so reads and writes carry on meanwhile.
+
+    Returns:
+        list: (table, constraint name) of the validated foreign keys
+    """
+    qn = connection.ops.quote_name
+    with connection.cursor() as cursor:
+        cursor.execute(
+            """
+            SELECT c.relname, con.conname FROM pg_constraint con
+            JOIN pg_class c ON c.oid = con.conrelid
+            WHERE con.contype = 'f' AND NOT con.convalidated AND c.relname = ANY(%s)
+            ORDER BY c.relname, con.conname
+            """,
+            [list(tables)]
+        )
+        constraints = cursor.fetchall()
+        for table, name in constraints:
+            cursor.execute(f"ALTER TABLE {qn(table)} VALIDATE CONSTRAINT {qn(name)}")
+    return constraints
+
+
+class AlterUUIDKey(migrations.AlterField):
+    """
+    AlterField converting a varchar(36) UUID key to uuid in place, which
+    does nothing on databases where convert_uuid_keys already converted the
+    column online.
+    """
+    def database_forwards(self, app_label, schema_editor, from_state, to_state):
+        model = to_state.apps.get_model(app_label, self.model_name)
+        column = model._meta.get_field(self.name).column
+        if column_type(schema_editor.connection, model._meta.db_table, column) == 'uuid':
+            return
+        super().database_forwards(app_label, schema_editor, from_state, to_state)
@@ -2,13 +2,20 @@
 core/views.py
 
 This module defines the API root view that provides navigation links
-to all available endpoints in the NexaVote Electronic Voting Platform.
+to all available endpoints in the NexaVote Electronic Voting Platform, and
+the views behind background deletions.
 """
+from rest_framework import generics, permissions, status
 from rest_framework.decorators import api_view, permission_classes
 from rest_framework.permissions import AllowAny
 from rest_framework.response import Response
 from rest_framework.reverse import reverse
 
+from core.deletion import delete_or_schedule
+from core.models import DeletionJob
+from core.serializers import DeletionJobSerializer
+from users.permissions import IsElectionAdmin
+
 
 UUID = "00000000-0000-0000-0000-000000000000"
 
@@ -49,15 +56,20 @@ def api_root(request, format=None):
         "user-current-user":     reverse("users_api:current-user", request=request, format=format),
         "user-password-reset-confirm":     reverse("users_api:password-reset-confirm", request=request, format=format),
         "user-password-reset-request":     reverse("users_api:password-reset-request", request=request, format=format),
+        "user-provision-voters":     reverse("users_api:provision-voters", request=request, format=format),
         
         # Invitations
         "invitation-create":    reverse("invitation-create", request=request, format=format),
         "invitation-list":      reverse("invitation-list", request=request, format=format),
         "invitation-detail":    reverse("invitation-detail", kwargs={"pk": UUID}, request=request, format=format),
         "invitation-by-event":  reverse("invitation-by-event", kwargs={"event_id": UUID}, request=request, format=format),
+        "invitation-funnel":    reverse("invitation-funnel", kwargs={"event_id": UUID}, request=request, format=format),
         "invitation-mark-used": reverse("invitation-mark-used", kwargs={"pk": UUID}, request=request, format=format),
         "invitation-by-token":  reverse("invitation-by-token", kwargs={"token": UUID}, request=request, format=format),
         "invitation-bulk-upload":    reverse("invitation-bulk-upload", request=request, format=format),
+        "invitation-upload-create":  reverse("invitation-upload-create", request=request, format=format),
+        "invitation-upload-chunk":   reverse("invitation-upload-chunk", kwargs={"pk": UUID}, request=request, format=format),
+        "invitation-upload-complete":   reverse("invitation-upload-complete", kwargs={"pk": UUID}, request=request, format=format),
 
         # Election Events
         "event-events":     reverse("events_api:event-list", request=request, format=format),
@@ -94,5 +106,46 @@ def api_root(request, format=None):
         "vote-elections-available":  reverse("votes:elections-available", request=request, format=format),
         "vote-election-results":     reverse("votes:election-results", kwargs={"election_id": UUID}, request=request, format=format),
         "vote-election-statistics":  reverse("votes:election-statistics", kwargs={"election_id": UUID}, request=request, format=format),
+        "vote-archived-results":     reverse("votes:archived-results", kwargs={"event_id": UUID}, request=request, format=format),
         "vote-audit-logs":           reverse("votes:audit-logs", request=request, format=format),
+
+        # Background deletions
+        "deletion-job-detail":       reverse("deletion-job-detail", kwargs={"pk": UUID}, request=request, format=format),
     })
+
+
+class BackgroundDestroyMixin:
+    """
+    DestroyAPIView mixin deleting large objects in the background.
+
+    Small objects are deleted at once (204). Large ones are flagged
+    ``is_deleting`` and handed to a DeletionJob, and the response is 202
+    with the job's status URL. Repeating the request returns the same job.
+
+    Methods:
+        destroy: Delete inline or queue a DeletionJob
+    """
+
+    def destroy(self, request, *args, **kwargs):
+        instance = self.get_object()
+        job = delete_or_schedule(instance, user=request.user)
+        if job is None:
+            return Response(status=status.HTTP_204_NO_CONTENT)
+        return Response({
+            "detail": "Deletion in progress.",
+            "job_id": str(job.id),
+            "status": job.status,
+            "status_url": reverse("deletion-job-detail", kwargs={"pk": job.id}, request=request),
+        }, status=status.HTTP_202_ACCEPTED)
+
+
+class DeletionJobDetailView(generics.RetrieveAPIView):
+    """
+    API view reporting the progress of a background deletion.
+
+    Permissions:
+        Election admins only
+    """
+    queryset = DeletionJob.objects.select_related('content_type')
+    serializer_class = DeletionJobSerializer
+    permission_classes = [permissions.IsAuthenticated, IsElectionAdmin]
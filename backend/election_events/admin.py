@@ -4,7 +4,7 @@ election_events/admin.py
 Django admin configuration for the election_events application.
 This module registers the ElectionEvent model with the Django admin interface.
 """
-from django.contrib import admin
+from django.contrib import admin, messages
 from election_events.models import ElectionEvent
 
 
@@ -18,5 +18,23 @@ class ElectionEventAdmin(admin.ModelAdmin):
     
     Attributes:
         list_display (tuple): Fields to display in the admin list view
+        list_filter (tuple): Fields to filter the list view by
+        actions (list): Bulk actions, including certifying closed events
     """
-    list_display = ('title', 'start_time', 'end_time', 'is_active')
\ No newline at end of file
+    list_display = ('title', 'start_time', 'end_time', 'is_active', 'status')
+    list_filter = ('status',)
+    actions = ['certify']
+
+    @admin.action(description="Certify results of selected closed election events")
+    def certify(self, request, queryset):
+        """
+        Certify each selected event that has closed, warning about the rest.
+        """
+        certified = 0
+        for event in queryset:
+            try:
+                event.certify()
+                certified += 1
+            except ValueError as e:
+                self.message_user(request, str(e), messages.WARNING)
+        self.message_user(request, f"Certified {certified} election events.")
\ No newline at end of file
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.3 on 2026-10-19 01:27
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('election_events', '0002_alter_electionevent_id'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='electionevent',
+            name='is_deleting',
+            field=models.BooleanField(default=False, editable=False),
+        ),
+    ]
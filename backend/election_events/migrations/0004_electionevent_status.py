@@ -0,0 +1,39 @@
+# Generated by Django 5.2.3 on 2026-10-19 01:43
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('election_events', '0003_electionevent_is_deleting'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='electionevent',
+            name='status',
+            field=models.CharField(choices=[('scheduled', 'Scheduled'), ('open', 'Open'), ('closed', 'Closed'), ('certified', 'Certified')], default='scheduled', editable=False, max_length=10),
+        ),
+        # Existing rows start from their window; the scheduler keeps them
+        # in step from then on
+        migrations.RunSQL(
+            """
+            UPDATE election_events_electionevent
+            SET status = CASE
+                WHEN now() < start_time THEN 'scheduled'
+                WHEN now() <= end_time THEN 'open'
+                ELSE 'closed'
+            END
+            """,
+            migrations.RunSQL.noop,
+        ),
+        migrations.AddIndex(
+            model_name='electionevent',
+            index=models.Index(condition=models.Q(('status', 'scheduled')), fields=['start_time'], name='event_scheduled_start_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='electionevent',
+            index=models.Index(condition=models.Q(('status', 'open')), fields=['end_time'], name='event_open_end_idx'),
+        ),
+    ]
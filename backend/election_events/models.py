@@ -5,12 +5,12 @@ This module defines the ElectionEvent model for creating and managing
 election events.
 """
 from django.db import models
-from django.utils import timezone
+from django.db.models import Q
 
-from core.models import BaseUUIDModel
+from core.models import BaseUUIDModel, ScheduledStatusModel
 
 
-class ElectionEvent(BaseUUIDModel):
+class ElectionEvent(ScheduledStatusModel, BaseUUIDModel):
     """
     ElectionEvent model representing one election period, consisting
     at least one election.
@@ -26,25 +26,34 @@ class ElectionEvent(BaseUUIDModel):
         start_time (DateTimeField): When the election event begins
         end_time (DateTimeField): When the election event ends
         is_active (BooleanField): Whether the election event is currently active
+        is_deleting (BooleanField): Whether the election event is being
+            deleted in the background
+        status (CharField): scheduled, open, closed or certified, kept in
+            step with the voting window (see core/scheduling.py)
     """
     title = models.CharField(max_length=255)
     description = models.TextField(blank=True)
     start_time = models.DateTimeField()
     end_time = models.DateTimeField()
     is_active = models.BooleanField(default=True)
+    is_deleting = models.BooleanField(default=False, editable=False)  # Set while a DeletionJob purges it
 
-    def is_open(self):
+    class Meta:
         """
-        Check if the election event is currently open for voting.
-        
-        An election event is considered open if it's active and the current
-        time falls within the start and end time window.
-        
-        Returns:
-            bool: True if the election event is open, False otherwise
+        Partial indexes on the statuses the scheduler moves on from.
         """
-        now = timezone.now()
-        return self.is_active and self.start_time <= now <= self.end_time
+        indexes = [
+            models.Index(
+                fields=['start_time'],
+                condition=Q(status=ScheduledStatusModel.SCHEDULED),
+                name='event_scheduled_start_idx'
+            ),
+            models.Index(
+                fields=['end_time'],
+                condition=Q(status=ScheduledStatusModel.OPEN),
+                name='event_open_end_idx'
+            ),
+        ]
 
     def __str__(self):
         """
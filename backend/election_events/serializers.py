@@ -26,7 +26,8 @@ class ElectionEventSerializer(serializers.ModelSerializer):
             'description',
             'start_time',
             'end_time',
-            'is_active'         
+            'is_active',
+            'status'
         ]
     
     def validate(self, data):
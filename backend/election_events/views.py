@@ -12,11 +12,12 @@ from django.views.generic import View
 
 from rest_framework import generics, permissions
 
+from core.views import BackgroundDestroyMixin
 from election_events.forms import ElectionEventForm
 from election_events.models import ElectionEvent
 from election_events.serializers import ElectionEventSerializer
 from users.models import VoterProfile
-from users.permissions import IsVoter, IsElectionAdmin
+from users.permissions import IsVoter, IsElectionAdmin, get_request_voter
 
 
 # === API Views ===
@@ -29,10 +30,10 @@ class ElectionEventListView(generics.ListAPIView):
     election events in the system using the ElectionEventSerializer.
     
     Attributes:
-        queryset: All ElectionEvent objects
+        queryset: ElectionEvent objects not being deleted
         serializer_class: ElectionEventSerializer for JSON serialization
     """
-    queryset = ElectionEvent.objects.all()
+    queryset = ElectionEvent.objects.filter(is_deleting=False)
     serializer_class = ElectionEventSerializer
     permission_classes = [permissions.IsAuthenticated, IsElectionAdmin]
 
@@ -40,7 +41,7 @@ class ElectionEventListView(generics.ListAPIView):
 class ElectionEventDetailView(generics.RetrieveAPIView):
     """
     """
-    queryset = ElectionEvent.objects.all()
+    queryset = ElectionEvent.objects.filter(is_deleting=False)
     serializer_class = ElectionEventSerializer
     permission_class = [permissions.IsAuthenticated, IsElectionAdmin]
 
@@ -52,8 +53,7 @@ class ElectionEventVoterView(generics.RetrieveAPIView):
     permission_classes = [permissions.IsAuthenticated, IsVoter]
 
     def get_object(self):
-        voter = VoterProfile.objects.get(user=self.request.user)
-        return voter.election_event
+        return get_request_voter(self.request).election_event
 
 
 class ElectionEventCreateAPIView(generics.CreateAPIView):
@@ -67,14 +67,16 @@ class ElectionEventCreateAPIView(generics.CreateAPIView):
 class ElectionEventUpdateView(generics.RetrieveUpdateAPIView):
     """
     """
-    queryset = ElectionEvent.objects.all()
+    queryset = ElectionEvent.objects.filter(is_deleting=False)
     serializer_class = ElectionEventSerializer
     permission_classes = [permissions.IsAuthenticated, IsElectionAdmin]
     lookup_field = 'pk'
 
 
-class ElectionEventDeleteView(generics.DestroyAPIView):
+class ElectionEventDeleteView(BackgroundDestroyMixin, generics.DestroyAPIView):
     """
+    API view deleting an election event. Large events are deleted in the
+    background: the response is 202 with a deletion job status URL.
     """
     queryset = ElectionEvent.objects.all()
     serializer_class = ElectionEventSerializer
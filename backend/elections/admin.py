@@ -1,7 +1,8 @@
 """
 """
-from django.contrib import admin
+from django.contrib import admin, messages
 from elections.models import Election, Candidate
+from votes.recount import queue_recounts
 
 
 @admin.register(Election)
@@ -13,12 +14,42 @@ class ElectionAdmin(admin.ModelAdmin):
         'election_event',
         'start_time',
         'end_time',
-        'is_active'
+        'is_active',
+        'status'
     )
+    list_filter = ('status',)
+    actions = ['certify', 'recount']
+
+    @admin.action(description="Certify results of selected closed elections")
+    def certify(self, request, queryset):
+        """
+        Certify each selected election that has closed, warning about the rest.
+        """
+        certified = 0
+        for election in queryset:
+            try:
+                election.certify()
+                certified += 1
+            except ValueError as e:
+                self.message_user(request, str(e), messages.WARNING)
+        self.message_user(request, f"Certified {certified} elections.")
+
+    @admin.action(description="Recount selected elections and snapshot their results")
+    def recount(self, request, queryset):
+        """
+        Queue a recount of each selected election for the recount worker.
+        """
+        jobs = queue_recounts(list(queryset.values_list('id', flat=True)), requested_by=request.user)
+        self.message_user(
+            request,
+            f"Queued {len(jobs)} recounts; their snapshots appear under result snapshots once the "
+            f"recount worker has run them."
+        )
 
 
 @admin.register(Candidate)
 class ClassAdmin(admin.ModelAdmin):
     """
     """
-    list_display =('first_name', 'last_name', 'election', 'user')
\ No newline at end of file
+    list_display =('first_name', 'last_name', 'election', 'user')
+    search_fields = ('first_name', 'last_name')
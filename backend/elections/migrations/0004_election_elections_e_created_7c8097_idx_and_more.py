@@ -0,0 +1,22 @@
+# Generated by Django 5.2.3 on 2026-10-19 00:49
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('election_events', '0001_initial'),
+        ('elections', '0003_candidate'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='election',
+            index=models.Index(fields=['created_at', 'id'], name='elections_e_created_7c8097_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='election',
+            index=models.Index(fields=['election_event', 'created_at', 'id'], name='elections_e_electio_d9dad3_idx'),
+        ),
+    ]
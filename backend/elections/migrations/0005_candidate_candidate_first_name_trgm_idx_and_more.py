@@ -0,0 +1,26 @@
+# Generated by Django 5.2.3 on 2026-10-19 01:03
+
+import django.contrib.postgres.indexes
+import django.db.models.functions.text
+from django.conf import settings
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0001_pg_trgm'),
+        ('elections', '0004_election_elections_e_created_7c8097_idx_and_more'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='candidate',
+            index=django.contrib.postgres.indexes.GinIndex(django.contrib.postgres.indexes.OpClass(django.db.models.functions.text.Upper('first_name'), name='gin_trgm_ops'), name='candidate_first_name_trgm_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='candidate',
+            index=django.contrib.postgres.indexes.GinIndex(django.contrib.postgres.indexes.OpClass(django.db.models.functions.text.Upper('last_name'), name='gin_trgm_ops'), name='candidate_last_name_trgm_idx'),
+        ),
+    ]
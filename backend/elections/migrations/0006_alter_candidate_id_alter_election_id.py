@@ -0,0 +1,35 @@
+# Generated by Django 5.2.3 on 2026-10-19 01:14
+
+import uuid
+from django.db import migrations, models
+
+from core.uuid_conversion import AlterUUIDKey
+
+
+class Migration(migrations.Migration):
+
+    # Load every app with foreign keys to these models, so that altering a
+    # primary key also converts the columns referencing it
+    dependencies = [
+        ('admin', '0003_logentry_add_action_flag_choices'),
+        ('authtoken', '0004_alter_tokenproxy_options'),
+        ('election_events', '0001_initial'),
+        ('elections', '0005_candidate_candidate_first_name_trgm_idx_and_more'),
+        ('invitations', '0009_invitation_invitation_email_trgm_idx'),
+        ('users', '0009_user_user_email_trgm_idx_and_more'),
+        ('votes', '0002_remove_vote_votes_vote_voter_i_17d5e1_idx_and_more'),
+    ]
+
+    # Skipped for keys already converted online by convert_uuid_keys
+    operations = [
+        AlterUUIDKey(
+            model_name='candidate',
+            name='id',
+            field=models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False),
+        ),
+        AlterUUIDKey(
+            model_name='election',
+            name='id',
+            field=models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False),
+        ),
+    ]
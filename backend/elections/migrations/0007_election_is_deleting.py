@@ -0,0 +1,18 @@
+# Generated by Django 5.2.3 on 2026-10-19 01:27
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('elections', '0006_alter_candidate_id_alter_election_id'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='election',
+            name='is_deleting',
+            field=models.BooleanField(default=False, editable=False),
+        ),
+    ]
@@ -0,0 +1,19 @@
+# Generated by Django 5.2.3 on 2026-10-19 01:50
+
+import votes.tally
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('elections', '0008_election_status'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='election',
+            name='tally_method',
+            field=models.CharField(choices=votes.tally.tally_method_choices, default='plurality', max_length=20),
+        ),
+    ]
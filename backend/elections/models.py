@@ -8,15 +8,19 @@ Each election has candidates to choose from and a time window
 for voting.
 """
 from django.conf import settings
+from django.contrib.postgres.indexes import GinIndex, OpClass
 from django.core.exceptions import ValidationError
 from django.db import models
+from django.db.models import Q
+from django.db.models.functions import Upper
 from django.utils import timezone
 
-from core.models import BaseUUIDModel
+from core.models import BaseUUIDModel, ScheduledStatusModel
 from election_events.models import ElectionEvent
+from votes.tally import PLURALITY, tally_method_choices
 
 
-class Election(BaseUUIDModel):
+class Election(ScheduledStatusModel, BaseUUIDModel):
     """
     Election model representing a specific voting event within an
     election event.
@@ -32,6 +36,12 @@ class Election(BaseUUIDModel):
         start_time (DateTimeField): When voting begins for this election
         end_time (DateTimeField): When voting ends for this election
         is_active (BooleanField): Whether the election is currently active
+        is_deleting (BooleanField): Whether the election is being deleted
+            in the background
+        status (CharField): scheduled, open, closed or certified, kept in
+            step with the voting window (see core/scheduling.py)
+        tally_method (CharField): How ballots are counted, one of the
+            methods registered in votes/tally.py
     """
     election_event = models.ForeignKey(
         ElectionEvent,
@@ -43,20 +53,57 @@ class Election(BaseUUIDModel):
     start_time = models.DateTimeField()
     end_time = models.DateTimeField()
     is_active = models.BooleanField(default=True)
+    is_deleting = models.BooleanField(default=False, editable=False)  # Set while a DeletionJob purges it
+    tally_method = models.CharField(max_length=20, choices=tally_method_choices, default=PLURALITY)
 
-    def is_open(self):
+    class Meta:
         """
-        Check if the election is currently open for voting.
-        
-        An election is considered open if it's active and the current
-        time falls within the start and end time window.
-        
+        Composite indexes backing keyset pagination on (created_at, id), and
+        partial indexes on open and scheduled elections.
+        """
+        indexes = [
+            models.Index(fields=['created_at', 'id']),
+            models.Index(fields=['election_event', 'created_at', 'id']),
+            # Open elections are a small fraction of all elections
+            models.Index(
+                fields=['election_event', 'end_time'],
+                condition=Q(status=ScheduledStatusModel.OPEN),
+                name='election_open_idx'
+            ),
+            models.Index(
+                fields=['start_time'],
+                condition=Q(status=ScheduledStatusModel.SCHEDULED),
+                name='election_scheduled_start_idx'
+            ),
+        ]
+
+    @classmethod
+    def open_for_event(cls, election_event_id, now=None):
+        """
+        Return an event's elections whose voting window is open.
+
+        The window is compared with the clock, so elections the scheduler
+        has not flipped to open yet are included and those it has not
+        closed yet are not. Restricting the status to scheduled or open
+        still lets the partial status indexes skip every finished election.
+
+        Args:
+            election_event_id (UUID): Election event id
+            now (datetime): Moment to check (default: the current time)
+
         Returns:
-            bool: True if the election is open for voting, False otherwise
+            QuerySet: Active elections open at that moment
         """
-        now = timezone.now()
-        return self.is_active and self.start_time <= now <= self.end_time
-    
+        now = now or timezone.now()
+        return cls.objects.filter(
+            election_event_id=election_event_id,
+            status__in=[cls.SCHEDULED, cls.OPEN],
+            is_active=True,
+            is_deleting=False,
+            start_time__lte=now,
+            end_time__gte=now
+        )
+
     def __str__(self):
         """
         Return string representation of the election.
@@ -132,6 +179,19 @@ class Candidate(BaseUUIDModel):
         related_name='candidates'
     )
 
+    class Meta:
+        """
+        Expression indexes backing case-insensitive search on names: B-tree
+        for the prefix search of short terms and trigram GIN for substring
+        search (see core/filters.py).
+        """
+        indexes = [
+            models.Index(OpClass(Upper('first_name'), name='text_pattern_ops'), name='candidate_first_prefix_idx'),
+            models.Index(OpClass(Upper('last_name'), name='text_pattern_ops'), name='candidate_last_prefix_idx'),
+            GinIndex(OpClass(Upper('first_name'), name='gin_trgm_ops'), name='candidate_first_name_trgm_idx'),
+            GinIndex(OpClass(Upper('last_name'), name='gin_trgm_ops'), name='candidate_last_name_trgm_idx'),
+        ]
+
     def __str__(self):
         """
         Return string representation of the candidate.
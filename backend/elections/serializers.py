@@ -24,6 +24,8 @@ class ElectionSerializer(serializers.ModelSerializer):
         start_time: Election start timestamp
         end_time: Election end timestamp
         is_active: Boolean indicating if election is active
+        status: scheduled, open, closed or certified (read-only)
+        tally_method: How ballots are counted (plurality by default)
         election_event: Associated election event ID
         election_event_title: Election event title (read-only)
     """
@@ -42,6 +44,8 @@ class ElectionSerializer(serializers.ModelSerializer):
             'start_time',
             'end_time',
             'is_active',
+            'status',
+            'tally_method',
             'election_event',
             'election_event_title'
         ]
@@ -51,6 +55,7 @@ class ElectionSerializer(serializers.ModelSerializer):
             'start_time': {'help_text': 'Election start date and time'},
             'end_time': {'help_text': 'Election end date and time'},
             'is_active': {'help_text': 'Whether the election is currently active'},
+            'tally_method': {'help_text': 'How ballots are counted: plurality, approval or irv'},
             'election_event': {'help_text': 'ID of the associated election event'}
         }
     
@@ -68,7 +73,8 @@ class ElectionSerializer(serializers.ModelSerializer):
             dict: Validated attributes
             
         Raises:
-            ValidationError: If election times are outside event bounds
+            ValidationError: If election times are outside event bounds, or
+                the tally method changes after voting started
         """
         event = (
             attrs.get('election_event') or
@@ -100,7 +106,15 @@ class ElectionSerializer(serializers.ModelSerializer):
                 raise ValidationError(
                     "Election start time must be before end time."
                 )
-        
+
+        # Ballots already cast were shaped by the old method
+        if (
+            self.instance and
+            attrs.get('tally_method', self.instance.tally_method) != self.instance.tally_method and
+            self.instance.participations.exists()
+        ):
+            raise ValidationError("The tally method cannot change once votes have been cast.")
+
         return attrs
 
 
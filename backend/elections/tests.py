@@ -1,3 +1,158 @@
+"""
+elections/tests.py
+
+This module tests the elections app: which elections are open for voting,
+the voting form and the results pages.
+"""
+from datetime import timedelta
+from unittest import mock
+
+from django.http import HttpResponse
 from django.test import TestCase
+from django.urls import reverse
+from django.utils import timezone
+
+from core.models import ScheduledStatusModel
+from election_events.models import ElectionEvent
+from elections.models import Candidate, Election
+from invitations.models import Invitation
+from users.models import User, VoterProfile
+from votes.models import Participation, Vote
+from votes.tally import APPROVAL, INSTANT_RUNOFF, PLURALITY
+
+
+class OpenElectionTests(TestCase):
+    """
+    Open elections follow the clock, whether or not the scheduler has
+    caught up with their stored status.
+    """
+    @classmethod
+    def setUpTestData(cls):
+        now = timezone.now()
+        cls.event = ElectionEvent.objects.create(
+            title='Event', start_time=now - timedelta(days=3), end_time=now + timedelta(days=3)
+        )
+
+    def create_election(self, starts_in, ends_in, **fields):
+        now = timezone.now()
+        return Election.objects.create(
+            election_event=self.event, title='Election',
+            start_time=now + starts_in, end_time=now + ends_in, **fields
+        )
+
+    def test_open_window(self):
+        election = self.create_election(timedelta(hours=-1), timedelta(hours=1))
+        self.create_election(timedelta(hours=1), timedelta(hours=2))
+        self.create_election(timedelta(days=-2), timedelta(days=-1))
+        self.create_election(timedelta(hours=-1), timedelta(hours=1), is_active=False)
+
+        self.assertEqual(list(Election.open_for_event(self.event.id)), [election])
+
+    def test_scheduler_running_late(self):
+        opened = self.create_election(timedelta(hours=1), timedelta(hours=2))
+        ended = self.create_election(timedelta(hours=-1), timedelta(hours=1))
+        self.assertEqual(opened.status, ScheduledStatusModel.SCHEDULED)
+        self.assertEqual(ended.status, ScheduledStatusModel.OPEN)
+
+        # An hour and a half later, before the scheduler has run
+        later = timezone.now() + timedelta(minutes=90)
+        self.assertEqual(list(Election.open_for_event(self.event.id, now=later)), [opened])
+
+
+class BallotFormTests(TestCase):
+    """
+    The voting form casts every kind of ballot, and the results pages
+    count them with the election's tally method.
+    """
+    @classmethod
+    def setUpTestData(cls):
+        now = timezone.now()
+        cls.event = ElectionEvent.objects.create(
+            title='Event', start_time=now - timedelta(days=1), end_time=now + timedelta(days=1)
+        )
+        cls.elections = {}
+        for method in (PLURALITY, APPROVAL, INSTANT_RUNOFF):
+            election = Election.objects.create(
+                election_event=cls.event, title=method, tally_method=method,
+                start_time=cls.event.start_time, end_time=cls.event.end_time
+            )
+            candidates = [
+                Candidate.objects.create(election=election, first_name='Candidate', last_name=str(n))
+                for n in range(3)
+            ]
+            cls.elections[method] = (election, candidates)
+        cls.voters = [cls.create_voter(f'voter{n}@example.com') for n in range(5)]
+        cls.staff = User.objects.create_user(email='staff@example.com', is_staff=True)
+
+    @classmethod
+    def create_voter(cls, email):
+        Invitation.objects.create(email=email, election_event=cls.event, is_used=True)
+        user = User.objects.create_user(email=email, first_name='Voter', last_name='Test')
+        return VoterProfile.objects.create(user=user, election_event=cls.event)
+
+    def vote(self, voter, method, choices):
+        election, candidates = self.elections[method]
+        self.client.force_login(voter.user)
+        return self.client.post(
+            reverse('vote-page', args=[election.pk]),
+            {'candidate': [str(candidates[index].pk) if index is not None else '' for index in choices]}
+        )
+
+    def votes(self, method):
+        election, candidates = self.elections[method]
+        return sorted(
+            (candidates.index(vote.candidate), vote.rank)
+            for vote in Vote.objects.filter(election=election).select_related('candidate')
+        )
+
+    def test_single_choice(self):
+        self.vote(self.voters[0], PLURALITY, [1])
+
+        self.assertEqual(self.votes(PLURALITY), [(1, 1)])
+
+    def test_single_choice_refuses_several_candidates(self):
+        self.vote(self.voters[0], PLURALITY, [0, 1])
+
+        self.assertFalse(Participation.objects.exists())
+
+    def test_approval(self):
+        self.vote(self.voters[0], APPROVAL, [0, 2])
+
+        self.assertEqual(self.votes(APPROVAL), [(0, 1), (2, 1)])
+
+    def test_ranked_keeps_preference_order_and_skips_blanks(self):
+        self.vote(self.voters[0], INSTANT_RUNOFF, [2, 0, None])
+
+        self.assertEqual(self.votes(INSTANT_RUNOFF), [(0, 2), (2, 1)])
+
+    def test_candidate_of_another_election_is_refused(self):
+        other = self.elections[APPROVAL][1][0]
+        election = self.elections[PLURALITY][0]
+        self.client.force_login(self.voters[0].user)
+
+        response = self.client.post(reverse('vote-page', args=[election.pk]), {'candidate': [str(other.pk)]})
+
+        self.assertEqual(response.status_code, 404)
+
+    def test_results_use_the_tally_method(self):
+        for voter, ranking in zip(self.voters, [[0], [0], [1, 0], [2, 1], [2, 1]]):
+            self.vote(voter, INSTANT_RUNOFF, ranking)
+        self.client.force_login(self.staff)
+
+        with mock.patch('elections.views.render', return_value=HttpResponse()) as render:
+            self.client.get(reverse('admin-results'))
+        results = {
+            result['election'].tally_method: [candidate['votes'] for candidate in result['candidates']]
+            for result in render.call_args.args[2]['results']
+        }
+        # Seven ranked votes, but five ballots: the final round counts 3 to 2
+        self.assertEqual(results[INSTANT_RUNOFF], [3, 2, 0])
+        self.assertEqual(results[PLURALITY], [0, 0, 0])
 
-# Create your tests here.
+        with mock.patch('elections.views.render', return_value=HttpResponse()) as render:
+            self.client.get(reverse('admin-dashboard'))
+        counts = {
+            election.tally_method: election.ballot_count
+            for event in render.call_args.args[2]['events'] for election in event.elections.all()
+        }
+        self.assertEqual(counts, {PLURALITY: 0, APPROVAL: 0, INSTANT_RUNOFF: 5})
@@ -4,10 +4,14 @@ elections/views.py
 This module defines views for the elections application.
 Contains both API views and HTML template views for election and candidate management.
 """
+import uuid
+
 from django.contrib import messages
 from django.contrib.admin.views.decorators import staff_member_required
 from django.contrib.auth.mixins import LoginRequiredMixin
+from django.core.exceptions import ValidationError
 from django.db.models import Count, Prefetch
+from django.http import Http404
 from django.shortcuts import render, get_object_or_404, redirect
 from django.utils.decorators import method_decorator
 from django.views import View
@@ -15,13 +19,20 @@ from django.views.generic import ListView
 
 from rest_framework import generics, permissions
 
+from core.pagination import PageNumberOrKeysetPagination
+from core.views import BackgroundDestroyMixin
+from core.routers import read_from_replica
 from elections.forms import CandidateForm, ElectionForm
 from elections.models import Election, Candidate
 from election_events.models import ElectionEvent
 from elections.serializers import ElectionSerializer, CandidateSerializer
 from users.models import VoterProfile
-from users.permissions import IsElectionAdmin
-from votes.models import Vote
+from users.permissions import IsElectionAdmin, get_request_voter
+from votes.models import Participation, Vote
+from votes.tally import get_tally_method
+
+# Extra tag on the message VoterElectionDetailView.post() leaves after a vote
+VOTE_SUBMITTED_TAG = "vote-submitted"
 
 
 # === API Views ===
@@ -51,10 +62,12 @@ class ElectionListView(generics.ListAPIView):
     Attributes:
         serializer_class: ElectionSerializer for JSON serialization
         permission_classes: Requires authentication
+        pagination_class: Page numbers, or keyset paging with ``?pagination=cursor``
     """
-    queryset = Election.objects.select_related('election_event')
+    queryset = Election.objects.filter(is_deleting=False).select_related('election_event')
     serializer_class = ElectionSerializer
     permission_classes = [permissions.IsAuthenticated]
+    pagination_class = PageNumberOrKeysetPagination
 
     def get_queryset(self):
         """
@@ -66,11 +79,10 @@ class ElectionListView(generics.ListAPIView):
         user = self.request.user
         if user.is_staff:
             return self.queryset.all()
-        try:
-            voter = VoterProfile.objects.get(user=user)
-            return self.queryset.filter(election_event=voter.election_event)
-        except VoterProfile.DoesNotExist:
+        voter = get_request_voter(self.request)
+        if voter is None:
             return Election.objects.none()
+        return self.queryset.filter(election_event_id=voter.election_event_id)
 
 
 class ElectionRetrieveAPIView(generics.RetrieveAPIView):
@@ -79,7 +91,7 @@ class ElectionRetrieveAPIView(generics.RetrieveAPIView):
     - Admins can retrieve any election.
     - Voters can retrieve any election from their election event.
     """
-    queryset = Election.objects.select_related('election_event')
+    queryset = Election.objects.filter(is_deleting=False).select_related('election_event')
     serializer_class = ElectionSerializer
     permission_classes = [permissions.IsAuthenticated]
     llokup_field = 'pk'
@@ -94,11 +106,10 @@ class ElectionRetrieveAPIView(generics.RetrieveAPIView):
         user = self.request.user
         if user.is_staff:
             return self.queryset.all()
-        try:
-            voter = VoterProfile.objects.get(user=user)
-            return self.queryset.filter(election_event=voter.election_event)
-        except VoterProfile.DoesNotExist:
+        voter = get_request_voter(self.request)
+        if voter is None:
             return Election.objects.none()
+        return self.queryset.filter(election_event_id=voter.election_event_id)
 
 
 class ElectionUpdateAPIView(generics.UpdateAPIView):
@@ -108,21 +119,23 @@ class ElectionUpdateAPIView(generics.UpdateAPIView):
     This view allows administrators to perform CRUD operations on individual elections.
     
     Attributes:
-        queryset: All Election objects
+        queryset: Election objects not being deleted
         serializer_class: ElectionSerializer for JSON serialization
         permission_classes: Requires admin privileges
     """
-    queryset = Election.objects.all()
+    queryset = Election.objects.filter(is_deleting=False)
     serializer_class = ElectionSerializer
     permission_classes = [permissions.IsAuthenticated, IsElectionAdmin]
     lookup_field = 'pk'
 
 
-class ElectionDeleteAPIView(generics.DestroyAPIView):
+class ElectionDeleteAPIView(BackgroundDestroyMixin, generics.DestroyAPIView):
     """
     API view for deleting elections (admin only).
     
     This view allows administrators to perform CRUD operations on individual elections.
+    Elections with many votes are deleted in the background: the response
+    is 202 with a deletion job status URL.
     
     Attributes:
         queryset: All Election objects
@@ -213,6 +226,7 @@ class CandidateListView(generics.ListAPIView):
     """
     serializer_class = CandidateSerializer
     permission_classes = [permissions.IsAuthenticated]
+    search_fields = ['first_name', 'last_name']
     lookup_field = 'election_id'
 
     def get_queryset(self):
@@ -253,7 +267,7 @@ class VoterElectionListView(LoginRequiredMixin, ListView):
             QuerySet: Elections belonging to the voter's election event
         """
         profile = get_object_or_404(VoterProfile, user=self.request.user)
-        return Election.objects.filter(election_event=profile.election_event)
+        return Election.objects.filter(election_event=profile.election_event, is_deleting=False)
 
 
 class VoterElectionDetailView(LoginRequiredMixin, View):
@@ -274,25 +288,24 @@ class VoterElectionDetailView(LoginRequiredMixin, View):
         Returns:
             HttpResponse: Rendered HTML template with election and voting context
         """
-        profile = request.user.voterprofile
-        election = get_object_or_404(Election, pk=pk, election_event=profile.election_event)
+        profile = get_request_voter(request)
+        election = get_object_or_404(Election, pk=pk, election_event_id=profile.election_event_id)
         candidates = Candidate.objects.filter(election=election)
 
-        just_voted = request.session.get("just_voted", False)
-        has_voted = Vote.objects.filter(voter=request.user.voterprofile, candidate__election=election).exists()
-
-        show_form = not has_voted and not just_voted
-
-        if just_voted:
-            messages.success(request, "Your vote has been submitted successfully.")
-            request.session.pop("just_voted", None)
+        has_voted = Participation.objects.filter(voter=profile, election=election).exists()
+        # Set by post() as a cookie-stored message, so no session write is needed
+        just_voted = any(
+            VOTE_SUBMITTED_TAG in message.extra_tags
+            for message in messages.get_messages(request)
+        )
 
         context = {
             "election": election,
+            "ballot": get_tally_method(election.tally_method).ballot,
             "candidates": candidates,
-            "has_voted": has_voted and not just_voted,
+            "has_voted": has_voted,
             "just_voted": just_voted,
-            "show_form": show_form,
+            "show_form": not has_voted,
         }
 
         return render(request, "elections/election_detail.html", context)
@@ -308,22 +321,39 @@ class VoterElectionDetailView(LoginRequiredMixin, View):
         Returns:
             HttpResponse: Redirect to election detail page
         """
-        profile = request.user.voterprofile
-        election = get_object_or_404(Election, pk=pk, election_event=profile.election_event)
+        profile = get_request_voter(request)
+        election = get_object_or_404(Election, pk=pk, election_event_id=profile.election_event_id)
 
         # Check if user has already voted
-        if Vote.objects.filter(voter=request.user.voterprofile, candidate__election=election).exists():
-            return redirect("election-detail", pk=pk)
+        if Participation.objects.filter(voter=profile, election=election).exists():
+            return redirect("vote-page", pk=pk)
         
-        # Process the vote
-        candidate_id = request.POST.get("candidate")
-        candidate = get_object_or_404(Candidate, pk=candidate_id, election=election)
-
-        Vote.objects.create(voter=request.user.voterprofile, candidate=candidate)
+        # One "candidate" value per choice: the chosen candidate, every
+        # approved one, or the preferences in rank order; blank ranks are
+        # left out
+        try:
+            candidate_ids = [
+                uuid.UUID(value) for value in request.POST.getlist("candidate") if value
+            ]
+        except ValueError:
+            raise Http404("Invalid candidate.")
+        by_id = Candidate.objects.filter(election=election).in_bulk(candidate_ids)
+        if len(by_id) != len(set(candidate_ids)):
+            raise Http404("Invalid candidate.")
 
-        request.session["just_voted"] = True
+        try:
+            Vote.cast_ballot(profile, election, [by_id[candidate_id] for candidate_id in candidate_ids])
+        except ValidationError as e:
+            messages.error(request, ' '.join(e.messages))
+            return redirect("vote-page", pk=pk)
+
+        messages.success(
+            request,
+            "Your vote has been submitted successfully.",
+            extra_tags=VOTE_SUBMITTED_TAG
+        )
 
-        return redirect("election-detail", pk=pk)
+        return redirect("vote-page", pk=pk)
 
 
 class AdminElectionResultsView(View):
@@ -331,9 +361,10 @@ class AdminElectionResultsView(View):
     HTML view for displaying election results to administrators.
     
     This view shows vote counts for all candidates across all elections.
-    Requires staff privileges.
+    Requires staff privileges. Reads from the replica when one is configured.
     """
     @method_decorator(staff_member_required)
+    @method_decorator(read_from_replica)
     def get(self, request):
         """
         Handle GET requests to display election results.
@@ -344,18 +375,23 @@ class AdminElectionResultsView(View):
         Returns:
             HttpResponse: Rendered HTML template with election results
         """
-        elections = Election.objects.all().prefetch_related('candidates__votes', 'candidates')
+        elections = Election.objects.all().prefetch_related('candidates')
         results = []
 
         for election in elections:
-            candidates = election.candidates.all()
-            candidate_data = []
-            for candidate in candidates:
-                vote_count = candidate.votes.count()
-                candidate_data.append({
-                    "name": f"{candidate.first_name} {candidate.last_name}",
-                    "votes": vote_count,
-                })
+            # Counted with the election's tally method, so later preferences
+            # on ranked ballots only count once transferred
+            counts = Vote.count_by_candidate(election)
+            candidate_data = sorted(
+                (
+                    {
+                        "name": f"{candidate.first_name} {candidate.last_name}",
+                        "votes": counts.get(candidate.id, 0),
+                    }
+                    for candidate in election.candidates.all()
+                ),
+                key=lambda candidate: -candidate["votes"]
+            )
             results.append({
                 "election": election,
                 "candidates": candidate_data
@@ -415,9 +451,10 @@ class AdminElectionListView(View):
     HTML view for creating new elections (admin only).
     
     This view provides a form interface for administrators to create new elections.
-    Requires staff privileges.
+    Requires staff privileges. Reads from the replica when one is configured.
     """
     @method_decorator(staff_member_required)
+    @method_decorator(read_from_replica)
     def get(self, request):
         """
         Handle GET requests to display election creation form.
@@ -430,15 +467,18 @@ class AdminElectionListView(View):
         """
         event_qs = (
             ElectionEvent.objects
-            .filter(elections__isnull=False)
+            .filter(elections__isnull=False, is_deleting=False)
             .annotate(election_count=Count('elections'))
             .prefetch_related(
                 Prefetch(
                     'elections',
                     queryset=(
                         Election.objects
+                        .filter(is_deleting=False)
                         .prefetch_related('candidates')
-                        .annotate(vote_count=Count('candidates__votes'))
+                        # Ballots cast, one per voter whatever the number
+                        # of candidates on each ballot
+                        .annotate(ballot_count=Count('participations'))
                         .order_by('start_time')
                     )
                 )
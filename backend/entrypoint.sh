@@ -11,6 +11,6 @@ python manage.py migrate
 echo "==> Collecting static files..."
 python manage.py collectstatic --noinput
 
-# Start Gunicorn server
+# Start Gunicorn server (worker count comes from WEB_CONCURRENCY)
 echo "==> Starting Gunicorn..."
-exec gunicorn config.wsgi:application --bind 0.0.0.0:8000
+exec gunicorn config.wsgi:application --bind 0.0.0.0:8000 --threads "${WEB_THREADS:-1}"
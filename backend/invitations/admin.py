@@ -6,12 +6,13 @@ including automatic email sending when invitations are created through the admin
 """
 from django.contrib import admin
 
+from core.admin import LargeTableAdminMixin
 from invitations.models import Invitation
 from invitations.views import InvitationCreateAPIView
 
 
 @admin.register(Invitation)
-class InvitationAdmin(admin.ModelAdmin):
+class InvitationAdmin(LargeTableAdminMixin, admin.ModelAdmin):
     """
     Django admin configuration for managing invitations.
     
@@ -21,9 +22,11 @@ class InvitationAdmin(admin.ModelAdmin):
     Attributes:
         list_display: Fields to display in the admin list view
         search_fields: Fields to enable searching in the admin interface
+        list_select_related: Related objects joined into the changelist query
     """
     list_display = ('email', 'election_event', 'is_used', 'created_at')
     search_fields = ('email',)
+    list_select_related = ('election_event',)
 
     def save_model(self, request, obj, form, change):
         """
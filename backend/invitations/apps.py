@@ -4,3 +4,6 @@ from django.apps import AppConfig
 class InvitationsConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'invitations'
+
+    def ready(self):
+        import invitations.signals  # noqa: F401
@@ -0,0 +1,67 @@
+"""
+invitations/management/commands/rebuild_invitation_funnels.py
+
+This module defines a management command that recomputes the per-event
+invitation funnel counters from the invitation, voter and vote tables.
+"""
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.db.models import Count, Q
+
+from election_events.models import ElectionEvent
+from invitations.models import InvitationFunnel
+from users.models import VoterProfile
+
+
+class Command(BaseCommand):
+    """
+    Recompute invitation funnel counters for one or all election events.
+    
+    The invited, registered and voted counters are recounted from source
+    data. Email delivery outcomes are not stored anywhere else, so the
+    email_delivered and email_failed counters are left as they are.
+    """
+    help = "Recompute invitation funnel counters from source data."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--event',
+            help="Only rebuild the funnel of this election event ID"
+        )
+
+    def handle(self, *args, **options):
+        events = ElectionEvent.objects.all()
+        if options['event']:
+            events = events.filter(pk=options['event'])
+
+        # Voters who voted but have no flag predate the flag, or lost a race
+        VoterProfile.objects.filter(has_voted=False, participations__isnull=False).update(has_voted=True)
+
+        events = events.annotate(
+            invited_count=Count('invitations', distinct=True),
+            registered_count=Count(
+                'invitations',
+                filter=Q(invitations__is_used=True),
+                distinct=True
+            ),
+            voted_count=Count(
+                'voter_profiles',
+                filter=Q(voter_profiles__has_voted=True),
+                distinct=True
+            ),
+        )
+
+        rebuilt = 0
+        for event in events.iterator():
+            with transaction.atomic():
+                InvitationFunnel.objects.update_or_create(
+                    election_event=event,
+                    defaults={
+                        'invited': event.invited_count,
+                        'registered': event.registered_count,
+                        'voted': event.voted_count,
+                    }
+                )
+            rebuilt += 1
+
+        self.stdout.write(self.style.SUCCESS(f"Rebuilt {rebuilt} invitation funnel(s)."))
@@ -0,0 +1,47 @@
+"""
+invitations/management/commands/run_invitation_uploads.py
+
+This module defines the worker command that imports completed voter roll
+uploads.
+"""
+import time
+
+from django.core.management.base import BaseCommand
+
+from invitations.services import InvitationUploadService, claim_invitation_upload
+
+
+class Command(BaseCommand):
+    """
+    Claim completed InvitationUploads one at a time, verify their checksum
+    and create their invitations. Several workers can run side by side;
+    each upload is claimed with SELECT ... FOR UPDATE SKIP LOCKED. With
+    --once the worker exits when the queue is empty, otherwise it polls
+    every --sleep seconds.
+    """
+    help = "Import completed voter roll uploads."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--once', action='store_true', help="Exit when no upload is queued")
+        parser.add_argument('--sleep', type=float, default=5.0, help="Seconds between polls of an empty queue")
+
+    def handle(self, *args, **options):
+        while True:
+            upload = claim_invitation_upload()
+            if upload is None:
+                if options['once']:
+                    return
+                time.sleep(options['sleep'])
+                continue
+
+            self.stdout.write(f"Importing upload {upload.pk}: {upload.filename}")
+            results = InvitationUploadService(upload).process()
+            if results is None:
+                self.stdout.write(self.style.ERROR(
+                    f"Upload {upload.pk} failed: {upload.results['error']}"
+                ))
+            else:
+                self.stdout.write(self.style.SUCCESS(
+                    f"Imported {upload.filename}: {results['successful_invitations']} of "
+                    f"{results['total_rows']} rows invited"
+                ))
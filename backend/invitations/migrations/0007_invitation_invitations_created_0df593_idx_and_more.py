@@ -0,0 +1,24 @@
+# Generated by Django 5.2.3 on 2026-10-19 00:49
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('election_events', '0001_initial'),
+        ('invitations', '0006_invitationupload'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='invitation',
+            index=models.Index(fields=['created_at', 'id'], name='invitations_created_0df593_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='invitation',
+            index=models.Index(fields=['election_event', 'created_at', 'id'], name='invitations_electio_46d8bf_idx'),
+        ),
+    ]
@@ -0,0 +1,33 @@
+# Generated by Django 5.2.3 on 2026-10-19 00:52
+
+import core.models
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('election_events', '0001_initial'),
+        ('invitations', '0007_invitation_invitations_created_0df593_idx_and_more'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='InvitationFunnel',
+            fields=[
+                ('id', models.CharField(default=core.models.generate_uuid, editable=False, max_length=36, primary_key=True, serialize=False)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('invited', models.PositiveIntegerField(default=0)),
+                ('email_delivered', models.PositiveIntegerField(default=0)),
+                ('email_failed', models.PositiveIntegerField(default=0)),
+                ('registered', models.PositiveIntegerField(default=0)),
+                ('voted', models.PositiveIntegerField(default=0)),
+                ('election_event', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, related_name='invitation_funnel', to='election_events.electionevent')),
+            ],
+            options={
+                'abstract': False,
+            },
+        ),
+    ]
@@ -0,0 +1,23 @@
+# Generated by Django 5.2.3 on 2026-10-19 01:03
+
+import django.contrib.postgres.indexes
+import django.db.models.functions.text
+from django.conf import settings
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0001_pg_trgm'),
+        ('election_events', '0001_initial'),
+        ('invitations', '0008_invitationfunnel'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='invitation',
+            index=django.contrib.postgres.indexes.GinIndex(django.contrib.postgres.indexes.OpClass(django.db.models.functions.text.Upper('email'), name='gin_trgm_ops'), name='invitation_email_trgm_idx'),
+        ),
+    ]
@@ -0,0 +1,19 @@
+# Generated by Django 5.2.3 on 2026-10-19 01:19
+
+import core.models
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('invitations', '0010_alter_invitation_id_alter_invitationfunnel_id_and_more'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='invitation',
+            name='id',
+            field=models.UUIDField(default=core.models.generate_uuid7, editable=False, primary_key=True, serialize=False),
+        ),
+    ]
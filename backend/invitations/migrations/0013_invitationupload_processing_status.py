@@ -0,0 +1,18 @@
+# Generated by Django 5.2.3 on 2026-10-19 02:54
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('invitations', '0012_invitation_email_prefix_idx'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='invitationupload',
+            name='status',
+            field=models.CharField(choices=[('uploading', 'Uploading'), ('complete', 'Complete'), ('processing', 'Processing'), ('processed', 'Processed'), ('failed', 'Failed')], default='uploading', max_length=20),
+        ),
+    ]
@@ -8,15 +8,22 @@ Each invitation consists of a unique email and a UUID token, for one-time use,
 to control voter registration access.
 """
 import uuid
-from django.db import models
+from pathlib import Path
+
+from django.conf import settings
+from django.contrib.postgres.indexes import GinIndex, OpClass
+from django.db import IntegrityError, models, transaction
+from django.db.models import F
+from django.db.models.functions import Upper
 from django.contrib.auth import get_user_model
-from core.models import BaseUUIDModel
+from django.utils import timezone
+from core.models import BaseUUIDModel, TimeOrderedUUIDModel
 from election_events.models import ElectionEvent
 
 User = get_user_model()
 
 
-class Invitation(BaseUUIDModel):
+class Invitation(TimeOrderedUUIDModel):
     """
     Invitation model representing an invite to register as a voter.
     """
@@ -38,8 +45,151 @@ class Invitation(BaseUUIDModel):
         related_name='sent_invitations'
     )
 
+    class Meta:
+        """
+        Composite indexes backing keyset pagination on (created_at, id), and
+        expression indexes backing case-insensitive search on email: B-tree
+        for the prefix search of short terms and trigram GIN for substring
+        search (see core/filters.py).
+        """
+        indexes = [
+            models.Index(fields=['created_at', 'id']),
+            models.Index(fields=['election_event', 'created_at', 'id']),
+            models.Index(OpClass(Upper('email'), name='text_pattern_ops'), name='invitation_email_prefix_idx'),
+            GinIndex(OpClass(Upper('email'), name='gin_trgm_ops'), name='invitation_email_trgm_idx'),
+        ]
+
+    def mark_used(self):
+        """
+        Mark the invitation as used and count the registration.
+        
+        The flag is flipped with a conditional UPDATE, so concurrent calls
+        for the same invitation only count it once.
+        
+        Returns:
+            bool: True if this call marked the invitation, False if it was
+            already used
+        """
+        claimed = Invitation.objects.filter(pk=self.pk, is_used=False).update(
+            is_used=True,
+            updated_at=timezone.now()
+        )
+        self.is_used = True
+        if claimed:
+            InvitationFunnel.bump(self.election_event_id, registered=1)
+        return bool(claimed)
+
     def __str__(self):
         """
         Return string representation with user email and invitation use status.
         """
         return f'{self.email} - Used: {self.is_used}'
+
+
+class InvitationFunnel(BaseUUIDModel):
+    """
+    Running invitation funnel counters for one election event.
+    
+    The counters are bumped in place as invitations are created, emailed and
+    used, and as invited voters cast their first vote, so the dashboard reads
+    a single row instead of counting the invitation table. The
+    ``rebuild_invitation_funnels`` command recomputes them from source data.
+    """
+    election_event = models.OneToOneField(
+        ElectionEvent,
+        on_delete=models.CASCADE,
+        related_name='invitation_funnel'
+    )
+    invited = models.PositiveIntegerField(default=0)
+    email_delivered = models.PositiveIntegerField(default=0)
+    email_failed = models.PositiveIntegerField(default=0)
+    registered = models.PositiveIntegerField(default=0)
+    voted = models.PositiveIntegerField(default=0)
+
+    COUNTER_FIELDS = ('invited', 'email_delivered', 'email_failed', 'registered', 'voted')
+
+    @classmethod
+    def bump(cls, election_event_id, **deltas):
+        """
+        Atomically add to one or more counters of an event's funnel.
+        
+        Uses ``UPDATE ... SET field = field + n`` so concurrent bumps never
+        lose increments. The row is created on first use.
+        
+        Args:
+            election_event_id: ID of the election event
+            **deltas: Counter names mapped to the amount to add
+        """
+        updates = {field: F(field) + delta for field, delta in deltas.items()}
+        funnel = cls.objects.filter(election_event_id=election_event_id)
+        if funnel.update(**updates, updated_at=timezone.now()):
+            return
+        try:
+            with transaction.atomic():
+                cls.objects.create(election_event_id=election_event_id, **deltas)
+        except IntegrityError:
+            # Another request created the row first
+            funnel.update(**updates, updated_at=timezone.now())
+
+    def __str__(self):
+        """
+        Return string representation with event and funnel counts.
+        """
+        return (
+            f'{self.election_event_id} - invited {self.invited}, '
+            f'registered {self.registered}, voted {self.voted}'
+        )
+
+
+class InvitationUpload(BaseUUIDModel):
+    """
+    Resumable, chunked upload of a voter roll CSV file.
+
+    Chunks are appended to a spool file on disk and the accepted offset is
+    tracked here, so an interrupted upload resumes where it stopped instead
+    of starting over. A completed upload is queued for the
+    run_invitation_uploads worker, which imports it into invitations.
+    """
+    STATUS_CHOICES = [
+        ('uploading', 'Uploading'),
+        ('complete', 'Complete'),
+        ('processing', 'Processing'),
+        ('processed', 'Processed'),
+        ('failed', 'Failed'),
+    ]
+
+    election_event = models.ForeignKey(
+        ElectionEvent,
+        on_delete=models.CASCADE,
+        related_name='invitation_uploads'
+    )
+    uploaded_by = models.ForeignKey(
+        User,
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name='invitation_uploads'
+    )
+    filename = models.CharField(max_length=255)
+    total_size = models.PositiveBigIntegerField()
+    offset = models.PositiveBigIntegerField(default=0)
+    checksum = models.CharField(max_length=64, blank=True)  # SHA-256 of the whole file
+    status = models.CharField(
+        max_length=20,
+        choices=STATUS_CHOICES,
+        default='uploading'
+    )
+    results = models.JSONField(null=True, blank=True)
+
+    @property
+    def spool_path(self):
+        """
+        Path of the spool file the received chunks are appended to.
+        """
+        return Path(settings.INVITATION_UPLOAD_ROOT) / f"{self.id}.csv"
+
+    def __str__(self):
+        """
+        Return string representation with file name and upload progress.
+        """
+        return f'{self.filename} - {self.offset}/{self.total_size} bytes ({self.status})'
@@ -4,10 +4,12 @@ Django REST Framework serializers for invitation management.
 This module contains serializers for handling invitation creation, listing,
 and CSV upload functionality with comprehensive validation.
 """
+from django.conf import settings
+
 from rest_framework import serializers
 
 from election_events.models import ElectionEvent
-from invitations.models import Invitation
+from invitations.models import Invitation, InvitationFunnel, InvitationUpload
 
 
 class InvitationCreateSerializer(serializers.ModelSerializer):
@@ -121,3 +123,116 @@ class CSVUploadSerializer(serializers.Serializer):
         if not file.name.endswith('.csv'):
             raise serializers.ValidationError('Only CSV files are allowed.')
         return file
+
+
+class InvitationUploadCreateSerializer(serializers.ModelSerializer):
+    """
+    Serializer for starting a resumable, chunked voter roll upload.
+    
+    The client declares the file name and total size up front, and may
+    provide a SHA-256 checksum of the whole file to be verified on completion.
+    
+    Attributes:
+        election_event: PrimaryKeyRelatedField for selecting election events
+    """
+    election_event = serializers.PrimaryKeyRelatedField(
+        queryset=ElectionEvent.objects.all(),
+        help_text="ID of the election event for these invitations"
+    )
+
+    class Meta:
+        model = InvitationUpload
+        fields = ['id', 'election_event', 'filename', 'total_size', 'checksum']
+        read_only_fields = ['id']
+
+    def validate_filename(self, value):
+        """
+        Validate that the uploaded file is a CSV format.
+        """
+        if not value.endswith('.csv'):
+            raise serializers.ValidationError('Only CSV files are allowed.')
+        return value
+
+    def validate_total_size(self, value):
+        """
+        Validate that the declared size is within the configured limit.
+        """
+        if value <= 0:
+            raise serializers.ValidationError('File is empty.')
+        if value > settings.INVITATION_UPLOAD_MAX_SIZE:
+            raise serializers.ValidationError(
+                f'File size must not exceed {settings.INVITATION_UPLOAD_MAX_SIZE} bytes.'
+            )
+        return value
+
+
+class InvitationUploadSerializer(serializers.ModelSerializer):
+    """
+    Serializer reporting the progress of a chunked voter roll upload.
+    
+    Fields:
+        offset: Number of bytes received so far; the next chunk starts here
+        chunk_size: Maximum chunk size accepted by the server
+        results: Import summary once the upload has been processed
+    """
+    chunk_size = serializers.SerializerMethodField(
+        help_text="Maximum chunk size in bytes accepted by the server"
+    )
+
+    class Meta:
+        model = InvitationUpload
+        fields = [
+            'id',
+            'election_event',
+            'filename',
+            'total_size',
+            'offset',
+            'chunk_size',
+            'status',
+            'results',
+            'created_at'
+        ]
+        read_only_fields = fields
+
+    def get_chunk_size(self, obj):
+        """
+        Return the configured maximum chunk size.
+        """
+        return settings.INVITATION_UPLOAD_CHUNK_SIZE
+
+
+class InvitationFunnelSerializer(serializers.ModelSerializer):
+    """
+    Serializer for an election event's invitation funnel summary.
+    
+    Fields:
+        invited: Invitations created for the event
+        email_delivered: Invitation emails handed to the mail server
+        email_failed: Invitation emails that could not be sent
+        registered: Invitations used to register
+        voted: Registered voters who have cast at least one vote
+        pending: Invitations not yet used
+    """
+    pending = serializers.SerializerMethodField(
+        help_text="Invitations not yet used to register"
+    )
+
+    class Meta:
+        model = InvitationFunnel
+        fields = [
+            'election_event',
+            'invited',
+            'email_delivered',
+            'email_failed',
+            'registered',
+            'voted',
+            'pending',
+            'updated_at'
+        ]
+        read_only_fields = fields
+
+    def get_pending(self, obj):
+        """
+        Return the number of invitations not yet used.
+        """
+        return max(obj.invited - obj.registered, 0)
@@ -1,11 +1,17 @@
 import csv
+import hashlib
 import io
-from django.core.mail import send_mail
-from django.template.loader import render_to_string
+import shutil
+import uuid
+from datetime import timedelta
+from itertools import islice
+
 from django.conf import settings
-from django.contrib.sites.shortcuts import get_current_site
 from django.db import transaction
-from .models import Invitation
+from django.db.models import Q
+from django.utils import timezone
+from .models import Invitation, InvitationUpload
+from .utils import send_invite_email
 from elections.models import ElectionEvent
 import logging
 
@@ -14,96 +20,144 @@ logger = logging.getLogger(__name__)
 class CSVInvitationService:
     """
     Service class for handling CSV upload and invitation processing.
+
+    Rows are imported one chunk per transaction, and a chunk's invitation
+    emails are only sent once it has committed: no transaction stays open
+    while mail is sent, and a later failure cannot roll back invitations
+    whose emails already went out. Only the first IMPORT_MAX_REPORTED_ERRORS
+    row errors are kept; the rest are counted in ``errors_omitted``.
+
+    Attributes:
+        invited_by: User recorded as the inviter, if any
+        chunk_size (int): Number of rows imported per transaction
     """
     
-    def __init__(self, request):
-        self.request = request
-        self.domain = get_current_site(request).domain
+    def __init__(self, invited_by=None, chunk_size=1000):
+        self.invited_by = invited_by
+        self.chunk_size = chunk_size
     
     def process_csv_upload(self, csv_file, election_event):
         """
         Process CSV file and create invitations.
         
+        The file is read row by row, so memory use does not grow with the
+        size of the voter roll.
+        
         Args:
-            csv_file: Uploaded CSV file
+            csv_file: Uploaded CSV file or binary file object
             election_event: ElectionEvent instance
             
         Returns:
             dict: Processing results
         """
+        results = {
+            'total_rows': 0,
+            'successful_invitations': 0,
+            'failed_invitations': 0,
+            'duplicate_emails': 0,
+            'errors': [],
+            'errors_omitted': 0
+        }
+
         try:
-            # Read CSV content
+            # Stream CSV content
             csv_file.seek(0)
-            content = csv_file.read().decode('utf-8')
-            csv_reader = csv.DictReader(io.StringIO(content))
-            
-            results = {
-                'total_rows': 0,
-                'successful_invitations': 0,
-                'failed_invitations': 0,
-                'duplicate_emails': 0,
-                'errors': []
-            }
-            
-            with transaction.atomic():
-                for row_num, row in enumerate(csv_reader, start=2):  # Start from 2 (header is row 1)
-                    results['total_rows'] += 1
-                    
-                    try:
-                        # Extract and clean data
-                        first_name = row['first_name'].strip()
-                        last_name = row['last_name'].strip()
-                        email = row['email'].strip().lower()
-                        
-                        # Validate required fields
-                        if not all([first_name, last_name, email]):
-                            results['failed_invitations'] += 1
-                            results['errors'].append(
-                                f"Row {row_num}: Missing required fields"
-                            )
-                            continue
-                        
-                        # Check for duplicate email in this election event
-                        if Invitation.objects.filter(
-                            email=email, 
-                            election_event=election_event
-                        ).exists():
-                            results['duplicate_emails'] += 1
-                            results['errors'].append(
-                                f"Row {row_num}: Email {email} already invited"
-                            )
-                            continue
-                        
-                        # Create invitation
-                        invitation = Invitation.objects.create(
-                            email=email,
-                            first_name=first_name,
-                            last_name=last_name,
-                            election_event=election_event,
-                            invited_by=self.request.user
-                        )
-                        
-                        # Send invitation email
-                        if self.send_invitation_email(invitation):
-                            results['successful_invitations'] += 1
-                        else:
-                            results['failed_invitations'] += 1
-                            results['errors'].append(
-                                f"Row {row_num}: Failed to send email to {email}"
-                            )
-                    
-                    except Exception as e:
+            text_stream = io.TextIOWrapper(
+                getattr(csv_file, 'file', csv_file),
+                encoding='utf-8',
+                newline=''
+            )
+            rows = enumerate(csv.DictReader(text_stream), start=2)  # Start from 2 (header is row 1)
+
+            while True:
+                chunk = list(islice(rows, self.chunk_size))
+                if not chunk:
+                    break
+
+                with transaction.atomic():
+                    invitations = []
+                    for row_num, row in chunk:
+                        invitation = self.import_row(row_num, row, election_event, results)
+                        if invitation is not None:
+                            invitations.append((row_num, invitation))
+
+                # Send invitation emails once the chunk is committed
+                for row_num, invitation in invitations:
+                    if self.send_invitation_email(invitation):
+                        results['successful_invitations'] += 1
+                    else:
                         results['failed_invitations'] += 1
-                        results['errors'].append(
-                            f"Row {row_num}: {str(e)}"
-                        )
-                        logger.error(f"Error processing row {row_num}: {str(e)}")
-            
+                        self.add_error(results, f"Row {row_num}: Failed to send email to {invitation.email}")
+
+            text_stream.detach()
             return results
-            
+
         except Exception as e:
             logger.error(f"Error processing CSV upload: {str(e)}")
             raise
+
+    def import_row(self, row_num, row, election_event, results):
+        """
+        Create the invitation for one CSV row, reporting rows that are
+        incomplete, already invited or fail to save.
+
+        Args:
+            row_num (int): Line number of the row in the file
+            row (dict): The CSV row
+            election_event: ElectionEvent instance
+            results (dict): Results to update
+
+        Returns:
+            Invitation or None: The new invitation, None if the row was skipped
+        """
+        try:
+            # Extract and clean data
+            first_name = row['first_name'].strip()
+            last_name = row['last_name'].strip()
+            email = row['email'].strip().lower()
+
+            # Validate required fields
+            if not all([first_name, last_name, email]):
+                results['failed_invitations'] += 1
+                self.add_error(results, f"Row {row_num}: Missing required fields")
+                return None
+
+            # Check for duplicate email in this election event
+            if Invitation.objects.filter(
+                email=email,
+                election_event=election_event
+            ).exists():
+                results['duplicate_emails'] += 1
+                self.add_error(results, f"Row {row_num}: Email {email} already invited")
+                return None
+
+            # Create invitation (savepoint keeps one bad row from aborting
+            # the whole chunk)
+            with transaction.atomic():
+                return Invitation.objects.create(
+                    email=email,
+                    first_name=first_name,
+                    last_name=last_name,
+                    election_event=election_event,
+                    invited_by=self.invited_by
+                )
+
+        except Exception as e:
+            results['failed_invitations'] += 1
+            self.add_error(results, f"Row {row_num}: {str(e)}")
+            logger.error(f"Error processing row {row_num}: {str(e)}")
+            return None
+
+    @staticmethod
+    def add_error(results, message):
+        """
+        Report a row error, or only count it once IMPORT_MAX_REPORTED_ERRORS
+        errors have been kept.
+        """
+        if len(results['errors']) < settings.IMPORT_MAX_REPORTED_ERRORS:
+            results['errors'].append(message)
+        else:
+            results['errors_omitted'] += 1
     
     def send_invitation_email(self, invitation):
         """
@@ -116,35 +170,225 @@ class CSVInvitationService:
             bool: True if email sent successfully
         """
         try:
-            # Generate registration link
-            registration_link = f"http://{self.domain}/auth/register/voter/html/?token={invitation.token}"
-            
-            # Email context
-            context = {
-                'first_name': invitation.first_name,
-                'last_name': invitation.last_name,
-                'election_event': invitation.election_event,
-                'registration_link': registration_link,
-                'domain': self.domain,
-            }
-            
-            # Render email content
-            subject = f"Invitation to Vote - {invitation.election_event.title}"
-            html_message = render_to_string('emails/voter_invitation.html', context)
-            plain_message = render_to_string('emails/voter_invitation.txt', context)
-            
-            # Send email
-            send_mail(
-                subject=subject,
-                message=plain_message,
-                from_email=settings.DEFAULT_FROM_EMAIL,
-                recipient_list=[invitation.email],
-                html_message=html_message,
-                fail_silently=False,
-            )
-            
+            send_invite_email(invitation, use_api=False)
             return True
             
         except Exception as e:
             logger.error(f"Failed to send invitation email to {invitation.email}: {str(e)}")
             return False
+
+
+class UploadError(Exception):
+    """
+    Raised when a chunk or completion request cannot be accepted.
+    """
+
+
+class UploadOffsetMismatch(UploadError):
+    """
+    Raised when a chunk does not start at the current upload offset.
+    """
+    def __init__(self, expected_offset):
+        super().__init__(f"Chunk must start at offset {expected_offset}.")
+        self.expected_offset = expected_offset
+
+
+class InvitationUploadService:
+    """
+    Service class for resumable, chunked voter roll uploads.
+
+    Chunks are streamed from the request in small blocks into a temporary
+    file, so peak memory per request stays bounded by the block size no
+    matter how large the chunk or the whole file is. The upload row is only
+    locked once the chunk has been received, to append it to the spool file.
+    Completed uploads are verified and imported by the run_invitation_uploads
+    worker, not in the request.
+    """
+    block_size = 64 * 1024
+
+    def __init__(self, upload):
+        self.upload = upload
+
+    @staticmethod
+    def check_chunk(upload, offset, length):
+        """
+        Check that a chunk can be appended to the upload.
+
+        Raises:
+            UploadOffsetMismatch: If offset is not the current upload offset
+            UploadError: If the upload is closed or the chunk oversized
+        """
+        if upload.status != 'uploading':
+            raise UploadError("Upload is no longer accepting chunks.")
+        if offset != upload.offset:
+            raise UploadOffsetMismatch(upload.offset)
+        if offset + length > upload.total_size:
+            raise UploadError("Chunk exceeds the declared upload size.")
+
+    def append_chunk(self, stream, offset, length, checksum):
+        """
+        Append one chunk to the spool file and advance the upload offset.
+
+        The chunk is first copied from the client into a temporary file and
+        verified there, outside any transaction. The upload row is then
+        locked just long enough to recheck the offset, append the chunk to
+        the spool file and advance the offset, so concurrent chunks for the
+        same upload are applied one at a time and a slow client never holds
+        the lock.
+
+        Args:
+            stream: Readable stream positioned at the start of the chunk
+            offset (int): Byte offset the client claims the chunk starts at
+            length (int): Declared chunk length in bytes
+            checksum (str): Hex SHA-256 digest of the chunk
+
+        Returns:
+            InvitationUpload: The upload with its new offset
+
+        Raises:
+            UploadOffsetMismatch: If offset is not the current upload offset
+            UploadError: If the chunk is oversized, truncated or corrupt
+        """
+        # Refuse a chunk that cannot apply before reading its body
+        self.check_chunk(InvitationUpload.objects.get(pk=self.upload.pk), offset, length)
+
+        path = self.upload.spool_path
+        path.parent.mkdir(parents=True, exist_ok=True)
+        part = path.with_name(f"{path.stem}.{uuid.uuid4().hex}.part")
+        digest = hashlib.sha256()
+        received = 0
+
+        try:
+            with open(part, 'wb') as chunk:
+                while received < length:
+                    block = stream.read(min(self.block_size, length - received))
+                    if not block:
+                        break
+                    digest.update(block)
+                    chunk.write(block)
+                    received += len(block)
+
+            if received != length:
+                raise UploadError(
+                    f"Chunk truncated: expected {length} bytes, received {received}."
+                )
+            if digest.hexdigest() != checksum.lower():
+                raise UploadError("Chunk checksum mismatch.")
+
+            with transaction.atomic():
+                upload = InvitationUpload.objects.select_for_update().get(pk=self.upload.pk)
+                self.check_chunk(upload, offset, length)
+
+                with open(path, 'r+b' if path.exists() else 'w+b') as spool, open(part, 'rb') as chunk:
+                    # Drop bytes left behind by an interrupted earlier attempt
+                    spool.truncate(offset)
+                    spool.seek(offset)
+                    shutil.copyfileobj(chunk, spool, self.block_size)
+
+                upload.offset = offset + length
+                upload.save(update_fields=['offset', 'updated_at'])
+        finally:
+            part.unlink(missing_ok=True)
+
+        self.upload = upload
+        return upload
+
+    def complete(self):
+        """
+        Mark a fully received upload complete and queue it for import.
+
+        The upload row is locked and moved from uploading to complete in one
+        transaction, so of two concurrent calls only the first queues the
+        roll and the second is refused. The checksum is verified and the
+        invitations created by the run_invitation_uploads worker.
+
+        Returns:
+            InvitationUpload: The upload, now complete
+
+        Raises:
+            UploadError: If the upload is incomplete or already completed
+        """
+        with transaction.atomic():
+            upload = InvitationUpload.objects.select_for_update().get(pk=self.upload.pk)
+            if upload.status != 'uploading':
+                raise UploadError("Upload has already been completed.")
+            if upload.offset != upload.total_size:
+                raise UploadError(
+                    f"Upload incomplete: received {upload.offset} of {upload.total_size} bytes."
+                )
+            upload.status = 'complete'
+            upload.save(update_fields=['status', 'updated_at'])
+
+        self.upload = upload
+        return upload
+
+    def process(self):
+        """
+        Verify a claimed upload and import its invitations.
+
+        The upload ends up processed, with the import summary as its
+        results, or failed, with the error. Either way the spool file is
+        removed.
+
+        Returns:
+            dict or None: The import results, None if the upload failed
+        """
+        upload = self.upload
+        path = upload.spool_path
+
+        try:
+            if upload.checksum:
+                digest = hashlib.sha256()
+                with open(path, 'rb') as spool:
+                    for block in iter(lambda: spool.read(self.block_size), b''):
+                        digest.update(block)
+                if digest.hexdigest() != upload.checksum.lower():
+                    raise UploadError("File checksum mismatch.")
+
+            with open(path, 'rb') as spool:
+                results = CSVInvitationService(upload.uploaded_by).process_csv_upload(
+                    spool, upload.election_event
+                )
+        except Exception as e:
+            logger.exception(f"Invitation upload {upload.pk} failed")
+            upload.status = 'failed'
+            upload.results = {'error': str(e)}
+            upload.save(update_fields=['status', 'results', 'updated_at'])
+            return None
+        finally:
+            path.unlink(missing_ok=True)
+
+        upload.status = 'processed'
+        upload.results = results
+        upload.save(update_fields=['status', 'results', 'updated_at'])
+        return results
+
+
+def claim_invitation_upload():
+    """
+    Claim the oldest completed upload for this worker.
+
+    Uploads still marked processing after INVITATION_UPLOAD_STALE_SECONDS
+    are claimed again; rows already imported are skipped as duplicates, so
+    the import simply resumes.
+
+    Returns:
+        InvitationUpload or None: The claimed upload, now processing
+    """
+    stale_before = timezone.now() - timedelta(seconds=settings.INVITATION_UPLOAD_STALE_SECONDS)
+    with transaction.atomic():
+        upload = (
+            InvitationUpload.objects
+            .select_for_update(skip_locked=True)
+            .filter(
+                Q(status='complete') |
+                Q(status='processing', updated_at__lt=stale_before)
+            )
+            .order_by('updated_at')
+            .first()
+        )
+        if upload is None:
+            return None
+        upload.status = 'processing'
+        upload.save(update_fields=['status', 'updated_at'])
+    return upload
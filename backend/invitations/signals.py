@@ -0,0 +1,19 @@
+"""
+invitations/signals.py
+
+This module keeps the per-event invitation funnel in step with invitations
+as they are created.
+"""
+from django.db.models.signals import post_save
+from django.dispatch import receiver
+
+from invitations.models import Invitation, InvitationFunnel
+
+
+@receiver(post_save, sender=Invitation)
+def count_new_invitation(sender, instance, created, **kwargs):
+    """
+    Count a newly created invitation in its event's funnel.
+    """
+    if created:
+        InvitationFunnel.bump(instance.election_event_id, invited=1)
@@ -1,3 +1,287 @@
-from django.test import TestCase
+"""
+invitations/tests.py
 
-# Create your tests here.
+This module tests the invitations app: signing, reading and resolving the
+tokens carried by invitation links, and uploading and importing voter
+rolls.
+"""
+import hashlib
+import io
+import tempfile
+import uuid
+from datetime import timedelta
+from pathlib import Path
+from unittest import mock
+
+from django.core import mail, signing
+from django.core.management import call_command
+from django.db import transaction
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+
+from election_events.models import ElectionEvent
+from invitations.models import Invitation, InvitationUpload
+from invitations.services import CSVInvitationService
+from invitations.tokens import (
+    TOKEN_SALT,
+    InvalidInvitationToken,
+    get_invitation,
+    lock_invitation,
+    make_invitation_token,
+    read_invitation_token
+)
+from users.models import User
+
+
+class InvitationTokenTests(TestCase):
+    """
+    Invitation tokens are verified in-process and resolve to the unused
+    invitation they were made for.
+    """
+    @classmethod
+    def setUpTestData(cls):
+        start = timezone.now()
+        cls.event = ElectionEvent.objects.create(
+            title='Event', start_time=start, end_time=start + timedelta(days=1)
+        )
+        cls.invitation = Invitation.objects.create(email='invited@example.com', election_event=cls.event)
+
+    def test_round_trip(self):
+        data = read_invitation_token(make_invitation_token(self.invitation))
+
+        self.assertEqual(data.invitation_id, str(self.invitation.id))
+        self.assertEqual(data.election_event_id, str(self.event.id))
+        self.assertEqual(data.nonce, str(self.invitation.token))
+        self.assertEqual(get_invitation(data), self.invitation)
+
+    def test_token_carries_no_email(self):
+        payload = signing.loads(make_invitation_token(self.invitation), salt=TOKEN_SALT)
+
+        self.assertNotIn(self.invitation.email, str(payload))
+
+    def test_tampered_token_is_refused(self):
+        token = make_invitation_token(self.invitation)
+        tampered = token[:-1] + ('A' if token[-1] != 'A' else 'B')
+
+        for bad in (tampered, 'not-a-token', ''):
+            with self.subTest(bad), self.assertRaises(InvalidInvitationToken):
+                read_invitation_token(bad)
+
+    @override_settings(INVITATION_TOKEN_MAX_AGE=-1)
+    def test_expired_token_is_refused(self):
+        with self.assertRaisesMessage(InvalidInvitationToken, 'Expired token'):
+            read_invitation_token(make_invitation_token(self.invitation))
+
+    def test_version_one_token_is_accepted(self):
+        token = signing.dumps({
+            'v': 1, 'i': str(self.invitation.id), 'e': str(self.event.id),
+            'n': str(self.invitation.token), 'm': self.invitation.email,
+        }, salt=TOKEN_SALT, compress=True)
+
+        self.assertEqual(get_invitation(read_invitation_token(token)), self.invitation)
+
+    def test_unknown_version_is_refused(self):
+        token = signing.dumps({'v': 99, 'i': '', 'e': '', 'n': ''}, salt=TOKEN_SALT)
+
+        with self.assertRaisesMessage(InvalidInvitationToken, 'Unsupported token version'):
+            read_invitation_token(token)
+
+    @override_settings(INVITATION_ACCEPT_LEGACY_TOKENS=True)
+    def test_legacy_token_is_looked_up_by_nonce(self):
+        data = read_invitation_token(str(self.invitation.token))
+
+        self.assertIsNone(data.invitation_id)
+        self.assertEqual(get_invitation(data), self.invitation)
+
+    @override_settings(INVITATION_ACCEPT_LEGACY_TOKENS=False)
+    def test_legacy_token_is_refused_when_disabled(self):
+        with self.assertRaises(InvalidInvitationToken):
+            read_invitation_token(str(self.invitation.token))
+
+    def test_used_invitation_is_not_returned(self):
+        data = read_invitation_token(make_invitation_token(self.invitation))
+        Invitation.objects.filter(pk=self.invitation.pk).update(is_used=True)
+
+        self.assertIsNone(get_invitation(data))
+        with transaction.atomic():
+            self.assertIsNone(lock_invitation(data))
+
+    def test_token_for_another_event_is_not_returned(self):
+        data = read_invitation_token(make_invitation_token(self.invitation))
+
+        self.assertIsNone(get_invitation(data._replace(election_event_id=str(uuid.uuid4()))))
+        with transaction.atomic():
+            self.assertEqual(lock_invitation(data), self.invitation)
+
+    def test_legacy_token_is_refused_by_default(self):
+        with self.assertRaises(InvalidInvitationToken):
+            read_invitation_token(str(self.invitation.token))
+
+    def test_detail_view_checks_the_event(self):
+        token = make_invitation_token(self.invitation)
+        payload = signing.loads(token, salt=TOKEN_SALT)
+        other_event = signing.dumps({**payload, 'e': str(uuid.uuid4())}, salt=TOKEN_SALT, compress=True)
+        self.client.force_login(User.objects.create_user(email='staff@example.com', is_staff=True))
+
+        self.assertEqual(self.client.get(reverse('invitation-by-token', args=[token])).status_code, 200)
+        self.assertEqual(self.client.get(reverse('invitation-by-token', args=[other_event])).status_code, 404)
+
+
+def roll(*rows):
+    """
+    Return a voter roll CSV file with the given (first, last, email) rows.
+    """
+    lines = ['first_name,last_name,email'] + [','.join(row) for row in rows]
+    return io.BytesIO('\n'.join(lines).encode())
+
+
+class CSVInvitationImportTests(TestCase):
+    """
+    Voter rolls are imported chunk by chunk, emailing each chunk's voters
+    once it has committed.
+    """
+    @classmethod
+    def setUpTestData(cls):
+        start = timezone.now()
+        cls.event = ElectionEvent.objects.create(
+            title='Event', start_time=start, end_time=start + timedelta(days=1)
+        )
+
+    def test_import_sends_invitations(self):
+        results = CSVInvitationService(chunk_size=2).process_csv_upload(
+            roll(('Ada', 'Lovelace', 'ADA@example.com'), ('Alan', 'Turing', 'alan@example.com'),
+                 ('Grace', 'Hopper', 'grace@example.com')),
+            self.event
+        )
+
+        self.assertEqual(results['successful_invitations'], 3)
+        self.assertEqual(sorted(message.to[0] for message in mail.outbox),
+                         ['ada@example.com', 'alan@example.com', 'grace@example.com'])
+
+    def test_committed_chunks_survive_a_later_failure(self):
+        # The bad row sits past the reader's first decoded block
+        csv_file = roll(('Ada', 'Lovelace', 'ada@example.com'), ('Alan', 'Turing', 'alan@example.com'))
+        padding = b'\n' * io.DEFAULT_BUFFER_SIZE
+        csv_file = io.BytesIO(csv_file.getvalue() + padding + b'Bad,\xff\xfe,bad@example.com\n')
+
+        with self.assertRaises(UnicodeDecodeError):
+            CSVInvitationService(chunk_size=2).process_csv_upload(csv_file, self.event)
+
+        self.assertEqual(Invitation.objects.filter(election_event=self.event).count(), 2)
+        self.assertEqual(len(mail.outbox), 2)
+
+    def test_failed_email_is_reported_after_commit(self):
+        with mock.patch('invitations.services.send_invite_email', side_effect=OSError('no route')):
+            results = CSVInvitationService().process_csv_upload(
+                roll(('Ada', 'Lovelace', 'ada@example.com')), self.event
+            )
+
+        self.assertEqual(results['failed_invitations'], 1)
+        self.assertTrue(Invitation.objects.filter(email='ada@example.com').exists())
+
+    @override_settings(IMPORT_MAX_REPORTED_ERRORS=2)
+    def test_reported_errors_are_capped(self):
+        results = CSVInvitationService().process_csv_upload(
+            roll(*[('', '', f'voter{n}@example.com') for n in range(5)]), self.event
+        )
+
+        self.assertEqual(results['failed_invitations'], 5)
+        self.assertEqual(results['errors'], ['Row 2: Missing required fields', 'Row 3: Missing required fields'])
+        self.assertEqual(results['errors_omitted'], 3)
+
+
+class InvitationUploadTests(TestCase):
+    """
+    Chunked uploads are appended under a short row lock, and completed
+    uploads are imported by the run_invitation_uploads worker.
+    """
+    @classmethod
+    def setUpTestData(cls):
+        start = timezone.now()
+        cls.event = ElectionEvent.objects.create(
+            title='Event', start_time=start, end_time=start + timedelta(days=1)
+        )
+        cls.staff = User.objects.create_user(email='staff@example.com', is_staff=True)
+
+    def setUp(self):
+        upload_root = tempfile.TemporaryDirectory()
+        self.addCleanup(upload_root.cleanup)
+        self.upload_root = Path(upload_root.name)
+        settings_override = override_settings(INVITATION_UPLOAD_ROOT=self.upload_root)
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+        self.client.force_login(self.staff)
+
+    def create_upload(self, content, checksum=None):
+        return InvitationUpload.objects.create(
+            election_event=self.event, uploaded_by=self.staff, filename='roll.csv',
+            total_size=len(content), checksum=checksum or hashlib.sha256(content).hexdigest()
+        )
+
+    def send_chunk(self, upload, offset, chunk, checksum=None):
+        return self.client.patch(
+            reverse('invitation-upload-chunk', args=[upload.pk]), chunk,
+            content_type='application/offset+octet-stream',
+            headers={
+                'Upload-Offset': str(offset),
+                'Upload-Checksum': checksum or hashlib.sha256(chunk).hexdigest()
+            }
+        )
+
+    def complete(self, upload):
+        return self.client.post(reverse('invitation-upload-complete', args=[upload.pk]))
+
+    def test_upload_is_imported_by_the_worker(self):
+        content = roll(('Ada', 'Lovelace', 'ada@example.com'), ('Alan', 'Turing', 'alan@example.com')).getvalue()
+        upload = self.create_upload(content)
+
+        self.assertEqual(self.send_chunk(upload, 0, content[:20]).status_code, 200)
+        self.assertEqual(self.send_chunk(upload, 20, content[20:]).status_code, 200)
+        response = self.complete(upload)
+
+        self.assertEqual(response.status_code, 202)
+        self.assertEqual(response.json()['status'], 'complete')
+        self.assertFalse(Invitation.objects.exists())
+
+        call_command('run_invitation_uploads', '--once', stdout=io.StringIO())
+
+        upload.refresh_from_db()
+        self.assertEqual(upload.status, 'processed')
+        self.assertEqual(upload.results['successful_invitations'], 2)
+        self.assertEqual(Invitation.objects.filter(election_event=self.event).count(), 2)
+        self.assertEqual(list(self.upload_root.iterdir()), [])
+
+    def test_corrupt_chunk_is_discarded(self):
+        content = roll(('Ada', 'Lovelace', 'ada@example.com')).getvalue()
+        upload = self.create_upload(content)
+
+        response = self.send_chunk(upload, 0, content, checksum='0' * 64)
+
+        self.assertEqual(response.status_code, 400)
+        upload.refresh_from_db()
+        self.assertEqual(upload.offset, 0)
+        self.assertEqual(list(self.upload_root.iterdir()), [])
+
+    def test_chunk_at_the_wrong_offset_is_refused(self):
+        content = roll(('Ada', 'Lovelace', 'ada@example.com')).getvalue()
+        upload = self.create_upload(content)
+
+        response = self.send_chunk(upload, 10, content[10:])
+
+        self.assertEqual(response.status_code, 409)
+        self.assertEqual(response.json()['offset'], 0)
+
+    def test_checksum_mismatch_fails_the_upload_and_removes_the_file(self):
+        content = roll(('Ada', 'Lovelace', 'ada@example.com')).getvalue()
+        upload = self.create_upload(content, checksum='0' * 64)
+        self.send_chunk(upload, 0, content)
+        self.complete(upload)
+
+        call_command('run_invitation_uploads', '--once', stdout=io.StringIO())
+
+        upload.refresh_from_db()
+        self.assertEqual(upload.status, 'failed')
+        self.assertEqual(upload.results, {'error': 'File checksum mismatch.'})
+        self.assertFalse(Invitation.objects.exists())
+        self.assertFalse(upload.spool_path.exists())
@@ -0,0 +1,151 @@
+"""
+invitations/tokens.py
+
+This module defines the signed, versioned tokens carried by invitation links.
+
+A token encodes the invitation ID, its election event and the invitation's
+one-time nonce, signed with SECRET_KEY and timestamped. Forged, tampered or
+expired tokens are therefore rejected in-process, and the database is only
+touched for genuine links. Signed payloads are readable by anyone who sees
+the link, so tokens carry no personal data: the invited email is looked up
+from the invitation.
+"""
+import uuid
+from collections import namedtuple
+
+from django.conf import settings
+from django.core import signing
+
+from invitations.models import Invitation
+
+
+TOKEN_VERSION = 2
+# Version 1 tokens also carried the invited email; links already sent with
+# them stay valid, and the email in them is ignored
+SUPPORTED_TOKEN_VERSIONS = (1, 2)
+TOKEN_SALT = 'invitations.invitation-token'
+
+InvitationTokenData = namedtuple(
+    'InvitationTokenData',
+    ['invitation_id', 'election_event_id', 'nonce']
+)
+
+
+class InvalidInvitationToken(Exception):
+    """
+    Raised when an invitation token is malformed, forged or expired.
+    """
+
+
+def make_invitation_token(invitation):
+    """
+    Create the signed token placed in an invitation's registration link.
+
+    Args:
+        invitation: Invitation instance
+
+    Returns:
+        str: URL-safe signed token
+    """
+    payload = {
+        'v': TOKEN_VERSION,
+        'i': str(invitation.id),
+        'e': str(invitation.election_event_id),
+        'n': str(invitation.token),
+    }
+    return signing.dumps(payload, salt=TOKEN_SALT, compress=True)
+
+
+def read_invitation_token(token):
+    """
+    Verify an invitation token and return its contents without a DB lookup.
+
+    Plain UUID tokens from links sent before signed tokens were introduced
+    are accepted only while the temporary INVITATION_ACCEPT_LEGACY_TOKENS
+    switch is enabled (it is off by default); they carry only the nonce and
+    no signature, so the invitation must still be looked up to use them.
+
+    Args:
+        token (str): Token taken from the registration link
+
+    Returns:
+        InvitationTokenData: Decoded token contents
+
+    Raises:
+        InvalidInvitationToken: If the token is malformed, forged or expired
+    """
+    if not token:
+        raise InvalidInvitationToken("Missing token")
+
+    if settings.INVITATION_ACCEPT_LEGACY_TOKENS:
+        try:
+            nonce = uuid.UUID(str(token))
+        except ValueError:
+            pass
+        else:
+            return InvitationTokenData(None, None, str(nonce))
+
+    try:
+        payload = signing.loads(
+            token,
+            salt=TOKEN_SALT,
+            max_age=settings.INVITATION_TOKEN_MAX_AGE
+        )
+    except signing.SignatureExpired:
+        raise InvalidInvitationToken("Expired token")
+    except signing.BadSignature:
+        raise InvalidInvitationToken("Invalid token")
+
+    if not isinstance(payload, dict) or payload.get('v') not in SUPPORTED_TOKEN_VERSIONS:
+        raise InvalidInvitationToken("Unsupported token version")
+
+    return InvitationTokenData(payload['i'], payload['e'], payload['n'])
+
+
+def _invitation_filters(token_data):
+    """
+    Return the lookup matching the unused invitation a token refers to.
+    """
+    filters = {'token': token_data.nonce, 'is_used': False}
+    if token_data.invitation_id is not None:
+        filters['pk'] = token_data.invitation_id
+        filters['election_event_id'] = token_data.election_event_id
+    return filters
+
+
+def get_invitation(token_data):
+    """
+    Return the unused invitation a verified token refers to, without locking.
+
+    Args:
+        token_data (InvitationTokenData): Verified token contents
+
+    Returns:
+        Invitation or None: The invitation, or None if it no longer exists
+        or has already been used
+    """
+    return Invitation.objects.filter(**_invitation_filters(token_data)).first()
+
+
+def lock_invitation(token_data):
+    """
+    Lock and return the unused invitation a verified token refers to.
+
+    Must be called inside ``transaction.atomic()``. The row stays locked
+    until the transaction ends, so two concurrent registrations with the
+    same link cannot both claim it.
+
+    Args:
+        token_data (InvitationTokenData): Verified token contents
+
+    Returns:
+        Invitation or None: The locked invitation, or None if it no longer
+        exists or has already been used
+    """
+    return (
+        Invitation.objects
+        .select_for_update(of=('self',))
+        .select_related('election_event')
+        .filter(**_invitation_filters(token_data))
+        .first()
+    )
@@ -10,9 +10,13 @@ from invitations.views import (
     InvitationListCreateView,
     InvitationDetailView,
     InvitationsByEventView,
+    InvitationFunnelView,
     InvitationMarkUsedView,
     InvitationByTokenView,
-    BulkInviteUploadAPIView
+    BulkInviteUploadAPIView,
+    InvitationUploadCreateAPIView,
+    InvitationUploadChunkView,
+    InvitationUploadCompleteView
 )
 
 urlpatterns =[
@@ -21,7 +25,11 @@ urlpatterns =[
     path('list/', InvitationListCreateView.as_view(), name='invitation-list'),
     path('<uuid:pk>/', InvitationDetailView.as_view(), name='invitation-detail'),
     path('event/<uuid:event_id>/', InvitationsByEventView.as_view(), name='invitation-by-event'),
+    path('event/<uuid:event_id>/summary/', InvitationFunnelView.as_view(), name='invitation-funnel'),
     path('<uuid:pk>/mark-used/', InvitationMarkUsedView.as_view(), name='invitation-mark-used'),
-    path('detail-by-token/<uuid:token>/', InvitationByTokenView.as_view(), name='invitation-by-token'),
+    path('detail-by-token/<str:token>/', InvitationByTokenView.as_view(), name='invitation-by-token'),
     path('bulk-upload/', BulkInviteUploadAPIView.as_view(), name='invitation-bulk-upload'),
+    path('uploads/', InvitationUploadCreateAPIView.as_view(), name='invitation-upload-create'),
+    path('uploads/<uuid:pk>/', InvitationUploadChunkView.as_view(), name='invitation-upload-chunk'),
+    path('uploads/<uuid:pk>/complete/', InvitationUploadCompleteView.as_view(), name='invitation-upload-complete'),
 ]
\ No newline at end of file
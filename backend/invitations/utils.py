@@ -8,16 +8,20 @@ from django.core.mail import send_mail
 from django.conf import settings
 from django.template.loader import render_to_string
 
+from invitations.models import InvitationFunnel
+from invitations.tokens import make_invitation_token
+
 def send_invite_email(invitation, use_api=True):
         """
         Sends an email to the invited voter with one-time use registration
         link containing the token using a text template.
         """
         base_url = getattr(settings, "FRONTEND_URL", "http://localhost:8000")
+        token = make_invitation_token(invitation)
         if use_api:
-            registration_url = f"{base_url}/api/register/?token={invitation.token}"
+            registration_url = f"{base_url}/api/register/?token={token}"
         else:
-            registration_url = f"{base_url}/auth/register/voter/?token={invitation.token}"
+            registration_url = f"{base_url}/auth/register/voter/?token={token}"
 
         context = {
             'election_title': invitation.election_event.title,
@@ -26,10 +30,15 @@ def send_invite_email(invitation, use_api=True):
         subject = f"You are invited to register for {invitation.election_event.title}"
         message = render_to_string('emails/invitation_email.txt', context)
 
-        send_mail(
-            subject,
-            message,
-            settings.DEFAULT_FROM_EMAIL,
-            [invitation.email],
-            fail_silently=False,
-        )
\ No newline at end of file
+        try:
+            send_mail(
+                subject,
+                message,
+                settings.DEFAULT_FROM_EMAIL,
+                [invitation.email],
+                fail_silently=False,
+            )
+        except Exception:
+            InvitationFunnel.bump(invitation.election_event_id, email_failed=1)
+            raise
+        InvitationFunnel.bump(invitation.election_event_id, email_delivered=1)
\ No newline at end of file
@@ -7,8 +7,10 @@ via both API and HTML interfaces, including bulk invitation functionality.
 import csv
 from io import TextIOWrapper
 
+from django.conf import settings
 from django.contrib import messages
 from django.contrib.admin.views.decorators import staff_member_required
+from django.http import Http404
 from django.shortcuts import render, redirect, get_object_or_404
 from django.utils.decorators import method_decorator
 from django.views import View
@@ -17,14 +19,24 @@ from rest_framework import generics, permissions, status
 from rest_framework.response import Response
 from rest_framework.views import APIView
 
+from core.pagination import PageNumberOrKeysetPagination
 from election_events.models import ElectionEvent
 from invitations.forms import InvitationForm
-from invitations.models import Invitation
+from invitations.models import Invitation, InvitationFunnel, InvitationUpload
 from invitations.serializers import (
     InvitationCreateSerializer,
     InvitationListSerializer,
-    CSVUploadSerializer
+    CSVUploadSerializer,
+    InvitationFunnelSerializer,
+    InvitationUploadCreateSerializer,
+    InvitationUploadSerializer
 )
+from invitations.services import (
+    InvitationUploadService,
+    UploadError,
+    UploadOffsetMismatch
+)
+from invitations.tokens import InvalidInvitationToken, _invitation_filters, read_invitation_token
 from invitations.utils import send_invite_email
 from users.permissions import IsElectionAdmin
 
@@ -73,12 +85,16 @@ class InvitationListCreateView(generics.ListCreateAPIView):
         - IsAdminUser: Only admin users can access this endpoint
         
     Methods:
-        GET: Retrieve list of all invitations
+        GET: Retrieve list of all invitations (``?pagination=cursor`` for keyset
+            paging, ``?search=`` by email; terms under three characters match
+            a prefix)
         POST: Create a new invitation
     """
     queryset = Invitation.objects.all()
     serializer_class = InvitationListSerializer
     permission_classes = [permissions.IsAdminUser]
+    pagination_class = PageNumberOrKeysetPagination
+    search_fields = ['email']
 
 
 class InvitationDetailView(generics.RetrieveAPIView):
@@ -111,8 +127,12 @@ class InvitationsByEventView(generics.ListAPIView):
         
     Methods:
         GET: Retrieve invitations for specified election event
+            (``?pagination=cursor`` for keyset paging, ``?search=`` by email;
+            terms under three characters match a prefix)
     """
     serializer_class = InvitationListSerializer
+    pagination_class = PageNumberOrKeysetPagination
+    search_fields = ['email']
 
     def get_queryset(self):
         """
@@ -125,6 +145,41 @@ class InvitationsByEventView(generics.ListAPIView):
         return Invitation.objects.filter(election_event_id=event_id)
 
 
+class InvitationFunnelView(generics.RetrieveAPIView):
+    """
+    API view for an election event's invitation funnel summary.
+    
+    Serves the event's precomputed funnel counters (invited, email delivered,
+    email failed, registered, voted) from a single row, instead of listing
+    and counting the event's invitations on every refresh.
+    
+    URL Parameters:
+        event_id: UUID of the election event
+    
+    Permissions:
+        - IsAdminUser: Only admin users can view the funnel
+        
+    Methods:
+        GET: Retrieve the funnel counters for the election event
+    """
+    serializer_class = InvitationFunnelSerializer
+    permission_classes = [permissions.IsAdminUser]
+
+    def get_object(self):
+        """
+        Return the event's funnel, or an all-zero funnel if none exists yet.
+        
+        Raises:
+            Http404: If the election event does not exist
+        """
+        event_id = self.kwargs['event_id']
+        funnel = InvitationFunnel.objects.filter(election_event_id=event_id).first()
+        if funnel is None:
+            event = get_object_or_404(ElectionEvent, pk=event_id)
+            funnel = InvitationFunnel(election_event=event)
+        return funnel
+
+
 class InvitationMarkUsedView(APIView):
     """
     API view for marking invitations as used.
@@ -151,14 +206,12 @@ class InvitationMarkUsedView(APIView):
             Response: Success message or error if invitation already used
         """
         invitation = get_object_or_404(Invitation, pk=pk)
-        if invitation.is_used:
+        if not invitation.mark_used():
             return Response(
                 {'detail': 'Invitation already marked as used.'}, 
                 status=status.HTTP_400_BAD_REQUEST
             )
         
-        invitation.is_used = True
-        invitation.save()
         return Response(
             {'detail': 'Invitation marked as used.'}, 
             status=status.HTTP_200_OK
@@ -171,17 +224,37 @@ class InvitationByTokenView(generics.RetrieveAPIView):
     
     Allows retrieval of invitation information using the invitation token,
     typically used during the registration process to verify invitation validity.
+    Forged or expired tokens are rejected before any database lookup.
     
     URL Parameters:
-        token: UUID token of the invitation
+        token: Signed invitation token
         
     Methods:
         GET: Retrieve invitation details by token
     """
     serializer_class = InvitationListSerializer
-    lookup_field = 'token'
     queryset = Invitation.objects.all()
 
+    def get_object(self):
+        """
+        Verify the token signature, then fetch the invitation it refers to.
+        
+        Returns:
+            Invitation: The invitation identified by the token
+            
+        Raises:
+            Http404: If the token is invalid, or the invitation does not
+                exist, belongs to another event or has been used
+        """
+        try:
+            token_data = read_invitation_token(self.kwargs['token'])
+        except InvalidInvitationToken:
+            raise Http404("Invalid or expired token.")
+        
+        invitation = get_object_or_404(self.get_queryset(), **_invitation_filters(token_data))
+        self.check_object_permissions(self.request, invitation)
+        return invitation
+
 
 # === Template Views ===
 
@@ -330,3 +403,146 @@ class BulkInviteUploadAPIView(generics.GenericAPIView):
             "skipped_count": len(skipped),
             "election_event": election_event_id
         }, status=status.HTTP_201_CREATED)
+
+
+class InvitationUploadCreateAPIView(generics.CreateAPIView):
+    """
+    API view for starting a resumable, chunked voter roll upload.
+    
+    Very large CSV files are sent as a series of chunks instead of one
+    multipart request, so a dropped connection only costs the current chunk.
+    
+    Permissions:
+        - IsAuthenticated: User must be authenticated
+        - IsElectionAdmin: User must have election admin privileges
+        
+    Methods:
+        POST: Declare file name, size and checksum; returns the upload ID
+    """
+    queryset = InvitationUpload.objects.all()
+    serializer_class = InvitationUploadCreateSerializer
+    permission_classes = [permissions.IsAuthenticated, IsElectionAdmin]
+
+    def perform_create(self, serializer):
+        """
+        Record the admin who started the upload.
+        """
+        serializer.save(uploaded_by=self.request.user)
+
+
+class InvitationUploadChunkView(APIView):
+    """
+    API view for reporting progress of and appending chunks to an upload.
+    
+    Chunks are sent as the raw request body (``application/offset+octet-stream``)
+    with these headers:
+        Upload-Offset: Byte offset the chunk starts at
+        Upload-Checksum: Hex SHA-256 digest of the chunk
+    
+    The body is streamed to disk and never parsed, so request memory stays
+    bounded regardless of chunk size.
+    
+    Permissions:
+        - IsAuthenticated: User must be authenticated
+        - IsElectionAdmin: User must have election admin privileges
+        
+    Methods:
+        GET: Return current offset and status (used to resume)
+        PATCH: Append one chunk at the current offset
+    """
+    permission_classes = [permissions.IsAuthenticated, IsElectionAdmin]
+
+    def get(self, request, pk):
+        """
+        Return the upload's current offset and status.
+        """
+        upload = get_object_or_404(InvitationUpload, pk=pk)
+        return Response(InvitationUploadSerializer(upload).data)
+
+    def patch(self, request, pk):
+        """
+        Append a chunk to the upload.
+        
+        Args:
+            request: HTTP request whose body is the chunk
+            pk: Primary key of the upload
+            
+        Returns:
+            Response: Upload progress, or an error with the expected offset
+        """
+        upload = get_object_or_404(InvitationUpload, pk=pk)
+
+        try:
+            offset = int(request.headers['Upload-Offset'])
+            length = int(request.META.get('CONTENT_LENGTH') or 0)
+            checksum = request.headers['Upload-Checksum']
+        except (KeyError, ValueError):
+            return Response(
+                {'detail': 'Upload-Offset, Upload-Checksum and Content-Length headers are required.'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        if length <= 0:
+            return Response(
+                {'detail': 'Chunk is empty.'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        if length > settings.INVITATION_UPLOAD_CHUNK_SIZE:
+            return Response(
+                {'detail': f'Chunk must not exceed {settings.INVITATION_UPLOAD_CHUNK_SIZE} bytes.'},
+                status=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE
+            )
+
+        service = InvitationUploadService(upload)
+        try:
+            upload = service.append_chunk(request.stream, offset, length, checksum)
+        except UploadOffsetMismatch as e:
+            return Response(
+                {'detail': str(e), 'offset': e.expected_offset},
+                status=status.HTTP_409_CONFLICT
+            )
+        except UploadError as e:
+            return Response(
+                {'detail': str(e)},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        return Response(InvitationUploadSerializer(upload).data)
+
+
+class InvitationUploadCompleteView(APIView):
+    """
+    API view for finishing a chunked upload and queueing its import.
+    
+    Verifies that every byte was received, then leaves the whole-file
+    checksum and the CSV import to the run_invitation_uploads worker. Poll
+    the upload to see it become processed, with its import summary, or
+    failed.
+    
+    Permissions:
+        - IsAuthenticated: User must be authenticated
+        - IsElectionAdmin: User must have election admin privileges
+        
+    Methods:
+        POST: Complete the upload and queue it for import
+    """
+    permission_classes = [permissions.IsAuthenticated, IsElectionAdmin]
+
+    def post(self, request, pk):
+        """
+        Complete the upload and return it, queued for import.
+        """
+        upload = get_object_or_404(InvitationUpload, pk=pk)
+
+        try:
+            upload = InvitationUploadService(upload).complete()
+        except UploadError as e:
+            return Response(
+                {'detail': str(e)},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        return Response(
+            InvitationUploadSerializer(upload).data,
+            status=status.HTTP_202_ACCEPTED
+        )
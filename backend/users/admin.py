@@ -5,12 +5,14 @@ This module defines admin interfaces for User and VoterProfile models
 with custom display options and actions.
 """
 from django.contrib import admin
+
+from core.admin import LargeTableAdminMixin
 from users.models import User, VoterProfile
 from users.utils import send_password_reset_email
 
 
 @admin.register(User)
-class UserAdmin(admin.ModelAdmin):
+class UserAdmin(LargeTableAdminMixin, admin.ModelAdmin):
     """
     Admin interface for User model with custom display and actions.
     """
@@ -48,8 +50,9 @@ class UserAdmin(admin.ModelAdmin):
 
 
 @admin.register(VoterProfile)
-class VoterProfileAdmin(admin.ModelAdmin):
+class VoterProfileAdmin(LargeTableAdminMixin, admin.ModelAdmin):
     """
     Admin interface for VoterProfile model with user and election event display.
     """
     list_display = ('user', 'election_event')
+    list_select_related = ('user', 'election_event')
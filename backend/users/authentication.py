@@ -0,0 +1,151 @@
+"""
+users/authentication.py
+
+This module defines a token authentication backend that caches token
+lookups.
+
+DRF's TokenAuthentication joins the token and user tables on every API call.
+CachedTokenAuthentication keeps recently used tokens in a small process-local
+LRU cache, optionally backed by a shared Django cache, for a short TTL.
+Deleting a token or deactivating a user evicts its entries (see
+users/signals.py); other processes' local caches expire within the TTL.
+"""
+import copy
+import threading
+import time
+from collections import OrderedDict
+
+from django.conf import settings
+from django.core.cache import caches
+
+from rest_framework.authentication import TokenAuthentication
+from rest_framework.exceptions import AuthenticationFailed
+
+
+class TokenCache:
+    """
+    Thread-safe LRU cache of token key to (user, token), with expiry.
+
+    Attributes:
+        maxsize (int): Maximum number of entries kept
+        ttl (float): Seconds an entry stays valid
+    """
+    def __init__(self, maxsize, ttl):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        """
+        Return the cached (user, token) for a key, or None if absent or expired.
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            expires_at, value = entry
+            if expires_at < time.monotonic():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key, value):
+        """
+        Store (user, token) for a key, evicting the least recently used entry.
+        """
+        with self._lock:
+            self._entries[key] = (time.monotonic() + self.ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def delete(self, key):
+        """
+        Remove a key from the cache if present.
+        """
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def clear(self):
+        """
+        Remove all entries.
+        """
+        with self._lock:
+            self._entries.clear()
+
+
+token_cache = TokenCache(
+    maxsize=settings.TOKEN_AUTH_CACHE_SIZE,
+    ttl=settings.TOKEN_AUTH_CACHE_TTL
+)
+
+
+def _shared_cache():
+    """
+    Return the shared Django cache used for tokens, or None if disabled.
+    """
+    alias = settings.TOKEN_AUTH_SHARED_CACHE
+    return caches[alias] if alias else None
+
+
+def _shared_cache_key(key):
+    return f'auth-token:{key}'
+
+
+def invalidate_token(key):
+    """
+    Evict a token from the local and shared caches.
+
+    Args:
+        key (str): Token key
+    """
+    token_cache.delete(key)
+    shared = _shared_cache()
+    if shared is not None:
+        shared.delete(_shared_cache_key(key))
+
+
+class CachedTokenAuthentication(TokenAuthentication):
+    """
+    Drop-in replacement for TokenAuthentication that caches token lookups.
+
+    Valid tokens are cached for TOKEN_AUTH_CACHE_TTL seconds in a
+    process-local LRU of TOKEN_AUTH_CACHE_SIZE entries and, if
+    TOKEN_AUTH_SHARED_CACHE names a cache alias, in that cache too. Each
+    request gets its own copy of the cached user, so per-request state set
+    on the user never leaks into other requests.
+    """
+
+    def authenticate_credentials(self, key):
+        """
+        Return (user, token) for a key, from cache when possible.
+
+        Raises:
+            AuthenticationFailed: If the token is invalid or the user inactive
+        """
+        cached = token_cache.get(key)
+        if cached is None:
+            shared = _shared_cache()
+            if shared is not None:
+                cached = shared.get(_shared_cache_key(key))
+                if cached is not None:
+                    token_cache.set(key, cached)
+
+        if cached is None:
+            user, token = super().authenticate_credentials(key)
+            cached = (user, token)
+            token_cache.set(key, cached)
+            shared = _shared_cache()
+            if shared is not None:
+                shared.set(_shared_cache_key(key), cached, settings.TOKEN_AUTH_CACHE_TTL)
+
+        user, token = cached
+        if not user.is_active:
+            raise AuthenticationFailed('User inactive or deleted.')
+
+        user = copy.copy(user)
+        token = copy.copy(token)
+        token.user = user
+        return (user, token)
@@ -22,7 +22,7 @@ class VoterRegistrationForm(forms.Form):
     last_name = forms.CharField(max_length=50, required=True)
     password1 = forms.CharField(widget=forms.PasswordInput(attrs={'autocomplete': 'new-password'}))
     password2 = forms.CharField(widget=forms.PasswordInput(attrs={'autocomplete': 'new-password'}))
-    email = forms.EmailField(disabled=True)
+    email = forms.EmailField(disabled=True, required=False)
     
     def clean(self):
         """
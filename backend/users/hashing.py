@@ -0,0 +1,101 @@
+"""
+users/hashing.py
+
+This module hashes registration passwords and defines the tunable Argon2
+hasher used by the 'argon2' PASSWORD_HASHER_POLICY.
+
+Password hashing is deliberately CPU-heavy. hash_password() hashes inline by
+default: hashlib and argon2-cffi release the GIL while hashing, so a web
+worker's threads already hash in parallel, and the request waits for its
+hash either way. Setting PASSWORD_HASHING_WORKERS runs hashes in a pool of
+that many spawned processes per web worker instead, which only caps how many
+hashes a worker computes at once; benchmark_registration shows it no faster
+than inline hashing.
+"""
+import atexit
+import logging
+import multiprocessing
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+from django.conf import settings
+from django.contrib.auth.hashers import Argon2PasswordHasher, make_password
+
+logger = logging.getLogger(__name__)
+
+_executor = None
+_executor_lock = threading.Lock()
+
+
+class TunedArgon2PasswordHasher(Argon2PasswordHasher):
+    """
+    Argon2 hasher with cost parameters taken from settings.
+
+    Hashes made with other parameters are re-hashed with these on the user's
+    next successful login, since must_update() compares the parameters.
+    """
+    time_cost = settings.ARGON2_TIME_COST
+    memory_cost = settings.ARGON2_MEMORY_COST
+    parallelism = settings.ARGON2_PARALLELISM
+
+
+def _init_worker():
+    """
+    Set up Django in a freshly spawned hashing process.
+    """
+    import django
+    django.setup()
+
+
+def _get_executor():
+    """
+    Return the process pool, creating it on first use.
+    """
+    global _executor
+    if _executor is None:
+        with _executor_lock:
+            if _executor is None:
+                _executor = ProcessPoolExecutor(
+                    max_workers=settings.PASSWORD_HASHING_WORKERS,
+                    mp_context=multiprocessing.get_context('spawn'),
+                    initializer=_init_worker
+                )
+                atexit.register(_executor.shutdown, wait=False)
+    return _executor
+
+
+def _reset_executor():
+    """
+    Drop a broken pool so the next call starts a new one.
+    """
+    global _executor
+    with _executor_lock:
+        if _executor is not None:
+            _executor.shutdown(wait=False)
+        _executor = None
+
+
+def hash_password(raw_password):
+    """
+    Hash a password with the preferred hasher, in the hashing pool if enabled.
+
+    The result is an encoded password suitable for ``User.password``. If
+    PASSWORD_HASHING_WORKERS is 0, or the pool has broken, the password is
+    hashed inline.
+
+    Args:
+        raw_password (str): Plain-text password
+
+    Returns:
+        str: Encoded password hash
+    """
+    if settings.PASSWORD_HASHING_WORKERS <= 0:
+        return make_password(raw_password)
+
+    try:
+        return _get_executor().submit(make_password, raw_password).result()
+    except BrokenProcessPool:
+        logger.error("Password hashing pool broke; hashing inline.")
+        _reset_executor()
+        return make_password(raw_password)
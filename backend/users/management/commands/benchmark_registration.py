@@ -0,0 +1,88 @@
+"""
+users/management/commands/benchmark_registration.py
+
+This module defines a management command that measures voter registration
+throughput with inline and pooled password hashing.
+"""
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+from django.db import connection
+from django.test.utils import override_settings
+from django.utils import timezone
+
+from election_events.models import ElectionEvent
+from invitations.models import Invitation
+from invitations.tokens import make_invitation_token
+from users.models import User
+from users.serializers import RegisterViaTokenSerializer
+
+
+class Command(BaseCommand):
+    """
+    Register a batch of voters through RegisterViaTokenSerializer from
+    several threads, once with inline hashing and once with the hashing pool,
+    and report registrations per second. The benchmark's event, invitations
+    and users are deleted afterwards.
+    """
+    help = "Benchmark registration throughput with inline and pooled password hashing."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--registrations', type=int, default=100, help="Registrations per run")
+        parser.add_argument('--threads', type=int, default=8, help="Concurrent registering threads")
+        parser.add_argument('--workers', type=int, default=4, help="Hashing processes for the pooled run")
+
+    def handle(self, *args, **options):
+        for label, workers in (('inline', 0), ('pool', options['workers'])):
+            with override_settings(
+                PASSWORD_HASHING_WORKERS=workers,
+                EMAIL_BACKEND='django.core.mail.backends.locmem.EmailBackend'
+            ):
+                rate = self.run(options['registrations'], options['threads'])
+            self.stdout.write(f"{label:<8} {rate:8.1f} registrations/s")
+
+    def run(self, count, threads):
+        """
+        Register ``count`` voters from ``threads`` threads.
+
+        Returns:
+            float: Registrations per second
+        """
+        now = timezone.now()
+        event = ElectionEvent.objects.create(
+            title=f'Registration benchmark {uuid.uuid4().hex[:8]}',
+            start_time=now,
+            end_time=now + timedelta(days=1)
+        )
+        invitations = Invitation.objects.bulk_create([
+            Invitation(email=f'bench-{uuid.uuid4().hex}@example.com', election_event=event)
+            for _ in range(count)
+        ])
+        tokens = [make_invitation_token(invitation) for invitation in invitations]
+
+        def register(token):
+            try:
+                serializer = RegisterViaTokenSerializer(data={
+                    'token': token,
+                    'first_name': 'Bench',
+                    'last_name': 'Voter',
+                    'password': 'Bench-Pass-2024!',
+                })
+                serializer.is_valid(raise_exception=True)
+                serializer.save()
+            finally:
+                connection.close()
+
+        try:
+            start = time.perf_counter()
+            with ThreadPoolExecutor(max_workers=threads) as executor:
+                list(executor.map(register, tokens))
+            elapsed = time.perf_counter() - start
+        finally:
+            User.objects.filter(email__in=[i.email for i in invitations]).delete()
+            event.delete()
+
+        return count / elapsed
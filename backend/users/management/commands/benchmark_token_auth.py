@@ -0,0 +1,59 @@
+"""
+users/management/commands/benchmark_token_auth.py
+
+This module defines a management command that measures the per-request cost
+of API token authentication with and without the token cache.
+"""
+import time
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.test import RequestFactory
+from django.test.utils import CaptureQueriesContext
+
+from rest_framework.authentication import TokenAuthentication
+from rest_framework.authtoken.models import Token
+
+from users.authentication import CachedTokenAuthentication, invalidate_token
+
+User = get_user_model()
+
+
+class Command(BaseCommand):
+    """
+    Authenticate the same token repeatedly with each backend and report the
+    mean time and number of queries per request.
+    """
+    help = "Benchmark TokenAuthentication against CachedTokenAuthentication."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--email', help="User whose token is used (default: first active user)")
+        parser.add_argument('--requests', type=int, default=2000, help="Authentications per backend")
+
+    def handle(self, *args, **options):
+        users = User.objects.filter(is_active=True)
+        if options['email']:
+            users = users.filter(email=options['email'])
+        user = users.order_by('email').first()
+        if user is None:
+            raise CommandError("No matching active user.")
+
+        token, _ = Token.objects.get_or_create(user=user)
+        request = RequestFactory().get('/', HTTP_AUTHORIZATION=f'Token {token.key}')
+        invalidate_token(token.key)
+
+        count = options['requests']
+        for name, backend in (
+            ('TokenAuthentication', TokenAuthentication()),
+            ('CachedTokenAuthentication', CachedTokenAuthentication()),
+        ):
+            with CaptureQueriesContext(connection) as queries:
+                start = time.perf_counter()
+                for _ in range(count):
+                    backend.authenticate(request)
+                elapsed = time.perf_counter() - start
+            self.stdout.write(
+                f"{name:<28} {elapsed / count * 1e6:8.1f} us/request  "
+                f"{len(queries) / count:.3f} queries/request"
+            )
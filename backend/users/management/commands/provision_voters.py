@@ -0,0 +1,51 @@
+"""
+users/management/commands/provision_voters.py
+
+This module defines a management command that bulk-provisions voters for an
+election event from a CSV voter roll.
+"""
+from django.core.management.base import BaseCommand, CommandError
+
+from election_events.models import ElectionEvent
+from users.services import VoterProvisioningService, read_voter_rows
+
+
+class Command(BaseCommand):
+    """
+    Create users, voter profiles and used invitations for every voter in a
+    CSV file with email, first_name and last_name columns. Safe to re-run:
+    voters already provisioned for the event are skipped.
+    """
+    help = "Bulk-provision voters for an election event from a CSV voter roll."
+
+    def add_arguments(self, parser):
+        parser.add_argument('event_id', help="ID of the election event")
+        parser.add_argument('csv_path', help="CSV file with email, first_name and last_name columns")
+        parser.add_argument('--chunk-size', type=int, default=1000, help="Voters per transaction")
+        parser.add_argument(
+            '--send-login-links',
+            action='store_true',
+            help="Email each new voter a one-time link to set a password"
+        )
+
+    def handle(self, *args, **options):
+        try:
+            event = ElectionEvent.objects.get(pk=options['event_id'])
+        except ElectionEvent.DoesNotExist:
+            raise CommandError(f"Election event {options['event_id']} does not exist.")
+
+        service = VoterProvisioningService(
+            event,
+            chunk_size=options['chunk_size'],
+            send_login_links=options['send_login_links']
+        )
+        try:
+            with open(options['csv_path'], 'rb') as csv_file:
+                results = service.provision(read_voter_rows(csv_file))
+        except OSError as e:
+            raise CommandError(str(e))
+
+        for error in results.pop('errors'):
+            self.stderr.write(error)
+        for key, value in results.items():
+            self.stdout.write(f"{key}: {value}")
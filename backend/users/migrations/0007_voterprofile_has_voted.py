@@ -0,0 +1,18 @@
+# Generated by Django 5.2.3 on 2026-10-19 00:52
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('users', '0006_voterprofile_election_event'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='voterprofile',
+            name='has_voted',
+            field=models.BooleanField(default=False),
+        ),
+    ]
@@ -0,0 +1,37 @@
+# Generated by Django 5.2.3 on 2026-10-19 01:02
+
+import django.contrib.postgres.indexes
+import django.db.models.functions.text
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('auth', '0012_alter_user_first_name_max_length'),
+        ('election_events', '0001_initial'),
+        ('users', '0007_voterprofile_has_voted'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='user',
+            index=models.Index(django.contrib.postgres.indexes.OpClass(django.db.models.functions.text.Upper('email'), name='text_pattern_ops'), name='user_email_prefix_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='user',
+            index=models.Index(django.contrib.postgres.indexes.OpClass(django.db.models.functions.text.Upper('first_name'), name='text_pattern_ops'), name='user_first_name_prefix_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='user',
+            index=models.Index(django.contrib.postgres.indexes.OpClass(django.db.models.functions.text.Upper('last_name'), name='text_pattern_ops'), name='user_last_name_prefix_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='voterprofile',
+            index=models.Index(fields=['created_at', 'id'], name='users_voter_created_fee5f5_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='voterprofile',
+            index=models.Index(fields=['election_event', 'created_at', 'id'], name='users_voter_electio_b95531_idx'),
+        ),
+    ]
@@ -9,7 +9,9 @@ superusers.
 The model extends Django's AbstractUser.
 """
 from django.contrib.auth.models import AbstractUser, BaseUserManager
+from django.contrib.postgres.indexes import GinIndex, OpClass
 from django.db import models
+from django.db.models.functions import Upper
 
 from core.models import BaseUUIDModel
 from election_events.models import ElectionEvent
@@ -78,6 +80,22 @@ class User(AbstractUser, BaseUUIDModel):
 
     objects = UserManager()
 
+    class Meta(AbstractUser.Meta):
+        """
+        Expression indexes backing case-insensitive search on email and names:
+        B-tree for prefix search (``istartswith``, ``UPPER(col) LIKE 'AB%'``)
+        and trigram GIN for substring search (``icontains``,
+        ``UPPER(col) LIKE '%ABC%'``).
+        """
+        indexes = [
+            models.Index(OpClass(Upper('email'), name='text_pattern_ops'), name='user_email_prefix_idx'),
+            models.Index(OpClass(Upper('first_name'), name='text_pattern_ops'), name='user_first_name_prefix_idx'),
+            models.Index(OpClass(Upper('last_name'), name='text_pattern_ops'), name='user_last_name_prefix_idx'),
+            GinIndex(OpClass(Upper('email'), name='gin_trgm_ops'), name='user_email_trgm_idx'),
+            GinIndex(OpClass(Upper('first_name'), name='gin_trgm_ops'), name='user_first_name_trgm_idx'),
+            GinIndex(OpClass(Upper('last_name'), name='gin_trgm_ops'), name='user_last_name_trgm_idx'),
+        ]
+
     def __str__(self):
         """
         Return string representation with user email.
@@ -99,6 +117,16 @@ class VoterProfile(BaseUUIDModel):
         on_delete=models.CASCADE,
         related_name='voter_profiles'
     )
+    has_voted = models.BooleanField(default=False)  # Set on the voter's first vote in the event
+
+    class Meta:
+        """
+        Composite indexes backing keyset pagination on (created_at, id).
+        """
+        indexes = [
+            models.Index(fields=['created_at', 'id']),
+            models.Index(fields=['election_event', 'created_at', 'id']),
+        ]
 
     def __str__(self):
         """
@@ -2,11 +2,86 @@
 users/permissions.py
 
 Custom permission classes for the voting system.
+
+The request user's VoterProfile and admin role are resolved at most once per
+request by get_request_voter and is_election_admin and cached on the
+underlying HttpRequest, so permission checks and the view that follows them
+share the result instead of each running their own queries.
 """
 from rest_framework import permissions
 from .models import VoterProfile
 
 
+def _http_request(request):
+    """
+    Return the Django HttpRequest behind a DRF Request (or the request itself).
+    """
+    return getattr(request, '_request', request)
+
+
+def get_request_voter(request):
+    """
+    Return the request user's VoterProfile, resolved once per request.
+    
+    The profile is fetched with its election event joined, so callers can
+    use ``voter.election_event`` without another query.
+    
+    Args:
+        request: DRF Request or Django HttpRequest
+        
+    Returns:
+        VoterProfile or None: The user's voter profile, or None if the user
+        is anonymous or not a voter
+    """
+    user = getattr(request, 'user', None)
+    if not user or not user.is_authenticated:
+        return None
+    
+    http_request = _http_request(request)
+    cached = getattr(http_request, '_cached_voter', None)
+    if cached is None or cached[0] != user.pk:
+        voter = (
+            VoterProfile.objects
+            .select_related('election_event')
+            .filter(user=user)
+            .first()
+        )
+        cached = (user.pk, voter)
+        http_request._cached_voter = cached
+    return cached[1]
+
+
+def is_election_admin(request):
+    """
+    Check whether the request user is an election admin, once per request.
+    
+    Staff, superusers and users with the admin role qualify without a query;
+    otherwise membership of the 'ElectionAdmins' group is looked up and cached.
+    
+    Args:
+        request: DRF Request or Django HttpRequest
+        
+    Returns:
+        bool: True if the user is an election admin
+    """
+    user = getattr(request, 'user', None)
+    if not user or not user.is_authenticated:
+        return False
+    
+    if user.is_staff or user.is_superuser:
+        return True
+    
+    if getattr(user, 'role', None) == 'admin':
+        return True
+    
+    http_request = _http_request(request)
+    cached = getattr(http_request, '_cached_election_admin', None)
+    if cached is None or cached[0] != user.pk:
+        cached = (user.pk, user.groups.filter(name='ElectionAdmins').exists())
+        http_request._cached_election_admin = cached
+    return cached[1]
+
+
 class IsVoter(permissions.BasePermission):
     """
     Permission class to check if user is a voter.
@@ -17,15 +92,7 @@ class IsVoter(permissions.BasePermission):
         """
         Check if the user is authenticated and has a voter profile.
         """
-        if not request.user or not request.user.is_authenticated:
-            return False
-        
-        # Check if user has a VoterProfile
-        try:
-            VoterProfile.objects.get(user=request.user)
-            return True
-        except VoterProfile.DoesNotExist:
-            return False
+        return get_request_voter(request) is not None
 
 
 class IsElectionAdmin(permissions.BasePermission):
@@ -38,19 +105,7 @@ class IsElectionAdmin(permissions.BasePermission):
         """
         Check if the user is authenticated and is an election admin.
         """
-        if not request.user or not request.user.is_authenticated:
-            return False
-        
-        # Check if user is staff or superuser
-        if request.user.is_staff or request.user.is_superuser:
-            return True
-        
-        # Check if user has admin role
-        if hasattr(request.user, 'role') and request.user.role == 'admin':
-            return True
-        
-        # Check if user is in ElectionAdmins group
-        return request.user.groups.filter(name='ElectionAdmins').exists()
+        return is_election_admin(request)
 
 
 class IsOwnerOrAdmin(permissions.BasePermission):
@@ -68,22 +123,14 @@ class IsOwnerOrAdmin(permissions.BasePermission):
         """
         Check if user owns the object or is an admin.
         """
-        # Allow access to admins
-        if request.user.is_staff or request.user.is_superuser:
-            return True
-        
-        if hasattr(request.user, 'role') and request.user.role == 'admin':
-            return True
-        
-        # Check if user is in ElectionAdmins group
-        if request.user.groups.filter(name='ElectionAdmins').exists():
+        if is_election_admin(request):
             return True
         
         # Check if user owns the object
         if hasattr(obj, 'user'):
             return obj.user == request.user
-        elif hasattr(obj, 'voter') and hasattr(obj.voter, 'user'):
-            return obj.voter.user == request.user
+        elif hasattr(obj, 'voter') and hasattr(obj.voter, 'user_id'):
+            return obj.voter.user_id == request.user.pk
         
         return False
 
@@ -97,19 +144,4 @@ class IsVoterOrAdmin(permissions.BasePermission):
         """
         Check if user is authenticated and is either a voter or admin.
         """
-        if not request.user or not request.user.is_authenticated:
-            return False
-        
-        # Check if user is admin
-        if (request.user.is_staff or 
-            request.user.is_superuser or 
-            (hasattr(request.user, 'role') and request.user.role == 'admin') or
-            request.user.groups.filter(name='ElectionAdmins').exists()):
-            return True
-        
-        # Check if user is a voter
-        try:
-            VoterProfile.objects.get(user=request.user)
-            return True
-        except VoterProfile.DoesNotExist:
-            return False
\ No newline at end of file
+        return is_election_admin(request) or get_request_voter(request) is not None
@@ -7,13 +7,21 @@ and direct admin/staff registration.
 from django.contrib.auth import get_user_model
 from django.contrib.auth.password_validation import validate_password
 from django.contrib.auth.tokens import default_token_generator
+from django.db import transaction
 from django.utils.encoding import force_str
 from django.utils.http import urlsafe_base64_decode
 
 from rest_framework import serializers
 
-from invitations.models import Invitation
+from election_events.models import ElectionEvent
+from invitations.tokens import (
+    InvalidInvitationToken,
+    lock_invitation,
+    read_invitation_token
+)
+from users.hashing import hash_password
 from users.models import User, VoterProfile
+from users.services import NAME_MAX_LENGTH
 from users.utils import send_voter_registration_email
 
 User = get_user_model()
@@ -27,13 +35,13 @@ class RegisterViaTokenSerializer(serializers.Serializer):
     and creating both User and VoterProfile instances upon successful registration.
     
     Attributes:
-        token (UUIDField): The invitation token UUID
+        token (CharField): The signed invitation token
         first_name (CharField): User's first name (max 50 characters)
         last_name (CharField): User's last name (max 50 characters)
         password (CharField): User's password (write-only)
     """
-    token = serializers.UUIDField(
-        help_text="Valid invitation token UUID for voter registration"
+    token = serializers.CharField(
+        help_text="Signed invitation token from the registration link"
     )
     first_name = serializers.CharField(
         max_length=50,
@@ -50,20 +58,24 @@ class RegisterViaTokenSerializer(serializers.Serializer):
 
     def validate_token(self, value):
         """
-        Validate that the invitation token is valid and unused.
+        Validate the invitation token's signature and age.
+        
+        No database lookup happens here; whether the invitation is still
+        unused is checked when it is claimed in create().
         
         Args:
-            value (UUID): The invitation token to validate
+            value (str): The invitation token to validate
             
         Returns:
-            UUID: The validated token
+            InvitationTokenData: The decoded token contents
             
         Raises:
-            ValidationError: If token is invalid or already used
+            ValidationError: If token is malformed, forged or expired
         """
-        if not Invitation.objects.filter(token=value, is_used=False).exists():
+        try:
+            return read_invitation_token(value)
+        except InvalidInvitationToken:
             raise serializers.ValidationError("Invalid or expired token")
-        return value
 
     def create(self, validated_data):
         """
@@ -77,47 +89,49 @@ class RegisterViaTokenSerializer(serializers.Serializer):
             User: The newly created voter user instance
             
         Raises:
-            ValidationError: If user is already registered for the election event
+            ValidationError: If the invitation was already used or the user is
+                already registered for the election event
         """
-        token = validated_data["token"]
-        invitation = Invitation.objects.get(token=token, is_used=False)
-        password = validated_data["password"]
         first_name = validated_data["first_name"].strip()
         last_name = validated_data["last_name"].strip()
-        email = invitation.email
-        election_event = invitation.election_event
-
-        user, created = User.objects.get_or_create(
-            email=email,
-            defaults={
-                "first_name": first_name,
-                "last_name": last_name,
-                "role": "voter",
-            }
-        )
-
-        updated = False
-        if not created:
-            if not user.first_name and first_name:
-                user.first_name = first_name
-                updated = True
-            if not user.last_name and last_name:
-                user.last_name = last_name
-                updated = True
-            if updated:
-                user.save()
-
-        if created:
-            user.set_password(password)
-            user.save()
-        
-        if VoterProfile.objects.filter(user=user, election_event=election_event).exists():
-            raise serializers.ValidationError("You are already registered as a voter for this election event.")
+        # Hash before taking the invitation lock, so it is not held meanwhile
+        encoded_password = hash_password(validated_data["password"])
+
+        with transaction.atomic():
+            invitation = lock_invitation(validated_data["token"])
+            if invitation is None:
+                raise serializers.ValidationError({"token": ["Invalid or expired token"]})
+
+            email = invitation.email
+            election_event = invitation.election_event
+
+            user, created = User.objects.get_or_create(
+                email=email,
+                defaults={
+                    "first_name": first_name,
+                    "last_name": last_name,
+                    "role": "voter",
+                    "password": encoded_password,
+                }
+            )
 
-        VoterProfile.objects.create(user=user, election_event=invitation.election_event)
+            updated = False
+            if not created:
+                if not user.first_name and first_name:
+                    user.first_name = first_name
+                    updated = True
+                if not user.last_name and last_name:
+                    user.last_name = last_name
+                    updated = True
+                if updated:
+                    user.save()
 
-        invitation.is_used = True
-        invitation.save()
+            if VoterProfile.objects.filter(user=user, election_event=election_event).exists():
+                raise serializers.ValidationError("You are already registered as a voter for this election event.")
+
+            VoterProfile.objects.create(user=user, election_event=election_event)
+
+            invitation.mark_used()
 
         send_voter_registration_email(user, election_event)
         return user
@@ -266,3 +280,57 @@ class PasswordResetRequestSerializer(serializers.Serializer):
         self.context['user'] = user
         return value
 
+
+class VoterRowSerializer(serializers.Serializer):
+    """
+    Serializer for one voter of a voter roll.
+    
+    Attributes:
+        email (EmailField): Voter's email address
+        first_name (CharField): Voter's first name (max 50 characters)
+        last_name (CharField): Voter's last name (max 50 characters)
+    """
+    email = serializers.EmailField()
+    first_name = serializers.CharField(max_length=NAME_MAX_LENGTH, required=False, allow_blank=True, default='')
+    last_name = serializers.CharField(max_length=NAME_MAX_LENGTH, required=False, allow_blank=True, default='')
+
+
+class VoterProvisionSerializer(serializers.Serializer):
+    """
+    Serializer for bulk-provisioning voters for an election event.
+    
+    The roll is given either as a JSON list of voters or as a CSV file with
+    email, first_name and last_name columns.
+    
+    Attributes:
+        election_event (PrimaryKeyRelatedField): Event to provision voters for
+        voters (ListField): Voters to provision
+        file (FileField): CSV voter roll, instead of voters
+        send_login_links (BooleanField): Email new voters a one-time login link
+    """
+    election_event = serializers.PrimaryKeyRelatedField(
+        queryset=ElectionEvent.objects.all(),
+        help_text="ID of the election event to provision voters for"
+    )
+    voters = VoterRowSerializer(many=True, required=False)
+    file = serializers.FileField(
+        required=False,
+        help_text="CSV file with email, first_name and last_name columns"
+    )
+    send_login_links = serializers.BooleanField(
+        default=False,
+        help_text="Email each new voter a one-time link to set a password"
+    )
+
+    def validate(self, data):
+        """
+        Validate that exactly one of voters and file is given.
+        
+        Raises:
+            ValidationError: If neither or both are given
+        """
+        if ('voters' in data) == ('file' in data):
+            raise serializers.ValidationError("Provide either 'voters' or a CSV 'file'.")
+        if 'file' in data and not data['file'].name.endswith('.csv'):
+            raise serializers.ValidationError({'file': 'Only CSV files are allowed.'})
+        return data
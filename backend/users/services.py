@@ -0,0 +1,308 @@
+"""
+users/services.py
+
+This module provisions voters in bulk for closed electorates.
+
+When the voter roll is known in advance there is no need to route every
+voter through an invitation email and token registration. The provisioning
+service creates the users (with unusable passwords), their voter profiles
+and already-used invitations directly with bulk inserts, one chunked
+transaction at a time, and can optionally email each new voter a one-time
+link to set their password. Emails are matched case-insensitively against
+existing users and invitations, and rows that would not fit the model
+columns are reported rather than inserted. Only the first
+IMPORT_MAX_REPORTED_ERRORS errors are kept; the rest are counted in
+``errors_omitted``.
+"""
+import csv
+import io
+import logging
+from itertools import islice
+
+from django.conf import settings
+from django.contrib.auth.hashers import make_password
+from django.core.exceptions import ValidationError
+from django.core.validators import validate_email
+from django.db import transaction
+from django.db.models.functions import Upper
+
+from invitations.models import Invitation, InvitationFunnel
+from users.models import User, VoterProfile
+from users.utils import send_voter_login_link_email
+
+logger = logging.getLogger(__name__)
+
+# Names must fit both the user and the invitation columns
+NAME_MAX_LENGTH = min(
+    model._meta.get_field(field).max_length
+    for model in (User, Invitation)
+    for field in ('first_name', 'last_name')
+)
+
+
+def read_voter_rows(csv_file):
+    """
+    Stream voter rows from a CSV file with email, first_name and last_name
+    columns.
+
+    Args:
+        csv_file: Uploaded CSV file or binary file object
+
+    Yields:
+        dict: One row per voter
+    """
+    text_stream = io.TextIOWrapper(
+        getattr(csv_file, 'file', csv_file),
+        encoding='utf-8',
+        newline=''
+    )
+    try:
+        yield from csv.DictReader(text_stream)
+    finally:
+        text_stream.detach()
+
+
+class VoterProvisioningService:
+    """
+    Service class for bulk-creating voters for an election event.
+
+    Provisioning is idempotent on email: voters that are already fully
+    provisioned for the event are skipped, and partially provisioned ones
+    are completed. Emails already tied to another election event are
+    reported as conflicts and left untouched.
+
+    Attributes:
+        election_event: ElectionEvent the voters are provisioned for
+        provisioned_by: User recorded as the inviter, if any
+        chunk_size (int): Number of voters handled per transaction
+        send_login_links (bool): Email new voters a link to set a password
+    """
+    def __init__(self, election_event, provisioned_by=None, chunk_size=1000, send_login_links=False):
+        self.election_event = election_event
+        self.provisioned_by = provisioned_by
+        self.chunk_size = chunk_size
+        self.send_login_links = send_login_links
+
+    def provision(self, rows):
+        """
+        Provision voters from an iterable of row dicts.
+
+        Args:
+            rows: Iterable of dicts with email, first_name and last_name
+
+        Returns:
+            dict: Provisioning results
+        """
+        results = {
+            'total_rows': 0,
+            'users_created': 0,
+            'profiles_created': 0,
+            'invitations_created': 0,
+            'invitations_marked_used': 0,
+            'already_provisioned': 0,
+            'conflicts': 0,
+            'duplicate_rows': 0,
+            'invalid_rows': 0,
+            'login_links_sent': 0,
+            'errors': [],
+            'errors_omitted': 0
+        }
+
+        rows = iter(rows)
+        row_num = 1  # header is row 1
+        while True:
+            chunk = list(islice(rows, self.chunk_size))
+            if not chunk:
+                break
+
+            voters = {}
+            for row in chunk:
+                row_num += 1
+                results['total_rows'] += 1
+                email = (row.get('email') or '').strip().lower()
+                try:
+                    validate_email(email)
+                except ValidationError:
+                    results['invalid_rows'] += 1
+                    self._add_error(results, f"Row {row_num}: Invalid email '{email}'")
+                    continue
+                if email in voters:
+                    results['duplicate_rows'] += 1
+                    continue
+                first_name = (row.get('first_name') or '').strip()
+                last_name = (row.get('last_name') or '').strip()
+                if len(first_name) > NAME_MAX_LENGTH or len(last_name) > NAME_MAX_LENGTH:
+                    results['invalid_rows'] += 1
+                    self._add_error(
+                        results, f"Row {row_num}: Names must be at most {NAME_MAX_LENGTH} characters"
+                    )
+                    continue
+                voters[email] = (first_name, last_name)
+
+            if voters:
+                created_users = self._provision_chunk(voters, results)
+                if self.send_login_links:
+                    self._send_login_links(created_users, results)
+
+        return results
+
+    @staticmethod
+    def _add_error(results, message):
+        """
+        Record an error, or only count it once IMPORT_MAX_REPORTED_ERRORS
+        have been recorded.
+        """
+        if len(results['errors']) < settings.IMPORT_MAX_REPORTED_ERRORS:
+            results['errors'].append(message)
+        else:
+            results['errors_omitted'] += 1
+
+    @staticmethod
+    def _matching_emails(queryset, emails, field='email'):
+        """
+        Filter a queryset to rows whose email matches one of the (lowercase)
+        emails, ignoring case.
+
+        Compares UPPER(email), which the expression indexes on user and
+        invitation emails serve.
+        """
+        return (
+            queryset
+            .annotate(email_upper=Upper(field))
+            .filter(email_upper__in=[email.upper() for email in emails])
+        )
+
+    def _provision_chunk(self, voters, results):
+        """
+        Provision one chunk of voters in a single transaction.
+
+        Only rows actually inserted are counted; rows skipped by
+        ignore_conflicts, because a concurrent request inserted them first,
+        are not.
+
+        Args:
+            voters (dict): Lowercase email mapped to (first_name, last_name)
+            results (dict): Results to update
+
+        Returns:
+            list: Users created in this chunk
+        """
+        event_id = self.election_event.pk
+        emails = list(voters)
+
+        with transaction.atomic():
+            user_ids = {
+                email.lower(): pk
+                for email, pk in self._matching_emails(User.objects, emails).values_list('email', 'pk')
+            }
+            profile_events = {
+                email.lower(): election_event_id
+                for email, election_event_id in self._matching_emails(
+                    VoterProfile.objects, emails, 'user__email'
+                ).values_list('user__email', 'election_event_id')
+            }
+            invitations = {
+                invitation.email.lower(): invitation
+                for invitation in self._matching_emails(Invitation.objects, emails)
+                .only('id', 'email', 'election_event_id', 'is_used')
+            }
+
+            eligible = []
+            for email in emails:
+                invitation = invitations.get(email)
+                if profile_events.get(email, event_id) != event_id:
+                    results['conflicts'] += 1
+                    self._add_error(results, f"{email}: registered for another election event")
+                elif invitation is not None and invitation.election_event_id != event_id:
+                    results['conflicts'] += 1
+                    self._add_error(results, f"{email}: invited to another election event")
+                elif email in profile_events and invitation is not None and invitation.is_used:
+                    results['already_provisioned'] += 1
+                else:
+                    eligible.append(email)
+
+            new_users = [
+                User(
+                    email=email,
+                    first_name=voters[email][0],
+                    last_name=voters[email][1],
+                    role='voter',
+                    password=make_password(None)
+                )
+                for email in eligible if email not in user_ids
+            ]
+            User.objects.bulk_create(new_users, ignore_conflicts=True)
+
+            # Re-read IDs: rows skipped as conflicts keep the existing user's ID
+            user_ids = {
+                email.lower(): pk
+                for email, pk in self._matching_emails(User.objects, eligible).values_list('email', 'pk')
+            }
+            created_users = [user for user in new_users if user_ids.get(user.email) == user.pk]
+            results['users_created'] += len(created_users)
+
+            new_profiles = [
+                VoterProfile(user_id=user_ids[email], election_event_id=event_id)
+                for email in eligible if email not in profile_events and email in user_ids
+            ]
+            VoterProfile.objects.bulk_create(new_profiles, ignore_conflicts=True)
+            results['profiles_created'] += self._count_inserted(VoterProfile, new_profiles)
+
+            new_invitations = [
+                Invitation(
+                    email=email,
+                    first_name=voters[email][0],
+                    last_name=voters[email][1],
+                    election_event_id=event_id,
+                    invited_by=self.provisioned_by,
+                    is_used=True
+                )
+                for email in eligible if email not in invitations
+            ]
+            Invitation.objects.bulk_create(new_invitations, ignore_conflicts=True)
+            invitations_created = self._count_inserted(Invitation, new_invitations)
+            marked_used = Invitation.objects.filter(
+                pk__in=[invitations[email].pk for email in eligible if email in invitations],
+                is_used=False
+            ).update(is_used=True)
+            results['invitations_created'] += invitations_created
+            results['invitations_marked_used'] += marked_used
+
+            # bulk_create and update() bypass the signals that keep the funnel
+            if invitations_created or marked_used:
+                InvitationFunnel.bump(
+                    event_id,
+                    invited=invitations_created,
+                    registered=invitations_created + marked_used
+                )
+
+        return created_users
+
+    @staticmethod
+    def _count_inserted(model, objects):
+        """
+        Count how many of the objects given to bulk_create(ignore_conflicts=True)
+        were inserted.
+
+        Primary keys are generated client-side, so the objects that were
+        skipped are the ones whose keys are not in the table.
+        """
+        if not objects:
+            return 0
+        return model.objects.filter(pk__in=[obj.pk for obj in objects]).count()
+
+    def _send_login_links(self, users, results):
+        """
+        Email each newly created voter a one-time link to set a password.
+
+        Args:
+            users (list): Users created by provisioning
+            results (dict): Results to update
+        """
+        for user in users:
+            try:
+                send_voter_login_link_email(user, self.election_event)
+                results['login_links_sent'] += 1
+            except Exception as e:
+                self._add_error(results, f"{user.email}: Failed to send login link")
+                logger.error(f"Failed to send login link to {user.email}: {str(e)}")
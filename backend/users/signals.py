@@ -0,0 +1,33 @@
+"""
+users/signals.py
+
+This module evicts cached API tokens when they stop being valid.
+"""
+from django.contrib.auth import get_user_model
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from rest_framework.authtoken.models import Token
+
+from users.authentication import invalidate_token
+
+User = get_user_model()
+
+
+@receiver(post_delete, sender=Token)
+def evict_deleted_token(sender, instance, **kwargs):
+    """
+    Evict a deleted token (e.g. on logout) from the token cache.
+    """
+    invalidate_token(instance.key)
+
+
+@receiver(post_save, sender=User)
+def evict_tokens_of_inactive_user(sender, instance, created, **kwargs):
+    """
+    Evict the tokens of a user who has been deactivated.
+    """
+    if created or instance.is_active:
+        return
+    for key in Token.objects.filter(user=instance).values_list('key', flat=True):
+        invalidate_token(key)
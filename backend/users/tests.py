@@ -1,3 +1,64 @@
-from django.test import TestCase
+"""
+users/tests.py
 
-# Create your tests here.
+This module tests bulk voter provisioning through the service and the API.
+"""
+from datetime import timedelta
+
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+
+from election_events.models import ElectionEvent
+from users.models import User, VoterProfile
+from users.services import VoterProvisioningService
+
+
+class VoterProvisioningTests(TestCase):
+    """
+    Voter rolls are provisioned in bulk, with a bounded error report, and
+    the API refuses rolls larger than VOTER_PROVISION_API_MAX_ROWS.
+    """
+    @classmethod
+    def setUpTestData(cls):
+        start = timezone.now()
+        cls.event = ElectionEvent.objects.create(
+            title='Event', start_time=start, end_time=start + timedelta(days=1)
+        )
+        cls.staff = User.objects.create_user(email='staff@example.com', is_staff=True)
+
+    def provision_through_api(self, count):
+        self.client.force_login(self.staff)
+        return self.client.post(
+            reverse('users_api:provision-voters'),
+            {
+                'election_event': str(self.event.pk),
+                'voters': [{'email': f'voter{n}@example.com'} for n in range(count)]
+            },
+            content_type='application/json'
+        )
+
+    @override_settings(IMPORT_MAX_REPORTED_ERRORS=2)
+    def test_reported_errors_are_capped(self):
+        results = VoterProvisioningService(self.event).provision(
+            [{'email': f'not-an-email-{n}'} for n in range(5)]
+        )
+
+        self.assertEqual(results['invalid_rows'], 5)
+        self.assertEqual(len(results['errors']), 2)
+        self.assertEqual(results['errors_omitted'], 3)
+
+    @override_settings(VOTER_PROVISION_API_MAX_ROWS=3)
+    def test_api_provisions_rolls_up_to_the_limit(self):
+        response = self.provision_through_api(3)
+
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(VoterProfile.objects.filter(election_event=self.event).count(), 3)
+
+    @override_settings(VOTER_PROVISION_API_MAX_ROWS=3)
+    def test_api_refuses_rolls_over_the_limit(self):
+        response = self.provision_through_api(4)
+
+        self.assertEqual(response.status_code, 400)
+        self.assertIn('provision_voters', response.json()['detail'])
+        self.assertFalse(VoterProfile.objects.exists())
@@ -10,7 +10,8 @@ from users.views import (
     LogoutAPIView,
     CurrentUserView,
     PasswordResetConfirmAPIView,
-    PasswordResetRequestAPIView
+    PasswordResetRequestAPIView,
+    VoterProvisionAPIView
 )
 app_name = "users_api"
 
@@ -21,4 +22,5 @@ urlpatterns = [
     path('me/', CurrentUserView.as_view(), name='current-user'),
     path('auth/reset-password/confirm/', PasswordResetConfirmAPIView.as_view(), name='password-reset-confirm'),
     path('password-reset/', PasswordResetRequestAPIView.as_view(), name='password-reset-request'),
+    path('provision/', VoterProvisionAPIView.as_view(), name='provision-voters'),
 ]
\ No newline at end of file
@@ -59,4 +59,40 @@ The NexaVote Team
                 settings.DEFAULT_FROM_EMAIL,
                 [user.email],
                 fail_silently=False,
-        )
\ No newline at end of file
+        )
+
+
+def send_voter_login_link_email(user, election_event):
+        """
+        Sends a provisioned voter a one-time link to set their password.
+
+        The link uses the password reset token, which stops working once the
+        password has been set.
+        """
+        base_url = getattr(settings, "FRONTEND_URL", "http://localhost:8000")
+        token = default_token_generator.make_token(user)
+        uid = urlsafe_base64_encode(force_bytes(user.pk))
+        login_link = f"{base_url}/auth/reset/{uid}/{token}"
+
+        subject = f"Your voter account for {election_event.title}"
+
+        message = f"""
+Hello {user.first_name},
+
+A voter account has been created for you for the election event:
+{election_event.title}.
+
+Use the link below to set your password and log in. The link can only be used once:
+{login_link}
+
+Thank you,
+The NexaVote Team
+""".strip()
+
+        send_mail(
+                subject,
+                message,
+                settings.DEFAULT_FROM_EMAIL,
+                [user.email],
+                fail_silently=False,
+        )
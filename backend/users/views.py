@@ -4,9 +4,17 @@ Django views module for user registration and authentication.
 This module contains view classes for handling user registration via invitation tokens,
 admin/staff registration, logout functionality, and voter management.
 """
+import uuid
+from itertools import islice
+
+from django.conf import settings
+from django.contrib import messages
 from django.contrib.admin.views.decorators import staff_member_required
 from django.contrib.auth import get_user_model, login, logout, authenticate
 from django.contrib.auth.views import LoginView
+from django.db import transaction
+from django.db.models import Q
+from django.http import Http404
 from django.shortcuts import render, redirect
 from django.urls import reverse
 from django.utils.decorators import method_decorator
@@ -17,15 +25,27 @@ from rest_framework.authtoken.models import Token
 from rest_framework.response import Response
 from rest_framework.views import APIView
 
-from invitations.models import Invitation
+from core.pagination import keyset_paginate
+from core.throttling import LoginAccountRateThrottle, LoginRateThrottle
+from election_events.models import ElectionEvent
+from invitations.tokens import (
+    InvalidInvitationToken,
+    get_invitation,
+    lock_invitation,
+    read_invitation_token
+)
 from users.forms import VoterRegistrationForm
+from users.hashing import hash_password
 from users.models import VoterProfile
 from users.serializers import (
     RegisterViaTokenSerializer,
     CurrentUserSerializer,
     PasswordResetConfirmSerializer,
-    PasswordResetRequestSerializer
+    PasswordResetRequestSerializer,
+    VoterProvisionSerializer
 )
+from users.permissions import IsElectionAdmin
+from users.services import VoterProvisioningService, read_voter_rows
 from users.utils import send_password_reset_email
 
 User = get_user_model()
@@ -64,7 +84,14 @@ class RegisterViaTokenView(APIView):
 
 class LoginAPIView(APIView):
     """
+    API view exchanging email and password for an auth token.
+
+    Attempts are throttled per client IP ('login' rate) and per submitted
+    email ('login_account' rate) in the shared throttle store.
     """
+    permission_classes = [permissions.AllowAny]
+    throttle_classes = [LoginRateThrottle, LoginAccountRateThrottle]
+
     def post(self, request):
         email = request.data.get('email')
         password = request.data.get('password')
@@ -142,6 +169,19 @@ class LoginView(LoginView):
     """
     template_name = "registration/login.html"
     redirect_authenticated_user = True
+    throttle_classes = [LoginRateThrottle, LoginAccountRateThrottle]
+
+    def post(self, request, *args, **kwargs):
+        """
+        Reject the attempt before checking credentials if it is throttled.
+        """
+        for throttle_class in self.throttle_classes:
+            if not throttle_class().allow_request(request, self):
+                messages.error(request, "Too many login attempts. Please try again later.")
+                # An unbound form, so rendering it doesn't authenticate
+                form = self.get_form_class()(request=request)
+                return self.render_to_response(self.get_context_data(form=form), status=429)
+        return super().post(request, *args, **kwargs)
 
     def get_success_url(self):
         user = self.request.user
@@ -182,6 +222,10 @@ class RegisterViaTokenHTMLView(View):
         """
         Display voter registration form with token validation.
         
+        The token's signature is checked in-process, so forged or expired
+        links are rejected without a database lookup. The email shown is
+        read from the invitation, since tokens do not carry it.
+        
         Args:
             request: The HTTP request object
             
@@ -191,10 +235,13 @@ class RegisterViaTokenHTMLView(View):
         if request.user.is_authenticated:
             logout(request)
         
-        token = request.GET.get("token")
         try:
-            invitation = Invitation.objects.get(token=token, is_used=False)
-        except Invitation.DoesNotExist:
+            token_data = read_invitation_token(request.GET.get("token"))
+        except InvalidInvitationToken:
+            return render(request, "users/register_voter.html", {"invalid_token": True})
+        
+        invitation = get_invitation(token_data)
+        if invitation is None:
             return render(request, "users/register_voter.html", {"invalid_token": True})
         
         form = VoterRegistrationForm(initial={"email": invitation.email})
@@ -204,32 +251,47 @@ class RegisterViaTokenHTMLView(View):
         """
         Process voter registration form submission.
         
+        The invitation is locked and claimed in a single transaction, so the
+        same link cannot be used to register twice concurrently.
+        
         Args:
             request: The HTTP request object
             
         Returns:
             HttpResponse: Success redirect or form with errors
         """
-        token = request.GET.get("token")
         try:
-            invitation = Invitation.objects.get(token=token, is_used=False)
-        except Invitation.DoesNotExist:
+            token_data = read_invitation_token(request.GET.get("token"))
+        except InvalidInvitationToken:
+            return render(request, "users/register_voter.html", {"invalid_token": True})
+        
+        invitation = get_invitation(token_data)
+        if invitation is None:
             return render(request, "users/register_voter.html", {"invalid_token": True})
         
         form = VoterRegistrationForm(request.POST, initial={"email": invitation.email})
         
-        if form.is_valid():
-            first_name = form.cleaned_data["first_name"]
-            last_name = form.cleaned_data["last_name"]
-            password = form.cleaned_data["password1"]
+        if not form.is_valid():
+            return render(request, "users/register_voter.html", {"form": form})
+        
+        first_name = form.cleaned_data["first_name"]
+        last_name = form.cleaned_data["last_name"]
+        # Hash before taking the invitation lock, so it is not held meanwhile
+        encoded_password = hash_password(form.cleaned_data["password1"])
+        
+        with transaction.atomic():
+            invitation = lock_invitation(token_data)
+            if invitation is None:
+                return render(request, "users/register_voter.html", {"invalid_token": True})
+            
             user = User.objects.filter(email=invitation.email).first()
             
             if user is None:
-                user = User.objects.create_user(
+                user = User.objects.create(
                     email=invitation.email,
                     first_name=first_name,
                     last_name=last_name,
-                    password=password,
+                    password=encoded_password,
                     role="voter"
                 )
             
@@ -238,31 +300,70 @@ class RegisterViaTokenHTMLView(View):
             except VoterProfile.DoesNotExist:
                 voter = VoterProfile.objects.create(user=user, election_event=invitation.election_event)
             
-            invitation.is_used = True
-            invitation.save()
-            login(request, user)
-            return redirect("home")
+            invitation.mark_used()
         
-        return render(request, "users/register_voter.html", {"form": form})
+        login(request, user)
+        return redirect("home")
 
 
 class VoterListView(View):
     """
-    View to display a list of all voters (staff access required).
+    View to display a paginated, searchable list of voters (staff access required).
+    
+    Query Parameters:
+        event: Only list voters of this election event
+        q: Case-insensitive prefix of the voter's email, first or last name
+        cursor: Keyset pagination cursor from a previous page
+    
+    Attributes:
+        page_size (int): Number of voters per page
     """
+    page_size = 50
+
     @method_decorator(staff_member_required)
     def get(self, request):
         """
-        Display list of all voters with their election events.
+        Display one page of voters matching the filters.
         
         Args:
             request: The HTTP request object
             
         Returns:
             HttpResponse: Voter list page
+            
+        Raises:
+            Http404: If the cursor or election event ID is malformed
         """
         voters = VoterProfile.objects.select_related('user', 'election_event')
-        return render(request, "users/voter_list.html", {"voters": voters})
+        
+        event_id = request.GET.get("event", "")
+        if event_id:
+            try:
+                event_id = uuid.UUID(event_id)
+            except ValueError:
+                raise Http404("Invalid election event.")
+            voters = voters.filter(election_event_id=event_id)
+        
+        query = request.GET.get("q", "").strip()
+        if query:
+            voters = voters.filter(
+                Q(user__email__istartswith=query) |
+                Q(user__first_name__istartswith=query) |
+                Q(user__last_name__istartswith=query)
+            )
+        
+        try:
+            page = keyset_paginate(voters, request.GET.get("cursor"), self.page_size)
+        except ValueError:
+            raise Http404("Invalid cursor.")
+        
+        return render(request, "users/voter_list.html", {
+            "voters": page.items,
+            "page": page,
+            "events": ElectionEvent.objects.only("id", "title").order_by("title"),
+            "selected_event": event_id,
+            "query": query,
+        })
 
 
 class PasswordResetConfirmAPIView(APIView):
@@ -292,3 +393,61 @@ class PasswordResetRequestAPIView(APIView):
         return Response({
             "detail": "Password reset email sent successfully."
         }, status=status.HTTP_200_OK)
+
+
+class VoterProvisionAPIView(APIView):
+    """
+    API endpoint to bulk-provision voters for a closed electorate.
+    
+    Creates users, voter profiles and used invitations for a known voter
+    roll in chunked bulk inserts, skipping the invitation email and token
+    registration. Idempotent on email, so a roll can be re-submitted. Rolls
+    are limited to VOTER_PROVISION_API_MAX_ROWS voters per request; larger
+    ones are provisioned with the provision_voters management command.
+    
+    Permissions:
+        - IsAuthenticated: User must be authenticated
+        - IsElectionAdmin: User must have election admin privileges
+        
+    Methods:
+        POST: Provision voters from a JSON list or CSV file
+    """
+    permission_classes = [permissions.IsAuthenticated, IsElectionAdmin]
+
+    def post(self, request):
+        """
+        Provision the submitted voters and report counts.
+        
+        Args:
+            request (Request): The HTTP request object
+            
+        Returns:
+            Response: Provisioning results or validation errors
+        """
+        serializer = VoterProvisionSerializer(data=request.data)
+        if not serializer.is_valid():
+            return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+        
+        data = serializer.validated_data
+        if 'file' in data:
+            rows = read_voter_rows(data['file'])
+        else:
+            rows = data['voters']
+        
+        # Read one row past the limit to tell whether the roll exceeds it
+        max_rows = settings.VOTER_PROVISION_API_MAX_ROWS
+        rows = list(islice(rows, max_rows + 1))
+        if len(rows) > max_rows:
+            return Response(
+                {'detail': f"At most {max_rows} voters can be provisioned per request. "
+                           f"Use the provision_voters management command for larger rolls."},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        
+        service = VoterProvisioningService(
+            data['election_event'],
+            provisioned_by=request.user,
+            send_login_links=data['send_login_links']
+        )
+        results = service.provision(rows)
+        return Response(results, status=status.HTTP_201_CREATED)
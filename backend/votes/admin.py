@@ -1,3 +1,82 @@
+"""
+votes/admin.py
+
+Django admin configuration for vote audit logs, result snapshots and
+recount jobs.
+"""
 from django.contrib import admin
 
-# Register your models here.
+from core.admin import LargeTableAdminMixin
+from votes.models import RecountJob, ResultSnapshot, VoteAuditLog
+
+
+@admin.register(VoteAuditLog)
+class VoteAuditLogAdmin(LargeTableAdminMixin, admin.ModelAdmin):
+    """
+    Read-only admin interface for browsing vote audit logs.
+    """
+    list_display = ('action', 'participation_id', 'vote_id', 'performed_by', 'ip_address', 'created_at')
+    list_filter = ('action',)
+    list_select_related = ('performed_by',)
+
+    def has_add_permission(self, request):
+        """
+        Audit logs are written by the voting flow only.
+        """
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        """
+        Audit logs are immutable.
+        """
+        return False
+
+    def has_delete_permission(self, request, obj=None):
+        """
+        Audit logs are never deleted from the admin.
+        """
+        return False
+
+
+@admin.register(ResultSnapshot)
+class ResultSnapshotAdmin(admin.ModelAdmin):
+    """
+    Read-only admin interface for recounted results.
+    """
+    list_display = ('election', 'verified_votes', 'total_votes', 'invalid_hashes', 'is_certified', 'created_at')
+    list_filter = ('is_certified',)
+    list_select_related = ('election__election_event',)
+
+    def has_add_permission(self, request):
+        """
+        Snapshots are written by recounts only.
+        """
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        """
+        Snapshots are immutable.
+        """
+        return False
+
+
+@admin.register(RecountJob)
+class RecountJobAdmin(admin.ModelAdmin):
+    """
+    Read-only admin interface for following queued recounts.
+    """
+    list_display = ('election', 'status', 'certify', 'requested_by', 'snapshot', 'created_at', 'finished_at')
+    list_filter = ('status',)
+    list_select_related = ('election__election_event', 'requested_by', 'snapshot')
+
+    def has_add_permission(self, request):
+        """
+        Recounts are queued from the election admin.
+        """
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        """
+        Jobs are updated by the recount worker only.
+        """
+        return False
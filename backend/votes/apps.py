@@ -4,3 +4,6 @@ from django.apps import AppConfig
 class VotesConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'votes'
+
+    def ready(self):
+        import votes.signals  # noqa: F401
@@ -0,0 +1,529 @@
+"""
+votes/archive.py
+
+This module moves a closed election event's votes, participation ledger and
+audit logs into cold storage, and back.
+
+An archive is a directory in the 'archive' storage (local disk or
+S3-compatible object storage, see STORAGES) holding:
+
+- votes.ndjson.gz, participations.ndjson.gz and audit_logs.ndjson.gz: one
+  flat JSON object per row, every row with the same columns in the same
+  order, so the files load straight into columnar tools (DuckDB, pandas,
+  Spark, BigQuery);
+- results.json.gz: the results and participation snapshot at archive time;
+- manifest.json: the event, and per file its row count, SHA-256 checksum,
+  size and column types.
+
+Rows are read in primary key order with keyset queries and streamed through
+gzip into a temporary file, so memory use does not grow with the event.
+Files are read back and checked against the manifest before any row is
+removed, and again before a restore or a results read.
+"""
+import gzip
+import hashlib
+import json
+import logging
+import tempfile
+from datetime import date, datetime
+from decimal import Decimal
+from uuid import UUID
+
+from django.conf import settings
+from django.core.files import File
+from django.core.files.storage import storages
+from django.db import connection, transaction
+from django.db.models import Count, Q
+from django.utils import timezone
+
+from core.deletion import purge_batch
+from votes.models import Participation, Vote, VoteArchive, VoteAuditLog
+from votes.partitioning import create_event_partitions, detach_event_partitions, is_partitioned
+
+logger = logging.getLogger(__name__)
+
+# Version 2 added the participation ledger and removed voters and
+# timestamps from votes
+ARCHIVE_FORMAT_VERSION = 2
+
+# Manifest key and model of each row file, in restore order
+ROW_FILES = [
+    ('votes', Vote),
+    ('participations', Participation),
+    ('audit_logs', VoteAuditLog),
+]
+
+
+def archive_storage():
+    """
+    Return the storage archives are written to.
+    """
+    return storages['archive']
+
+
+def _json_default(value):
+    """
+    Encode the column types json cannot, keeping full timestamp precision.
+    """
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    if isinstance(value, (UUID, Decimal)):
+        return str(value)
+    raise TypeError(f"Cannot encode {type(value).__name__}")
+
+
+def _dumps(data):
+    return json.dumps(data, default=_json_default, separators=(',', ':'))
+
+
+class _HashingWriter:
+    """
+    File wrapper computing the SHA-256 and size of everything written.
+    """
+    def __init__(self, file):
+        self.file = file
+        self.sha256 = hashlib.sha256()
+        self.size = 0
+
+    def write(self, data):
+        self.sha256.update(data)
+        self.size += len(data)
+        return self.file.write(data)
+
+    def flush(self):
+        self.file.flush()
+
+
+class _HashingReader:
+    """
+    File wrapper computing the SHA-256 and size of everything read.
+    """
+    def __init__(self, file):
+        self.file = file
+        self.sha256 = hashlib.sha256()
+        self.size = 0
+
+    def read(self, size=-1):
+        data = self.file.read(size)
+        self.sha256.update(data)
+        self.size += len(data)
+        return data
+
+    def drain(self):
+        while self.read(65536):
+            pass
+
+
+def _write_gzip(storage, name, lines):
+    """
+    Compress lines of text into a storage file.
+
+    Returns:
+        dict: Manifest entry with the file's name, rows, size and sha256
+    """
+    rows = 0
+    with tempfile.TemporaryFile() as spool:
+        writer = _HashingWriter(spool)
+        with gzip.GzipFile(fileobj=writer, mode='wb', mtime=0) as compressed:
+            for line in lines:
+                compressed.write(line.encode() + b'\n')
+                rows += 1
+        spool.seek(0)
+        saved = storage.save(name, File(spool, name=name))
+    if saved != name:
+        raise ValueError(f"Archive file {name} already exists.")
+    return {
+        'name': name.rsplit('/', 1)[-1],
+        'rows': rows,
+        'size': writer.size,
+        'sha256': writer.sha256.hexdigest(),
+    }
+
+
+def _iter_event_rows(model, event_id, columns, batch_size):
+    """
+    Yield an event's rows of a model as dicts, in primary key order.
+
+    Uses keyset queries of batch_size rows rather than one long-lived
+    cursor, so it also works behind transaction-mode connection poolers.
+    The primary key must be the first column.
+    """
+    queryset = model._base_manager.filter(election_event_id=event_id).order_by('pk')
+    last = None
+    while True:
+        batch = queryset if last is None else queryset.filter(pk__gt=last)
+        rows = list(batch.values_list(*columns)[:batch_size])
+        for row in rows:
+            yield dict(zip(columns, row))
+        if len(rows) < batch_size:
+            return
+        last = rows[-1][0]
+
+
+def _columns(model):
+    """
+    Return a model's columns, primary key first, with their field types.
+    """
+    fields = sorted(model._meta.concrete_fields, key=lambda field: not field.primary_key)
+    return [
+        {'name': field.attname, 'type': field.get_internal_type()}
+        for field in fields
+    ]
+
+
+def results_snapshot(election_event):
+    """
+    Return the results and participation of an event, as archived.
+
+    Args:
+        election_event: ElectionEvent instance
+
+    Returns:
+        dict: Event, per-election results by candidate, and participation
+    """
+    elections = []
+    for election in election_event.elections.order_by('start_time'):
+        counts = {
+            row['candidate_id']: row
+            for row in (
+                Vote.objects
+                .filter(election_event_id=election_event.id, election=election)
+                .values('candidate_id')
+                .annotate(
+                    verified=Count('id', filter=Q(is_verified=True)),
+                    unverified=Count('id', filter=Q(is_verified=False))
+                )
+            )
+        }
+        results = sorted(
+            (
+                {
+                    'candidate_id': candidate.id,
+                    'candidate_name': f"{candidate.first_name} {candidate.last_name}",
+                    'vote_count': counts.get(candidate.id, {}).get('verified', 0),
+                }
+                for candidate in election.candidates.all()
+            ),
+            key=lambda result: -result['vote_count']
+        )
+        elections.append({
+            'election_id': election.id,
+            'election_title': election.title,
+            'start_time': election.start_time,
+            'end_time': election.end_time,
+            'total_votes': sum(result['vote_count'] for result in results),
+            'unverified_votes': sum(row['unverified'] for row in counts.values()),
+            'results': results,
+        })
+
+    return {
+        'election_event': {
+            'id': election_event.id,
+            'title': election_event.title,
+            'start_time': election_event.start_time,
+            'end_time': election_event.end_time,
+        },
+        'elections': elections,
+        'participation': Vote.get_voter_participation(election_event),
+        'generated_at': timezone.now(),
+    }
+
+
+def read_manifest(archive):
+    """
+    Read an archive's manifest, checking it against the recorded checksum.
+
+    Raises:
+        ValueError: If the manifest is missing or was modified
+    """
+    storage = archive_storage()
+    name = f"{archive.location}/manifest.json"
+    if not storage.exists(name):
+        raise ValueError(f"Archive manifest {name} is missing.")
+    with storage.open(name, 'rb') as file:
+        data = file.read()
+    if hashlib.sha256(data).hexdigest() != archive.manifest_sha256:
+        raise ValueError(f"Archive manifest {name} does not match its checksum.")
+    return json.loads(data)
+
+
+def _open_file(archive, entry):
+    """
+    Open an archive file for reading, wrapped to hash what is read.
+
+    Returns:
+        tuple: (raw file, hashing reader, gzip stream of lines)
+    """
+    raw = archive_storage().open(f"{archive.location}/{entry['name']}", 'rb')
+    reader = _HashingReader(raw)
+    return raw, reader, gzip.GzipFile(fileobj=reader, mode='rb')
+
+
+def _check_file(entry, reader, rows):
+    """
+    Compare a fully read archive file with its manifest entry.
+    """
+    reader.drain()
+    if reader.sha256.hexdigest() != entry['sha256'] or reader.size != entry['size']:
+        raise ValueError(f"Archive file {entry['name']} does not match its checksum.")
+    if rows is not None and rows != entry['rows']:
+        raise ValueError(f"Archive file {entry['name']} has {rows} rows, expected {entry['rows']}.")
+
+
+def verify_archive(archive):
+    """
+    Read every file of an archive back and check it against the manifest.
+
+    Returns:
+        dict: The manifest
+
+    Raises:
+        ValueError: If a file is missing, corrupt or incomplete
+    """
+    manifest = read_manifest(archive)
+    for key, entry in manifest['files'].items():
+        raw, reader, lines = _open_file(archive, entry)
+        with raw:
+            try:
+                rows = sum(1 for _ in lines) if key != 'results' else None
+            except (OSError, EOFError) as e:
+                raise ValueError(f"Archive file {entry['name']} is corrupt: {str(e)}")
+            _check_file(entry, reader, rows)
+    return manifest
+
+
+def read_results(archive):
+    """
+    Return the results snapshot of an archive, verified against the manifest.
+    """
+    entry = read_manifest(archive)['files']['results']
+    raw, reader, stream = _open_file(archive, entry)
+    with raw:
+        try:
+            data = stream.read()
+        except (OSError, EOFError) as e:
+            raise ValueError(f"Archive file {entry['name']} is corrupt: {str(e)}")
+        _check_file(entry, reader, None)
+    return json.loads(data)
+
+
+def delete_archive_files(archive):
+    """
+    Delete an archive's files from the storage.
+    """
+    storage = archive_storage()
+    if not archive.location:
+        return
+    try:
+        _, names = storage.listdir(archive.location)
+    except FileNotFoundError:
+        return
+    for name in names:
+        storage.delete(f"{archive.location}/{name}")
+
+
+def purge_event_rows(event_id, batch_size):
+    """
+    Remove an event's votes and audit logs from the database.
+
+    Drops the event's partitions when the tables are partitioned, then
+    deletes whatever is left (all rows otherwise) in batches.
+
+    Returns:
+        int: Rows deleted in batches
+    """
+    try:
+        detach_event_partitions(event_id, drop=True)
+    except ValueError:
+        # Not partitioned, or the event has no partitions of its own
+        pass
+
+    deleted = 0
+    for _, model in reversed(ROW_FILES):
+        queryset = model._base_manager.filter(election_event_id=event_id)
+        while True:
+            count = purge_batch(queryset, batch_size)
+            deleted += count
+            if count < batch_size:
+                break
+    return deleted
+
+
+def archive_event(election_event, batch_size=None):
+    """
+    Archive a closed event's votes and audit logs, then remove the rows.
+
+    An interrupted archive is resumed: if its files are complete it goes
+    straight to removing the rows, otherwise it is written again.
+
+    Args:
+        election_event: ElectionEvent instance, ended
+        batch_size (int): Rows per query (default ARCHIVE_BATCH_SIZE)
+
+    Returns:
+        VoteArchive: The completed archive
+
+    Raises:
+        ValueError: If the event has not ended or is already archived
+    """
+    batch_size = batch_size or settings.ARCHIVE_BATCH_SIZE
+    if not election_event.has_ended():
+        raise ValueError(f"Election event '{election_event.title}' has not ended yet.")
+    if election_event.vote_archives.filter(status=VoteArchive.ARCHIVED).exists():
+        raise ValueError(f"Election event '{election_event.title}' is already archived.")
+
+    archive = election_event.vote_archives.filter(status=VoteArchive.WRITING).first()
+    manifest = None
+    if archive is not None:
+        try:
+            manifest = verify_archive(archive)
+            if manifest['format_version'] != ARCHIVE_FORMAT_VERSION:
+                raise ValueError(f"Archive {archive.id} is in an older format.")
+        except ValueError:
+            manifest = None
+            delete_archive_files(archive)
+            archive.delete()
+            archive = None
+
+    if manifest is None:
+        archive = VoteArchive(election_event=election_event)
+        archive.location = f"events/{election_event.id}/{archive.id}"
+        archive.save()
+        manifest = write_archive(archive, election_event, batch_size)
+        verify_archive(archive)
+
+    for key, model in ROW_FILES:
+        live = model._base_manager.filter(election_event_id=election_event.id).count()
+        if live > manifest['files'][key]['rows']:
+            raise ValueError(
+                f"{live - manifest['files'][key]['rows']} {key} rows were added after "
+                f"the archive was written; archive again."
+            )
+
+    purge_event_rows(election_event.id, batch_size)
+
+    archive.status = VoteArchive.ARCHIVED
+    archive.vote_count = manifest['files']['votes']['rows']
+    archive.audit_log_count = manifest['files']['audit_logs']['rows']
+    archive.save(update_fields=['status', 'vote_count', 'audit_log_count', 'updated_at'])
+    logger.info(f"Archived election event {election_event.id} to {archive.location}")
+    return archive
+
+
+def write_archive(archive, election_event, batch_size):
+    """
+    Write an event's files and manifest, and record the manifest checksum.
+
+    Returns:
+        dict: The manifest
+    """
+    storage = archive_storage()
+    files = {}
+    for key, model in ROW_FILES:
+        columns = _columns(model)
+        names = [column['name'] for column in columns]
+        rows = _iter_event_rows(model, election_event.id, names, batch_size)
+        files[key] = _write_gzip(
+            storage,
+            f"{archive.location}/{key}.ndjson.gz",
+            (_dumps(row) for row in rows)
+        )
+        files[key]['table'] = model._meta.db_table
+        files[key]['columns'] = columns
+    files['results'] = _write_gzip(
+        storage,
+        f"{archive.location}/results.json.gz",
+        [_dumps(results_snapshot(election_event))]
+    )
+
+    manifest = {
+        'format_version': ARCHIVE_FORMAT_VERSION,
+        'election_event': {
+            'id': election_event.id,
+            'title': election_event.title,
+            'start_time': election_event.start_time,
+            'end_time': election_event.end_time,
+        },
+        'created_at': timezone.now(),
+        'files': files,
+    }
+    data = json.dumps(manifest, default=_json_default, indent=2).encode()
+    with tempfile.TemporaryFile() as spool:
+        spool.write(data)
+        spool.seek(0)
+        storage.save(f"{archive.location}/manifest.json", File(spool, name='manifest.json'))
+
+    archive.manifest_sha256 = hashlib.sha256(data).hexdigest()
+    archive.save(update_fields=['manifest_sha256', 'updated_at'])
+    return json.loads(data)
+
+
+def _insert_rows(model, columns, rows):
+    """
+    Insert archived rows as they were, keeping their ids and timestamps.
+
+    Rows already present are skipped, so a restore can be repeated.
+    """
+    qn = connection.ops.quote_name
+    column_sql = ', '.join(qn(column) for column in columns)
+    placeholders = ', '.join(['(' + ', '.join(['%s'] * len(columns)) + ')'] * len(rows))
+    params = [row.get(column) for row in rows for column in columns]
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f"INSERT INTO {qn(model._meta.db_table)} ({column_sql}) VALUES {placeholders} "
+            f"ON CONFLICT DO NOTHING",
+            params
+        )
+
+
+def restore_archive(archive, batch_size=None):
+    """
+    Bring an archived event's votes and audit logs back into the database.
+
+    The files are verified first and the rows inserted in one transaction,
+    so a failed restore leaves nothing behind. The archive files are kept.
+
+    Args:
+        archive (VoteArchive): An archive with status 'archived'
+        batch_size (int): Rows per INSERT (default ARCHIVE_BATCH_SIZE)
+
+    Raises:
+        ValueError: If the archive is not archived, fails verification, or
+            was written in an older format
+    """
+    batch_size = batch_size or settings.ARCHIVE_BATCH_SIZE
+    if archive.status != VoteArchive.ARCHIVED:
+        raise ValueError(f"Archive {archive.id} is {archive.status}, not archived.")
+    manifest = verify_archive(archive)
+    if manifest['format_version'] != ARCHIVE_FORMAT_VERSION:
+        # Version 1 votes name their voter and have no participation
+        # ledger; their results can still be read with read_results()
+        raise ValueError(
+            f"Archive {archive.id} is in format {manifest['format_version']}, "
+            f"which cannot be restored into the current vote tables."
+        )
+
+    if is_partitioned(Vote):
+        create_event_partitions(archive.election_event_id)
+
+    with transaction.atomic():
+        for key, model in ROW_FILES:
+            entry = manifest['files'][key]
+            known = {field.attname for field in model._meta.concrete_fields}
+            columns = [column['name'] for column in entry['columns'] if column['name'] in known]
+            raw, reader, lines = _open_file(archive, entry)
+            with raw:
+                batch = []
+                for line in lines:
+                    batch.append(json.loads(line))
+                    if len(batch) == batch_size:
+                        _insert_rows(model, columns, batch)
+                        batch = []
+                if batch:
+                    _insert_rows(model, columns, batch)
+                _check_file(entry, reader, None)
+
+        archive.status = VoteArchive.RESTORED
+        archive.restored_at = timezone.now()
+        archive.save(update_fields=['status', 'restored_at', 'updated_at'])
+    logger.info(f"Restored election event {archive.election_event_id} from {archive.location}")
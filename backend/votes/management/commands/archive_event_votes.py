@@ -0,0 +1,41 @@
+"""
+votes/management/commands/archive_event_votes.py
+
+This module defines a management command that moves a closed election
+event's votes and audit logs into cold storage.
+"""
+from django.core.exceptions import ValidationError
+from django.core.management.base import BaseCommand, CommandError
+
+from election_events.models import ElectionEvent
+from votes.archive import archive_event
+
+
+class Command(BaseCommand):
+    """
+    Write an ended event's votes, audit logs and results snapshot to
+    compressed, checksummed files in the 'archive' storage, verify them,
+    then remove the rows from the database. Re-running an interrupted
+    archive resumes it.
+    """
+    help = "Archive a closed election event's votes and audit logs."
+
+    def add_arguments(self, parser):
+        parser.add_argument('event_id', help="Election event id")
+        parser.add_argument('--batch-size', type=int, default=None, help="Rows per query")
+
+    def handle(self, *args, **options):
+        try:
+            event = ElectionEvent.objects.get(pk=options['event_id'])
+        except (ElectionEvent.DoesNotExist, ValidationError):
+            raise CommandError(f"Election event {options['event_id']} not found.")
+
+        try:
+            archive = archive_event(event, batch_size=options['batch_size'])
+        except ValueError as e:
+            raise CommandError(str(e))
+
+        self.stdout.write(self.style.SUCCESS(
+            f"Archived {archive.vote_count} votes and {archive.audit_log_count} audit log "
+            f"entries of '{event.title}' to {archive.location}."
+        ))
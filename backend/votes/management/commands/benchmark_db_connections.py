@@ -0,0 +1,87 @@
+"""
+votes/management/commands/benchmark_db_connections.py
+
+This module defines a management command that measures check_vote_status
+latency with fresh, persistent and pooled database connections.
+"""
+import statistics
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import close_old_connections, connection
+from django.db.backends.postgresql.psycopg_any import is_psycopg3
+from django.test import Client
+from django.urls import reverse
+
+from elections.models import Election
+from rest_framework.authtoken.models import Token
+from users.models import VoterProfile
+
+
+class Command(BaseCommand):
+    """
+    Call the check_vote_status endpoint repeatedly as a given voter and
+    report p50/p99 latency per connection mode. Connections are opened and
+    released around each request exactly as the WSGI handler does, so the
+    'fresh' mode pays a new connection and handshake on every request.
+    The 'pool' mode is only run when psycopg 3 and psycopg_pool are in use.
+    """
+    help = "Benchmark check_vote_status latency with and without connection reuse."
+
+    def add_arguments(self, parser):
+        parser.add_argument('voter_email', help="Email of a voter whose election is queried")
+        parser.add_argument('--requests', type=int, default=500, help="Requests per mode")
+
+    def handle(self, *args, **options):
+        profile = (
+            VoterProfile.objects
+            .select_related('user')
+            .filter(user__email=options['voter_email'])
+            .first()
+        )
+        if profile is None:
+            raise CommandError(f"No voter with email {options['voter_email']}")
+        election = Election.objects.filter(election_event_id=profile.election_event_id).first()
+        if election is None:
+            raise CommandError("The voter's election event has no elections")
+
+        token, _ = Token.objects.get_or_create(user=profile.user)
+        client = Client(HTTP_AUTHORIZATION=f'Token {token.key}', HTTP_HOST='localhost')
+        url = reverse('votes:check-vote-status', args=[election.pk])
+
+        modes = [('fresh', {'CONN_MAX_AGE': 0}), ('persistent', {'CONN_MAX_AGE': 60})]
+        if is_psycopg3:
+            modes.append(('pool', {'CONN_MAX_AGE': 0, 'OPTIONS': {'pool': True}}))
+        else:
+            self.stdout.write("pool: skipped (psycopg 3 is not installed)")
+
+        original = dict(connection.settings_dict)
+        try:
+            for label, overrides in modes:
+                connection.close()
+                connection.settings_dict.update(overrides)
+                timings = self.run(client, url, options['requests'])
+                p50 = statistics.median(timings)
+                p99 = statistics.quantiles(timings, n=100)[98]
+                self.stdout.write(f"{label:<11} p50 {p50:7.2f} ms   p99 {p99:7.2f} ms")
+                if 'pool' in overrides.get('OPTIONS', {}):
+                    connection.close_pool()
+        finally:
+            connection.close()
+            connection.settings_dict.clear()
+            connection.settings_dict.update(original)
+
+    def run(self, client, url, count):
+        """
+        Issue ``count`` requests and return their latencies in milliseconds.
+        """
+        timings = []
+        for _ in range(count):
+            start = time.perf_counter()
+            close_old_connections()  # request_started
+            response = client.get(url)
+            close_old_connections()  # request_finished
+            timings.append((time.perf_counter() - start) * 1000)
+            if response.status_code != 200:
+                raise CommandError(f"{url} returned {response.status_code}")
+        return timings
@@ -0,0 +1,286 @@
+"""
+votes/management/commands/check_vote_query_plans.py
+
+This module defines a management command that runs EXPLAIN (ANALYZE,
+BUFFERS) on the hot vote and participation queries over seeded data and
+fails if any of them scans a vote or participation table sequentially.
+"""
+import random
+import uuid
+from datetime import timedelta
+
+from django.contrib.contenttypes.models import ContentType
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+from django.db.models import Count
+from django.db.models.functions import TruncHour
+from django.utils import timezone
+
+from core.deletion import run_job
+from core.explain import explain, plan_index_names, plan_nodes
+from core.models import DeletionJob
+from election_events.models import ElectionEvent
+from elections.models import Candidate, Election
+from users.models import User, VoterProfile
+from votes.models import Participation, Vote
+from votes.partitioning import create_event_partitions, is_partitioned, partition_name
+
+# Smallest seeds at which the planner should prefer the indexes
+MIN_EVENTS = 5
+MIN_VOTES = 1000
+
+
+def hot_queries(election, vote, participation):
+    """
+    Return (label, queryset, index) for each hot vote and participation
+    query, built like the views build them, with the index designed to
+    answer it.
+
+    Args:
+        election: Election queried
+        vote: One of its votes, whose receipt is looked up
+        participation: One of its participations, whose voter is looked up
+
+    Returns:
+        list: (label, queryset, index name) triples
+    """
+    election_votes = Vote.objects.filter(election_event_id=election.election_event_id, election=election)
+    verified = election_votes.filter(is_verified=True)
+    return [
+        ('results', (
+            verified
+            .values('candidate__id', 'candidate__first_name', 'candidate__last_name')
+            .annotate(vote_count=Count('id'))
+            .order_by('-vote_count')
+        ), 'vote_verified_by_candidate_idx'),
+        ('total verified', (
+            verified.values('election_id').annotate(total=Count('id'))
+        ), 'vote_verified_by_candidate_idx'),
+        ('unverified count', (
+            election_votes.filter(is_verified=False)
+            .values('election_id').annotate(total=Count('id'))
+        ), 'vote_unverified_candidate_idx'),
+        ('receipt lookup', (
+            Vote.objects.select_related('candidate', 'election').filter(vote_hash=vote.vote_hash)
+        ), 'vote_hash_event_candidate_uniq'),
+        ('timeline', (
+            Participation.objects.filter(election=election)
+            .annotate(bucket=TruncHour('created_at', tzinfo=timezone.get_current_timezone()))
+            .values('bucket')
+            .annotate(vote_count=Count('*'))
+            .order_by('bucket')
+        ), 'participation_election_idx'),
+        ('has voted', (
+            Participation.objects.filter(voter_id=participation.voter_id, election=election)
+        ), 'participation_voter_election_uniq'),
+        ('elections voted in', (
+            Participation.objects.filter(voter_id=participation.voter_id).values('election_id')
+        ), 'participation_voter_election_uniq'),
+        # Counted with count(), which drops the default created_at ordering
+        # that would otherwise join the DISTINCT
+        ('voters in event', (
+            Participation.objects.filter(election_event_id=election.election_event_id)
+            .values('voter').distinct().order_by()
+        ), 'participation_event_idx'),
+    ]
+
+
+def index_roots(names):
+    """
+    Return index names with each partition's index replaced by the
+    partitioned index it belongs to, so plans over partitions can be
+    compared with the indexes declared on the models.
+
+    Args:
+        names (set): Index names read by a plan
+
+    Returns:
+        set: Index names
+    """
+    with connection.cursor() as cursor:
+        cursor.execute(
+            "SELECT COALESCE(pg_partition_root(name::regclass)::text, name) FROM unnest(%s::text[]) AS name",
+            [sorted(names)]
+        )
+        return {name for (name,) in cursor.fetchall()}
+
+
+class Command(BaseCommand):
+    """
+    Seed several election events with voters and ballots, ANALYZE, and run
+    the queries behind election results, election statistics, receipt
+    verification, turnout timelines and the voter's "has voted" checks
+    under EXPLAIN (ANALYZE, BUFFERS). Each query is reported with its
+    execution time, shared buffers read and the indexes it used, and the
+    command fails if any plan contains a sequential scan of the vote table,
+    one of its partitions, or the participation ledger, or answers a query
+    from another index than the one designed for it. Unlike
+    check_search_indexes, sequential scans are left enabled: the seeded
+    tables are large enough that the planner must prefer the indexes on its
+    own. Two kinds of scans are allowed: of tables and partitions smaller
+    than --small-pages pages, which the planner rightly reads whole, and of
+    the queried event's own partition, which pruning has already narrowed
+    to that event's rows. For the same reason the command refuses fewer
+    than MIN_EVENTS events or MIN_VOTES ballots per event: on smaller
+    tables, or when the queried event holds a large share of the rows,
+    reading the whole table is the better plan.
+
+    The seeded rows are committed and vacuumed before the check, since
+    index-only scans are only planned over pages the visibility map marks
+    all-visible, and are deleted again afterwards through DeletionJobs.
+    Meant for development and CI databases, to measure the queries at a
+    realistic size; votes/tests.py checks on small tables that each query
+    can use its designed index.
+    """
+    help = "Check that the vote and participation queries never scan their tables."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--events', type=int, default=5, help="Election events seeded")
+        parser.add_argument(
+            '--votes', type=int, default=20000, help="Ballots seeded per event, each by its own voter"
+        )
+        parser.add_argument('--candidates', type=int, default=5, help="Candidates per election")
+        parser.add_argument(
+            '--unverified', type=float, default=0.02, help="Fraction of seeded votes left unverified"
+        )
+        parser.add_argument(
+            '--small-pages', type=int, default=10, help="Partitions below this many pages may be scanned"
+        )
+
+    def handle(self, *args, **options):
+        if options['events'] < MIN_EVENTS or options['votes'] < MIN_VOTES:
+            raise CommandError(
+                f"Seed at least {MIN_EVENTS} events of {MIN_VOTES} ballots; below that, "
+                f"sequential scans are the better plan."
+            )
+        run = uuid.uuid4().hex[:8]
+        with transaction.atomic():
+            events = self.seed(run, options)
+        try:
+            with connection.cursor() as cursor:
+                cursor.execute(
+                    "VACUUM ANALYZE votes_vote, votes_participation, users_voterprofile, elections_candidate"
+                )
+            failures = self.check_plans(events[-1], options['small_pages'])
+        finally:
+            self.cleanup(run, events)
+
+        if failures:
+            raise CommandError(f"{len(failures)} vote queries scan their table sequentially.")
+        self.stdout.write(self.style.SUCCESS("No vote query scans its table sequentially."))
+
+    def check_plans(self, event, small_pages):
+        """
+        Explain the hot queries over one seeded event and report their plans.
+
+        Returns:
+            list: Labels of the queries with a sequential scan of a checked
+            table
+        """
+        election = event.elections.get()
+        vote = Vote.objects.filter(election_event=event).order_by('?').first()
+        participation = Participation.objects.filter(election=election).order_by('?').first()
+        own_partition = partition_name(Vote, event.pk)
+        tables = (Vote._meta.db_table, Participation._meta.db_table)
+        with connection.cursor() as cursor:
+            cursor.execute(
+                "SELECT relname FROM pg_class WHERE relname LIKE ANY(%s) AND relkind = 'r' AND relpages < %s",
+                [[f'{table}%' for table in tables], small_pages]
+            )
+            allowed = {name for (name,) in cursor.fetchall()} | {own_partition}
+
+        failures = []
+        for label, queryset, index in hot_queries(election, vote, participation):
+            plan = explain(queryset, analyze=True, buffers=True)
+            root = plan['Plan']
+            seq_scans = [
+                node['Relation Name'] for node in plan_nodes(root)
+                if node['Node Type'] == 'Seq Scan' and node.get('Relation Name', '').startswith(tables)
+            ]
+            scans = [name for name in seq_scans if name not in allowed]
+            used = index_roots(plan_index_names(root))
+            buffers = root.get('Shared Hit Blocks', 0) + root.get('Shared Read Blocks', 0)
+            stats = f"{plan['Execution Time']:8.2f}ms {buffers:>6} buffers"
+            if scans:
+                failures.append(label)
+                self.stdout.write(f"FAIL  {label:<20} {stats}  seq scan on {', '.join(scans)}")
+            elif index not in used and not seq_scans:
+                failures.append(label)
+                self.stdout.write(f"FAIL  {label:<20} {stats}  {', '.join(sorted(used))} instead of {index}")
+            else:
+                self.stdout.write(f"ok    {label:<20} {stats}  {', '.join(sorted(used)) or 'no index'}")
+        return failures
+
+    def cleanup(self, run, events):
+        """
+        Delete the seeded events and users.
+        """
+        content_type = ContentType.objects.get_for_model(ElectionEvent)
+        for event in events:
+            job = DeletionJob.objects.create(
+                content_type=content_type,
+                object_id=event.pk,
+                object_repr=str(event)[:255],
+                status=DeletionJob.RUNNING
+            )
+            run_job(job)
+            if job.status != DeletionJob.DONE:
+                self.stderr.write(f"Could not delete {event.title}: {job.error}")
+                continue
+            job.delete()
+        User.objects.filter(email__startswith=f'plan-{run}-').delete()
+
+    def seed(self, run, options):
+        """
+        Seed events, one election each, candidates, voters and their
+        ballots, written as Vote.cast_ballot() writes them.
+
+        Returns:
+            list: The seeded events
+        """
+        now = timezone.now()
+        partitioned = is_partitioned(Vote)
+        events = []
+        for number in range(options['events']):
+            event = ElectionEvent.objects.create(
+                title=f'Query plan check {run} {number}',
+                start_time=now - timedelta(days=1),
+                end_time=now + timedelta(days=1)
+            )
+            events.append(event)
+            if partitioned:
+                # The post_save signal only creates partitions on commit
+                create_event_partitions(event.id)
+            election = Election.objects.create(
+                election_event=event,
+                title=f'Query plan check {number}',
+                start_time=event.start_time,
+                end_time=event.end_time
+            )
+            candidates = Candidate.objects.bulk_create([
+                Candidate(election=election, first_name='Candidate', last_name=str(n))
+                for n in range(options['candidates'])
+            ])
+            users = User.objects.bulk_create([
+                User(email=f'plan-{run}-{number}-{n}@example.com', first_name='Plan', last_name='Voter')
+                for n in range(options['votes'])
+            ], batch_size=5000)
+            voters = VoterProfile.objects.bulk_create([
+                VoterProfile(user=user, election_event=event, has_voted=True) for user in users
+            ], batch_size=5000)
+            Participation.objects.bulk_create([
+                Participation(voter=voter, election=election, election_event=event)
+                for voter in voters
+            ], batch_size=5000)
+            Vote.objects.bulk_create([
+                Vote(
+                    election=election,
+                    candidate=random.choice(candidates),
+                    election_event=event,
+                    vote_hash=Vote.generate_receipt(),
+                    is_verified=random.random() >= options['unverified']
+                )
+                for _ in voters
+            ], batch_size=5000)
+            self.stdout.write(f"Seeded {options['votes']} ballots for {event.title}")
+        return events
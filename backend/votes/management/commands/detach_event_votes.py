@@ -0,0 +1,47 @@
+"""
+votes/management/commands/detach_event_votes.py
+
+This module defines a management command that takes a closed election
+event's votes and audit logs out of the live tables.
+"""
+from django.core.exceptions import ValidationError
+from django.core.management.base import BaseCommand, CommandError
+
+from election_events.models import ElectionEvent
+from votes.partitioning import detach_event_partitions
+
+
+class Command(BaseCommand):
+    """
+    Detach an event's vote and audit log partitions, leaving them as
+    standalone tables to dump and archive, or drop them with --drop.
+
+    Either way no rows are deleted one by one, so removing an event takes
+    the same short time however many votes it holds. Requires the
+    partitioned layout (see partition_votes) and refuses events that have
+    not ended yet.
+    """
+    help = "Detach (or drop) a closed election event's vote partitions."
+
+    def add_arguments(self, parser):
+        parser.add_argument('event_id', help="Election event id")
+        parser.add_argument('--drop', action='store_true', help="Drop the partitions instead of keeping them")
+
+    def handle(self, *args, **options):
+        try:
+            event = ElectionEvent.objects.get(pk=options['event_id'])
+        except (ElectionEvent.DoesNotExist, ValidationError):
+            raise CommandError(f"Election event {options['event_id']} not found.")
+
+        if not event.has_ended():
+            raise CommandError(f"Election event '{event.title}' has not ended yet.")
+
+        try:
+            tables = detach_event_partitions(event.id, drop=options['drop'])
+        except ValueError as e:
+            raise CommandError(str(e))
+
+        action = 'Dropped' if options['drop'] else 'Detached'
+        for table in tables:
+            self.stdout.write(f"{action} {table}")
+        self.stdout.write(self.style.SUCCESS(f"{action} the votes of '{event.title}'."))
@@ -0,0 +1,65 @@
+"""
+votes/management/commands/partition_votes.py
+
+This module defines a management command that switches the vote tables to
+the partitioned-by-event layout.
+"""
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+
+from election_events.models import ElectionEvent
+from votes.partitioning import (
+    PARTITIONED_MODELS,
+    PARTITION_COLUMN,
+    convert_to_partitioned,
+    create_event_partitions,
+    default_partition_name,
+    is_partitioned
+)
+
+
+class Command(BaseCommand):
+    """
+    Convert votes_vote and votes_voteauditlog into tables partitioned by
+    election event, then make sure every event has its partitions.
+
+    The conversion copies every row and holds an exclusive lock on both
+    tables until it commits, so run it in a maintenance window. Running it
+    again on partitioned tables only creates missing partitions, and lists
+    events whose rows sit in the DEFAULT partition.
+    """
+    help = "Partition the vote and audit log tables by election event."
+
+    def handle(self, *args, **options):
+        if connection.vendor != 'postgresql':
+            raise CommandError("Partitioning requires PostgreSQL.")
+
+        with transaction.atomic():
+            for model in PARTITIONED_MODELS:
+                if is_partitioned(model):
+                    self.stdout.write(f"{model._meta.db_table} is already partitioned.")
+                    continue
+                try:
+                    convert_to_partitioned(model)
+                except ValueError as e:
+                    raise CommandError(str(e))
+                self.stdout.write(f"Converted {model._meta.db_table}.")
+
+        created = []
+        for event_id in ElectionEvent.objects.values_list('id', flat=True):
+            created.extend(create_event_partitions(event_id))
+        self.stdout.write(f"Created {len(created)} missing partitions.")
+
+        qn = connection.ops.quote_name
+        with connection.cursor() as cursor:
+            for model in PARTITIONED_MODELS:
+                cursor.execute(
+                    f"SELECT {qn(PARTITION_COLUMN)}, count(*) "
+                    f"FROM {qn(default_partition_name(model))} GROUP BY 1"
+                )
+                for event_id, count in cursor.fetchall():
+                    self.stdout.write(self.style.WARNING(
+                        f"{default_partition_name(model)} holds {count} rows of event {event_id}"
+                    ))
+
+        self.stdout.write(self.style.SUCCESS("Vote tables are partitioned by election event."))
@@ -0,0 +1,45 @@
+"""
+votes/management/commands/restore_event_votes.py
+
+This module defines a management command that brings an archived election
+event's votes and audit logs back into the database.
+"""
+from django.core.exceptions import ValidationError
+from django.core.management.base import BaseCommand, CommandError
+
+from votes.archive import restore_archive
+from votes.models import VoteArchive
+
+
+class Command(BaseCommand):
+    """
+    Verify an event's archive against its manifest and insert its votes
+    and audit logs back, with their original ids and timestamps. The
+    voters and candidates they reference must still exist.
+    """
+    help = "Restore an archived election event's votes and audit logs."
+
+    def add_arguments(self, parser):
+        parser.add_argument('event_id', help="Election event id")
+        parser.add_argument('--batch-size', type=int, default=None, help="Rows per INSERT")
+
+    def handle(self, *args, **options):
+        try:
+            archive = VoteArchive.objects.filter(
+                election_event_id=options['event_id'],
+                status=VoteArchive.ARCHIVED
+            ).first()
+        except ValidationError:
+            archive = None
+        if archive is None:
+            raise CommandError(f"No archive found for election event {options['event_id']}.")
+
+        try:
+            restore_archive(archive, batch_size=options['batch_size'])
+        except ValueError as e:
+            raise CommandError(str(e))
+
+        self.stdout.write(self.style.SUCCESS(
+            f"Restored {archive.vote_count} votes and {archive.audit_log_count} audit log "
+            f"entries from {archive.location}."
+        ))
@@ -0,0 +1,45 @@
+"""
+votes/management/commands/run_recount_jobs.py
+
+This module defines the worker command that runs queued recounts.
+"""
+import time
+
+from django.core.management.base import BaseCommand
+
+from votes.recount import claim_recount_job, run_recount_job
+
+
+class Command(BaseCommand):
+    """
+    Claim queued RecountJobs one at a time, recount their elections and
+    save result snapshots. Several workers can run side by side; each job
+    is claimed with SELECT ... FOR UPDATE SKIP LOCKED. With --once the
+    worker exits when the queue is empty, otherwise it polls every --sleep
+    seconds.
+    """
+    help = "Run queued election recounts."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--once', action='store_true', help="Exit when no job is queued")
+        parser.add_argument('--sleep', type=float, default=5.0, help="Seconds between polls of an empty queue")
+        parser.add_argument('--chunk-size', type=int, default=None, help="Rows fetched per round trip")
+
+    def handle(self, *args, **options):
+        while True:
+            job = claim_recount_job()
+            if job is None:
+                if options['once']:
+                    return
+                time.sleep(options['sleep'])
+                continue
+
+            self.stdout.write(f"Running recount job {job.pk}: election {job.election_id}")
+            result = run_recount_job(job, chunk_size=options['chunk_size'])
+            if result is None:
+                self.stdout.write(self.style.ERROR(f"Recount job {job.pk} failed: {job.error}"))
+            else:
+                certified = ' certified' if result['is_certified'] else ''
+                self.stdout.write(self.style.SUCCESS(
+                    f"Recounted {job.election_id}: {result['rows']} votes in {result['seconds']:.2f}s{certified}"
+                ))
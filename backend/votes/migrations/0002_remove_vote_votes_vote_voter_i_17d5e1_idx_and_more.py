@@ -0,0 +1,29 @@
+# Generated by Django 5.2.3 on 2026-10-19 00:49
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('elections', '0004_election_elections_e_created_7c8097_idx_and_more'),
+        ('users', '0006_voterprofile_election_event'),
+        ('votes', '0001_initial'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='vote',
+            name='votes_vote_voter_i_17d5e1_idx',
+        ),
+        migrations.AddIndex(
+            model_name='vote',
+            index=models.Index(fields=['voter', 'created_at', 'id'], name='votes_vote_voter_i_4535ca_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='voteauditlog',
+            index=models.Index(fields=['created_at', 'id'], name='votes_votea_created_1d02f8_idx'),
+        ),
+    ]
@@ -0,0 +1,24 @@
+# Generated by Django 5.2.3 on 2026-10-19 01:19
+
+import core.models
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('votes', '0003_alter_vote_id_alter_voteauditlog_id'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='vote',
+            name='id',
+            field=models.UUIDField(default=core.models.generate_uuid7, editable=False, primary_key=True, serialize=False),
+        ),
+        migrations.AlterField(
+            model_name='voteauditlog',
+            name='id',
+            field=models.UUIDField(default=core.models.generate_uuid7, editable=False, primary_key=True, serialize=False),
+        ),
+    ]
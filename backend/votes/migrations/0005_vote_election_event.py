@@ -0,0 +1,25 @@
+# Generated by Django 5.2.3 on 2026-10-19 01:22
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('election_events', '0002_alter_electionevent_id'),
+        ('votes', '0004_alter_vote_id_alter_voteauditlog_id'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='vote',
+            name='election_event',
+            field=models.ForeignKey(editable=False, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='votes', to='election_events.electionevent'),
+        ),
+        migrations.AddField(
+            model_name='voteauditlog',
+            name='election_event',
+            field=models.ForeignKey(editable=False, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='vote_audit_logs', to='election_events.electionevent'),
+        ),
+    ]
@@ -0,0 +1,35 @@
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+    """
+    Fill the new election_event columns from each vote's candidate and each
+    audit log's vote.
+    """
+
+    dependencies = [
+        ('elections', '0006_alter_candidate_id_alter_election_id'),
+        ('votes', '0005_vote_election_event'),
+    ]
+
+    operations = [
+        migrations.RunSQL(
+            """
+            UPDATE votes_vote AS v
+            SET election_event_id = e.election_event_id
+            FROM elections_candidate AS c
+            JOIN elections_election AS e ON e.id = c.election_id
+            WHERE c.id = v.candidate_id AND v.election_event_id IS NULL
+            """,
+            migrations.RunSQL.noop,
+        ),
+        migrations.RunSQL(
+            """
+            UPDATE votes_voteauditlog AS a
+            SET election_event_id = v.election_event_id
+            FROM votes_vote AS v
+            WHERE v.id = a.vote_id AND a.election_event_id IS NULL
+            """,
+            migrations.RunSQL.noop,
+        ),
+    ]
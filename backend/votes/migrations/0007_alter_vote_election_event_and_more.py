@@ -0,0 +1,25 @@
+# Generated by Django 5.2.3 on 2026-10-19 01:24
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('election_events', '0002_alter_electionevent_id'),
+        ('votes', '0006_backfill_election_event'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='vote',
+            name='election_event',
+            field=models.ForeignKey(editable=False, on_delete=django.db.models.deletion.CASCADE, related_name='votes', to='election_events.electionevent'),
+        ),
+        migrations.AlterField(
+            model_name='voteauditlog',
+            name='election_event',
+            field=models.ForeignKey(editable=False, on_delete=django.db.models.deletion.CASCADE, related_name='vote_audit_logs', to='election_events.electionevent'),
+        ),
+    ]
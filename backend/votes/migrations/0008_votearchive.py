@@ -0,0 +1,34 @@
+# Generated by Django 5.2.3 on 2026-10-19 01:31
+
+import django.db.models.deletion
+import uuid
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('election_events', '0003_electionevent_is_deleting'),
+        ('votes', '0007_alter_vote_election_event_and_more'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='VoteArchive',
+            fields=[
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('location', models.CharField(max_length=255)),
+                ('status', models.CharField(choices=[('writing', 'Writing'), ('archived', 'Archived'), ('restored', 'Restored')], default='writing', max_length=10)),
+                ('manifest_sha256', models.CharField(blank=True, max_length=64)),
+                ('vote_count', models.PositiveBigIntegerField(default=0)),
+                ('audit_log_count', models.PositiveBigIntegerField(default=0)),
+                ('restored_at', models.DateTimeField(blank=True, null=True)),
+                ('election_event', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='vote_archives', to='election_events.electionevent')),
+            ],
+            options={
+                'ordering': ['-created_at'],
+            },
+        ),
+    ]
@@ -0,0 +1,33 @@
+# Generated by Django 5.2.3 on 2026-10-19 01:37
+
+import django.contrib.postgres.indexes
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('election_events', '0003_electionevent_is_deleting'),
+        ('elections', '0007_election_is_deleting'),
+        ('users', '0010_alter_user_id_alter_voterprofile_id'),
+        ('votes', '0008_votearchive'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='vote',
+            index=models.Index(condition=models.Q(('is_verified', True)), fields=['election_event', 'candidate'], include=('id', 'created_at'), name='vote_verified_by_candidate_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='vote',
+            index=models.Index(condition=models.Q(('is_verified', False)), fields=['election_event', 'candidate'], name='vote_unverified_candidate_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='vote',
+            index=django.contrib.postgres.indexes.BrinIndex(fields=['created_at'], name='vote_created_at_brin_idx'),
+        ),
+        migrations.AddConstraint(
+            model_name='vote',
+            constraint=models.UniqueConstraint(fields=('vote_hash', 'election_event'), name='vote_hash_event_uniq'),
+        ),
+    ]
@@ -0,0 +1,36 @@
+# Generated by Django 5.2.3 on 2026-10-19 01:46
+
+import django.db.models.deletion
+import uuid
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('elections', '0008_election_status'),
+        ('votes', '0009_vote_aggregation_indexes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ResultSnapshot',
+            fields=[
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('results', models.JSONField(default=list)),
+                ('total_votes', models.PositiveBigIntegerField(default=0)),
+                ('verified_votes', models.PositiveBigIntegerField(default=0)),
+                ('invalid_hashes', models.PositiveBigIntegerField(default=0)),
+                ('ballots_sha256', models.CharField(max_length=64)),
+                ('is_certified', models.BooleanField(default=False)),
+                ('duration', models.FloatField(default=0)),
+                ('election', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='result_snapshots', to='elections.election')),
+            ],
+            options={
+                'ordering': ['-created_at'],
+                'indexes': [models.Index(fields=['election', 'created_at'], name='votes_resul_electio_96ea7f_idx')],
+            },
+        ),
+    ]
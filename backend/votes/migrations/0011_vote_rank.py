@@ -0,0 +1,18 @@
+# Generated by Django 5.2.3 on 2026-10-19 01:50
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('votes', '0010_resultsnapshot'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='vote',
+            name='rank',
+            field=models.PositiveSmallIntegerField(default=1),
+        ),
+    ]
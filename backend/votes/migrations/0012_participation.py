@@ -0,0 +1,59 @@
+# Generated by Django 5.2.3 on 2026-10-19 02:10
+
+import core.models
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('election_events', '0004_electionevent_status'),
+        ('elections', '0009_election_tally_method'),
+        ('users', '0010_alter_user_id_alter_voterprofile_id'),
+        ('votes', '0011_vote_rank'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Participation',
+            fields=[
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('id', models.UUIDField(default=core.models.generate_uuid7, editable=False, primary_key=True, serialize=False)),
+                ('election', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='participations', to='elections.election')),
+                ('election_event', models.ForeignKey(editable=False, on_delete=django.db.models.deletion.CASCADE, related_name='participations', to='election_events.electionevent')),
+                ('voter', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='participations', to='users.voterprofile')),
+            ],
+            options={
+                'ordering': ['created_at'],
+                'indexes': [
+                    models.Index(fields=['election', 'created_at'], name='participation_election_idx'),
+                    models.Index(fields=['election_event', 'voter'], name='participation_event_idx'),
+                ],
+                'constraints': [
+                    models.UniqueConstraint(fields=('voter', 'election'), name='participation_voter_election_uniq'),
+                ],
+            },
+        ),
+        migrations.AddField(
+            model_name='vote',
+            name='election',
+            field=models.ForeignKey(editable=False, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='votes', to='elections.election'),
+        ),
+        migrations.AlterField(
+            model_name='voteauditlog',
+            name='vote',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='audit_logs', to='votes.vote'),
+        ),
+        migrations.AddField(
+            model_name='voteauditlog',
+            name='participation',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='audit_logs', to='votes.participation'),
+        ),
+        # A ballot's rows will share one receipt hash
+        migrations.RemoveConstraint(
+            model_name='vote',
+            name='vote_hash_event_uniq',
+        ),
+    ]
@@ -0,0 +1,92 @@
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+    """
+    Move who voted out of the vote table and into the participation ledger.
+
+    Each voter's votes in an election become one ballot: a Participation
+    row is written for them, their votes are given the receipt hash of the
+    ballot's first preference, and the audit log entries of the cast point
+    at the Participation instead of the votes. Vote ids, which were
+    time-ordered, are replaced with random ones so they cannot be matched
+    with the ledger's timestamps.
+    """
+
+    dependencies = [
+        ('votes', '0012_participation'),
+    ]
+
+    operations = [
+        migrations.RunSQL(
+            """
+            UPDATE votes_vote AS v
+            SET election_id = c.election_id
+            FROM elections_candidate AS c
+            WHERE c.id = v.candidate_id AND v.election_id IS NULL
+            """,
+            migrations.RunSQL.noop,
+        ),
+        # Ledger ids are UUIDv7 built from the time of the voter's first vote
+        migrations.RunSQL(
+            """
+            INSERT INTO votes_participation
+                (id, created_at, updated_at, voter_id, election_id, election_event_id)
+            SELECT
+                (
+                    lpad(to_hex((extract(epoch FROM min(created_at)) * 1000)::bigint), 12, '0')
+                    || '7' || substr(md5(random()::text), 1, 3)
+                    || to_hex(8 + floor(random() * 4)::int)
+                    || substr(md5(random()::text), 1, 15)
+                )::uuid,
+                min(created_at), min(created_at), voter_id, election_id, election_event_id
+            FROM votes_vote
+            GROUP BY voter_id, election_id, election_event_id
+            ON CONFLICT DO NOTHING
+            """,
+            migrations.RunSQL.noop,
+        ),
+        migrations.RunSQL(
+            """
+            UPDATE votes_vote AS v
+            SET vote_hash = b.vote_hash
+            FROM (
+                SELECT DISTINCT ON (voter_id, election_id) voter_id, election_id, vote_hash
+                FROM votes_vote
+                ORDER BY voter_id, election_id, rank, id
+            ) AS b
+            WHERE b.voter_id = v.voter_id AND b.election_id = v.election_id
+              AND b.vote_hash <> v.vote_hash
+            """,
+            migrations.RunSQL.noop,
+        ),
+        migrations.RunSQL(
+            """
+            UPDATE votes_voteauditlog AS a
+            SET participation_id = p.id, vote_id = NULL, details = 'Ballot cast'
+            FROM votes_vote AS v
+            JOIN votes_participation AS p
+              ON p.voter_id = v.voter_id AND p.election_id = v.election_id
+            WHERE v.id = a.vote_id AND a.action = 'cast'
+            """,
+            migrations.RunSQL.noop,
+        ),
+        # Foreign keys to votes are deferred, so ids can be swapped in place
+        migrations.RunSQL(
+            """
+            CREATE TEMPORARY TABLE vote_new_ids ON COMMIT DROP AS
+            SELECT id AS old_id, gen_random_uuid() AS new_id FROM votes_vote;
+
+            UPDATE votes_voteauditlog AS a
+            SET vote_id = m.new_id
+            FROM vote_new_ids AS m
+            WHERE m.old_id = a.vote_id;
+
+            UPDATE votes_vote AS v
+            SET id = m.new_id
+            FROM vote_new_ids AS m
+            WHERE m.old_id = v.id;
+            """,
+            migrations.RunSQL.noop,
+        ),
+    ]
@@ -0,0 +1,73 @@
+# Generated by Django 5.2.3 on 2026-10-19 02:10
+
+import django.db.models.deletion
+import uuid
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('votes', '0013_split_ballots_from_participation'),
+    ]
+
+    operations = [
+        migrations.AlterModelOptions(
+            name='vote',
+            options={},
+        ),
+        migrations.RemoveIndex(
+            model_name='vote',
+            name='votes_vote_candida_f899d7_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='vote',
+            name='votes_vote_voter_i_4535ca_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='vote',
+            name='vote_verified_by_candidate_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='vote',
+            name='vote_unverified_candidate_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='vote',
+            name='vote_created_at_brin_idx',
+        ),
+        migrations.RemoveField(
+            model_name='vote',
+            name='created_at',
+        ),
+        migrations.RemoveField(
+            model_name='vote',
+            name='updated_at',
+        ),
+        migrations.RemoveField(
+            model_name='vote',
+            name='voter',
+        ),
+        migrations.AlterField(
+            model_name='vote',
+            name='election',
+            field=models.ForeignKey(editable=False, on_delete=django.db.models.deletion.CASCADE, related_name='votes', to='elections.election'),
+        ),
+        migrations.AlterField(
+            model_name='vote',
+            name='id',
+            field=models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False),
+        ),
+        migrations.AddIndex(
+            model_name='vote',
+            index=models.Index(condition=models.Q(('is_verified', True)), fields=['election', 'candidate'], include=('id',), name='vote_verified_by_candidate_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='vote',
+            index=models.Index(condition=models.Q(('is_verified', False)), fields=['election', 'candidate'], name='vote_unverified_candidate_idx'),
+        ),
+        migrations.AddConstraint(
+            model_name='vote',
+            constraint=models.UniqueConstraint(fields=('vote_hash', 'election_event', 'candidate'), name='vote_hash_event_candidate_uniq'),
+        ),
+    ]
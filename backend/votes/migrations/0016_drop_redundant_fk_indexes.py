@@ -0,0 +1,47 @@
+# Generated by Django 5.2.3 on 2026-10-19 02:40
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('election_events', '0004_electionevent_status'),
+        ('elections', '0010_candidate_name_prefix_idx'),
+        ('users', '0010_alter_user_id_alter_voterprofile_id'),
+        ('votes', '0015_recountjob'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='participation',
+            name='election',
+            field=models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.CASCADE, related_name='participations', to='elections.election'),
+        ),
+        migrations.AlterField(
+            model_name='participation',
+            name='election_event',
+            field=models.ForeignKey(db_index=False, editable=False, on_delete=django.db.models.deletion.CASCADE, related_name='participations', to='election_events.electionevent'),
+        ),
+        migrations.AlterField(
+            model_name='participation',
+            name='voter',
+            field=models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.CASCADE, related_name='participations', to='users.voterprofile'),
+        ),
+        migrations.AlterField(
+            model_name='vote',
+            name='candidate',
+            field=models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.CASCADE, related_name='votes', to='elections.candidate'),
+        ),
+        migrations.AlterField(
+            model_name='vote',
+            name='election',
+            field=models.ForeignKey(db_index=False, editable=False, on_delete=django.db.models.deletion.CASCADE, related_name='votes', to='elections.election'),
+        ),
+        migrations.AlterField(
+            model_name='vote',
+            name='election_event',
+            field=models.ForeignKey(db_index=False, editable=False, on_delete=django.db.models.deletion.CASCADE, related_name='votes', to='election_events.electionevent'),
+        ),
+    ]
@@ -0,0 +1,23 @@
+# Generated by Django 5.2.3 on 2026-10-19 02:43
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('election_events', '0004_electionevent_status'),
+        ('elections', '0010_candidate_name_prefix_idx'),
+        ('votes', '0016_drop_redundant_fk_indexes'),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='vote',
+            name='vote_verified_by_candidate_idx',
+        ),
+        migrations.AddIndex(
+            model_name='vote',
+            index=models.Index(condition=models.Q(('is_verified', True)), fields=['election', 'candidate'], include=('id', 'election_event'), name='vote_verified_by_candidate_idx'),
+        ),
+    ]
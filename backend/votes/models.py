@@ -1,126 +1,296 @@
 """
 votes/models.py
 
-This module defines the Vote model for recording and managing votes
-cast by voters in elections.
+This module defines the ballot box (Vote) and the participation ledger
+(Participation) for recording votes cast by voters in elections, their
+audit log, cold archives of closed events' votes, recounted result
+snapshots and the queue of recounts waiting for a worker.
 
-The Vote model ensures one vote per voter per election and maintains
-vote integrity and anonymity.
+A ballot is cast with Vote.cast_ballot(), which writes the voter's
+Participation and the ballot's Vote rows in one transaction. The two tables
+share no key: Participation records who voted in which election and
+enforces one ballot per voter per election, while Vote rows record what was
+voted for under a random receipt hash, with no voter and no timestamps. All
+counting reads Vote only; "has this voter voted" questions read
+Participation only.
 """
-from django.db import models
+import secrets
+import uuid
+
+from django.db import IntegrityError, models, transaction
+from django.db.models import Count, Q
 from django.core.exceptions import ValidationError
-from django.utils import timezone
-from core.models import BaseUUIDModel
+from core.models import BaseUUIDModel, TimeOrderedUUIDModel
 from elections.models import Candidate
 from users.models import VoterProfile
+from votes.tally import PLURALITY, RANKED, SINGLE, Ballots, get_tally_method, tally
 
 
-class Vote(BaseUUIDModel):
-    """
-    Vote model representing a vote cast by a voter for a candidate.
-    
-    This model ensures:
-    - One vote per voter per election (derived from candidate.election)
-    - Vote integrity and auditability
-    - Voter anonymity (no direct link to specific voter choice)
+class Participation(TimeOrderedUUIDModel):
     """
+    Participation ledger entry: a voter has cast their ballot in an election.
+
+    Written together with the ballot's Vote rows by Vote.cast_ballot(). The
+    unique (voter, election) constraint is what prevents double voting, and
+    it leads with the voter so the "which elections has this voter voted
+    in" lookups read it directly. Rows never reference the ballot.
 
+    Attributes:
+        voter (ForeignKey): The voter
+        election (ForeignKey): The election voted in
+        election_event (ForeignKey): The election's event, denormalised for
+            per-event statistics, archiving and deletion
+        created_at (DateTimeField): When the ballot was cast
+    """
+    # Each foreign key leads one of the indexes below, so none needs its own
     voter = models.ForeignKey(
         VoterProfile,
         on_delete=models.CASCADE,
-        related_name='votes'
+        related_name='participations',
+        db_index=False
     )
-    candidate = models.ForeignKey(
-        Candidate,
+    election = models.ForeignKey(
+        'elections.Election',
         on_delete=models.CASCADE,
-        related_name='votes'
+        related_name='participations',
+        db_index=False
+    )
+    election_event = models.ForeignKey(
+        'election_events.ElectionEvent',
+        on_delete=models.CASCADE,
+        related_name='participations',
+        editable=False,
+        db_index=False
     )
-    encrypted_vote = models.TextField(blank=True, null=True)  # Encrypts vote_choice for additional security
-    vote_hash = models.CharField(max_length=64, blank=True)
-    is_verified = models.BooleanField(default=True)
 
-    @property
-    def election(self):
-        """
-        Get the election from the candidate.
-        """
-        return self.candidate.election
-    
     class Meta:
-        """
-        Ensures one vote per voter per election
-        """
         ordering = ['created_at']
         indexes = [
-            models.Index(fields=['candidate', 'created_at']),
-            models.Index(fields=['voter', 'created_at']),
+            # Turnout timelines and counts per election
+            models.Index(fields=['election', 'created_at'], name='participation_election_idx'),
+            # Distinct voters per event, by index-only scan
+            models.Index(fields=['election_event', 'voter'], name='participation_event_idx'),
         ]
-    
-    def clean(self):
+        constraints = [
+            models.UniqueConstraint(
+                fields=['voter', 'election'],
+                name='participation_voter_election_uniq'
+            ),
+        ]
+
+    def save(self, *args, **kwargs):
         """
-        Validates the vote before saving to database.
+        Override save to copy the election event from the election.
         """
-        super().clean()
-        
-        if not self.election.is_open():
-            raise ValidationError(
-                'Cannot cast vote: Election is not currently open.'
-            )
-        
-        if not self._is_voter_eligible():
-            raise ValidationError(
-                'Voter is not eligible for this election event.'
-            )
-        
-        # Check if voter has already voted in this election
-        if Vote.objects.filter(
-            candidate__election=self.candidate.election,
-            voter=self.voter
-        ).exclude(pk=self.pk).exists():
-            raise ValidationError(
-                'Voter has already cast a vote in this election.'
-            )
-    
-    def _is_voter_eligible(self):
+        if self.election_event_id is None and self.election_id is not None:
+            self.election_event_id = self.election.election_event_id
+        super().save(*args, **kwargs)
+
+    def __str__(self):
         """
-        Check if the voter is eligible to vote in this election's event.
-        
-        Returns:
-            bool: True if voter is eligible, False otherwise.
+        Return string representation of the participation.
         """
-        return self.election.election_event.invitations.filter(
-            email=self.voter.user.email,
-            is_used=True
-        ).exists()
-    
+        return f"{self.voter.user.email} voted in {self.election.title}"
+
+
+class Vote(models.Model):
+    """
+    Vote model: one row of the anonymous ballot box.
+
+    A ballot is one Vote row for a single-choice election, one per approved
+    candidate for approval voting, and one per preference, ranked, for
+    instant-runoff. The rows of a ballot share its receipt hash, which is
+    random and handed to the voter to verify their ballot with. Rows carry
+    no voter, and neither timestamps nor time-ordered ids, so no column
+    points back to the Participation written alongside; they are never
+    updated after the ballot is cast.
+
+    This anonymity holds for queries and exports, not for raw access to
+    the database. A ballot's rows and its Participation are written in one
+    transaction, so they share the same xmin, and rows are stored in the
+    order ballots were cast, so ctid order follows Participation.created_at.
+    Anyone who can read system columns, heap pages or the WAL can therefore
+    match ballots to voters. Shuffling inserts would not hide the shared
+    transaction id, and writing the two in separate transactions would give
+    up counting a ballot exactly when its voter is marked as having voted.
+    Archiving a closed event and restoring it rewrites its rows in random
+    receipt order under new transactions (see votes/archive.py).
+
+    The foreign keys are not indexed on their own: lookups by election and
+    candidate use the (election, candidate) indexes below, and lookups by
+    event are pruned to the event's partition.
+
+    Attributes:
+        id (UUIDField): Random UUID primary key
+        election (ForeignKey): Election, denormalised from the candidate so
+            counts read this table alone
+        election_event (ForeignKey): Partition key (see votes/partitioning.py)
+        candidate (ForeignKey): Candidate voted for
+        vote_hash (CharField): Receipt hash of the ballot
+        is_verified (BooleanField): Whether the vote is counted
+        rank (PositiveSmallIntegerField): Preference order on ranked
+            ballots (see votes/tally.py); 1 otherwise
+    """
+    id = models.UUIDField(
+        primary_key=True,
+        default=uuid.uuid4,
+        editable=False
+    )
+    election = models.ForeignKey(
+        'elections.Election',
+        on_delete=models.CASCADE,
+        related_name='votes',
+        editable=False,
+        db_index=False
+    )
+    candidate = models.ForeignKey(
+        Candidate,
+        on_delete=models.CASCADE,
+        related_name='votes',
+        db_index=False
+    )
+    # Denormalised from candidate.election so queries can name the event
+    # directly, which lets Postgres prune partitions (see votes/partitioning.py)
+    election_event = models.ForeignKey(
+        'election_events.ElectionEvent',
+        on_delete=models.CASCADE,
+        related_name='votes',
+        editable=False,
+        db_index=False
+    )
+    encrypted_vote = models.TextField(blank=True, null=True)  # Encrypts vote_choice for additional security
+    vote_hash = models.CharField(max_length=64, blank=True)
+    is_verified = models.BooleanField(default=True)
+    rank = models.PositiveSmallIntegerField(default=1)
+
+    class Meta:
+        indexes = [
+            # Results and statistics count verified votes per candidate;
+            # INCLUDE lets them be answered by index-only scans, including
+            # the event filter they carry for partition pruning
+            models.Index(
+                fields=['election', 'candidate'],
+                include=['id', 'election_event'],
+                condition=Q(is_verified=True),
+                name='vote_verified_by_candidate_idx'
+            ),
+            # Unverified votes are few, so their index stays small
+            models.Index(
+                fields=['election', 'candidate'],
+                condition=Q(is_verified=False),
+                name='vote_unverified_candidate_idx'
+            ),
+        ]
+        constraints = [
+            # Unique constraints must include the partition key (see
+            # votes/partitioning.py); vote_hash leads so receipt lookups
+            # use it. A ballot's rows share the hash, one per candidate.
+            models.UniqueConstraint(
+                fields=['vote_hash', 'election_event', 'candidate'],
+                name='vote_hash_event_candidate_uniq'
+            ),
+        ]
+
     def save(self, *args, **kwargs):
         """
-        Override save to perform validation and generate vote hash.
+        Override save to copy the election and event from the candidate.
+
+        Raises:
+            ValueError: If the vote already exists; ballots are append-only
         """
-        self.full_clean()
-        if not self.vote_hash:
-            self.vote_hash = self._generate_vote_hash()
-        
+        if not self._state.adding:
+            raise ValueError("Votes cannot be changed once cast.")
+        if self.election_id is None and self.candidate_id is not None:
+            self.election_id = self.candidate.election_id
+        if self.election_event_id is None and self.election_id is not None:
+            self.election_event_id = self.election.election_event_id
         super().save(*args, **kwargs)
-    
-    def _generate_vote_hash(self):
+
+    def __str__(self):
         """
-        Generate a hash for vote integrity verification.
-        
+        Return string representation of the vote.
+        """
+        return f"Vote for {self.candidate.first_name} {self.candidate.last_name} in {self.election.title}"
+
+    @staticmethod
+    def generate_receipt():
+        """
+        Generate a ballot receipt hash.
+
+        Receipts are random rather than derived from the vote, so they
+        cannot be recomputed from a voter's id and the time they voted.
+
         Returns:
-            str: SHA-256 hash of vote data.
+            str: 64 hexadecimal characters
         """
-        import hashlib
-        
-        vote_data = f"{self.election.id}{self.voter.id}{self.candidate.id}{timezone.now().isoformat()}"
-        return hashlib.sha256(vote_data.encode()).hexdigest()
-    
-    def __str__(self):
+        return secrets.token_hex(32)
+
+    @classmethod
+    def cast_ballot(cls, voter, election, candidates):
         """
-        Return string representation of the vote.
+        Cast a voter's ballot in an election.
+
+        The voter's Participation and the ballot's Vote rows are written in
+        one transaction, so a ballot is never counted without its voter
+        being marked as having voted, or the other way round.
+
+        Args:
+            voter (VoterProfile): The voter
+            election (Election): The election
+            candidates (list): Candidates voted for: exactly one on
+                single-choice ballots, the approved ones on approval
+                ballots, and preferences in rank order on ranked ballots
+
+        Returns:
+            tuple: (Participation, list of Vote) just created
+
+        Raises:
+            ValidationError: If the election is not open, the voter is not
+                eligible or has already voted, or the ballot does not suit
+                the election's tally method
         """
-        return f"Vote by {self.voter.user.email} for {self.candidate.name} in {self.election.title}"
-    
+        if not election.is_open():
+            raise ValidationError('Cannot cast vote: Election is not currently open.')
+        if voter.election_event_id != election.election_event_id or not (
+            election.election_event.invitations.filter(email=voter.user.email, is_used=True).exists()
+        ):
+            raise ValidationError('Voter is not eligible for this election event.')
+
+        candidates = list(candidates)
+        ballot = get_tally_method(election.tally_method).ballot
+        if not candidates:
+            raise ValidationError('A ballot needs at least one candidate.')
+        if ballot == SINGLE and len(candidates) != 1:
+            raise ValidationError('Vote for exactly one candidate in this election.')
+        if len({candidate.id for candidate in candidates}) != len(candidates):
+            raise ValidationError('A candidate can only appear once on a ballot.')
+        if any(candidate.election_id != election.id for candidate in candidates):
+            raise ValidationError('Candidate does not stand in this election.')
+
+        receipt = cls.generate_receipt()
+        votes = [
+            cls(
+                election=election,
+                election_event_id=election.election_event_id,
+                candidate=candidate,
+                vote_hash=receipt,
+                rank=position if ballot == RANKED else 1
+            )
+            for position, candidate in enumerate(candidates, start=1)
+        ]
+        try:
+            with transaction.atomic():
+                participation = Participation.objects.create(
+                    voter=voter,
+                    election=election,
+                    election_event_id=election.election_event_id
+                )
+                cls.objects.bulk_create(votes)
+        except IntegrityError:
+            # The ledger's unique constraint, raced by a concurrent ballot
+            raise ValidationError('Voter has already cast a vote in this election.')
+        return participation, votes
+
     @classmethod
     def get_election_results(cls, election):
         """
@@ -132,10 +302,20 @@ class Vote(BaseUUIDModel):
         Returns:
             dict: Vote counts by candidate
         """
-        from django.db.models import Count
-        
+        if election.tally_method != PLURALITY:
+            counts = cls.count_by_candidate(election)
+            names = dict(
+                (candidate.id, f"{candidate.first_name} {candidate.last_name}")
+                for candidate in election.candidates.all()
+            )
+            return {
+                names[candidate_id]: count
+                for candidate_id, count in sorted(counts.items(), key=lambda item: -item[1])
+            }
+
         results = cls.objects.filter(
-            candidate__election=election,
+            election_event_id=election.election_event_id,
+            election=election,
             is_verified=True
         ).values(
             'candidate__id',
@@ -152,31 +332,95 @@ class Vote(BaseUUIDModel):
         
         return formatted_results
     
+    @classmethod
+    def count_by_candidate(cls, election):
+        """
+        Count an election's result for each of its candidates.
+
+        Plurality elections count verified votes. Other methods count whole
+        ballots with the election's tally method, so a ranked ballot's later
+        preferences only count once earlier ones are eliminated, and the
+        final round is returned.
+
+        Args:
+            election: Election instance
+
+        Returns:
+            dict: Count by candidate id, zero for candidates without votes
+        """
+        if election.tally_method != PLURALITY:
+            ballots = cls.load_ballots(election)
+            result = tally(ballots, election.tally_method)
+            return {
+                candidate_id: int(result.counts[index])
+                for index, candidate_id in enumerate(ballots.candidates)
+            }
+
+        counts = dict.fromkeys(election.candidates.values_list('id', flat=True), 0)
+        counts.update(
+            cls.objects.filter(
+                election_event_id=election.election_event_id,
+                election=election,
+                is_verified=True
+            ).values('candidate_id').annotate(
+                vote_count=Count('id')
+            ).values_list('candidate_id', 'vote_count')
+        )
+        return counts
+
+    @classmethod
+    def load_ballots(cls, election, chunk_size=10000):
+        """
+        Load an election's verified votes as a Ballots matrix.
+
+        Votes are streamed ordered by receipt hash and rank, so each
+        ballot's votes are grouped with preferences in rank order.
+
+        Args:
+            election: Election instance
+            chunk_size (int): Rows fetched per round trip
+
+        Returns:
+            Ballots: The election's ballots
+        """
+        candidates = list(election.candidates.order_by('id').values_list('id', flat=True))
+        rows = cls.objects.filter(
+            election_event_id=election.election_event_id,
+            election=election,
+            is_verified=True
+        ).order_by('vote_hash', 'rank').values_list('vote_hash', 'candidate_id')
+        # In a transaction, so the server-side cursor is not materialised
+        with transaction.atomic():
+            return Ballots.from_rows(candidates, rows.iterator(chunk_size=chunk_size))
+
     @classmethod
     def get_voter_participation(cls, election_event):
         """
         Get voter participation statistics for an election event.
         
+        Turnout comes from the participation ledger, vote counts from the
+        ballot box.
+
         Args:
             election_event: ElectionEvent instance
             
         Returns:
             dict: Participation statistics
         """
-        from django.db.models import Count, Q
-        
-        elections = election_event.elections.all()
-        voted_voters = cls.objects.filter(
-            candidate__election__in=elections
+        voted_voters = Participation.objects.filter(
+            election_event=election_event
         ).values('voter').distinct().count()
         total_invited = election_event.invitations.filter(is_used=True).count()
 
-        votes_per_election = {}
-        for election in elections:
-            votes_per_election[election.title] = cls.objects.filter(
-                candidate__election=election,
-                is_verified=True
-            ).count()
+        counts = dict(
+            cls.objects.filter(election_event=election_event, is_verified=True)
+            .values_list('election_id')
+            .annotate(total=Count('id'))
+        )
+        votes_per_election = {
+            election.title: counts.get(election.id, 0)
+            for election in election_event.elections.all()
+        }
         
         return {
             'total_invited_voters': total_invited,
@@ -187,9 +431,13 @@ class Vote(BaseUUIDModel):
         }
 
 
-class VoteAuditLog(BaseUUIDModel):
+class VoteAuditLog(TimeOrderedUUIDModel):
     """
     Audit log for tracking vote-related actions for security and transparency.
+
+    Entries about casting reference the voter's Participation, never the
+    Vote rows, so the log does not link a voter to their choices either.
+    Entries about a vote itself (verification, flagging) reference the Vote.
     """
     
     ACTION_CHOICES = [
@@ -202,7 +450,24 @@ class VoteAuditLog(BaseUUIDModel):
     vote = models.ForeignKey(
         Vote,
         on_delete=models.CASCADE,
-        related_name='audit_logs'
+        related_name='audit_logs',
+        null=True,
+        blank=True
+    )
+    participation = models.ForeignKey(
+        Participation,
+        on_delete=models.SET_NULL,
+        related_name='audit_logs',
+        null=True,
+        blank=True
+    )
+    # Copied from the vote or participation; the partition key of the
+    # audit log table
+    election_event = models.ForeignKey(
+        'election_events.ElectionEvent',
+        on_delete=models.CASCADE,
+        related_name='vote_audit_logs',
+        editable=False
     )
     
     action = models.CharField(
@@ -221,9 +486,191 @@ class VoteAuditLog(BaseUUIDModel):
     
     class Meta:
         ordering = ['-created_at'] 
+        indexes = [
+            models.Index(fields=['created_at', 'id']),
+        ]
     
+    def save(self, *args, **kwargs):
+        """
+        Override save to copy the election event from the vote or
+        participation.
+        """
+        if self.election_event_id is None and self.vote_id is not None:
+            self.election_event_id = self.vote.election_event_id
+        if self.election_event_id is None and self.participation_id is not None:
+            self.election_event_id = self.participation.election_event_id
+        super().save(*args, **kwargs)
+
     def __str__(self):
         """
         Return string representation of the audit log entry.
         """
-        return f"{self.action} - Vote {self.vote.id} at {self.created_at}"
\ No newline at end of file
+        subject = f"Vote {self.vote_id}" if self.vote_id else f"Participation {self.participation_id}"
+        return f"{self.action} - {subject} at {self.created_at}"
+
+
+class VoteArchive(BaseUUIDModel):
+    """
+    Cold archive of one closed election event's votes, participation
+    ledger and audit logs.
+
+    The rows are written to compressed files in the 'archive' storage and
+    removed from the database (see votes/archive.py). The manifest lists
+    every file with its row count and SHA-256 checksum.
+
+    Attributes:
+        election_event (ForeignKey): The archived election event
+        location (CharField): Directory of the archive files in the storage
+        status (CharField): writing, archived or restored
+        manifest_sha256 (CharField): Checksum of the manifest file
+        vote_count (PositiveBigIntegerField): Votes archived
+        audit_log_count (PositiveBigIntegerField): Audit log entries archived
+        restored_at (DateTimeField): When the rows were last restored
+    """
+    WRITING = 'writing'
+    ARCHIVED = 'archived'
+    RESTORED = 'restored'
+    STATUS_CHOICES = [
+        (WRITING, 'Writing'),
+        (ARCHIVED, 'Archived'),
+        (RESTORED, 'Restored'),
+    ]
+
+    election_event = models.ForeignKey(
+        'election_events.ElectionEvent',
+        on_delete=models.CASCADE,
+        related_name='vote_archives'
+    )
+    location = models.CharField(max_length=255)
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default=WRITING)
+    manifest_sha256 = models.CharField(max_length=64, blank=True)
+    vote_count = models.PositiveBigIntegerField(default=0)
+    audit_log_count = models.PositiveBigIntegerField(default=0)
+    restored_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        ordering = ['-created_at']
+
+    def __str__(self):
+        """
+        Return string representation of the archive.
+        """
+        return f"Archive of {self.election_event_id} at {self.location} ({self.status})"
+
+
+class ResultSnapshot(BaseUUIDModel):
+    """
+    Results of one election as recounted from its votes.
+
+    Snapshots are written by the recount_votes command and by recount jobs
+    queued from the election admin (see votes/recount.py). A snapshot taken after
+    voting ended, with every vote hash well formed, is certified, and is
+    then served by the results endpoint instead of a live count.
+
+    Attributes:
+        election (ForeignKey): The recounted election
+        results (JSONField): candidate_id, candidate_name and vote_count of
+            each candidate, most votes first, with the count of every round
+            under ``rounds`` for instant-runoff
+        total_votes (PositiveBigIntegerField): Votes read, verified or not
+        verified_votes (PositiveBigIntegerField): Verified votes counted
+        invalid_hashes (PositiveBigIntegerField): Votes with a malformed hash
+        ballots_sha256 (CharField): Digest of every vote's id, candidate and
+            hash in id order, to tell whether the votes changed between
+            recounts
+        is_certified (BooleanField): Whether these are the final results
+        duration (FloatField): Seconds the recount took
+    """
+    election = models.ForeignKey(
+        'elections.Election',
+        on_delete=models.CASCADE,
+        related_name='result_snapshots'
+    )
+    results = models.JSONField(default=list)
+    total_votes = models.PositiveBigIntegerField(default=0)
+    verified_votes = models.PositiveBigIntegerField(default=0)
+    invalid_hashes = models.PositiveBigIntegerField(default=0)
+    ballots_sha256 = models.CharField(max_length=64)
+    is_certified = models.BooleanField(default=False)
+    duration = models.FloatField(default=0)
+
+    class Meta:
+        ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['election', 'created_at']),
+        ]
+
+    def __str__(self):
+        """
+        Return string representation of the snapshot.
+        """
+        kind = 'certified' if self.is_certified else 'provisional'
+        return f"{kind} results of {self.election_id} ({self.verified_votes} votes)"
+
+
+class RecountJob(BaseUUIDModel):
+    """
+    Recount of one election, queued for the run_recount_jobs worker.
+
+    Recounts read every vote of an election, so they are queued (e.g. by
+    the election admin's recount action) rather than run inside a web
+    request. The worker runs recount_election() and links the resulting
+    snapshot (see votes/recount.py).
+
+    Attributes:
+        election (ForeignKey): Election to recount
+        certify (BooleanField): Certify the results if they qualify
+        status (CharField): pending, running, done or failed
+        requested_by (ForeignKey): User who asked for the recount
+        snapshot (ForeignKey): Snapshot written by the recount
+        error (TextField): Why the recount failed
+        started_at (DateTimeField): When a worker picked the job up
+        finished_at (DateTimeField): When the job completed or failed
+    """
+    PENDING = 'pending'
+    RUNNING = 'running'
+    DONE = 'done'
+    FAILED = 'failed'
+    STATUS_CHOICES = [
+        (PENDING, 'Pending'),
+        (RUNNING, 'Running'),
+        (DONE, 'Done'),
+        (FAILED, 'Failed'),
+    ]
+
+    election = models.ForeignKey(
+        'elections.Election',
+        on_delete=models.CASCADE,
+        related_name='recount_jobs'
+    )
+    certify = models.BooleanField(default=False)
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default=PENDING)
+    requested_by = models.ForeignKey(
+        'users.User',
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name='recount_jobs'
+    )
+    snapshot = models.ForeignKey(
+        ResultSnapshot,
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name='+'
+    )
+    error = models.TextField(blank=True)
+    started_at = models.DateTimeField(null=True, blank=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['status', 'updated_at']),
+        ]
+
+    def __str__(self):
+        """
+        Return string representation of the job.
+        """
+        return f"Recount of {self.election_id} ({self.status})"
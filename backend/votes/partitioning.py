@@ -0,0 +1,308 @@
+"""
+votes/partitioning.py
+
+This module manages the optional partitioned layout of the vote tables.
+
+By default every event's votes and audit logs share one votes_vote and one
+votes_voteauditlog table, so finished events keep bloating the indexes live
+events use, and purging an event is one huge DELETE. The partition_votes
+command converts both tables into Postgres tables partitioned by LIST
+(election_event_id), with one partition per election event and a DEFAULT
+partition catching rows of events without one:
+
+- queries naming election_event_id only touch that event's partition;
+- each event gets a small set of indexes of its own;
+- detach_event_partitions() takes a closed event's rows out of the live
+  tables (and optionally drops them) without deleting row by row.
+
+Postgres requires unique constraints on a partitioned table to include the
+partition key, so the primary keys become (id, election_event_id) and the
+audit log's foreign key to its vote becomes (vote_id, election_event_id).
+Unique constraints added to these tables later must include
+election_event_id as well.
+
+Partitions for new events are created by a post_save signal on
+ElectionEvent (see votes/signals.py) once the tables are partitioned.
+"""
+import logging
+
+from django.db import DEFAULT_DB_ALIAS, connections, transaction
+
+from election_events.models import ElectionEvent
+from votes.models import Vote, VoteAuditLog
+
+logger = logging.getLogger(__name__)
+
+PARTITION_COLUMN = 'election_event_id'
+
+# Referenced tables first: partitions are created in this order and
+# detached in reverse
+PARTITIONED_MODELS = [Vote, VoteAuditLog]
+
+
+def partition_name(model, event_id):
+    """
+    Return the name of an event's partition of a model's table.
+
+    Args:
+        model: Vote or VoteAuditLog
+        event_id (UUID): Election event id
+
+    Returns:
+        str: Table name, e.g. votes_vote_<event id hex>
+    """
+    return f"{model._meta.db_table}_{event_id.hex}"
+
+
+def default_partition_name(model):
+    """
+    Return the name of the DEFAULT partition of a model's table.
+    """
+    return f"{model._meta.db_table}_default"
+
+
+def is_partitioned(model, using=DEFAULT_DB_ALIAS):
+    """
+    Return whether a model's table is a partitioned table.
+    """
+    connection = connections[using]
+    if connection.vendor != 'postgresql':
+        return False
+    with connection.cursor() as cursor:
+        cursor.execute(
+            "SELECT relkind FROM pg_class WHERE oid = to_regclass(%s)",
+            [model._meta.db_table]
+        )
+        row = cursor.fetchone()
+    return row is not None and row[0] == 'p'
+
+
+def _table_exists(cursor, table):
+    cursor.execute("SELECT to_regclass(%s) IS NOT NULL", [table])
+    return cursor.fetchone()[0]
+
+
+def create_event_partitions(event_id, using=DEFAULT_DB_ALIAS):
+    """
+    Create an event's partitions of every partitioned vote table.
+
+    Existing partitions are left alone. Creating a partition briefly locks
+    the parent table, so the lock wait is bounded by a short lock_timeout
+    rather than queueing every vote behind it.
+
+    Args:
+        event_id (UUID): Election event id
+        using (str): Database alias
+
+    Returns:
+        list: Names of the partitions created
+    """
+    connection = connections[using]
+    qn = connection.ops.quote_name
+    created = []
+    with transaction.atomic(using=using), connection.cursor() as cursor:
+        cursor.execute("SET LOCAL lock_timeout = '5s'")
+        for model in PARTITIONED_MODELS:
+            if not is_partitioned(model, using):
+                continue
+            name = partition_name(model, event_id)
+            if _table_exists(cursor, name):
+                continue
+            cursor.execute(
+                f"CREATE TABLE {qn(name)} PARTITION OF {qn(model._meta.db_table)} "
+                f"FOR VALUES IN (%s)",
+                [str(event_id)]
+            )
+            created.append(name)
+    return created
+
+
+def _referencing_foreign_keys(model):
+    """
+    Return the foreign keys of other models enforced against a model's table.
+    """
+    return [
+        relation.field for relation in model._meta.related_objects
+        if relation.one_to_many and relation.field.db_constraint
+    ]
+
+
+def convert_to_partitioned(model, using=DEFAULT_DB_ALIAS):
+    """
+    Rebuild a model's table as a table partitioned by election event.
+
+    The table is locked, renamed aside, and its rows are copied into a new
+    partitioned table with one partition per existing election event plus a
+    DEFAULT partition. Indexes and constraints are then recreated on the new
+    table, with the primary key and the foreign keys pointing at it widened
+    to include election_event_id. Must run inside a transaction; the table
+    is unavailable until it commits.
+
+    Args:
+        model: Vote or VoteAuditLog
+        using (str): Database alias
+
+    Raises:
+        ValueError: If the table is already partitioned, or has a unique
+            constraint or an incoming foreign key that cannot include the
+            partition key
+    """
+    connection = connections[using]
+    qn = connection.ops.quote_name
+    table = model._meta.db_table
+    legacy = f"{table}_legacy"
+
+    if is_partitioned(model, using):
+        raise ValueError(f"{table} is already partitioned.")
+    for field in _referencing_foreign_keys(model):
+        if PARTITION_COLUMN not in {f.column for f in field.model._meta.local_fields}:
+            raise ValueError(
+                f"{field.model._meta.db_table}.{field.column} references {table} "
+                f"but has no {PARTITION_COLUMN} column."
+            )
+
+    with connection.cursor() as cursor:
+        cursor.execute(f"LOCK TABLE {qn(table)} IN ACCESS EXCLUSIVE MODE")
+
+        cursor.execute(
+            """
+            SELECT c.relname, pg_get_indexdef(i.indexrelid), i.indisunique
+            FROM pg_index i JOIN pg_class c ON c.oid = i.indexrelid
+            WHERE i.indrelid = %s::regclass AND NOT i.indisprimary
+              AND NOT EXISTS (
+                  SELECT 1 FROM pg_constraint WHERE conindid = i.indexrelid
+              )
+            """,
+            [table]
+        )
+        indexes = cursor.fetchall()
+        # A foreign key to a partitioned table (the audit log's to votes) has
+        # an internal clone per referenced partition; recreating the parent
+        # constraint recreates them
+        cursor.execute(
+            """
+            SELECT conname, pg_get_constraintdef(oid), contype
+            FROM pg_constraint
+            WHERE conrelid = %s::regclass AND contype IN ('f', 'u')
+              AND conparentid = 0
+            """,
+            [table]
+        )
+        constraints = cursor.fetchall()
+        for name, definition, unique in indexes:
+            if unique and PARTITION_COLUMN not in definition:
+                raise ValueError(f"Unique index {name} does not include {PARTITION_COLUMN}.")
+        for name, definition, kind in constraints:
+            if kind == 'u' and PARTITION_COLUMN not in definition:
+                raise ValueError(f"Unique constraint {name} does not include {PARTITION_COLUMN}.")
+
+        # Foreign keys pointing at the table are dropped and recreated
+        # against the new (id, election_event_id) primary key
+        cursor.execute(
+            """
+            SELECT conrelid::regclass::text, conname
+            FROM pg_constraint
+            WHERE confrelid = %s::regclass AND contype = 'f'
+            """,
+            [table]
+        )
+        for referencing_table, name in cursor.fetchall():
+            cursor.execute(f"ALTER TABLE {qn(referencing_table)} DROP CONSTRAINT {qn(name)}")
+
+        cursor.execute(f"ALTER TABLE {qn(table)} RENAME TO {qn(legacy)}")
+        cursor.execute(
+            f"CREATE TABLE {qn(table)} "
+            f"(LIKE {qn(legacy)} INCLUDING DEFAULTS INCLUDING CONSTRAINTS) "
+            f"PARTITION BY LIST ({qn(PARTITION_COLUMN)})"
+        )
+        cursor.execute(
+            f"CREATE TABLE {qn(default_partition_name(model))} "
+            f"PARTITION OF {qn(table)} DEFAULT"
+        )
+        for event_id in ElectionEvent.objects.using(using).values_list('id', flat=True):
+            cursor.execute(
+                f"CREATE TABLE {qn(partition_name(model, event_id))} "
+                f"PARTITION OF {qn(table)} FOR VALUES IN (%s)",
+                [str(event_id)]
+            )
+
+        cursor.execute(f"INSERT INTO {qn(table)} SELECT * FROM {qn(legacy)}")
+        cursor.execute(f"DROP TABLE {qn(legacy)}")
+
+        # Index and constraint names are free again; build them once the
+        # data is in, which is faster than maintaining them row by row
+        pk = model._meta.pk.column
+        cursor.execute(
+            f"ALTER TABLE {qn(table)} ADD CONSTRAINT {qn(table + '_pkey')} "
+            f"PRIMARY KEY ({qn(pk)}, {qn(PARTITION_COLUMN)})"
+        )
+        for name, definition, unique in indexes:
+            cursor.execute(definition)
+        for name, definition, kind in constraints:
+            cursor.execute(f"ALTER TABLE {qn(table)} ADD CONSTRAINT {qn(name)} {definition}")
+
+        for field in _referencing_foreign_keys(model):
+            referencing_table = field.model._meta.db_table
+            name = f"{referencing_table}_{field.column}_{PARTITION_COLUMN}_fk"
+            cursor.execute(
+                f"ALTER TABLE {qn(referencing_table)} ADD CONSTRAINT {qn(name)} "
+                f"FOREIGN KEY ({qn(field.column)}, {qn(PARTITION_COLUMN)}) "
+                f"REFERENCES {qn(table)} ({qn(pk)}, {qn(PARTITION_COLUMN)}) "
+                f"DEFERRABLE INITIALLY DEFERRED"
+            )
+
+    logger.info(f"Converted {table} to a table partitioned by {PARTITION_COLUMN}")
+
+
+def detach_event_partitions(event_id, drop=False, using=DEFAULT_DB_ALIAS):
+    """
+    Take an event's partitions out of the vote tables.
+
+    Detaching is a catalog change: no rows are read or deleted, so it takes
+    the same short time whatever the event's size. Detached tables keep
+    their data and names but lose their foreign keys, so they no longer
+    constrain or depend on the live tables and can be dumped and archived.
+    With drop=True they are dropped instead.
+
+    Args:
+        event_id (UUID): Election event id
+        drop (bool): Drop the partitions instead of keeping them
+        using (str): Database alias
+
+    Returns:
+        list: Names of the detached (or dropped) partitions
+
+    Raises:
+        ValueError: If the tables are not partitioned or the event has no
+            partitions
+    """
+    connection = connections[using]
+    qn = connection.ops.quote_name
+    models = [model for model in reversed(PARTITIONED_MODELS) if is_partitioned(model, using)]
+    if not models:
+        raise ValueError("The vote tables are not partitioned.")
+
+    detached = []
+    with transaction.atomic(using=using), connection.cursor() as cursor:
+        cursor.execute("SET LOCAL lock_timeout = '5s'")
+        for model in models:
+            name = partition_name(model, event_id)
+            if not _table_exists(cursor, name):
+                continue
+            cursor.execute(
+                f"ALTER TABLE {qn(model._meta.db_table)} DETACH PARTITION {qn(name)}"
+            )
+            cursor.execute(
+                "SELECT conname FROM pg_constraint WHERE conrelid = %s::regclass AND contype = 'f'",
+                [name]
+            )
+            for (constraint,) in cursor.fetchall():
+                cursor.execute(f"ALTER TABLE {qn(name)} DROP CONSTRAINT {qn(constraint)}")
+            if drop:
+                cursor.execute(f"DROP TABLE {qn(name)}")
+            detached.append(name)
+
+    if not detached:
+        raise ValueError(f"Election event {event_id} has no partitions.")
+    logger.info(f"{'Dropped' if drop else 'Detached'} partitions {', '.join(detached)}")
+    return detached
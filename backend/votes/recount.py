@@ -0,0 +1,271 @@
+"""
+votes/recount.py
+
+This module recounts elections from their votes and records the results as
+ResultSnapshots, spreading large events over a pool of processes.
+
+The work is partitioned by election: each worker process recounts whole
+elections, streaming their votes in id order through a server-side cursor
+(QuerySet.iterator), so memory stays flat however many votes an election
+has and no two workers read the same rows. Every vote is counted, its hash
+checked to be a well-formed SHA-256 digest, and fed into a digest of the
+whole ballot set. Elections counted by another method than plurality are
+then tallied with it (see votes/tally.py). Elections are independent, so
+throughput grows with the number of workers until the database's disks or
+cores are saturated.
+
+Recounts asked for from the admin are queued as RecountJobs instead, and
+run by the run_recount_jobs worker, one election per job.
+"""
+import hashlib
+import logging
+import multiprocessing
+import re
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Q
+from django.utils import timezone
+
+logger = logging.getLogger(__name__)
+
+VOTE_HASH_PATTERN = re.compile(r'[0-9a-f]{64}')
+
+
+def _init_worker():
+    """
+    Set up Django in a freshly spawned recount process.
+    """
+    import django
+    django.setup()
+
+
+def recount_election(election_id, certify=False, chunk_size=None):
+    """
+    Recount one election and save a ResultSnapshot of it.
+
+    With certify=True, the snapshot is certified, and the election moved to
+    certified, if voting has ended and every vote hash is well formed.
+
+    Args:
+        election_id (UUID): Election to recount
+        certify (bool): Certify the results if they qualify
+        chunk_size (int): Rows fetched per round trip (default
+            RECOUNT_CHUNK_SIZE)
+
+    Returns:
+        dict: election_id, snapshot_id, rows, seconds and is_certified
+    """
+    # Imported here: spawned workers load this module to find the function
+    # before their initializer has set Django up
+    from elections.models import Election
+    from votes.models import ResultSnapshot, Vote
+    from votes.tally import PLURALITY, RANKED, get_tally_method, tally
+
+    chunk_size = chunk_size or settings.RECOUNT_CHUNK_SIZE
+    start = time.perf_counter()
+    election = Election.objects.get(pk=election_id)
+    candidates = {
+        candidate['id']: candidate
+        for candidate in election.candidates.values('id', 'first_name', 'last_name')
+    }
+    counts = dict.fromkeys(candidates, 0)
+    total = verified = invalid = 0
+    digest = hashlib.sha256()
+    ranked = get_tally_method(election.tally_method).ballot == RANKED
+
+    votes = (
+        Vote.objects
+        .filter(election_event_id=election.election_event_id, election_id=election.id)
+        .order_by('id')
+        .values_list('id', 'candidate_id', 'vote_hash', 'is_verified', 'rank')
+    )
+    # Outside a transaction Django declares the cursor WITH HOLD, which
+    # makes Postgres materialise the whole result before the first fetch
+    with transaction.atomic():
+        for vote_id, candidate_id, vote_hash, is_verified, rank in votes.iterator(chunk_size=chunk_size):
+            total += 1
+            # Ranks only matter, and are only digested, on ranked ballots
+            digest.update(
+                f"{vote_id}:{candidate_id}:{vote_hash}{f':{rank}' if ranked else ''}\n".encode()
+            )
+            if not VOTE_HASH_PATTERN.fullmatch(vote_hash):
+                invalid += 1
+            if is_verified:
+                verified += 1
+                counts[candidate_id] += 1
+
+    rounds = {}
+    if election.tally_method != PLURALITY:
+        # Other methods count whole ballots rather than single votes
+        ballots = Vote.load_ballots(election, chunk_size)
+        outcome = tally(ballots, election.tally_method)
+        counts = {
+            candidate_id: int(outcome.counts[index])
+            for index, candidate_id in enumerate(ballots.candidates)
+        }
+        if len(outcome.rounds) > 1:
+            rounds = {
+                candidate_id: [int(counts_in_round[index]) for counts_in_round in outcome.rounds]
+                for index, candidate_id in enumerate(ballots.candidates)
+            }
+
+    results = sorted(
+        (
+            {
+                'candidate_id': str(candidate_id),
+                'candidate_name': f"{candidates[candidate_id]['first_name']} {candidates[candidate_id]['last_name']}",
+                'vote_count': count,
+                **({'rounds': rounds[candidate_id]} if rounds else {}),
+            }
+            for candidate_id, count in counts.items()
+        ),
+        key=lambda result: -result['vote_count']
+    )
+    certified = certify and election.has_ended() and invalid == 0
+
+    with transaction.atomic():
+        snapshot = ResultSnapshot.objects.create(
+            election=election,
+            results=results,
+            total_votes=total,
+            verified_votes=verified,
+            invalid_hashes=invalid,
+            ballots_sha256=digest.hexdigest(),
+            is_certified=certified,
+            duration=time.perf_counter() - start
+        )
+        if certified and election.status != Election.CERTIFIED:
+            election.certify()
+
+    if invalid:
+        logger.warning(f"Recount of election {election.id}: {invalid} malformed vote hashes")
+    return {
+        'election_id': election.id,
+        'snapshot_id': snapshot.id,
+        'rows': total,
+        'seconds': snapshot.duration,
+        'is_certified': certified,
+    }
+
+
+def recount_elections(election_ids, workers=None, certify=False, chunk_size=None):
+    """
+    Recount several elections, one per worker process at a time.
+
+    Args:
+        election_ids (list): Elections to recount
+        workers (int): Worker processes (default RECOUNT_WORKERS); with 0 or
+            1, or a single election, the recount runs inline
+        certify (bool): Certify results that qualify
+        chunk_size (int): Rows fetched per round trip
+
+    Yields:
+        dict: The result of recount_election() for each election, in
+        completion order
+    """
+    workers = settings.RECOUNT_WORKERS if workers is None else workers
+    election_ids = list(election_ids)
+    if workers <= 1 or len(election_ids) <= 1:
+        for election_id in election_ids:
+            yield recount_election(election_id, certify, chunk_size)
+        return
+
+    with ProcessPoolExecutor(
+        max_workers=min(workers, len(election_ids)),
+        mp_context=multiprocessing.get_context('spawn'),
+        initializer=_init_worker
+    ) as executor:
+        futures = [
+            executor.submit(recount_election, election_id, certify, chunk_size)
+            for election_id in election_ids
+        ]
+        for future in as_completed(futures):
+            yield future.result()
+
+
+def queue_recounts(election_ids, requested_by=None, certify=False):
+    """
+    Queue a RecountJob for each election without one already pending.
+
+    Args:
+        election_ids (list): Elections to recount
+        requested_by (User): User asking for the recounts
+        certify (bool): Certify results that qualify
+
+    Returns:
+        list: The queued RecountJobs
+    """
+    from votes.models import RecountJob
+
+    pending = set(
+        RecountJob.objects.filter(election_id__in=election_ids, status=RecountJob.PENDING, certify=certify)
+        .values_list('election_id', flat=True)
+    )
+    return RecountJob.objects.bulk_create(
+        RecountJob(election_id=election_id, certify=certify, requested_by=requested_by)
+        for election_id in election_ids if election_id not in pending
+    )
+
+
+def claim_recount_job():
+    """
+    Claim the oldest runnable recount job for this worker.
+
+    Jobs still marked running after RECOUNT_JOB_STALE_SECONDS are claimed
+    again; a recount only adds a snapshot, so running it twice is harmless.
+
+    Returns:
+        RecountJob or None: The claimed job, now running
+    """
+    from votes.models import RecountJob
+
+    stale_before = timezone.now() - timedelta(seconds=settings.RECOUNT_JOB_STALE_SECONDS)
+    with transaction.atomic():
+        job = (
+            RecountJob.objects
+            .select_for_update(skip_locked=True)
+            .filter(
+                Q(status=RecountJob.PENDING) |
+                Q(status=RecountJob.RUNNING, updated_at__lt=stale_before)
+            )
+            .order_by('created_at')
+            .first()
+        )
+        if job is None:
+            return None
+        job.status = RecountJob.RUNNING
+        job.started_at = timezone.now()
+        job.save(update_fields=['status', 'started_at', 'updated_at'])
+    return job
+
+
+def run_recount_job(job, chunk_size=None):
+    """
+    Recount a claimed job's election and record the outcome on the job.
+
+    Args:
+        job (RecountJob): A claimed, running job
+        chunk_size (int): Rows fetched per round trip
+
+    Returns:
+        dict or None: The result of recount_election(), None if it failed
+    """
+    try:
+        result = recount_election(job.election_id, job.certify, chunk_size)
+    except Exception as e:
+        logger.exception(f"Recount job {job.pk} failed")
+        job.status = job.FAILED
+        job.error = str(e)
+        job.finished_at = timezone.now()
+        job.save(update_fields=['status', 'error', 'finished_at', 'updated_at'])
+        return None
+
+    job.status = job.DONE
+    job.snapshot_id = result['snapshot_id']
+    job.finished_at = timezone.now()
+    job.save(update_fields=['status', 'snapshot', 'finished_at', 'updated_at'])
+    return result
@@ -1,98 +1,96 @@
 """
 votes/serializers.py
 
-Serializers for the Vote and VoteAuditLog models.
+Serializers for the Vote, Participation and VoteAuditLog models.
 """
 from django.core.exceptions import ValidationError as DjangoValidationError
 
 from rest_framework import serializers
 
 from elections.models import Candidate
-from users.models import VoterProfile
-from votes.models import Vote, VoteAuditLog
+from users.permissions import get_request_voter
+from votes.models import Participation, Vote, VoteAuditLog
 
 
-class VoteCastSerializer(serializers.ModelSerializer):
+class VoteCastSerializer(serializers.Serializer):
     """
-    Serializer for casting a vote.
-    Only requires candidate_id, voter is automatically set from request.user.
+    Serializer for casting a ballot.
+    Takes candidate_id for a single choice, or candidate_ids for approval
+    ballots (the approved candidates) and ranked ballots (preferences,
+    first choice first); voter is automatically set from request.user.
     """
-    candidate_id = serializers.UUIDField(write_only=True)
-    
-    class Meta:
-        model = Vote
-        fields = ['candidate_id']
+    candidate_id = serializers.UUIDField(write_only=True, required=False)
+    candidate_ids = serializers.ListField(
+        child=serializers.UUIDField(),
+        write_only=True,
+        required=False,
+        allow_empty=False
+    )
     
-    def validate_candidate_id(self, value):
+    def validate(self, attrs):
         """
-        Validate that the candidate exists and the election is open.
+        Resolve the candidates, and check the election is open and the user
+        has not voted in it yet.
         """
-        try:
-            candidate = Candidate.objects.get(id=value)
-        except Candidate.DoesNotExist:
+        if ('candidate_id' in attrs) == ('candidate_ids' in attrs):
+            raise serializers.ValidationError("Give either candidate_id or candidate_ids.")
+        candidate_ids = attrs.get('candidate_ids') or [attrs['candidate_id']]
+
+        found = Candidate.objects.select_related('election').in_bulk(candidate_ids)
+        if len(found) != len(set(candidate_ids)):
             raise serializers.ValidationError("Invalid candidate ID.")
+        candidates = [found[candidate_id] for candidate_id in candidate_ids]
+        election = candidates[0].election
+        if any(candidate.election_id != election.id for candidate in candidates):
+            raise serializers.ValidationError("All candidates must stand in the same election.")
         
-        if not candidate.election.is_open():
+        if not election.is_open():
             raise serializers.ValidationError(
                 "Cannot vote: Election is not currently open."
             )
         
-        return value
-    
-    def validate(self, attrs):
-        """
-        Additional validation to check if user has already voted.
-        """
-        candidate_id = attrs['candidate_id']
-        candidate = Candidate.objects.get(id=candidate_id)
-        
         # Get voter from request context
         request = self.context.get('request')
         if not request or not request.user.is_authenticated:
             raise serializers.ValidationError("Authentication required.")
         
-        try:
-            voter = VoterProfile.objects.get(user=request.user)
-        except VoterProfile.DoesNotExist:
+        voter = get_request_voter(request)
+        if voter is None:
             raise serializers.ValidationError("Voter profile not found.")
         
-        # Check if user has already voted in this election
-        if Vote.objects.filter(
-            voter=voter,
-            candidate__election=candidate.election.id
-        ).exists():
+        # Check the participation ledger for a ballot already cast
+        if Participation.objects.filter(voter=voter, election=election).exists():
             raise serializers.ValidationError(
                 "You have already voted in this election."
             )
         
         attrs['voter'] = voter
-        attrs['candidate'] = candidate
+        attrs['election'] = election
+        attrs['candidates'] = candidates
         return attrs
     
     def create(self, validated_data):
         """
-        Create a new vote instance.
+        Cast the ballot, and return the voter's Participation with the
+        ballot's votes as ``ballot``.
         """
-        candidate_id = validated_data.pop('candidate_id')
-        candidate = validated_data.pop('candidate')
-        voter = validated_data.pop('voter')
-        
         try:
-            vote = Vote.objects.create(
-                voter=voter,
-                candidate=candidate,
-                **validated_data
+            participation, votes = Vote.cast_ballot(
+                validated_data['voter'],
+                validated_data['election'],
+                validated_data['candidates']
             )
-            return vote
         except DjangoValidationError as e:
-            raise serializers.ValidationError(str(e))
+            raise serializers.ValidationError(e.messages)
+        participation.ballot = votes
+        return participation
 
 
 class VoteDetailSerializer(serializers.ModelSerializer):
     """
     Serializer for displaying vote details.
+    Votes are anonymous, so there is no voter to show.
     """
-    voter_email = serializers.CharField(source='voter.user.email', read_only=True)
     candidate_name = serializers.SerializerMethodField()
     election_title = serializers.CharField(source='election.title', read_only=True)
     election_id = serializers.UUIDField(source='election.id', read_only=True)
@@ -100,10 +98,10 @@ class VoteDetailSerializer(serializers.ModelSerializer):
     class Meta:
         model = Vote
         fields = [
-            'id', 'voter_email', 'candidate_name', 'election_title', 
-            'election_id', 'vote_hash', 'is_verified', 'created_at'
+            'id', 'candidate_name', 'election_title',
+            'election_id', 'vote_hash', 'rank', 'is_verified'
         ]
-        read_only_fields = ['id', 'vote_hash', 'created_at']
+        read_only_fields = ['id', 'vote_hash']
     
     def get_candidate_name(self, obj):
         """
@@ -112,6 +110,18 @@ class VoteDetailSerializer(serializers.ModelSerializer):
         return f"{obj.candidate.first_name} {obj.candidate.last_name}"
 
 
+class ParticipationSerializer(serializers.ModelSerializer):
+    """
+    Serializer for displaying the elections a voter has voted in.
+    """
+    election_title = serializers.CharField(source='election.title', read_only=True)
+
+    class Meta:
+        model = Participation
+        fields = ['id', 'election_id', 'election_title', 'created_at']
+        read_only_fields = fields
+
+
 class VoteResultSerializer(serializers.Serializer):
     """
     Serializer for election results.
@@ -170,14 +180,24 @@ class VoteAuditLogSerializer(serializers.ModelSerializer):
     
     def get_vote_details(self, obj):
         """
-        Return basic vote information.
+        Return basic information on the participation or vote logged.
+
+        Entries about casting name the voter but not the choice; entries
+        about a vote name the choice but not the voter.
         """
-        return {
-            'vote_id': str(obj.vote.id),
-            'voter_email': obj.vote.voter.user.email,
-            'candidate_name': f"{obj.vote.candidate.first_name} {obj.vote.candidate.last_name}",
-            'election_title': obj.vote.election.title
-        }
+        if obj.participation_id:
+            return {
+                'participation_id': str(obj.participation_id),
+                'voter_email': obj.participation.voter.user.email,
+                'election_title': obj.participation.election.title
+            }
+        if obj.vote_id:
+            return {
+                'vote_id': str(obj.vote_id),
+                'candidate_name': f"{obj.vote.candidate.first_name} {obj.vote.candidate.last_name}",
+                'election_title': obj.vote.election.title
+            }
+        return None
 
 
 class VoteVerificationSerializer(serializers.Serializer):
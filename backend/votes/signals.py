@@ -0,0 +1,83 @@
+"""
+votes/signals.py
+
+This module keeps the per-event invitation funnel in step with ballots as
+they are cast, and creates and drops vote table partitions as election
+events come and go.
+"""
+import logging
+
+from django.db import DatabaseError, transaction
+from django.db.models.signals import post_save
+from django.dispatch import receiver
+
+from core.deletion import purge_started
+from election_events.models import ElectionEvent
+from invitations.models import InvitationFunnel
+from users.models import VoterProfile
+from votes.models import Participation
+from votes.partitioning import create_event_partitions, detach_event_partitions
+
+logger = logging.getLogger(__name__)
+
+
+@receiver(post_save, sender=Participation)
+def count_first_vote(sender, instance, created, using, **kwargs):
+    """
+    Count a voter in the funnel the first time they vote in their event.
+    
+    The voter's has_voted flag is claimed with a conditional UPDATE, so a
+    voter casting ballots in several elections at once is counted only once.
+    The event's funnel row is shared by every voter in the event, so it is
+    bumped after the ballot commits rather than locked for the rest of the
+    ballot's transaction; a bump lost to a crash in between is restored by
+    rebuild_invitation_funnels.
+    """
+    if not created:
+        return
+    claimed = VoterProfile.objects.filter(
+        pk=instance.voter_id,
+        has_voted=False
+    ).update(has_voted=True)
+    if claimed:
+        election_event_id = instance.election_event_id
+        transaction.on_commit(
+            lambda: InvitationFunnel.bump(election_event_id, voted=1),
+            using=using
+        )
+
+
+@receiver(post_save, sender=ElectionEvent)
+def create_vote_partitions(sender, instance, created, using, **kwargs):
+    """
+    Create a new event's vote and audit log partitions, if the tables are
+    partitioned.
+
+    Runs after the event's transaction commits, so the brief lock partition
+    creation takes on the vote tables is not held for the rest of it. If
+    it fails, the event's rows land in the DEFAULT partition and
+    partition_votes reports them.
+    """
+    if not created:
+        return
+
+    def create():
+        try:
+            create_event_partitions(instance.id, using=using)
+        except DatabaseError as e:
+            logger.error(f"Could not create vote partitions for event {instance.id}: {str(e)}")
+
+    transaction.on_commit(create, using=using)
+
+
+@receiver(purge_started, sender=ElectionEvent)
+def drop_vote_partitions(sender, object_id, using, **kwargs):
+    """
+    Drop a deleted event's vote and audit log partitions outright, instead
+    of letting the deletion job purge them batch by batch.
+    """
+    try:
+        detach_event_partitions(object_id, drop=True, using=using)
+    except ValueError:
+        # Not partitioned, or the event's rows are in the DEFAULT partition
+        pass
@@ -0,0 +1,276 @@
+"""
+votes/tally.py
+
+This module counts ballots with pluggable tally methods.
+
+A ballot is the votes sharing one receipt hash, ordered by rank: one vote
+for plurality, one per approved candidate for approval voting, and one per
+ranked preference for instant-runoff. Ballots are loaded into a Ballots
+matrix (one row per ballot, candidate indices in rank order, padded with
+the number of candidates) so that every method, and every instant-runoff
+round, is a handful of NumPy operations over all ballots at once rather
+than a Python loop per ballot.
+
+Methods are registered by name with register_tally_method() and chosen per
+election through Election.tally_method. Each takes a Ballots and returns a
+TallyResult.
+"""
+from dataclasses import dataclass, field
+
+import numpy as np
+
+PLURALITY = 'plurality'
+APPROVAL = 'approval'
+INSTANT_RUNOFF = 'irv'
+
+# Ballot shapes: how many votes a voter casts and whether their order matters
+SINGLE = 'single'
+MULTIPLE = 'multiple'
+RANKED = 'ranked'
+
+TALLY_METHODS = {}
+
+
+@dataclass
+class TallyMethod:
+    """
+    A registered tally method.
+
+    Attributes:
+        name (str): Registry key, stored in Election.tally_method
+        label (str): Human-readable name
+        ballot (str): single, multiple or ranked
+        count: Function taking a Ballots and returning a TallyResult
+    """
+    name: str
+    label: str
+    ballot: str
+    count: callable
+
+
+@dataclass
+class TallyResult:
+    """
+    Outcome of a tally.
+
+    Attributes:
+        counts (ndarray): Final count per candidate index
+        rounds (list): Count arrays of every round (one for single-round methods)
+        winner (int): Index of the winning candidate, or None on a tie or
+            without ballots
+        eliminated (list): Candidate indices in order of elimination
+    """
+    counts: np.ndarray
+    rounds: list = field(default_factory=list)
+    winner: int = None
+    eliminated: list = field(default_factory=list)
+
+
+class Ballots:
+    """
+    Ballots of one election as a compact matrix of candidate indices.
+
+    Attributes:
+        candidates (list): Candidate ids; a candidate's index is its position
+        choices (ndarray): Shape (ballots, max choices), candidate indices in
+            rank order, padded with len(candidates)
+    """
+    def __init__(self, candidates, choices):
+        self.candidates = list(candidates)
+        self.choices = choices
+
+    @property
+    def pad(self):
+        """
+        Return the value filling unused choice slots.
+        """
+        return len(self.candidates)
+
+    def __len__(self):
+        return self.choices.shape[0]
+
+    @classmethod
+    def from_rows(cls, candidates, rows):
+        """
+        Build ballots from (ballot key, candidate id) pairs.
+
+        Args:
+            candidates (list): Candidate ids of the election
+            rows: Iterable of (ballot key, candidate id), grouped by ballot
+                key and in rank order within a ballot, e.g. votes ordered
+                by (vote_hash, rank)
+
+        Returns:
+            Ballots
+        """
+        index = {candidate: position for position, candidate in enumerate(candidates)}
+        ballot_numbers = []
+        candidate_indices = []
+        previous = object()
+        number = -1
+        for key, candidate in rows:
+            if key != previous:
+                number += 1
+                previous = key
+            ballot_numbers.append(number)
+            candidate_indices.append(index[candidate])
+        return cls.from_arrays(
+            candidates,
+            np.array(ballot_numbers, dtype=np.int64),
+            np.array(candidate_indices, dtype=np.int32)
+        )
+
+    @classmethod
+    def from_arrays(cls, candidates, ballot_numbers, candidate_indices):
+        """
+        Build ballots from parallel arrays of ballot numbers and candidate
+        indices, sorted by ballot number and in rank order within a ballot.
+
+        Returns:
+            Ballots
+        """
+        candidates = list(candidates)
+        dtype = np.int16 if len(candidates) < np.iinfo(np.int16).max else np.int32
+        if not len(ballot_numbers):
+            return cls(candidates, np.empty((0, 1), dtype=dtype))
+        sizes = np.bincount(ballot_numbers)
+        starts = np.concatenate(([0], np.cumsum(sizes)[:-1]))
+        positions = np.arange(len(ballot_numbers)) - starts[ballot_numbers]
+        choices = np.full((len(sizes), sizes.max()), len(candidates), dtype=dtype)
+        choices[ballot_numbers, positions] = candidate_indices
+        return cls(candidates, choices)
+
+
+def register_tally_method(name, label, ballot=SINGLE):
+    """
+    Register a function as a tally method.
+
+    Args:
+        name (str): Registry key
+        label (str): Human-readable name
+        ballot (str): single, multiple or ranked
+
+    Returns:
+        Decorator registering the function unchanged
+    """
+    def decorator(count):
+        TALLY_METHODS[name] = TallyMethod(name, label, ballot, count)
+        return count
+    return decorator
+
+
+def get_tally_method(name):
+    """
+    Return a registered tally method.
+
+    Raises:
+        ValueError: If no method has that name
+    """
+    try:
+        return TALLY_METHODS[name]
+    except KeyError:
+        raise ValueError(f"Unknown tally method '{name}'.")
+
+
+def tally_method_choices():
+    """
+    Return (name, label) pairs of the registered methods, for model choices.
+    """
+    return [(method.name, method.label) for method in TALLY_METHODS.values()]
+
+
+def _single_winner(counts):
+    """
+    Return the index of the unique highest count, or None on a tie.
+    """
+    if not counts.size or counts.max() == 0:
+        return None
+    leaders = np.flatnonzero(counts == counts.max())
+    return int(leaders[0]) if len(leaders) == 1 else None
+
+
+@register_tally_method(PLURALITY, 'Plurality')
+def plurality(ballots):
+    """
+    Count each ballot's first choice.
+    """
+    first = ballots.choices[:, 0]
+    counts = np.bincount(first, minlength=ballots.pad + 1)[:ballots.pad]
+    return TallyResult(counts=counts, rounds=[counts], winner=_single_winner(counts))
+
+
+@register_tally_method(APPROVAL, 'Approval', ballot=MULTIPLE)
+def approval(ballots):
+    """
+    Count every candidate a ballot approves of.
+    """
+    counts = np.bincount(ballots.choices.ravel(), minlength=ballots.pad + 1)[:ballots.pad]
+    return TallyResult(counts=counts, rounds=[counts], winner=_single_winner(counts))
+
+
+@register_tally_method(INSTANT_RUNOFF, 'Instant-runoff', ballot=RANKED)
+def instant_runoff(ballots):
+    """
+    Count first preferences among the remaining candidates, eliminating the
+    weakest candidate each round until one has a majority of the ballots
+    still expressing a preference.
+
+    Rounds are vectorised and incremental: every ballot keeps its current
+    top preference, and after an elimination only the ballots that were
+    counting for the eliminated candidate look up their next remaining
+    preference, with one mask lookup over their rows. Ties for last place
+    are broken by the lower count in the previous round, then by
+    candidate order.
+    """
+    choices = ballots.choices
+    pad = ballots.pad
+    remaining = np.ones(pad + 1, dtype=bool)
+    remaining[pad] = False
+    # Every slot of a non-empty ballot is live at first, so its top
+    # preference is its first choice (the pad for an empty ballot)
+    top = choices[:, 0].astype(np.intp)
+    rounds = []
+    eliminated = []
+
+    while True:
+        # Exhausted ballots point at the pad, which is sliced off
+        counts = np.bincount(top, minlength=pad + 1)[:pad]
+        rounds.append(counts)
+
+        candidates_left = np.flatnonzero(remaining[:pad])
+        active_ballots = counts.sum()
+        if not len(candidates_left) or active_ballots == 0:
+            return TallyResult(counts=counts, rounds=rounds, eliminated=eliminated)
+        leader = candidates_left[counts[candidates_left].argmax()]
+        if counts[leader] * 2 > active_ballots or len(candidates_left) == 1:
+            winner = int(leader) if np.count_nonzero(counts[candidates_left] == counts[leader]) == 1 else None
+            return TallyResult(counts=counts, rounds=rounds, winner=winner, eliminated=eliminated)
+
+        # Lowest current count, then lowest previous-round count, then index
+        previous = rounds[-2][candidates_left] if len(rounds) > 1 else np.zeros(len(candidates_left))
+        order = np.lexsort((candidates_left, previous, counts[candidates_left]))
+        loser = int(candidates_left[order[0]])
+        remaining[loser] = False
+        eliminated.append(loser)
+
+        moved = np.flatnonzero(top == loser)
+        if len(moved):
+            rows = choices[moved]
+            live = remaining[rows]
+            slot = live.argmax(axis=1)
+            next_choice = rows[np.arange(len(moved)), slot]
+            top[moved] = np.where(live[np.arange(len(moved)), slot], next_choice, pad)
+
+
+def tally(ballots, method=PLURALITY):
+    """
+    Count ballots with a registered method.
+
+    Args:
+        ballots (Ballots): Ballots to count
+        method (str): Tally method name
+
+    Returns:
+        TallyResult
+    """
+    return get_tally_method(method).count(ballots)
@@ -1,3 +1,403 @@
-from django.test import TestCase
+"""
+votes/tests.py
 
-# Create your tests here.
+This module tests the votes app: the tally methods, casting ballots and
+counting them, queued recounts, the query plans of the hot vote and
+participation queries, and the partitioned layout of the vote tables.
+"""
+from datetime import timedelta
+from io import StringIO
+from unittest import mock
+
+import numpy as np
+from django.contrib.admin.sites import site
+from django.core.exceptions import ValidationError
+from django.db import connection, transaction
+from django.test import RequestFactory, SimpleTestCase, TestCase
+from django.utils import timezone
+
+from core.explain import explain, plan_index_names, plan_nodes
+from election_events.models import ElectionEvent
+from elections.models import Candidate, Election
+from invitations.models import Invitation
+from users.models import User, VoterProfile
+from votes.management.commands.check_vote_query_plans import Command, hot_queries, index_roots
+from votes.models import Participation, RecountJob, ResultSnapshot, Vote, VoteAuditLog
+from votes.partitioning import (
+    PARTITIONED_MODELS,
+    _referencing_foreign_keys,
+    convert_to_partitioned,
+    is_partitioned,
+    partition_name
+)
+from votes.recount import claim_recount_job, queue_recounts, run_recount_job
+from votes.tally import (
+    APPROVAL,
+    INSTANT_RUNOFF,
+    PLURALITY,
+    Ballots,
+    get_tally_method,
+    tally
+)
+
+
+def create_election(tally_method=PLURALITY, candidates=3, starts_in=timedelta(days=-1)):
+    """
+    Create an event with one election open from ``starts_in`` for two
+    days, and its candidates.
+
+    Returns:
+        tuple: (Election, list of Candidate)
+    """
+    start = timezone.now() + starts_in
+    event = ElectionEvent.objects.create(title='Event', start_time=start, end_time=start + timedelta(days=2))
+    election = Election.objects.create(
+        election_event=event, title='Election', start_time=start, end_time=start + timedelta(days=2),
+        tally_method=tally_method
+    )
+    return election, [
+        Candidate.objects.create(election=election, first_name='Candidate', last_name=str(n))
+        for n in range(candidates)
+    ]
+
+
+def create_voter(event, email, invited=True):
+    """
+    Create a voter of an event, registered through a used invitation.
+    """
+    if invited:
+        Invitation.objects.create(email=email, election_event=event, is_used=True)
+    user = User.objects.create_user(email=email, first_name='Voter', last_name='Test')
+    return VoterProfile.objects.create(user=user, election_event=event)
+
+
+def ballots(*choices, candidates=3):
+    """
+    Build Ballots from lists of candidate indices in rank order.
+    """
+    rows = [(number, index) for number, ballot in enumerate(choices) for index in ballot]
+    return Ballots.from_rows(list(range(candidates)), rows)
+
+
+class TallyTests(SimpleTestCase):
+    """
+    The tally methods, on hand-made ballots.
+    """
+    def test_ballots_are_grouped_and_padded(self):
+        result = Ballots.from_rows(['a', 'b', 'c'], [('h1', 'a'), ('h1', 'c'), ('h2', 'b')])
+
+        self.assertEqual(result.choices.tolist(), [[0, 2], [1, 3]])
+        self.assertEqual(len(result), 2)
+
+    def test_plurality_counts_first_choices(self):
+        result = tally(ballots([0], [1], [0], [2]), PLURALITY)
+
+        self.assertEqual(result.counts.tolist(), [2, 1, 1])
+        self.assertEqual(result.winner, 0)
+
+    def test_plurality_tie_has_no_winner(self):
+        self.assertIsNone(tally(ballots([0], [1]), PLURALITY).winner)
+
+    def test_approval_counts_every_approved_candidate(self):
+        result = tally(ballots([0, 1], [1], [1, 2]), APPROVAL)
+
+        self.assertEqual(result.counts.tolist(), [1, 3, 1])
+        self.assertEqual(result.winner, 1)
+
+    def test_instant_runoff_transfers_eliminated_preferences(self):
+        result = tally(ballots([0], [0], [1, 0], [2, 1], [2, 1]), INSTANT_RUNOFF)
+
+        self.assertEqual([counts.tolist() for counts in result.rounds], [[2, 1, 2], [3, 0, 2]])
+        self.assertEqual(result.eliminated, [1])
+        self.assertEqual(result.winner, 0)
+
+    def test_instant_runoff_drops_exhausted_ballots(self):
+        # Candidate 1 goes first; its ballot has no further preference.
+        # Candidates 0 and 2 then tie in this and the previous round, so
+        # the lower index goes, leaving candidate 2 a majority
+        result = tally(ballots([1], [0], [0], [2], [2]), INSTANT_RUNOFF)
+
+        self.assertEqual(result.eliminated, [1, 0])
+        self.assertEqual(result.counts.tolist(), [0, 0, 2])
+        self.assertEqual(result.winner, 2)
+
+    def test_no_ballots(self):
+        for method in (PLURALITY, APPROVAL, INSTANT_RUNOFF):
+            with self.subTest(method):
+                result = tally(ballots(), method)
+                self.assertEqual(result.counts.tolist(), [0, 0, 0])
+                self.assertIsNone(result.winner)
+
+    def test_unknown_method(self):
+        with self.assertRaises(ValueError):
+            get_tally_method('borda')
+
+    def test_counts_are_arrays(self):
+        self.assertIsInstance(tally(ballots([0]), PLURALITY).counts, np.ndarray)
+
+
+class CastBallotTests(TestCase):
+    """
+    Casting ballots into the ballot box and the participation ledger, and
+    counting them.
+    """
+    def setUp(self):
+        self.election, self.candidates = create_election()
+        self.event = self.election.election_event
+        self.voter = create_voter(self.event, 'voter@example.com')
+
+    def test_ballot_is_recorded_apart_from_the_voter(self):
+        participation, votes = Vote.cast_ballot(self.voter, self.election, [self.candidates[1]])
+
+        self.assertEqual(participation.voter, self.voter)
+        self.assertEqual([vote.candidate for vote in votes], [self.candidates[1]])
+        self.assertEqual(len(votes[0].vote_hash), 64)
+        self.voter.refresh_from_db()
+        self.assertTrue(self.voter.has_voted)
+
+    def test_voter_votes_once(self):
+        Vote.cast_ballot(self.voter, self.election, [self.candidates[0]])
+
+        with self.assertRaises(ValidationError):
+            Vote.cast_ballot(self.voter, self.election, [self.candidates[1]])
+        self.assertEqual(Vote.objects.filter(election=self.election).count(), 1)
+
+    def test_invalid_ballots_are_refused(self):
+        other_election, other_candidates = create_election()
+        stranger = create_voter(self.event, 'stranger@example.com', invited=False)
+        closed, closed_candidates = create_election(starts_in=timedelta(days=-3))
+        cases = [
+            ('two choices', self.voter, self.election, self.candidates[:2]),
+            ('no choice', self.voter, self.election, []),
+            ('other election', self.voter, self.election, other_candidates[:1]),
+            ('not invited', stranger, self.election, self.candidates[:1]),
+            ('closed', self.voter, closed, closed_candidates[:1]),
+        ]
+        for label, voter, election, candidates in cases:
+            with self.subTest(label), self.assertRaises(ValidationError):
+                Vote.cast_ballot(voter, election, candidates)
+        self.assertFalse(Participation.objects.exists())
+
+    def test_plurality_results(self):
+        for number, choice in enumerate([0, 1, 1]):
+            voter = create_voter(self.event, f'plurality{number}@example.com')
+            Vote.cast_ballot(voter, self.election, [self.candidates[choice]])
+
+        self.assertEqual(
+            Vote.get_election_results(self.election),
+            {'Candidate 1': 2, 'Candidate 0': 1}
+        )
+
+    def test_ranked_results_come_from_the_final_round(self):
+        election, candidates = create_election(INSTANT_RUNOFF)
+        for number, ranking in enumerate([[0], [0], [1, 0], [2, 1], [2, 1]]):
+            voter = create_voter(election.election_event, f'ranked{number}@example.com')
+            Vote.cast_ballot(voter, election, [candidates[index] for index in ranking])
+
+        self.assertEqual(Vote.objects.filter(election=election, rank=2).count(), 3)
+        self.assertEqual(
+            Vote.get_election_results(election),
+            {'Candidate 0': 3, 'Candidate 2': 2, 'Candidate 1': 0}
+        )
+
+    def test_approval_results_count_each_approval(self):
+        election, candidates = create_election(APPROVAL)
+        for number, approved in enumerate([[0, 1], [1], [1, 2]]):
+            voter = create_voter(election.election_event, f'approval{number}@example.com')
+            Vote.cast_ballot(voter, election, [candidates[index] for index in approved])
+
+        self.assertEqual(
+            Vote.get_election_results(election),
+            {'Candidate 1': 3, 'Candidate 2': 1, 'Candidate 0': 1}
+        )
+
+
+class RecountJobTests(TestCase):
+    """
+    Recounts are queued and run by the worker, not in the request asking
+    for them.
+    """
+    @classmethod
+    def setUpTestData(cls):
+        cls.election, cls.candidates = create_election()
+        voter = create_voter(cls.election.election_event, 'recount@example.com')
+        Vote.cast_ballot(voter, cls.election, [cls.candidates[2]])
+
+    def test_admin_action_only_queues(self):
+        admin = site._registry[Election]
+        request = RequestFactory().post('/admin/elections/election/')
+        request.user = User.objects.create_user(email='admin@example.com', is_staff=True)
+
+        with mock.patch.object(admin, 'message_user'):
+            admin.recount(request, Election.objects.filter(pk=self.election.pk))
+
+        job = RecountJob.objects.get()
+        self.assertEqual((job.status, job.requested_by), (RecountJob.PENDING, request.user))
+        self.assertFalse(ResultSnapshot.objects.exists())
+
+    def test_pending_recounts_are_not_queued_twice(self):
+        queue_recounts([self.election.pk])
+        queue_recounts([self.election.pk])
+
+        self.assertEqual(RecountJob.objects.count(), 1)
+
+    def test_worker_runs_the_recount(self):
+        queue_recounts([self.election.pk])
+        job = claim_recount_job()
+        self.assertEqual(job.status, RecountJob.RUNNING)
+        self.assertIsNone(claim_recount_job())
+
+        result = run_recount_job(job)
+
+        job.refresh_from_db()
+        self.assertEqual(job.status, RecountJob.DONE)
+        self.assertEqual(job.snapshot_id, result['snapshot_id'])
+        self.assertEqual(job.snapshot.results[0]['candidate_id'], str(self.candidates[2].pk))
+
+    def test_failed_recount_is_recorded(self):
+        queue_recounts([self.election.pk])
+        job = claim_recount_job()
+
+        with mock.patch('votes.recount.recount_election', side_effect=RuntimeError('disk full')), \
+                self.assertLogs('votes.recount', 'ERROR'):
+            self.assertIsNone(run_recount_job(job))
+
+        job.refresh_from_db()
+        self.assertEqual((job.status, job.error), (RecountJob.FAILED, 'disk full'))
+
+
+class VoteQueryPlanTests(TestCase):
+    """
+    Every hot vote and participation query can be answered from the index
+    designed for it, on the plain and on the partitioned layout.
+
+    Sequential scans are disabled, as in SearchIndexPlanTests: on test
+    sized tables the planner would rightly prefer them. The
+    check_vote_query_plans command checks the planner picks the indexes on
+    its own over realistically sized tables.
+    """
+    @classmethod
+    def setUpTestData(cls):
+        # Enough rows for the statistics to tell the indexes apart
+        options = {'events': 4, 'votes': 100, 'candidates': 5, 'unverified': 0.05}
+        events = Command(stdout=StringIO()).seed('test', options)
+        cls.election = events[-1].elections.get()
+
+    def hot_query_plans(self):
+        election = self.election
+        vote = Vote.objects.filter(election=election).first()
+        participation = Participation.objects.filter(election=election).first()
+        with transaction.atomic():
+            with connection.cursor() as cursor:
+                cursor.execute("ANALYZE votes_vote, votes_participation")
+                cursor.execute("SET LOCAL enable_seqscan = off")
+            return [
+                (label, explain(queryset)['Plan'], index)
+                for label, queryset, index in hot_queries(election, vote, participation)
+            ]
+
+    def assertUsesDesignedIndexes(self):
+        tables = (Vote._meta.db_table, Participation._meta.db_table)
+        for label, plan, index in self.hot_query_plans():
+            with self.subTest(label):
+                scans = [
+                    node['Relation Name'] for node in plan_nodes(plan)
+                    if node['Node Type'] == 'Seq Scan' and node.get('Relation Name', '').startswith(tables)
+                ]
+                self.assertEqual(scans, [])
+                self.assertIn(index, index_roots(plan_index_names(plan)))
+
+    def test_plain_layout(self):
+        self.assertUsesDesignedIndexes()
+
+    def test_partitioned_layout(self):
+        with connection.cursor() as cursor:
+            cursor.execute("SET CONSTRAINTS ALL IMMEDIATE")
+        for model in PARTITIONED_MODELS:
+            convert_to_partitioned(model)
+
+        self.assertUsesDesignedIndexes()
+
+
+class PartitioningTests(TestCase):
+    """
+    Converting the vote tables to the partitioned layout. The conversion is
+    transactional, so each test's rollback restores the plain tables.
+    """
+    @classmethod
+    def setUpTestData(cls):
+        now = timezone.now()
+        cls.event = ElectionEvent.objects.create(
+            title='Event', start_time=now - timedelta(days=1), end_time=now + timedelta(days=1)
+        )
+        election = Election.objects.create(
+            election_event=cls.event, title='Election',
+            start_time=now - timedelta(days=1), end_time=now + timedelta(days=1)
+        )
+        candidate = Candidate.objects.create(election=election, first_name='Ada', last_name='Byron')
+        cls.votes = [
+            Vote.objects.create(candidate=candidate, vote_hash=Vote.generate_receipt())
+            for _ in range(3)
+        ]
+        for vote in cls.votes:
+            VoteAuditLog.objects.create(vote=vote, action='verified')
+
+    def partition(self):
+        with connection.cursor() as cursor:
+            # ALTER TABLE refuses tables with deferred foreign key checks pending
+            cursor.execute("SET CONSTRAINTS ALL IMMEDIATE")
+        for model in PARTITIONED_MODELS:
+            convert_to_partitioned(model)
+
+    def foreign_keys(self, table, referenced):
+        with connection.cursor() as cursor:
+            cursor.execute(
+                """
+                SELECT pg_get_constraintdef(oid) FROM pg_constraint
+                WHERE conrelid = %s::regclass AND confrelid = %s::regclass
+                  AND contype = 'f' AND conparentid = 0
+                """,
+                [table, referenced]
+            )
+            return [row[0] for row in cursor.fetchall()]
+
+    def test_audit_log_foreign_key_is_a_referencing_key(self):
+        self.assertIn(VoteAuditLog._meta.get_field('vote'), _referencing_foreign_keys(Vote))
+
+    def test_partitioning_keeps_rows_in_event_partitions(self):
+        self.partition()
+
+        for model in PARTITIONED_MODELS:
+            self.assertTrue(is_partitioned(model))
+        with connection.cursor() as cursor:
+            cursor.execute(f"SELECT count(*) FROM {partition_name(Vote, self.event.id)}")
+            self.assertEqual(cursor.fetchone()[0], 3)
+        self.assertEqual(VoteAuditLog.objects.filter(vote__in=self.votes).count(), 3)
+
+    def test_partitioning_recreates_audit_log_foreign_key(self):
+        self.partition()
+
+        self.assertEqual(
+            self.foreign_keys('votes_voteauditlog', 'votes_vote'),
+            ['FOREIGN KEY (vote_id, election_event_id) REFERENCES votes_vote(id, election_event_id) '
+             'DEFERRABLE INITIALLY DEFERRED']
+        )
+
+    def test_partitioning_keeps_the_tables_own_constraints_only(self):
+        self.partition()
+
+        # The foreign key to votes has an internal clone per votes partition;
+        # these were once copied onto the audit log table as its own
+        with connection.cursor() as cursor:
+            cursor.execute(
+                """
+                SELECT confrelid::regclass::text FROM pg_constraint
+                WHERE conrelid = 'votes_voteauditlog'::regclass AND contype = 'f'
+                  AND conparentid = 0
+                ORDER BY 1
+                """
+            )
+            referenced = [row[0] for row in cursor.fetchall()]
+        self.assertEqual(referenced, [
+            'election_events_electionevent', 'users_user', 'votes_participation', 'votes_vote',
+        ])
@@ -9,6 +9,7 @@ from votes.views import (
     VoteDetailView,
     VoteAuditLogListView,
     ElectionResultsView,
+    ArchivedResultsView,
     ElectionEventParticipationView,
     ElectionsAvailableView,
     check_vote_status,
@@ -31,6 +32,7 @@ urlpatterns = [
     # Election Results and Statistics
     path('results/<uuid:election_id>/', ElectionResultsView.as_view(), name='election-results'),
     path('statistics/<uuid:election_id>/', election_statistics, name='election-statistics'),
+    path('archives/<uuid:event_id>/results/', ArchivedResultsView.as_view(), name='archived-results'),
     
     # Election Event Participation
     path('participation/<uuid:event_id>/', ElectionEventParticipationView.as_view(), name='event-participation'),
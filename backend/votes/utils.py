@@ -2,31 +2,35 @@
 Email utilities for  vote receipt.
 
 This module contains utility functions for sending emails of vote receipts
-to voters with details about their vote.
+to voters with the receipt of their ballot.
 """
 from django.core.mail import send_mail
 from django.conf import settings
 
-def send_vote_receipt_email(vote):
+def send_vote_receipt_email(participation, receipt):
         """
         Sends a vote receipt email to the voter right after casting a
-        vote with details about their vote.
+        ballot, with the receipt hash to verify it with.
+
+        The email does not say who the voter voted for: the choices are
+        only in the anonymous ballot box, under the receipt.
         """
-        email = vote.voter.user.email
-        subject = f"Your Vote Receipt for {vote.election.title}"
+        email = participation.voter.user.email
+        election = participation.election
+        subject = f"Your Vote Receipt for {election.title}"
 
         message = f"""
-Hello {vote.voter.user.first_name},
+Hello {participation.voter.user.first_name},
 
-Thank you for voting in '{vote.election.title}'.
+Thank you for voting in '{election.title}'.
 
-You voted for:
-- Candidate: {vote.candidate.first_name} {vote.candidate.last_name}
-- Election: {vote.election.title}
-- Time: {vote.created_at.strftime('%Y-%M-%d %H:%M:%S')}
-- Vote Receipt Hash: {vote.vote_hash}
+Your ballot:
+- Election: {election.title}
+- Time: {participation.created_at.strftime('%Y-%m-%d %H:%M:%S')}
+- Vote Receipt Hash: {receipt}
 
-Keep this receipt for your records.
+Keep this receipt for your records. You can check your ballot was counted
+as cast by verifying the receipt hash.
 
 Regards,
 NexaVote Team
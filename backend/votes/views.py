@@ -4,24 +4,30 @@ votes/views.py
 Views for handling vote-related operations including casting votes,
 viewing results, and managing vote audit logs.
 """
+import uuid
+
 from django.core.exceptions import ValidationError
 from django.db.models import Count, Q
 from django.shortcuts import get_object_or_404
 from django.utils import timezone
+from django.utils.decorators import method_decorator
 
 from django_filters.rest_framework import DjangoFilterBackend
 from rest_framework.filters import OrderingFilter
-from rest_framework import generics, status, permissions
+from rest_framework import generics, serializers, status, permissions
 from rest_framework.decorators import api_view, permission_classes, throttle_classes
 from rest_framework.response import Response
-from rest_framework.throttling import AnonRateThrottle
 
+from core.pagination import PageNumberOrKeysetPagination
+from core.routers import read_from_replica
+from core.throttling import VoteVerificationRateThrottle
 from elections.models import Election, ElectionEvent
 from elections.serializers import ElectionSerializer
-from users.models import VoterProfile
-from users.permissions import IsVoter, IsElectionAdmin
-from votes.models import Vote, VoteAuditLog
+from users.permissions import IsVoter, IsElectionAdmin, get_request_voter
+from votes.archive import read_results
+from votes.models import Participation, Vote, VoteArchive, VoteAuditLog
 from votes.serializers import (
+    ParticipationSerializer,
     VoteCastSerializer,
     VoteDetailSerializer,
     VoteResultSerializer,
@@ -37,38 +43,39 @@ from votes.utils import send_vote_receipt_email
 
 class CastVoteView(generics.CreateAPIView):
     """
-    API view for casting a vote.
-    Only authenticated voters can cast votes.
+    API view for casting a ballot.
+    Only authenticated voters can cast ballots.
     """
     serializer_class = VoteCastSerializer
     permission_classes = [permissions.IsAuthenticated, IsVoter]
     
     def create(self, request, *args, **kwargs):
         """
-        Create vote and log the action and return vote receipt.
+        Cast the ballot, log the action and return the ballot's receipt.
         """
         serializer = self.get_serializer(data=request.data)
         serializer.is_valid(raise_exception=True)
-        vote = serializer.save()
+        participation = serializer.save()
+        receipt = participation.ballot[0].vote_hash
         
-        # Create audit log
+        # Create audit log; it records the participation, not the choices
         VoteAuditLog.objects.create(
-            vote=vote,
+            participation=participation,
             action='cast',
             performed_by=self.request.user,
-            details=f"Vote cast for candidate {vote.candidate.first_name} {vote.candidate.last_name}",
+            details=f"Ballot cast in {participation.election.title}",
             ip_address=self.get_client_ip()
         )
 
         # Send vote receipt email
-        send_vote_receipt_email(vote)
+        send_vote_receipt_email(participation, receipt)
 
         return Response({
             "detail": "Vote submitted successfully.",
             "receipt": {
-                "vote_id": str(vote.id),
-                "timestamp": vote.created_at,
-                "vote_hash": vote.vote_hash
+                "election_id": str(participation.election_id),
+                "timestamp": participation.created_at,
+                "vote_hash": receipt
             }
         }, status=status.HTTP_201_CREATED)
     
@@ -86,54 +93,50 @@ class CastVoteView(generics.CreateAPIView):
 
 class VoteDetailView(generics.RetrieveAPIView):
     """
-    API view for getting vote details.
-    Voters can only see their own votes, admins can see all votes.
+    API view for getting vote details. Admins only: votes are anonymous,
+    so voters look their ballot up by receipt hash with verify_vote instead.
     """
     serializer_class = VoteDetailSerializer
-    permission_classes = [permissions.IsAuthenticated]
+    permission_classes = [permissions.IsAuthenticated, IsElectionAdmin]
     
     def get_queryset(self):
         """
-        Return appropriate queryset based on user permissions.
+        Return votes with their candidate and election.
         """
-        if self.request.user.is_staff:
-            return Vote.objects.all()
-        else:
-            try:
-                voter = VoterProfile.objects.get(user=self.request.user)
-                return Vote.objects.filter(voter=voter).select_related(
-                    'candidate',
-                    'candidate__election',
-                    'voter__user'
-                )
-            except VoterProfile.DoesNotExist:
-                return Vote.objects.none()
+        return Vote.objects.select_related('candidate', 'election')
 
 
 class VoterVotesListView(generics.ListAPIView):
     """
-    API view for listing votes cast by the authenticated voter.
+    API view for listing the elections the authenticated voter has voted
+    in, from the participation ledger. Choices are not listed: they are
+    only in the anonymous ballot box, under each ballot's receipt.
+    Supports ``?pagination=cursor`` for keyset paging.
     """
-    serializer_class = VoteDetailSerializer
+    serializer_class = ParticipationSerializer
     permission_classes = [permissions.IsAuthenticated, IsVoter]
+    pagination_class = PageNumberOrKeysetPagination
     
     def get_queryset(self):
         """
-        Return votes for the authenticated user.
+        Return participations of the authenticated user.
         """
-        try:
-            voter = VoterProfile.objects.get(user=self.request.user)
-            queryset =  Vote.objects.filter(voter=voter).select_related(
-                'candidate', 'candidate__election', 'voter__user'
-            ).order_by('-created_at')
-            
-            election_id = self.request.query_params.get('election_id')
-            if election_id:
-                queryset = queryset.filter(candidate__election__id=election_id)
-            
-            return queryset
-        except VoterProfile.DoesNotExist:
-            return Vote.objects.none()
+        voter = get_request_voter(self.request)
+        if voter is None:
+            return Participation.objects.none()
+        queryset = Participation.objects.filter(voter=voter).select_related(
+            'election'
+        ).order_by('-created_at')
+        
+        election_id = self.request.query_params.get('election_id')
+        if election_id:
+            try:
+                election_id = uuid.UUID(election_id)
+            except ValueError:
+                raise serializers.ValidationError({'election_id': 'Must be a valid UUID.'})
+            queryset = queryset.filter(election_id=election_id)
+        
+        return queryset
 
 
 class ElectionResultsView(generics.RetrieveAPIView):
@@ -152,7 +155,7 @@ class ElectionResultsView(generics.RetrieveAPIView):
         election = get_object_or_404(Election, id=election_id)
         
         # Check if user can view results
-        if not timezone.now() > election.end_time or not self.request.user.is_staff:
+        if not election.has_ended() or not self.request.user.is_staff:
             self.permission_denied(
                 self.request,
                 message="Results not available yet."
@@ -165,7 +168,12 @@ class ElectionResultsView(generics.RetrieveAPIView):
         Return election results.
         """
         election = self.get_object()
-        results = Vote.get_election_results(election)
+        # Certified results are served from their recount snapshot
+        snapshot = election.result_snapshots.filter(is_certified=True).first()
+        if snapshot is not None:
+            results = {result['candidate_name']: result['vote_count'] for result in snapshot.results}
+        else:
+            results = Vote.get_election_results(election)
         
         # Format results for serializer
         formatted_results = [
@@ -184,9 +192,43 @@ class ElectionResultsView(generics.RetrieveAPIView):
         return Response(serializer.data)
 
 
+class ArchivedResultsView(generics.GenericAPIView):
+    """
+    API view serving an archived election event's results straight from
+    its archive files. Election admins only.
+    """
+    permission_classes = [permissions.IsAuthenticated, IsElectionAdmin]
+
+    def get(self, request, event_id):
+        """
+        Return the results snapshot of the event's archive.
+        """
+        archive = get_object_or_404(
+            VoteArchive,
+            election_event_id=event_id,
+            status=VoteArchive.ARCHIVED
+        )
+        try:
+            results = read_results(archive)
+        except ValueError as e:
+            return Response({
+                'error': str(e)
+            }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+
+        results['archive'] = {
+            'id': str(archive.id),
+            'archived_at': archive.updated_at,
+            'vote_count': archive.vote_count,
+            'audit_log_count': archive.audit_log_count,
+        }
+        return Response(results, status=status.HTTP_200_OK)
+
+
+@method_decorator(read_from_replica, name='get')
 class ElectionEventParticipationView(generics.RetrieveAPIView):
     """
     API view for getting voter participation statistics for an election event.
+    Reads from the replica when one is configured.
     """
     serializer_class = VoterParticipationSerializer
     permission_classes = [permissions.IsAuthenticated, IsElectionAdmin]
@@ -209,15 +251,19 @@ class ElectionEventParticipationView(generics.RetrieveAPIView):
         return Response(serializer.data)
 
 
+@method_decorator(read_from_replica, name='get')
 class VoteAuditLogListView(generics.ListAPIView):
     """
     API view for listing vote audit logs.
     Only accessible by election admins.
+    Supports ``?pagination=cursor`` for keyset paging.
+    Reads from the replica when one is configured.
     """
     serializer_class = VoteAuditLogSerializer
     permission_classes = [permissions.IsAuthenticated, IsElectionAdmin]
+    pagination_class = PageNumberOrKeysetPagination
     filter_backends = [DjangoFilterBackend, OrderingFilter]
-    filterset_fields = ['action', 'vote__candidate__election']
+    filterset_fields = ['action', 'participation__election', 'vote__election']
     ordering = ['-created_at']
     
     def get_queryset(self):
@@ -225,8 +271,8 @@ class VoteAuditLogListView(generics.ListAPIView):
         Return audit logs with related data.
         """
         return VoteAuditLog.objects.select_related(
-            'vote', 'vote__voter__user', 'vote__candidate', 
-            'vote__candidate__election', 'performed_by'
+            'participation__voter__user', 'participation__election',
+            'vote__candidate', 'vote__election', 'performed_by'
         )
 
 
@@ -238,49 +284,51 @@ class ElectionsAvailableView(generics.ListAPIView):
     permission_classes = [permissions.IsAuthenticated, IsVoter]
 
     def get_queryset(self):
-        user = self.request.user
-        try:
-            voter = VoterProfile.objects.get(user=user)
-        except VoterProfile.DoesNotExist:
+        voter = get_request_voter(self.request)
+        if voter is None:
             return Election.objects.none()
         
-        voted_election_ids = Vote.objects.filter(
+        voted_election_ids = Participation.objects.filter(
             voter=voter
-        ).values_list('candidate__election_id', flat=True)
+        ).values_list('election_id', flat=True)
 
-        return Election.objects.filter(
-            election_event=voter.election_event,
-            is_active=True,
-            start_time__lte=timezone.now(),
-            end_time__gte=timezone.now()
-        ).exclude(id__in=voted_election_ids)
+        return Election.open_for_event(voter.election_event_id).exclude(
+            id__in=voted_election_ids
+        )
 
 
 @api_view(['POST'])
 @permission_classes([])
-@throttle_classes([AnonRateThrottle])
+@throttle_classes([VoteVerificationRateThrottle])
 def verify_vote(request):
     """
-    API endpoint for verifying a vote using its hash.
+    API endpoint for verifying a ballot using its receipt hash.
+
+    Throttled per client IP ('vote_verify' rate) in the shared throttle
+    store, since vote hashes must not be guessable by brute force.
     """
     serializer = VoteVerificationSerializer(data=request.data)
     if serializer.is_valid():
         vote_hash = serializer.validated_data['vote_hash']
-        try:
-            vote = Vote.objects.get(vote_hash=vote_hash)
-            return Response({
-                'verified': True,
-                'vote_id': vote.id,
-                'election_title': vote.candidate.election.title,
-                'candidate_name': f"{vote.candidate.first_name} {vote.candidate.last_name}",
-                'created_at': vote.created_at,
-                'is_verified': vote.is_verified
-            })
-        except Vote.DoesNotExist:
+        # A ballot's votes share its receipt, one per candidate
+        votes = list(
+            Vote.objects.select_related('candidate', 'election')
+            .filter(vote_hash=vote_hash)
+            .order_by('rank')
+        )
+        if not votes:
             return Response({
                 'verified': False,
                 'message': 'Vote hash not found'
             }, status=status.HTTP_404_NOT_FOUND)
+        candidate_names = [f"{vote.candidate.first_name} {vote.candidate.last_name}" for vote in votes]
+        return Response({
+            'verified': True,
+            'election_title': votes[0].election.title,
+            'candidate_name': candidate_names[0],
+            'candidate_names': candidate_names,
+            'is_verified': all(vote.is_verified for vote in votes)
+        }, status=status.HTTP_200_OK)
     
     return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
@@ -291,38 +339,38 @@ def check_vote_status(request, election_id):
     """
     Check if the authenticated user has voted in a specific election.
     """
-    try:
-        voter = VoterProfile.objects.get(user=request.user)
-        election = get_object_or_404(Election, id=election_id)
-        
-        vote_exists = Vote.objects.filter(
-            voter=voter,
-            candidate__election=election
-        ).exists()
-        
-        return Response({
-            'has_voted': vote_exists,
-            'election_id': election.id,
-            'election_title': election.title,
-            'election_status': (election.get_status_display()
-                    if hasattr(election, 'get_status_display') else 'active')
-        })  # modify election model to add choices later
-        
-    except VoterProfile.DoesNotExist:
+    voter = get_request_voter(request)
+    if voter is None:
         return Response({
             'error': 'Voter profile not found'
         }, status=status.HTTP_400_BAD_REQUEST)
+    
+    election = get_object_or_404(Election, id=election_id)
+    
+    vote_exists = Participation.objects.filter(voter=voter, election=election).exists()
+    
+    return Response({
+        'has_voted': vote_exists,
+        'election_id': election.id,
+        'election_title': election.title,
+        'election_status': (election.get_status_display()
+                if hasattr(election, 'get_status_display') else 'active')
+    })  # modify election model to add choices later
 
 
 @api_view(['GET'])
 @permission_classes([permissions.IsAuthenticated, IsElectionAdmin])
+@read_from_replica
 def election_statistics(request, election_id):
     """
     Get detailed vote statistics for a specific election. Admins only.
+    Reads from the replica when one is configured.
     """
     election = get_object_or_404(Election, id=election_id)
 
-    base_qs = Vote.objects.filter(candidate__election=election, is_verified=True)
+    # Naming the event lets Postgres scan only its partition
+    election_votes = Vote.objects.filter(election_event_id=election.election_event_id, election=election)
+    base_qs = election_votes.filter(is_verified=True)
 
     # Total Votes Cast in Specific Election
     total_votes = base_qs.count()
@@ -335,17 +383,20 @@ def election_statistics(request, election_id):
         .order_by('-vote_count')
     )
     
-    # Voting timeline (votes per hour/day)
+    # Voting timeline (ballots per hour/day), from the participation
+    # ledger: votes carry no timestamps
     from django.db.models.functions import TruncHour, TruncDay
 
     granularity = request.query_params.get('granularity', 'hour')
     trunc_fn = TruncDay if granularity == 'day' else TruncHour
 
+    # COUNT(*) rather than COUNT(id), so participation_election_idx can
+    # answer it with an index-only scan
     voting_timeline = (
-        base_qs
+        Participation.objects.filter(election=election)
         .annotate(bucket=trunc_fn('created_at', tzinfo=timezone.get_current_timezone()))
         .values('bucket')
-        .annotate(vote_count=Count('id'))
+        .annotate(vote_count=Count('*'))
         .order_by('bucket')
     )
 
@@ -354,10 +405,7 @@ def election_statistics(request, election_id):
     
     # Check For Unverified Votes Count
     verified_votes = total_votes
-    unverified_votes = (
-        Vote.objects.filter(candidate__election=election, is_verified=False)
-        .count()
-    )
+    unverified_votes = election_votes.filter(is_verified=False).count()
     
     return Response({
         'election_id': str(election.id),